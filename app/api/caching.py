@@ -0,0 +1,109 @@
+"""
+ETags and conditional GETs for the read-only data endpoints.
+
+An endpoint's ETag is a strong hash of the sheet contents it was built from
+(LeagueData.content_hash), the endpoint name and the configuration constants it
+embeds. A request whose If-None-Match matches gets an empty 304; otherwise the
+rendered body is reused for as long as the ETag stays the same.
+"""
+
+from collections import OrderedDict
+from typing import Any, Callable
+import hashlib
+import threading
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from app.api.compression import ENCODING_ETAG_SUFFIXES
+from app.api.serializers import dumps
+from app.core import config
+from app.core.config import DATA_CACHE_TTL_SECONDS
+
+# Rendered bodies kept (one per endpoint and content version)
+MAX_CACHED_BODIES = 32
+
+
+def _config_fingerprint() -> str:
+    """Hash of the configuration constants (rules, divisions, tiers...) the endpoints return."""
+    constants = sorted(
+        (name, repr(value)) for name, value in vars(config).items()
+        if name.isupper() and not name.startswith("CREDENTIALS")
+    )
+    return hashlib.sha256(repr(constants).encode('utf-8')).hexdigest()
+
+
+CONFIG_FINGERPRINT = _config_fingerprint()
+
+
+def make_etag(endpoint: str, content_hash: str) -> str:
+    """Strong ETag for an endpoint's response built from the given content."""
+    digest = hashlib.sha256(f"{endpoint}\0{content_hash}\0{CONFIG_FINGERPRINT}".encode('utf-8')).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def _base_etag(tag: str) -> str:
+    """An If-None-Match entry without the weak prefix or a compressed variant's suffix."""
+    tag = tag.strip().removeprefix("W/")
+    for suffix in ENCODING_ETAG_SUFFIXES:
+        if tag.endswith(f'{suffix}"'):
+            return tag[:-len(suffix) - 1] + '"'
+    return tag
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Whether an If-None-Match header matches the ETag (weak comparison, as RFC 9110 requires)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(_base_etag(tag) == etag for tag in if_none_match.split(','))
+
+
+class RenderedBodyCache:
+    """Small LRU of encoded response bodies keyed by ETag."""
+
+    def __init__(self, max_bodies: int = MAX_CACHED_BODIES):
+        self.max_bodies = max_bodies
+        self._bodies: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_render(self, etag: str, build: Callable[[], Any]) -> bytes:
+        with self._lock:
+            body = self._bodies.get(etag)
+            if body is not None:
+                self._bodies.move_to_end(etag)
+                return body
+        body = dumps(build())
+        with self._lock:
+            self._bodies[etag] = body
+            while len(self._bodies) > self.max_bodies:
+                self._bodies.popitem(last=False)
+        return body
+
+    def clear(self) -> None:
+        with self._lock:
+            self._bodies.clear()
+
+
+rendered_bodies = RenderedBodyCache()
+
+
+def conditional_json(request: Request, endpoint: str, content_hash: str, build: Callable[[], Any],
+                     max_age: int = DATA_CACHE_TTL_SECONDS) -> Response:
+    """
+    Respond with build()'s content as JSON, or 304 if the client's copy is current.
+
+    Args:
+        request: The incoming request (for If-None-Match)
+        endpoint: Name distinguishing this endpoint's ETags from the others'
+        content_hash: Hash of the data the response is built from
+        build: Produces the response content; only called on a cache miss
+        max_age: Seconds browsers may reuse the response without revalidating
+    """
+    etag = make_etag(endpoint, content_hash)
+    headers = {"ETag": etag, "Cache-Control": f"max-age={max_age}, must-revalidate"}
+    if etag_matches(request.headers.get("if-none-match", ""), etag):
+        return Response(status_code=304, headers=headers)
+    body = rendered_bodies.get_or_render(etag, build)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,199 @@
+"""
+Response compression for large JSON payloads.
+
+Full-season schedules and the /api/data and /api/info payloads compress very
+well (team and facility names repeat on every game). CompressionMiddleware picks
+brotli when the client accepts it and the brotli package is installed, gzip
+otherwise, and leaves small responses alone. Streamed responses (NDJSON) are
+compressed chunk by chunk and flushed, so each batch reaches the client as soon
+as it is serialized.
+"""
+
+from typing import Dict
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # Optional: gzip only
+    brotli = None
+
+# Suffixes added to strong ETags of compressed variants (see etag_matches in caching.py)
+ENCODING_ETAG_SUFFIXES = ("-gzip", "-br")
+
+# Responses smaller than this are sent uncompressed
+MINIMUM_SIZE = 1024
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5  # Quality 5 is close to gzip 9 in size and much faster than the default 11
+
+
+def accepted_encodings(header: str) -> Dict[str, float]:
+    """{encoding: q} from an Accept-Encoding header (encodings with q=0 are left out)."""
+    encodings = {}
+    for part in header.split(','):
+        name, _, params = part.strip().partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                continue
+        if q > 0:
+            encodings[name] = q
+    return encodings
+
+
+class _GzipCompressor:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits 31: gzip container
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _BrotliCompressor:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class CompressionMiddleware:
+    """Compress HTTP responses with brotli or gzip, per the request's Accept-Encoding."""
+
+    def __init__(self, app: ASGIApp, minimum_size: int = MINIMUM_SIZE,
+                 gzip_level: int = GZIP_LEVEL, brotli_quality: int = BROTLI_QUALITY):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def _choose(self, scope: Scope):
+        encodings = accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+        if brotli is not None and "br" in encodings:
+            return "br", lambda: _BrotliCompressor(self.brotli_quality)
+        if "gzip" in encodings:
+            return "gzip", lambda: _GzipCompressor(self.gzip_level)
+        return None, None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding, make_compressor = self._choose(scope)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressingResponder(self.app, self.minimum_size, encoding, make_compressor)
+        await responder(scope, receive, send)
+
+
+class _CompressingResponder:
+    """Holds back the response start until the first body chunk shows whether to compress."""
+
+    def __init__(self, app: ASGIApp, minimum_size: int, encoding: str, make_compressor):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encoding = encoding
+        self.make_compressor = make_compressor
+        self.send: Send = None
+        self.initial_message: Message = {}
+        self.started = False
+        self.passthrough = False
+        self.compressor = None
+        self.if_none_match = ""
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        self.if_none_match = Headers(scope=scope).get("if-none-match", "")
+        await self.app(scope, receive, self.send_compressed)
+
+    def _not_modified_headers(self, message: Message) -> None:
+        """
+        Give a 304 the ETag and Vary of the compressed 200 it revalidates.
+
+        The client's stored copy is the compressed variant when its If-None-Match
+        carries this encoding's suffixed ETag; a cache can only freshen that copy
+        if the 304 repeats the same ETag.
+        """
+        headers = MutableHeaders(raw=message["headers"])
+        etag = headers.get("etag")
+        if not etag or not etag.startswith('"'):
+            return
+        variant = f'{etag[:-1]}-{self.encoding}"'
+        if variant in (tag.strip().removeprefix("W/") for tag in self.if_none_match.split(',')):
+            headers["ETag"] = variant
+            headers.add_vary_header("Accept-Encoding")
+
+    async def send_compressed(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.initial_message = message
+            if message["status"] == 304:
+                self._not_modified_headers(message)
+                self.passthrough = True
+                return
+            # Already encoded (or explicitly not to be touched)
+            self.passthrough = "content-encoding" in Headers(raw=message["headers"])
+            return
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if not self.started:
+            self.started = True
+            if self.passthrough or (not more_body and len(body) < self.minimum_size):
+                self.passthrough = True
+                await self.send(self.initial_message)
+                await self.send(message)
+                return
+
+            self.compressor = self.make_compressor()
+            headers = MutableHeaders(raw=self.initial_message["headers"])
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            etag = headers.get("etag")
+            if etag and etag.startswith('"'):
+                # A strong ETag names exact bytes, so the compressed variant needs its own
+                headers["ETag"] = f'{etag[:-1]}-{self.encoding}"'
+            if more_body:
+                del headers["Content-Length"]
+            else:
+                body = self.compressor.compress(body) + self.compressor.finish()
+                headers["Content-Length"] = str(len(body))
+                await self.send(self.initial_message)
+                await self.send({"type": "http.response.body", "body": body, "more_body": False})
+                return
+            await self.send(self.initial_message)
+        elif self.passthrough:
+            await self.send(message)
+            return
+
+        # Streaming: flush every chunk so the client can start parsing it
+        if more_body:
+            body = self.compressor.compress(body) + self.compressor.flush()
+        else:
+            body = self.compressor.compress(body) + self.compressor.finish()
+        await self.send({"type": "http.response.body", "body": body, "more_body": more_body})
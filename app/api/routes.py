@@ -2,16 +2,36 @@
 API routes for schedule generation and management.
 """
 
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from typing import List, Dict, Any, Optional
+import logging
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from typing import List, Dict, Any, Optional, Literal
+import tempfile
+from dataclasses import asdict
 from datetime import datetime, date
 
 from app.services.sheets_reader import SheetsReader
 from app.services.scheduler import ScheduleOptimizer
 from app.services.scheduler_v2 import SchoolBasedScheduler  # New school-based clustering algorithm  # NEW: School-based scheduler
+from app.services.cp_scheduler import CPSatScheduler
+from app.services.decomposed_scheduler import DecomposedScheduler
 from app.services.validator import ScheduleValidator
-from app.models import Game, Division
+from app.services.aggregates import aggregate_schedule
+from app.services.metrics import compute_run_metrics
+from app.services.schedule_store import schedule_store
+from app.api.serializers import FastJSONResponse, game_serializer
+from app.api.caching import CONFIG_FINGERPRINT, conditional_json
+from app.services.league_data import LeagueData, league_data_cache
+from app.services import exporters
+from app.services.sheets_publisher import SheetsPublisher
+from app.services.sheets_client import sheets_client
+from app.services.exporters import CalendarWriter, calendar_groups, iter_csv, write_xlsx
+from app.services.schedule_query import (
+    GameFilters, QueryError, parse_days, DEFAULT_PAGE_SIZE
+)
+from app.models import Game, Division, Schedule
 from app.core.config import (
     SEASON_START_DATE, SEASON_END_DATE,
     WEEKNIGHT_START_TIME, WEEKNIGHT_END_TIME,
@@ -22,16 +42,24 @@ from app.core.config import (
     NO_GAMES_ON_SUNDAY, US_HOLIDAYS,
     DIVISIONS, REC_DIVISIONS, TIERS, CLUSTERS,
     ES_K1_REC_RIM_HEIGHT, ES_K1_REC_OFFICIALS, ES_K1_REC_PRIORITY_SITES,
-    PRIORITY_WEIGHTS
+    PRIORITY_WEIGHTS, TIMEOUT_SECONDS
 )
 
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/api", tags=["schedule"])
 
+# XLSX exports larger than this are buffered on disk
+XLSX_SPOOL_BYTES = 8 * 1024 * 1024
+
 
 class ScheduleRequest(BaseModel):
     """Request model for schedule generation."""
     force_regenerate: bool = False
+    profile: bool = False  # Include scheduler phase timings and rejection reasons
+    solver: Literal["greedy", "cpsat", "decomposed"] = "greedy"  # cpsat: CP-SAT warm-started from greedy; decomposed: per-cluster parallel
+    time_limit_seconds: float = Field(60.0, gt=0, le=TIMEOUT_SECONDS)  # CP-SAT time limit
 
 
 class GameResponse(BaseModel):
@@ -51,20 +79,57 @@ class ScheduleResponse(BaseModel):
     """Response model for schedule generation."""
     success: bool
     message: str
+    schedule_id: Optional[str] = None  # Key for /api/stats and later queries on this schedule
     total_games: int
     games: List[GameResponse]
     validation: Dict
     generation_time: float
+    profile: Optional[Dict] = None
+    metrics: Optional[Dict] = None  # Quality-versus-time record (see app/services/metrics.py)
 
 
 class ScheduleStats(BaseModel):
-    """Statistics about the schedule."""
+    """Statistics about the most recently generated schedule."""
+    schedule_id: str
+    generated_at: str
     total_teams: int
     total_games: int
     games_by_division: Dict[str, int]
     teams_with_8_games: int
     teams_under_8_games: int
     teams_over_8_games: int
+    facility_utilization: Optional[float] = None  # Games / available court slots
+    weeknight_courts: int = 0
+    weeknight_courts_under_3_games: int = 0
+    games_by_facility: Dict[str, int] = {}
+
+
+class GamesPageResponse(BaseModel):
+    """One page of games from a stored schedule."""
+    schedule_id: str
+    total: int  # Games matching the filters across all pages
+    count: int
+    next_cursor: Optional[str] = None  # Pass as ?cursor= for the next page; None on the last page
+    games: Any  # GameResponse fields (only those requested with ?fields=); {field: [values]} when columnar
+    teams: Optional[List[str]] = None  # format=columnar: team displays referenced by index
+    facilities: Optional[List[str]] = None  # format=columnar: facility displays referenced by index
+
+
+class PublishResponse(BaseModel):
+    """Outcome of publishing a stored schedule to the weekly Google Sheets tabs."""
+    schedule_id: str
+    dry_run: bool
+    tabs_created: List[str]
+    tabs_updated: List[str]
+    tabs_unchanged: List[str]
+    cells_changed: int
+    api_calls: int
+    retries: int
+
+
+def build_game_responses(schedule: Schedule) -> List[Dict[str, Any]]:
+    """Convert scheduled games to the API response format (GameResponse-shaped dicts)."""
+    return game_serializer.games(schedule.games)
 
 
 @router.get("/health")
@@ -73,8 +138,17 @@ async def health_check():
     return {"status": "healthy", "timestamp": datetime.now().isoformat()}
 
 
+@router.get("/sheets/metrics")
+async def sheets_metrics():
+    """Google Sheets API calls, retries, latency, throttling and circuit breaker state since startup."""
+    return sheets_client.metrics()
+
+
+# Handlers that load Sheets data or run the solver are plain defs: FastAPI runs
+# them in worker threads, so rate-limit waits, retry backoff and long solves
+# don't block the event loop (and /health)
 @router.post("/schedule", response_model=ScheduleResponse)
-async def generate_schedule(request: ScheduleRequest):
+def generate_schedule(request: ScheduleRequest):
     """
     Generate a new basketball schedule.
     
@@ -88,58 +162,41 @@ async def generate_schedule(request: ScheduleRequest):
         start_time = datetime.now()
         
         # Load data from Google Sheets
-        print("Loading data from Google Sheets...")
+        logger.info("Loading data from Google Sheets...")
         reader = SheetsReader()
         teams, facilities, rules = reader.load_all_data()
         
         # Generate schedule using NEW school-based algorithm
-        print(f"Generating schedule for {len(teams)} teams...")
-        print("Using REDESIGNED school-based scheduler (groups by schools, not divisions)")
-        optimizer = SchoolBasedScheduler(teams, facilities, rules)  # NEW SCHEDULER
+        logger.info("Generating schedule for %d teams with the school-based scheduler", len(teams))
+        if request.solver == "cpsat":
+            optimizer = CPSatScheduler(
+                teams, facilities, rules, profile=request.profile,
+                time_limit_seconds=request.time_limit_seconds
+            )
+        elif request.solver == "decomposed":
+            optimizer = DecomposedScheduler(teams, facilities, rules, profile=request.profile)
+        else:
+            optimizer = SchoolBasedScheduler(teams, facilities, rules, profile=request.profile)  # NEW SCHEDULER
         schedule = optimizer.optimize_schedule()
         
         # Validate schedule
-        print("Validating schedule...")
+        logger.info("Validating schedule...")
         validator = ScheduleValidator()
         validation_result = validator.validate_schedule(schedule)
         
         # Convert games to response format
-        games_response = []
-        for game in schedule.games:
-            # Format team names with coach names in parentheses
-            home_team_display = f"{game.home_team.school.name} ({game.home_team.coach_name})"
-            away_team_display = f"{game.away_team.school.name} ({game.away_team.coach_name})"
-            
-            # Format facility with specific court
-            facility_display = game.time_slot.facility.name
-            if game.time_slot.court_number and game.time_slot.court_number > 0:
-                facility_display = f"{facility_display} - Court {game.time_slot.court_number}"
-            
-            # Format date and day (matching Google Sheets format)
-            date_str = game.time_slot.date.strftime("%Y-%m-%d")
-            day_str = game.time_slot.date.strftime("%A")  # Full day name (Monday, Tuesday, etc.)
-            
-            # Format time in 12-hour format with AM/PM (matching Google Sheets format)
-            # Format: "5:00 PM - 6:00 PM" to match Google Sheets
-            start_time_str = game.time_slot.start_time.strftime("%I:%M %p").lstrip('0')
-            end_time_str = game.time_slot.end_time.strftime("%I:%M %p").lstrip('0')
-            time_str = f"{start_time_str} - {end_time_str}"
-            
-            games_response.append(GameResponse(
-                id=game.id,
-                home_team=home_team_display,
-                away_team=away_team_display,
-                date=date_str,
-                day=day_str,
-                time=time_str,
-                facility=facility_display,
-                court=game.time_slot.court_number,
-                division=game.division.value
-            ))
+        games_response = build_game_responses(schedule)
         
         # Calculate generation time
         generation_time = (datetime.now() - start_time).total_seconds()
         
+        # Per-team / division / facility statistics in one pass
+        aggregate = aggregate_schedule(schedule, teams)
+        metrics = compute_run_metrics(
+            schedule, teams, validation_result,
+            wall_time_seconds=generation_time, scheduler=optimizer, aggregate=aggregate
+        )
+        
         # Prepare validation summary
         validation_summary = {
             "is_valid": validation_result.is_valid,
@@ -148,336 +205,346 @@ async def generate_schedule(request: ScheduleRequest):
             "total_penalty": validation_result.total_penalty_score
         }
         
+        # Keep the schedule so /api/stats can answer without regenerating
+        stored = schedule_store.add(
+            schedule, teams, aggregate=aggregate, metrics=metrics, validation=validation_summary
+        )
+        
         # Build success message
         message = f"Schedule generated successfully with {len(schedule.games)} games"
         
-        return ScheduleResponse(
-            success=True,
-            message=message,
-            total_games=len(schedule.games),
-            games=games_response,
-            validation=validation_summary,
-            generation_time=generation_time
-        )
+        # Same shape as ScheduleResponse, encoded directly: re-validating thousands
+        # of already well-formed games would cost more than formatting them
+        return FastJSONResponse({
+            "success": True,
+            "message": message,
+            "schedule_id": stored.schedule_id,
+            "total_games": len(schedule.games),
+            "games": games_response,
+            "validation": validation_summary,
+            "generation_time": generation_time,
+            "profile": optimizer.profiler.report(),
+            "metrics": metrics
+        })
         
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.exception("Schedule generation failed")
         raise HTTPException(status_code=500, detail=f"Schedule generation failed: {str(e)}")
 
 
 @router.get("/stats", response_model=ScheduleStats)
 async def get_schedule_stats():
     """
-    Get statistics about teams and potential schedule.
+    Get statistics about the most recently generated schedule.
+    
+    Served from the stored aggregate and run metrics; nothing is reloaded or rerun.
+    """
+    stored = schedule_store.latest()
+    if stored is None:
+        raise HTTPException(status_code=404, detail="No schedule has been generated yet (POST /api/schedule)")
+    
+    aggregate = stored.aggregate
+    court_nights = aggregate.weeknight_court_games
+    return ScheduleStats(
+        schedule_id=stored.schedule_id,
+        generated_at=stored.generated_at.isoformat(timespec='seconds'),
+        total_teams=len(stored.teams),
+        total_games=aggregate.total_games,
+        games_by_division={
+            division.value: aggregate.games_by_division[division]
+            for division in Division if division in aggregate.games_by_division
+        },
+        **aggregate.game_count_buckets(stored.teams),
+        facility_utilization=stored.metrics.get("facility_utilization"),
+        weeknight_courts=len(court_nights),
+        weeknight_courts_under_3_games=sum(1 for c in court_nights.values() if c < 3),
+        games_by_facility=dict(sorted(aggregate.games_by_facility.items()))
+    )
+
+
+def _stored_or_404(schedule_id: str):
+    stored = schedule_store.get(schedule_id)
+    if stored is None:
+        raise HTTPException(status_code=404, detail=f"Unknown or expired schedule_id: {schedule_id}")
+    return stored
+
+
+# A plain def: the first query builds the game index, which runs in the threadpool
+@router.get("/schedule/{schedule_id}/games", response_model=GamesPageResponse)
+def query_schedule_games(
+    schedule_id: str,
+    team: Optional[str] = None,
+    school: Optional[str] = None,
+    coach: Optional[str] = None,
+    division: Optional[str] = None,
+    facility: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    day: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    fields: Optional[str] = None,
+    format: Literal["json", "columnar", "ndjson"] = "json"
+):
+    """
+    Query the games of a stored schedule, in date and time order.
+    
+    Filters (all optional, combined with AND; text is case-insensitive):
+    team (team id), school, coach, division (e.g. "BOY'S JV"), facility,
+    date_from / date_to (YYYY-MM-DD, inclusive) and day (comma-separated, e.g. "Tue,Sat").
+    
+    Pages hold up to `limit` games; pass the returned next_cursor as `cursor`
+    for the next page. `fields` is a comma-separated subset of the game fields.
+    
+    format=columnar returns the page as team/facility lists plus one array per
+    field (teams and facilities as indexes into those lists). format=ndjson
+    streams every matching game after `cursor`, one JSON object per line,
+    ignoring `limit`.
     """
+    stored = _stored_or_404(schedule_id)
+    
+    selected = None
+    if fields:
+        selected = {name.strip() for name in fields.split(',') if name.strip()}
+        unknown = selected - set(GameResponse.model_fields)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    
     try:
-        # Load data from Google Sheets
-        reader = SheetsReader()
-        teams, facilities, rules = reader.load_all_data()
-        
-        # Calculate stats
-        games_by_division = {}
-        for team in teams:
-            div_name = team.division.value
-            if div_name not in games_by_division:
-                games_by_division[div_name] = 0
-        
-        # Estimate games (8 games per team / 2 since each game has 2 teams)
-        for div_name in games_by_division:
-            div_teams = [t for t in teams if t.division.value == div_name]
-            games_by_division[div_name] = len(div_teams) * 8 // 2
-        
-        total_estimated_games = sum(games_by_division.values())
-        
-        return ScheduleStats(
-            total_teams=len(teams),
-            total_games=total_estimated_games,
-            games_by_division=games_by_division,
-            teams_with_8_games=0,  # Will be calculated after generation
-            teams_under_8_games=0,
-            teams_over_8_games=0
+        filters = GameFilters(
+            team=team, school=school, coach=coach, division=division, facility=facility,
+            date_from=date_from, date_to=date_to, days=parse_days(day) if day else None
         )
-        
+        if format == "ndjson":
+            games = stored.game_index.matching(filters, cursor=cursor)
+            return StreamingResponse(game_serializer.ndjson(games, selected), media_type="application/x-ndjson")
+        page = stored.game_index.query(filters, cursor=cursor, limit=limit)
+    except QueryError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    content = {
+        "schedule_id": schedule_id,
+        "total": page.total,
+        "count": len(page.games),
+        "next_cursor": page.next_cursor
+    }
+    if format == "columnar":
+        content.update(game_serializer.columns(page.games, selected))
+    else:
+        content["games"] = game_serializer.games(page.games, selected)
+    return FastJSONResponse(content)
+
+
+@router.get("/schedule/{schedule_id}/export.csv")
+async def export_schedule_csv(schedule_id: str):
+    """Download a stored schedule as CSV (one row per game, streamed)."""
+    stored = _stored_or_404(schedule_id)
+    return StreamingResponse(
+        iter_csv(stored.game_index.games, stored.schedule.season_start, game_serializer),
+        media_type="text/csv",
+        headers={"Content-Disposition": f'attachment; filename="schedule_{schedule_id}.csv"'}
+    )
+
+
+# A plain def: the workbook is built in a worker thread, and StreamingResponse
+# reads the spooled file back through the threadpool too
+@router.get("/schedule/{schedule_id}/export.xlsx")
+def export_schedule_xlsx(schedule_id: str):
+    """Download a stored schedule as an XLSX workbook with one sheet per week (needs openpyxl)."""
+    stored = _stored_or_404(schedule_id)
+    if exporters.openpyxl is None:
+        raise HTTPException(status_code=501, detail="XLSX export requires openpyxl on the server")
+    
+    # Large workbooks spill to disk instead of staying in memory
+    workbook = tempfile.SpooledTemporaryFile(max_size=XLSX_SPOOL_BYTES)
+    write_xlsx(stored.game_index.games, workbook, stored.schedule.season_start, game_serializer)
+    workbook.seek(0)
+    
+    def chunks():
+        with workbook:
+            yield from iter(lambda: workbook.read(64 * 1024), b"")
+    
+    return StreamingResponse(
+        chunks(),
+        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        headers={"Content-Disposition": f'attachment; filename="schedule_{schedule_id}.xlsx"'}
+    )
+
+
+@router.get("/schedule/{schedule_id}/calendar.ics")
+async def export_schedule_calendar(
+    schedule_id: str,
+    team: Optional[str] = None,
+    coach: Optional[str] = None,
+    school: Optional[str] = None
+):
+    """
+    iCalendar feed of one team's, coach's or school's games in a stored schedule.
+    
+    Exactly one of team (team id), coach or school is required.
+    """
+    stored = _stored_or_404(schedule_id)
+    given = [(name, value) for name, value in (("team", team), ("coach", coach), ("school", school)) if value]
+    if len(given) != 1:
+        raise HTTPException(status_code=400, detail="Give exactly one of team, coach or school")
+    
+    (name, value), = given
+    games = stored.game_index.matching(GameFilters(**{name: value}))
+    calendar_name = f"Coach {value}" if coach else value
+    if team and games:
+        # Same name as the team's calendar from the CLI export
+        calendar_name = calendar_groups(games[:1], by="team")[team][0]
+    return StreamingResponse(
+        CalendarWriter(game_serializer).iter_calendar(games, calendar_name),
+        media_type="text/calendar",
+        headers={"Content-Disposition": f'attachment; filename="{name}_calendar.ics"'}
+    )
+
+
+@router.post("/schedule/{schedule_id}/publish", response_model=PublishResponse)
+def publish_schedule(schedule_id: str, dry_run: bool = False):
+    """
+    Write a stored schedule to the weekly Google Sheets tabs.
+    
+    Only cells that differ from the tabs' current contents are written, one
+    batched update per changed tab. dry_run=true reports the changes without writing.
+    """
+    stored = _stored_or_404(schedule_id)
+    try:
+        result = SheetsPublisher().publish(stored.schedule, game_serializer, dry_run=dry_run)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to get stats: {str(e)}")
+        logger.exception("Publishing schedule %s failed", schedule_id)
+        raise HTTPException(status_code=502, detail=f"Publishing to Google Sheets failed: {str(e)}")
+    return PublishResponse(schedule_id=schedule_id, **asdict(result))
 
 
 @router.get("/data")
-async def get_scheduling_data():
+def get_scheduling_data(request: Request):
     """
     Get all scheduling data from Google Sheets for display.
     Returns rules, teams, facilities, schools, tiers, and other information.
+    
+    Conditional: send the returned ETag as If-None-Match to get a 304 when nothing changed.
     """
     try:
-        # Load data from Google Sheets
-        reader = SheetsReader()
-        teams, facilities, rules = reader.load_all_data()
-        
-        # Extract unique schools
-        schools_dict = {}
-        for team in teams:
-            school_name = team.school.name
-            if school_name not in schools_dict:
-                schools_dict[school_name] = {
-                    "name": school_name,
-                    "cluster": team.cluster.value if team.cluster else None,
-                    "tier": team.tier.value if team.tier else None,
-                    "teams": []
-                }
-            schools_dict[school_name]["teams"].append({
-                "id": team.id,
-                "division": team.division.value,
-                "coach": team.coach_name,
-                "email": team.coach_email
-            })
-        
-        schools = list(schools_dict.values())
-        
-        # Format teams data
-        teams_data = []
-        for team in teams:
-            teams_data.append({
-                "id": team.id,
-                "school": team.school.name,
-                "division": team.division.value,
-                "coach_name": team.coach_name,
-                "coach_email": team.coach_email,
-                "tier": team.tier.value if team.tier else None,
-                "cluster": team.cluster.value if team.cluster else None,
-                "home_facility": team.home_facility,
-                "rivals_count": len(team.rivals),
-                "do_not_play_count": len(team.do_not_play)
-            })
-        
-        # Format facilities data
-        facilities_data = []
-        for facility in facilities:
-            facilities_data.append({
-                "name": facility.name,
-                "address": facility.address,
-                "max_courts": facility.max_courts,
-                "has_8ft_rims": facility.has_8ft_rims,
-                "available_dates_count": len(facility.available_dates),
-                "unavailable_dates_count": len(facility.unavailable_dates),
-                "notes": facility.notes
-            })
-        
-        # Format rules data
-        rules_data = {
-            "season_start": rules.get("season_start"),
-            "season_end": rules.get("season_end"),
-            "holidays": rules.get("holidays", []),
-            "game_duration_minutes": 60,
-            "weeknight_time": "5:00 PM - 8:30 PM",
-            "saturday_time": "8:00 AM - 6:00 PM",
-            "no_games_on_sunday": True,
-            "games_per_team": 8,
-            "max_games_per_7_days": 2,
-            "max_games_per_14_days": 3,
-            "max_doubleheaders_per_season": 1,
-            "weeknight_slots_required": 3
-        }
-        
-        # Get divisions summary
-        divisions_summary = {}
-        for team in teams:
-            div = team.division.value
-            if div not in divisions_summary:
-                divisions_summary[div] = {
-                    "name": div,
-                    "team_count": 0,
-                    "estimated_games": 0
-                }
-            divisions_summary[div]["team_count"] += 1
-        
-        # Calculate estimated games
-        for div in divisions_summary.values():
-            div["estimated_games"] = (div["team_count"] * 8) // 2
-        
-        # Get clusters summary
-        clusters_summary = {}
-        for team in teams:
-            if team.cluster:
-                cluster = team.cluster.value
-                if cluster not in clusters_summary:
-                    clusters_summary[cluster] = {"name": cluster, "team_count": 0, "school_count": 0}
-                clusters_summary[cluster]["team_count"] += 1
-        
-        # Count schools per cluster
-        for school in schools:
-            if school["cluster"]:
-                cluster = school["cluster"]
-                if cluster in clusters_summary:
-                    clusters_summary[cluster]["school_count"] += 1
-        
-        # Get tiers summary
-        tiers_summary = {}
-        for team in teams:
-            if team.tier:
-                tier = team.tier.value
-                if tier not in tiers_summary:
-                    tiers_summary[tier] = {"name": tier, "team_count": 0, "school_count": 0}
-                tiers_summary[tier]["team_count"] += 1
-        
-        # Count schools per tier
-        for school in schools:
-            if school["tier"]:
-                tier = school["tier"]
-                if tier in tiers_summary:
-                    tiers_summary[tier]["school_count"] += 1
-        
-        return {
-            "success": True,
-            "rules": rules_data,
-            "teams": teams_data,
-            "facilities": facilities_data,
-            "schools": schools,
-            "divisions": list(divisions_summary.values()),
-            "clusters": list(clusters_summary.values()),
-            "tiers": list(tiers_summary.values()),
-            "summary": {
-                "total_teams": len(teams),
-                "total_facilities": len(facilities),
-                "total_schools": len(schools),
-                "total_divisions": len(divisions_summary),
-                "total_estimated_games": sum(d["estimated_games"] for d in divisions_summary.values())
-            }
-        }
-        
+        data = league_data_cache.get()
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.exception("Failed to load scheduling data")
         raise HTTPException(status_code=500, detail=f"Failed to load scheduling data: {str(e)}")
+    return conditional_json(request, "data", data.content_hash, lambda: build_scheduling_data(data))
+
+
+def build_scheduling_data(data: LeagueData) -> Dict[str, Any]:
+    """The /api/data payload."""
+    view = data.view
+    rules = data.rules
+    
+    # Format rules data
+    rules_data = {
+        "season_start": rules.get("season_start"),
+        "season_end": rules.get("season_end"),
+        "holidays": rules.get("holidays", []),
+        "game_duration_minutes": 60,
+        "weeknight_time": "5:00 PM - 8:30 PM",
+        "saturday_time": "8:00 AM - 6:00 PM",
+        "no_games_on_sunday": True,
+        "games_per_team": 8,
+        "max_games_per_7_days": 2,
+        "max_games_per_14_days": 3,
+        "max_doubleheaders_per_season": 1,
+        "weeknight_slots_required": 3
+    }
+    
+    return {
+        "success": True,
+        "rules": rules_data,
+        "teams": view.team_rows,
+        "facilities": view.facility_rows,
+        "schools": view.schools,
+        "divisions": view.divisions,
+        "clusters": view.clusters,
+        "tiers": view.tiers,
+        "summary": {
+            "total_teams": len(data.teams),
+            "total_facilities": len(data.facilities),
+            "total_schools": len(view.schools),
+            "total_divisions": len(view.divisions),
+            "total_estimated_games": sum(d["estimated_games"] for d in view.divisions)
+        }
+    }
 
 
 @router.get("/info")
-async def get_schedule_info():
+def get_schedule_info(request: Request):
     """
     Get detailed information about teams, facilities, schools, rankings, and scheduling rules.
+    
+    Conditional: send the returned ETag as If-None-Match to get a 304 when nothing changed.
     """
     try:
-        # Load data from Google Sheets
-        reader = SheetsReader()
-        teams, facilities, rules = reader.load_all_data()
-        
-        # Organize teams by division
-        teams_by_division: Dict[str, List[Dict]] = {}
-        schools_dict: Dict[str, Dict] = {}
-        
-        for team in teams:
-            div_name = team.division.value
-            if div_name not in teams_by_division:
-                teams_by_division[div_name] = []
-            
-            # Collect school information
-            school_key = team.school.name
-            if school_key not in schools_dict:
-                schools_dict[school_key] = {
-                    "name": team.school.name,
-                    "cluster": team.school.cluster.value if team.school.cluster else None,
-                    "tier": team.school.tier.value if team.school.tier else None,
-                    "teams": []
-                }
-            
-            # Add team to school
-            schools_dict[school_key]["teams"].append({
-                "id": team.id,
-                "division": div_name,
-                "coach_name": team.coach_name,
-                "coach_email": team.coach_email
-            })
-            
-            # Team information
-            team_info = {
-                "id": team.id,
-                "school_name": team.school.name,
-                "division": div_name,
-                "coach_name": team.coach_name,
-                "coach_email": team.coach_email,
-                "home_facility": team.home_facility,
-                "tier": team.tier.value if team.tier else None,
-                "cluster": team.cluster.value if team.cluster else None,
-                "rivals": list(team.rivals),
-                "do_not_play": list(team.do_not_play)
-            }
-            teams_by_division[div_name].append(team_info)
-        
-        # Facility information
-        facilities_info = []
-        for facility in facilities:
-            facility_info = {
-                "name": facility.name,
-                "address": facility.address,
-                "max_courts": facility.max_courts,
-                "has_8ft_rims": facility.has_8ft_rims,
-                "notes": facility.notes,
-                "available_dates_count": len(facility.available_dates),
-                "unavailable_dates_count": len(facility.unavailable_dates),
-                "available_dates": [str(d) for d in facility.available_dates[:10]],  # First 10
-                "unavailable_dates": [str(d) for d in facility.unavailable_dates[:10]]  # First 10
-            }
-            facilities_info.append(facility_info)
-        
-        # Ranking/Tier information and scheduling rules are already imported at the top
-        
-        scheduling_rules = {
-            "season": {
-                "start_date": SEASON_START_DATE,
-                "end_date": SEASON_END_DATE
-            },
-            "game_duration": {
-                "minutes": GAME_DURATION_MINUTES
-            },
-            "time_rules": {
-                "weeknight": {
-                    "start_time": WEEKNIGHT_START_TIME.strftime("%I:%M %p"),
-                    "end_time": WEEKNIGHT_END_TIME.strftime("%I:%M %p"),
-                    "slots": WEEKNIGHT_SLOTS
-                },
-                "saturday": {
-                    "start_time": SATURDAY_START_TIME.strftime("%I:%M %p"),
-                    "end_time": SATURDAY_END_TIME.strftime("%I:%M %p")
-                },
-                "no_sunday_games": NO_GAMES_ON_SUNDAY
-            },
-            "frequency_rules": {
-                "max_games_per_7_days": MAX_GAMES_PER_7_DAYS,
-                "max_games_per_14_days": MAX_GAMES_PER_14_DAYS,
-                "max_doubleheaders_per_season": MAX_DOUBLEHEADERS_PER_SEASON,
-                "doubleheader_break_minutes": DOUBLEHEADER_BREAK_MINUTES
-            },
-            "holidays": US_HOLIDAYS,
-            "divisions": DIVISIONS,
-            "recreational_divisions": REC_DIVISIONS,
-            "es_k1_rec_special": {
-                "priority_sites": ES_K1_REC_PRIORITY_SITES
+        data = league_data_cache.get()
+    except Exception as e:
+        logger.exception("Failed to get info")
+        raise HTTPException(status_code=500, detail=f"Failed to get info: {str(e)}")
+    return conditional_json(request, "info", data.content_hash, lambda: build_schedule_info(data))
+
+
+def build_schedule_info(data: LeagueData) -> Dict[str, Any]:
+    """The /api/info payload."""
+    view = data.view
+    
+    scheduling_rules = {
+        "season": {
+            "start_date": SEASON_START_DATE,
+            "end_date": SEASON_END_DATE
+        },
+        "game_duration": {
+            "minutes": GAME_DURATION_MINUTES
+        },
+        "time_rules": {
+            "weeknight": {
+                "start_time": WEEKNIGHT_START_TIME.strftime("%I:%M %p"),
+                "end_time": WEEKNIGHT_END_TIME.strftime("%I:%M %p"),
+                "slots": WEEKNIGHT_SLOTS
             },
-            "priority_weights": PRIORITY_WEIGHTS
-        }
-        
-        return {
-            "teams": teams_by_division,
-            "facilities": facilities_info,
-            "schools": list(schools_dict.values()),
-            "rankings": {
-                "tiers": TIERS,
-                "clusters": CLUSTERS,
-                "divisions": DIVISIONS
+            "saturday": {
+                "start_time": SATURDAY_START_TIME.strftime("%I:%M %p"),
+                "end_time": SATURDAY_END_TIME.strftime("%I:%M %p")
             },
-            "scheduling_rules": scheduling_rules,
-            "summary": {
-                "total_teams": len(teams),
-                "total_facilities": len(facilities),
-                "total_schools": len(schools_dict),
-                "teams_by_division": {div: len(teams_by_division[div]) for div in teams_by_division}
-            }
+            "no_sunday_games": NO_GAMES_ON_SUNDAY
+        },
+        "frequency_rules": {
+            "max_games_per_7_days": MAX_GAMES_PER_7_DAYS,
+            "max_games_per_14_days": MAX_GAMES_PER_14_DAYS,
+            "max_doubleheaders_per_season": MAX_DOUBLEHEADERS_PER_SEASON,
+            "doubleheader_break_minutes": DOUBLEHEADER_BREAK_MINUTES
+        },
+        "holidays": US_HOLIDAYS,
+        "divisions": DIVISIONS,
+        "recreational_divisions": REC_DIVISIONS,
+        "es_k1_rec_special": {
+            "priority_sites": ES_K1_REC_PRIORITY_SITES
+        },
+        "priority_weights": PRIORITY_WEIGHTS
+    }
+    
+    return {
+        "teams": view.team_infos_by_division,
+        "facilities": view.facility_infos,
+        "schools": view.school_infos,
+        "rankings": {
+            "tiers": TIERS,
+            "clusters": CLUSTERS,
+            "divisions": DIVISIONS
+        },
+        "scheduling_rules": scheduling_rules,
+        "summary": {
+            "total_teams": len(data.teams),
+            "total_facilities": len(data.facilities),
+            "total_schools": len(view.school_infos),
+            "teams_by_division": {div: len(infos) for div, infos in view.team_infos_by_division.items()}
         }
-        
-    except Exception as e:
-        import traceback
-        traceback.print_exc()
-        raise HTTPException(status_code=500, detail=f"Failed to get info: {str(e)}")
+    }
 
 
 # Information endpoints
@@ -538,42 +605,31 @@ class RulesInfo(BaseModel):
 
 
 @router.get("/teams", response_model=List[TeamInfo])
-async def get_teams_info():
+def get_teams_info(request: Request):
     """Get all team information."""
     try:
-        reader = SheetsReader()
-        teams = reader.load_teams()
-        
-        teams_info = []
-        for team in teams:
-            teams_info.append(TeamInfo(
-                id=team.id,
-                school_name=team.school.name,
-                division=team.division.value,
-                coach_name=team.coach_name,
-                coach_email=team.coach_email,
-                tier=team.tier.value if team.tier else None,
-                cluster=team.cluster.value if team.cluster else None,
-                home_facility=team.home_facility,
-                rivals=list(team.rivals),
-                do_not_play=list(team.do_not_play)
-            ))
-        
-        return teams_info
+        data = league_data_cache.get()
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get teams info: {str(e)}")
+    
+    def build():
+        # Same rows as /api/info, in TeamInfo field order
+        return [{name: info[name] for name in TeamInfo.model_fields} for info in data.view.team_infos]
+    
+    return conditional_json(request, "teams", data.content_hash, build)
 
 
 @router.get("/facilities", response_model=List[FacilityInfo])
-async def get_facilities_info():
+def get_facilities_info(request: Request):
     """Get all facility/stadium information."""
     try:
-        reader = SheetsReader()
-        facilities = reader.load_facilities()
-        
-        facilities_info = []
-        for facility in facilities:
-            facilities_info.append(FacilityInfo(
+        data = league_data_cache.get()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get facilities info: {str(e)}")
+    
+    def build():
+        return [
+            FacilityInfo(
                 name=facility.name,
                 address=facility.address,
                 max_courts=facility.max_courts,
@@ -581,50 +637,40 @@ async def get_facilities_info():
                 notes=facility.notes,
                 available_dates=[d.isoformat() for d in facility.available_dates],
                 unavailable_dates=[d.isoformat() for d in facility.unavailable_dates]
-            ))
-        
-        return facilities_info
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to get facilities info: {str(e)}")
+            ).model_dump()
+            for facility in data.facilities
+        ]
+    
+    return conditional_json(request, "facilities", data.content_hash, build)
 
 
 @router.get("/schools", response_model=List[SchoolInfo])
-async def get_schools_info():
+def get_schools_info(request: Request):
     """Get all school information."""
     try:
-        reader = SheetsReader()
-        schools = reader.load_schools()
-        teams = reader.load_teams()
-        
-        # Group teams by school
-        school_teams: Dict[str, List[str]] = {}
-        for team in teams:
-            school_name = team.school.name
-            if school_name not in school_teams:
-                school_teams[school_name] = []
-            school_teams[school_name].append(team.id)
-        
-        schools_info = []
-        for school_name, school in schools.items():
-            schools_info.append(SchoolInfo(
+        data = league_data_cache.get()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get schools info: {str(e)}")
+    
+    def build():
+        team_ids_by_school = data.view.team_ids_by_school
+        return [
+            SchoolInfo(
                 name=school.name,
                 cluster=school.cluster.value if school.cluster else None,
                 tier=school.tier.value if school.tier else None,
-                teams=school_teams.get(school_name, [])
-            ))
-        
-        return schools_info
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to get schools info: {str(e)}")
+                teams=team_ids_by_school.get(school_name, [])
+            ).model_dump()
+            for school_name, school in data.schools.items()
+        ]
+    
+    return conditional_json(request, "schools", data.content_hash, build)
 
 
 @router.get("/rules", response_model=RulesInfo)
-async def get_rules_info():
-    """Get schedule creation rules."""
-    try:
-        reader = SheetsReader()
-        rules = reader.load_rules()
-        
+def get_rules_info(request: Request):
+    """Get schedule creation rules (from config only, no Sheets data)."""
+    def build():
         return RulesInfo(
             season_start=SEASON_START_DATE,
             season_end=SEASON_END_DATE,
@@ -649,6 +695,6 @@ async def get_rules_info():
                 "officials": ES_K1_REC_OFFICIALS,
                 "priority_sites": ES_K1_REC_PRIORITY_SITES
             }
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to get rules info: {str(e)}")
+        ).model_dump()
+    
+    return conditional_json(request, "rules", CONFIG_FINGERPRINT, build)
@@ -0,0 +1,100 @@
+"""
+Fast JSON serialization for schedule responses.
+
+GameSerializer builds on GameFormatter (cached display strings per time slot,
+team and facility/court) to produce the row, columnar and NDJSON shapes of a
+games response. Responses are encoded with orjson when it is
+installed (standard library json otherwise) and sent as-is, without building
+and re-validating a Pydantic model per game.
+"""
+
+from datetime import date, datetime, time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
+import json
+
+from fastapi.responses import Response
+
+from app.models import Game
+from app.services.game_format import GAME_FIELDS, GameFormatter
+
+try:
+    import orjson
+except ImportError:  # Optional: the standard library encoder is used instead
+    orjson = None
+
+# Games per NDJSON chunk: small enough to start sending early, large enough to keep overhead low
+NDJSON_BATCH_SIZE = 200
+
+
+def _json_default(value: Any) -> Any:
+    """Encode the values orjson handles natively (dates and times) for the json fallback."""
+    if isinstance(value, (date, datetime, time)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Encode content as compact JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, separators=(',', ':'), ensure_ascii=False, default=_json_default).encode('utf-8')
+
+
+class FastJSONResponse(Response):
+    """JSON response encoded with dumps() (orjson when available)."""
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class GameSerializer(GameFormatter):
+    """GameFormatter plus the list, columnar and NDJSON response shapes."""
+
+    def games(self, games: Iterable[Game], fields: Optional[Set[str]] = None) -> List[Dict[str, Any]]:
+        """Many games as GameResponse-shaped dicts."""
+        return [self.game(game, fields) for game in games]
+
+    def columns(self, games: Iterable[Game], fields: Optional[Set[str]] = None) -> Dict[str, Any]:
+        """
+        Games in the compact columnar shape.
+
+        Returns {"teams": [...], "facilities": [...], "games": {field: [values]}};
+        home_team, away_team and facility columns hold indexes into teams and
+        facilities, every other column holds the GameResponse values.
+        """
+        teams, team_refs = [], {}
+        facilities, facility_refs = [], {}
+        columns = {name: [] for name in GAME_FIELDS if fields is None or name in fields}
+
+        def ref(display, values, refs):
+            position = refs.get(display)
+            if position is None:
+                position = refs[display] = len(values)
+                values.append(display)
+            return position
+
+        for game in games:
+            data = self.game(game)
+            data["home_team"] = ref(data["home_team"], teams, team_refs)
+            data["away_team"] = ref(data["away_team"], teams, team_refs)
+            data["facility"] = ref(data["facility"], facilities, facility_refs)
+            for name, values in columns.items():
+                values.append(data[name])
+        return {"teams": teams, "facilities": facilities, "games": columns}
+
+    def ndjson(self, games: Iterable[Game], fields: Optional[Set[str]] = None,
+               batch_size: int = NDJSON_BATCH_SIZE) -> Iterator[bytes]:
+        """Games as newline-delimited JSON, yielded in batches of batch_size lines."""
+        lines = []
+        for game in games:
+            lines.append(dumps(self.game(game, fields)))
+            if len(lines) >= batch_size:
+                yield b"\n".join(lines) + b"\n"
+                lines = []
+        if lines:
+            yield b"\n".join(lines) + b"\n"
+
+
+# Shared by the API routes
+game_serializer = GameSerializer()
@@ -146,4 +146,21 @@ PRIORITY_WEIGHTS = {
 
 # Optimization Settings
 MAX_ITERATIONS = 10000
-TIMEOUT_SECONDS = 300  # 5 minutes
+TIMEOUT_SECONDS = 300  # 5 minutes; also the longest CP-SAT time limit the API accepts
+
+# API Data Caching
+# Sheets data served by the read-only endpoints is reloaded at most this often
+DATA_CACHE_TTL_SECONDS = int(os.getenv("DATA_CACHE_TTL_SECONDS", "60"))
+
+# Google Sheets API Client
+# Every Sheets call (reads and publishing) shares one process-wide rate limit.
+# Quota (429) and server (5xx) errors are retried with jittered exponential backoff.
+SHEETS_REQUESTS_PER_MINUTE = float(os.getenv("SHEETS_REQUESTS_PER_MINUTE", "60"))  # Per-user read quota
+SHEETS_BURST = int(os.getenv("SHEETS_BURST", "20"))  # Calls allowed back to back before throttling
+SHEETS_MAX_RETRIES = int(os.getenv("SHEETS_MAX_RETRIES", "5"))
+SHEETS_BACKOFF_SECONDS = float(os.getenv("SHEETS_BACKOFF_SECONDS", "1.0"))  # First retry delay; doubles each retry
+SHEETS_MAX_BACKOFF_SECONDS = float(os.getenv("SHEETS_MAX_BACKOFF_SECONDS", "32.0"))
+SHEETS_BACKOFF_JITTER = float(os.getenv("SHEETS_BACKOFF_JITTER", "0.5"))  # Up to this fraction is taken off each delay
+# After this many failed calls in a row, calls fail fast (reads use the last good copy) for a while
+SHEETS_BREAKER_FAILURES = int(os.getenv("SHEETS_BREAKER_FAILURES", "5"))
+SHEETS_BREAKER_RESET_SECONDS = float(os.getenv("SHEETS_BREAKER_RESET_SECONDS", "30"))
@@ -0,0 +1,151 @@
+"""
+Logging configuration for the NCSAA Basketball Scheduling System.
+
+All services log through the standard ``logging`` module using per-module loggers
+(``logging.getLogger(__name__)``) and lazy %-style arguments, so disabled levels
+cost nothing beyond a level check.
+
+Environment variables:
+    LOG_LEVEL           Root level for the ``app`` loggers (default: INFO)
+    LOG_FORMAT          "text" (default) or "json" for production log shipping
+    LOG_MODULE_LEVELS   Per-module overrides, e.g.
+                        "app.services.sheets_reader=DEBUG,app.services.validator=WARNING"
+    LOG_RATE_LIMIT      Max records per rate-limit key per window (default: 20)
+    LOG_RATE_WINDOW     Rate-limit window in seconds (default: 60)
+"""
+
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+
+APP_LOGGER_NAME = "app"
+
+# Attributes present on every LogRecord; anything else was passed via `extra=`
+_RESERVED_RECORD_ATTRS = set(logging.LogRecord(
+    "", logging.INFO, "", 0, "", (), None
+).__dict__.keys()) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as single-line JSON objects, including `extra=` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key in _RESERVED_RECORD_ATTRS or key.startswith("_"):
+                continue
+            payload[key] = value
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str)
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Caps repetitive per-item diagnostics.
+
+    Only records logged with ``extra={"rate_limit": "<key>"}`` are limited: at most
+    ``max_records`` per key are emitted per ``window_seconds``. When a new window
+    opens, the first record reports how many were suppressed in the previous one.
+    """
+
+    def __init__(self, max_records: int = 20, window_seconds: float = 60.0):
+        super().__init__()
+        self.max_records = max_records
+        self.window_seconds = window_seconds
+        self._windows: Dict[str, Tuple[float, int, int]] = {}  # key -> (start, emitted, suppressed)
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        key = getattr(record, "rate_limit", None)
+        if not key:
+            return True
+
+        now = time.monotonic()
+        with self._lock:
+            start, emitted, suppressed = self._windows.get(key, (now, 0, 0))
+            if now - start >= self.window_seconds:
+                if suppressed:
+                    record.msg = f"{record.msg} [{suppressed} similar messages suppressed]"
+                start, emitted, suppressed = now, 0, 0
+
+            if emitted >= self.max_records:
+                self._windows[key] = (start, emitted, suppressed + 1)
+                return False
+
+            self._windows[key] = (start, emitted + 1, suppressed)
+            return True
+
+
+def _parse_module_levels(spec: Optional[str]) -> Dict[str, str]:
+    """Parse "module=LEVEL,module=LEVEL" into a dict."""
+    levels = {}
+    if not spec:
+        return levels
+    for item in spec.split(","):
+        if "=" not in item:
+            continue
+        module, level = item.split("=", 1)
+        if module.strip() and level.strip():
+            levels[module.strip()] = level.strip().upper()
+    return levels
+
+
+def configure_logging(
+    level: Optional[str] = None,
+    json_output: Optional[bool] = None,
+    module_levels: Optional[Dict[str, str]] = None,
+    stream=None
+) -> logging.Logger:
+    """
+    Configure the ``app`` logger hierarchy. Safe to call more than once.
+
+    Args:
+        level: Base level for app loggers (defaults to LOG_LEVEL or INFO)
+        json_output: Emit JSON lines (defaults to LOG_FORMAT == "json")
+        module_levels: Per-module level overrides (merged over LOG_MODULE_LEVELS)
+        stream: Output stream (defaults to stdout)
+
+    Returns:
+        The configured ``app`` logger
+    """
+    level = (level or os.getenv("LOG_LEVEL", "INFO")).upper()
+    if json_output is None:
+        json_output = os.getenv("LOG_FORMAT", "text").lower() == "json"
+
+    overrides = _parse_module_levels(os.getenv("LOG_MODULE_LEVELS"))
+    overrides.update(module_levels or {})
+
+    handler = logging.StreamHandler(stream or sys.stdout)
+    if json_output:
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter("%(message)s"))
+    handler.addFilter(RateLimitFilter(
+        max_records=int(os.getenv("LOG_RATE_LIMIT", "20")),
+        window_seconds=float(os.getenv("LOG_RATE_WINDOW", "60"))
+    ))
+    handler._ncsaa_handler = True
+
+    app_logger = logging.getLogger(APP_LOGGER_NAME)
+    for existing in list(app_logger.handlers):
+        if getattr(existing, "_ncsaa_handler", False):
+            app_logger.removeHandler(existing)
+    app_logger.addHandler(handler)
+    app_logger.setLevel(level)
+    app_logger.propagate = False
+
+    for module, module_level in overrides.items():
+        logging.getLogger(module).setLevel(module_level)
+
+    return app_logger
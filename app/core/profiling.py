@@ -0,0 +1,96 @@
+"""
+Lightweight instrumentation for the scheduling hot paths.
+Times each scheduler phase and counts why candidate time blocks were rejected.
+"""
+
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+
+class SchedulerProfiler:
+    """
+    Collects phase timings, counters and rejection reasons for one scheduler run.
+
+    When disabled, every hook returns immediately so the profiler can stay wired
+    into the scheduler permanently.
+    """
+
+    def __init__(self, enabled: bool = False):
+        """
+        Args:
+            enabled: Whether timings and counters should be recorded
+        """
+        self.enabled = enabled
+        self.phases: Dict[str, Dict[str, float]] = {}
+        self.phase_order: List[str] = []
+        self.counters: Counter = Counter()
+        self.rejections: Counter = Counter()
+        self._open_phases: Dict[str, float] = {}
+        self._created_at = time.perf_counter()
+
+    def start_phase(self, name: str):
+        """Mark the start of a named phase."""
+        if not self.enabled:
+            return
+        self._open_phases[name] = time.perf_counter()
+
+    def end_phase(self, name: str):
+        """Mark the end of a named phase and accumulate its duration."""
+        if not self.enabled:
+            return
+        started = self._open_phases.pop(name, None)
+        if started is None:
+            return
+
+        entry = self.phases.get(name)
+        if entry is None:
+            entry = {"calls": 0, "seconds": 0.0}
+            self.phases[name] = entry
+            self.phase_order.append(name)
+        entry["calls"] += 1
+        entry["seconds"] += time.perf_counter() - started
+
+    @contextmanager
+    def phase(self, name: str):
+        """Context manager timing the enclosed block as a named phase."""
+        self.start_phase(name)
+        try:
+            yield
+        finally:
+            self.end_phase(name)
+
+    def count(self, name: str, amount: int = 1):
+        """Increment a named counter."""
+        if self.enabled:
+            self.counters[name] += amount
+
+    def record_rejections(self, rejections: Counter):
+        """Merge the rejection reasons collected by one block search."""
+        if self.enabled and rejections:
+            self.rejections.update(rejections)
+
+    def report(self) -> Optional[Dict]:
+        """
+        Build a structured report of everything recorded so far.
+
+        Returns:
+            Dictionary with phases, counters and rejection reasons, or None when disabled
+        """
+        if not self.enabled:
+            return None
+
+        return {
+            "total_seconds": round(time.perf_counter() - self._created_at, 4),
+            "phases": [
+                {
+                    "name": name,
+                    "calls": int(self.phases[name]["calls"]),
+                    "seconds": round(self.phases[name]["seconds"], 4)
+                }
+                for name in self.phase_order
+            ],
+            "counters": dict(self.counters.most_common()),
+            "rejections": dict(self.rejections.most_common())
+        }
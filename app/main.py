@@ -6,6 +6,11 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api import routes
+from app.api.compression import CompressionMiddleware
+from app.core.logging_config import configure_logging
+
+# Log level/format come from LOG_LEVEL, LOG_FORMAT and LOG_MODULE_LEVELS
+configure_logging()
 
 app = FastAPI(
     title="NCSAA Basketball Scheduling API",
@@ -30,6 +35,9 @@ app.add_middleware(
     max_age=600,
 )
 
+# Compress large responses (brotli when installed and accepted, else gzip)
+app.add_middleware(CompressionMiddleware)
+
 # Include API routes
 app.include_router(routes.router)
 
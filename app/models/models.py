@@ -5,7 +5,7 @@ Defines all data structures used throughout the application.
 
 from dataclasses import dataclass, field
 from datetime import datetime, date, time
-from typing import List, Optional, Set, Dict
+from typing import List, Optional, Set, Dict, Tuple
 from enum import Enum
 
 
@@ -81,19 +81,66 @@ class Facility:
     """Represents a game facility/venue."""
     name: str
     address: str
-    available_dates: List[date] = field(default_factory=list)
-    unavailable_dates: List[date] = field(default_factory=list)
+    # Date lists are stored as tuples: replace them (never edit in place) and the
+    # availability bitset is rebuilt on assignment
+    available_dates: Tuple[date, ...] = ()
+    unavailable_dates: Tuple[date, ...] = ()
     max_courts: int = 1
     has_8ft_rims: bool = False  # For ES K-1 REC division
     notes: str = ""
+    # Bookable hours from the FACILITIES sheet as ((start, end), ...) per date; dates without
+    # an entry use default_time_windows, and no windows at all means the league's full day
+    time_windows: Dict[date, Tuple[Tuple[time, time], ...]] = field(default_factory=dict)
+    default_time_windows: Tuple[Tuple[time, time], ...] = ()
+    
+    # Availability as a bitset over day ordinals (bit i = origin + i days), see index_availability()
+    _availability_origin: int = field(default=0, init=False, repr=False, compare=False)
+    _open_bits: int = field(default=-1, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self.index_availability()
+    
+    def __setattr__(self, name, value):
+        if name in ('available_dates', 'unavailable_dates'):
+            value = tuple(value)
+            object.__setattr__(self, name, value)
+            # Re-index once constructed (__post_init__ handles the first build)
+            if '_open_bits' in self.__dict__:
+                self.index_availability()
+            return
+        object.__setattr__(self, name, value)
+    
+    def index_availability(self) -> None:
+        """
+        Build the availability bitset from available_dates / unavailable_dates.
+        
+        Runs on construction and whenever either date list is assigned, so
+        is_available() is a shift and a mask.
+        """
+        ordinals = [d.toordinal() for d in self.available_dates] + [d.toordinal() for d in self.unavailable_dates]
+        origin = min(ordinals) if ordinals else 0
+        
+        # No available_dates means every day is open (-1 has every bit set)
+        open_bits = 0 if self.available_dates else -1
+        for game_date in self.available_dates:
+            open_bits |= 1 << (game_date.toordinal() - origin)
+        for game_date in self.unavailable_dates:
+            open_bits &= ~(1 << (game_date.toordinal() - origin))
+        
+        self._availability_origin = origin
+        self._open_bits = open_bits
     
     def is_available(self, game_date: date) -> bool:
         """Check if facility is available on a given date."""
-        if self.unavailable_dates and game_date in self.unavailable_dates:
-            return False
-        if self.available_dates:
-            return game_date in self.available_dates
-        return True
+        offset = game_date.toordinal() - self._availability_origin
+        if offset < 0:
+            # Before every listed date
+            return not self.available_dates
+        return bool((self._open_bits >> offset) & 1)
+    
+    def time_windows_on(self, game_date: date) -> Tuple[Tuple[time, time], ...]:
+        """Bookable (start, end) windows on a date; empty when the sheet gave no hours."""
+        return self.time_windows.get(game_date, self.default_time_windows)
     
     def __hash__(self):
         return hash(self.name)
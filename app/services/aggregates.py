@@ -0,0 +1,142 @@
+"""
+One-pass schedule aggregates.
+
+The schedule report, team stats, run metrics and the API stats all read from a
+ScheduleAggregate, built with a single walk over the games, instead of each
+re-scanning the schedule per team, division or date.
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+from app.models import Schedule, Team, Division, TeamScheduleStats
+
+
+@dataclass
+class ScheduleAggregate:
+    """
+    Per-team, per-division, per-date, per-facility and per-school game counts.
+
+    Team statistics are stored column-wise: position i of every team_* list
+    belongs to teams[i] (see team_index).
+    """
+    season_start: Optional[date] = None
+    total_games: int = 0
+
+    teams: List[Team] = field(default_factory=list)
+    team_index: Dict[str, int] = field(default_factory=dict)  # {team_id: position}
+    team_games: List[int] = field(default_factory=list)
+    team_home_games: List[int] = field(default_factory=list)
+    team_away_games: List[int] = field(default_factory=list)
+    team_doubleheaders: List[int] = field(default_factory=list)
+    team_games_by_week: List[Dict[int, int]] = field(default_factory=list)
+    team_opponents: List[List[Team]] = field(default_factory=list)
+
+    games_by_division: Dict[Division, int] = field(default_factory=dict)
+    games_by_date: Dict[date, int] = field(default_factory=dict)
+    games_by_facility: Dict[str, int] = field(default_factory=dict)
+    games_by_school: Dict[str, int] = field(default_factory=dict)
+    weeknight_court_games: Dict[Tuple[date, str, int], int] = field(default_factory=dict)  # {(date, facility, court): games}
+
+    def _add_team(self, team: Team) -> int:
+        position = len(self.teams)
+        self.teams.append(team)
+        self.team_index[team.id] = position
+        self.team_games.append(0)
+        self.team_home_games.append(0)
+        self.team_away_games.append(0)
+        self.team_doubleheaders.append(0)
+        self.team_games_by_week.append({})
+        self.team_opponents.append([])
+        return position
+
+    def games_for(self, team: Team) -> int:
+        """Number of games a team plays (0 for teams not in the aggregate)."""
+        position = self.team_index.get(team.id)
+        return self.team_games[position] if position is not None else 0
+
+    def team_stats(self, team: Team) -> TeamScheduleStats:
+        """TeamScheduleStats for one team, read from the columns."""
+        position = self.team_index.get(team.id)
+        if position is None:
+            return TeamScheduleStats(team=team)
+        return TeamScheduleStats(
+            team=team,
+            total_games=self.team_games[position],
+            home_games=self.team_home_games[position],
+            away_games=self.team_away_games[position],
+            doubleheaders=self.team_doubleheaders[position],
+            games_by_week=dict(self.team_games_by_week[position]),
+            opponents=list(self.team_opponents[position])
+        )
+
+    def game_count_buckets(self, teams: Optional[List[Team]] = None) -> Dict[str, int]:
+        """Teams with exactly 8, under 8 and over 8 games (over the given teams, default all)."""
+        counts = [self.games_for(team) for team in teams] if teams is not None else self.team_games
+        return {
+            "teams_with_8_games": sum(1 for c in counts if c == 8),
+            "teams_under_8_games": sum(1 for c in counts if c < 8),
+            "teams_over_8_games": sum(1 for c in counts if c > 8),
+        }
+
+
+def aggregate_schedule(schedule: Schedule, teams: Optional[List[Team]] = None) -> ScheduleAggregate:
+    """
+    Build every schedule statistic in one pass over the games.
+
+    Args:
+        schedule: The schedule to aggregate
+        teams: Teams to include even without games (default: teams that appear in games,
+            in order of first appearance)
+
+    Returns:
+        ScheduleAggregate
+    """
+    aggregate = ScheduleAggregate(season_start=schedule.season_start, total_games=len(schedule.games))
+    for team in teams or []:
+        if team.id not in aggregate.team_index:
+            aggregate._add_team(team)
+
+    games_by_division = defaultdict(int)
+    games_by_date = defaultdict(int)
+    games_by_facility = defaultdict(int)
+    games_by_school = defaultdict(int)
+    weeknight_court_games = defaultdict(int)
+
+    for game in schedule.games:
+        slot = game.time_slot
+        games_by_division[game.division] += 1
+        games_by_date[slot.date] += 1
+        games_by_facility[slot.facility.name] += 1
+        if slot.date.weekday() < 5:
+            weeknight_court_games[(slot.date, slot.facility.name, slot.court_number)] += 1
+        week_num = (slot.date - schedule.season_start).days // 7 if schedule.season_start else None
+
+        for team, opponent, is_home in ((game.home_team, game.away_team, True), (game.away_team, game.home_team, False)):
+            position = aggregate.team_index.get(team.id)
+            if position is None:
+                position = aggregate._add_team(team)
+            aggregate.team_games[position] += 1
+            if is_home:
+                aggregate.team_home_games[position] += 1
+            else:
+                aggregate.team_away_games[position] += 1
+            if game.is_doubleheader:
+                aggregate.team_doubleheaders[position] += 1
+            aggregate.team_opponents[position].append(opponent)
+            if week_num is not None:
+                by_week = aggregate.team_games_by_week[position]
+                by_week[week_num] = by_week.get(week_num, 0) + 1
+
+        games_by_school[game.home_team.school.name] += 1
+        if game.away_team.school.name != game.home_team.school.name:
+            games_by_school[game.away_team.school.name] += 1
+
+    aggregate.games_by_division = dict(games_by_division)
+    aggregate.games_by_date = dict(games_by_date)
+    aggregate.games_by_facility = dict(games_by_facility)
+    aggregate.games_by_school = dict(games_by_school)
+    aggregate.weeknight_court_games = dict(weeknight_court_games)
+    return aggregate
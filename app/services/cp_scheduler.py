@@ -0,0 +1,544 @@
+"""
+Exact CP-SAT scheduler at the school-matchup / time-block level.
+
+The division-level model in scheduler.py cannot express school clustering, and
+SchoolBasedScheduler (scheduler_v2.py) is greedy. This model keeps the v2 unit
+of work - a school matchup played back to back on one court - and lets CP-SAT
+choose which matchups to play where:
+
+- One boolean per (matchup games, block start) option
+- Optional intervals with no-overlap per court/date, per school/date and for
+  coaches who coach at more than one school
+- At most 8 games per team (teams under 8 are penalized in the objective)
+- Every weeknight court that is used gets 3+ games (referees)
+- One facility per school per weeknight, no school Friday + Saturday
+- Team frequency windows matching ScheduleValidator (2 in 7 days, 3 in 14)
+- At most 2 meetings per team pair, one per school pair per date
+
+The greedy v2 schedule is computed first and used as the solution hint, so the
+solver starts from a known schedule. The better of the two schedules is returned.
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+import logging
+
+from ortools.sat.python import cp_model
+
+from app.models import Team, Facility, Division, Schedule, School
+from app.core.config import GAME_DURATION_MINUTES, MAX_GAMES_PER_7_DAYS, MAX_GAMES_PER_14_DAYS
+from app.services.scheduler_v2 import SchoolBasedScheduler, SchoolMatchup, TimeBlock
+from app.services.validator import ScheduleValidator
+
+logger = logging.getLogger(__name__)
+
+TARGET_GAMES_PER_TEAM = 8
+
+# Objective weights: games first, then finishing teams at 8, then matchup quality
+GAME_WEIGHT = 100
+UNDER_8_PENALTY = 400
+MAX_QUALITY_BONUS = 10
+HOME_FACILITY_BONUS = 5
+
+
+@dataclass
+class MatchupOption:
+    """One way to play a matchup: these games, back to back, starting at this block."""
+    school_a: School
+    school_b: School
+    games: Tuple[Tuple[Team, Team, Division], ...]
+    block: TimeBlock
+    home_school: Optional[School]
+    quality: int = 0
+
+
+class CPSatScheduler(SchoolBasedScheduler):
+    """
+    School-matchup scheduler that optimizes with CP-SAT, warm-started from the greedy result.
+
+    Only the most promising matchups per school and a spread of candidate blocks per
+    matchup enter the model, plus every placement the greedy schedule used, so the
+    hint is always expressible.
+    """
+
+    def __init__(self, teams: List[Team], facilities: List[Facility], rules: Dict,
+                 profile: bool = False, time_limit_seconds: float = 60.0, num_workers: int = 8,
+                 matchups_per_school: int = 10, candidates_per_matchup: int = 24):
+        """
+        Args:
+            teams: List of all teams to schedule
+            facilities: List of available facilities
+            rules: Dictionary of scheduling rules from config
+            profile: Record phase timings and counters
+            time_limit_seconds: CP-SAT wall time limit
+            num_workers: CP-SAT parallel search workers
+            matchups_per_school: Highest-priority matchups per school offered to the model
+            candidates_per_matchup: Candidate block starts per matchup
+        """
+        super().__init__(teams, facilities, rules, profile=profile)
+        self.time_limit_seconds = time_limit_seconds
+        self.num_workers = num_workers
+        self.matchups_per_school = matchups_per_school
+        self.candidates_per_matchup = candidates_per_matchup
+
+        # Owning school of each facility (None for neutral sites), resolved once per facility
+        self._facility_owner_names = {
+            facility.name: next(
+                (school.name for school in self.schools
+                 if self._facility_belongs_to_school(facility.name, school.name)),
+                None
+            )
+            for facility in self.time_blocks.facilities
+        }
+
+        # Result details (reported by the CLI/API and in the profiling report)
+        self.solver_status = None
+        self.solver_objective = None
+        self.used_greedy_fallback = False
+
+    def optimize_schedule(self) -> Schedule:
+        """
+        Greedy schedule -> CP-SAT model hinted with it -> best feasible schedule.
+        """
+        logger.info("CP-SAT school-matchup scheduling starting")
+
+        with self.profiler.phase("greedy_hint"):
+            greedy = SchoolBasedScheduler(self.teams, self.facilities, self.rules)
+            greedy.profiler = self.profiler
+            greedy_schedule = greedy.optimize_schedule()
+        self.rematch_passes_used = greedy.rematch_passes_used
+        self.saturday_fill_passes_used = greedy.saturday_fill_passes_used
+
+        with self.profiler.phase("cp_model_build"):
+            matchups = self._generate_school_matchups()
+            placements = list(self._greedy_placements(greedy_schedule))
+            options = self._build_options(matchups, placements)
+            model, option_vars = self._build_model(options)
+            hinted = self._hint_options(options, placements)
+            for index, var in enumerate(option_vars):
+                model.AddHint(var, 1 if index in hinted else 0)
+        self.profiler.count("cp_options", len(options))
+        self.profiler.count("cp_hinted_options", len(hinted))
+        logger.info(
+            "CP-SAT model: %d options (%d from the greedy hint), %d matchups",
+            len(options), len(hinted), len({(o.school_a.name, o.school_b.name) for o in options})
+        )
+
+        solver = cp_model.CpSolver()
+        solver.parameters.max_time_in_seconds = self.time_limit_seconds
+        solver.parameters.num_search_workers = self.num_workers
+        solver.parameters.log_search_progress = False
+
+        with self.profiler.phase("cp_solve"):
+            status = solver.Solve(model)
+        self.solver_status = solver.StatusName(status)
+        logger.info("CP-SAT finished: %s in %.1fs", self.solver_status, solver.WallTime())
+
+        if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            logger.warning("CP-SAT found no feasible schedule, using the greedy schedule")
+            return self._use_greedy(greedy, greedy_schedule)
+        self.solver_objective = solver.ObjectiveValue()
+
+        schedule = Schedule(season_start=self.season_start, season_end=self.season_end)
+        chosen = [o for o, var in zip(options, option_vars) if solver.Value(var)]
+        chosen.sort(key=lambda o: (o.block.date, o.block.start_time, o.block.facility.name, o.block.court_number))
+        for option in chosen:
+            for (team_a, team_b, division), slot in zip(option.games, option.block.get_slots(len(option.games))):
+                self._commit_game(schedule, team_a, team_b, division, slot, option.home_school)
+            self.school_matchup_count[tuple(sorted([option.school_a.name, option.school_b.name]))] += 1
+
+        # Return the better schedule: the greedy one can break hard rules, and the time
+        # limit can stop the solver short of the hint
+        validator = ScheduleValidator()
+        cp_quality = self._schedule_quality(schedule, validator)
+        greedy_quality = self._schedule_quality(greedy_schedule, validator)
+        logger.info(
+            "CP-SAT schedule: %d games, %d teams under 8, %d hard violations "
+            "(greedy: %d games, %d teams under 8, %d hard violations)",
+            len(schedule.games), cp_quality[1], cp_quality[0],
+            len(greedy_schedule.games), greedy_quality[1], greedy_quality[0]
+        )
+        if greedy_quality < cp_quality:
+            logger.info("Greedy schedule is better, keeping it")
+            return self._use_greedy(greedy, greedy_schedule)
+        return schedule
+
+    def _use_greedy(self, greedy: SchoolBasedScheduler, greedy_schedule: Schedule) -> Schedule:
+        """Adopt the greedy run's schedule and game counts."""
+        self.used_greedy_fallback = True
+        self.team_game_count = greedy.team_game_count
+        self.school_matchup_count = greedy.school_matchup_count
+        return greedy_schedule
+
+    def _schedule_quality(self, schedule: Schedule, validator: ScheduleValidator) -> Tuple[int, int, int]:
+        """Sort key for schedules: hard violations, teams under 8, then more games first."""
+        counts = defaultdict(int)
+        for game in schedule.games:
+            counts[game.home_team.id] += 1
+            counts[game.away_team.id] += 1
+        under_8 = sum(1 for team in self.teams if counts[team.id] < TARGET_GAMES_PER_TEAM)
+        hard = len(validator.validate_schedule(schedule).hard_constraint_violations)
+        return (hard, under_8, -len(schedule.games))
+
+    # ------------------------------------------------------------------
+    # Options
+    # ------------------------------------------------------------------
+
+    def _block_owner(self, block: TimeBlock) -> Optional[str]:
+        """Name of the school whose gym this block is at (None for neutral sites)."""
+        return self._facility_owner_names[block.facility.name]
+
+    def _option_allowed(self, games: Tuple[Tuple[Team, Team, Division], ...], block: TimeBlock) -> bool:
+        """Rules that depend only on the games and the block (not on other games)."""
+        num_games = len(games)
+        if block.num_consecutive_slots < num_games:
+            return False
+
+        divisions = {division for _, _, division in games}
+        has_k1_rec = Division.ES_K1_REC in divisions
+        if has_k1_rec and not block.facility.has_8ft_rims:
+            return False
+        if block.facility.has_8ft_rims and divisions != {Division.ES_K1_REC}:
+            return False
+        if Division.ES_23_REC in divisions and not self._is_start_or_end_of_day(block.date, block.start_time):
+            return False
+
+        for team_a, team_b, _ in games:
+            for team in (team_a, team_b):
+                if block.date in self.school_blackouts.get(team.school.name, ()):
+                    return False
+
+        # A team playing twice in one option: never on weeknights, 2 slots apart on Saturdays
+        positions = defaultdict(list)
+        for i, (team_a, team_b, division) in enumerate(games):
+            positions[team_a.id].append((i, division))
+            positions[team_b.id].append((i, division))
+        for appearances in positions.values():
+            if len(appearances) < 2:
+                continue
+            if block.date.weekday() < 5:
+                return False
+            non_rec = [i for i, division in appearances if division not in (Division.ES_K1_REC, Division.ES_23_REC)]
+            if any(later - earlier < 2 for earlier, later in zip(non_rec, non_rec[1:])):
+                return False
+        return True
+
+    def _select_matchups(self, matchups: List[SchoolMatchup]) -> List[SchoolMatchup]:
+        """The highest-priority matchups of every school (matchups arrive sorted by priority)."""
+        per_school = defaultdict(int)
+        selected = []
+        for matchup in matchups:
+            a, b = matchup.school_a.name, matchup.school_b.name
+            if per_school[a] >= self.matchups_per_school and per_school[b] >= self.matchups_per_school:
+                continue
+            per_school[a] += 1
+            per_school[b] += 1
+            selected.append(matchup)
+        return selected
+
+    def _build_options(self, matchups: List[SchoolMatchup], greedy_placements: List[Tuple]) -> List[MatchupOption]:
+        """Candidate placements for the selected matchups plus every greedy placement."""
+        facilities_by_owner = defaultdict(set)  # {school name or None: facility indexes}
+        for facility_index, facility in enumerate(self.time_blocks.facilities):
+            facilities_by_owner[self._facility_owner_names[facility.name]].add(facility_index)
+        neutral_facilities = facilities_by_owner.get(None, set())
+        limit = self.candidates_per_matchup
+
+        selected = self._select_matchups(matchups)
+        priorities = [m.priority_score for m in selected] or [0.0]
+        low, high = min(priorities), max(priorities)
+
+        def quality(priority: float) -> int:
+            if high <= low:
+                return 0
+            return round(MAX_QUALITY_BONUS * (min(max(priority, low), high) - low) / (high - low))
+
+        options = []
+        seen = set()
+
+        def add(school_a, school_b, games, block, matchup_quality):
+            key = (tuple((a.id, b.id) for a, b, _ in games), block.date, block.start_time,
+                   block.facility.name, block.court_number)
+            if key in seen:
+                return
+            seen.add(key)
+            owner = self._block_owner(block)
+            home_school = school_a if owner == school_a.name else school_b if owner == school_b.name else None
+            options.append(MatchupOption(school_a, school_b, tuple(games), block, home_school, matchup_quality))
+
+        for matchup in selected:
+            games = tuple(self._cluster_games_by_coach(matchup.games))
+            # Home gyms first: half the candidates when neutral sites can take the rest
+            home_facilities = facilities_by_owner.get(matchup.school_a.name, set()) | \
+                facilities_by_owner.get(matchup.school_b.name, set())
+            candidates = self._spread_candidates(games, home_facilities, limit // 2 if neutral_facilities else limit)
+            candidates += self._spread_candidates(games, neutral_facilities, limit - len(candidates))
+            for block in candidates:
+                add(matchup.school_a, matchup.school_b, games, block, quality(matchup.priority_score))
+
+        for school_a, school_b, games, block in greedy_placements:
+            add(school_a, school_b, games, block, 0)
+
+        return options
+
+    def _spread_candidates(self, games: Tuple[Tuple[Team, Team, Division], ...], facility_indexes: Set[int],
+                           limit: int) -> List[TimeBlock]:
+        """
+        Up to limit allowed blocks at the given facilities on evenly spaced dates,
+        one per date (earliest start).
+
+        Dates are taken from the block index without building blocks; only the
+        facilities' blocks on the dates actually tried are materialized.
+        """
+        if limit <= 0 or not facility_indexes:
+            return []
+        index = self.time_blocks
+        blackouts = set()
+        for team_a, team_b, _ in games:
+            for team in (team_a, team_b):
+                blackouts.update(self.school_blackouts.get(team.school.name, ()))
+        dates = [
+            d for d in index.dates
+            if d not in blackouts and not facility_indexes.isdisjoint(index.open_facilities(d))
+        ]
+
+        chosen = []
+        step = max(len(dates) / limit, 1.0)
+        next_position = 0
+        for i in range(limit):
+            # The evenly spaced date, or the next one after it with an allowed block
+            for position in range(max(int(i * step), next_position), len(dates)):
+                game_date = dates[position]
+                blocks = sorted(
+                    (block for facility_index in index.open_facilities(game_date) if facility_index in facility_indexes
+                     for block in index.blocks_for(game_date, facility_index)),
+                    key=lambda b: (b.start_time, b.facility.name, b.court_number)
+                )
+                block = next((b for b in blocks if self._option_allowed(games, b)), None)
+                if block is not None:
+                    chosen.append(block)
+                    next_position = position + 1
+                    break
+            else:
+                break
+        return chosen
+
+    def _block_at(self, game_date: date, start_time, facility_index: Optional[int],
+                  court_number: int) -> Optional[TimeBlock]:
+        """The block starting at this court and time, if the index has one (built on demand)."""
+        index = self.time_blocks
+        if facility_index is None or facility_index not in index.open_facilities(game_date):
+            return None
+        start_times = index.start_times(game_date)
+        if start_time not in start_times:
+            return None
+        try:
+            return index.block((game_date, facility_index, court_number, start_times.index(start_time)))
+        except KeyError:
+            return None
+
+    def _greedy_placements(self, schedule: Schedule):
+        """
+        Split a schedule into back-to-back runs of one school pair on one court.
+
+        Yields (school_a, school_b, games, block) for runs that start at a known block.
+        """
+        facility_indexes = {facility.name: i for i, facility in enumerate(self.time_blocks.facilities)}
+        game_dates = set(self.time_blocks.dates)
+        by_court = defaultdict(list)
+        for game in schedule.games:
+            slot = game.time_slot
+            by_court[(slot.date, slot.facility.name, slot.court_number)].append(game)
+
+        for (game_date, facility_name, court_number), games in by_court.items():
+            games.sort(key=lambda g: g.time_slot.start_time)
+            run = []
+            for game in games + [None]:
+                if run and (
+                    game is None
+                    or {game.home_team.school.name, game.away_team.school.name}
+                    != {run[0].home_team.school.name, run[0].away_team.school.name}
+                    or game.time_slot.start_time != run[-1].time_slot.end_time
+                ):
+                    block = None
+                    if game_date in game_dates:
+                        block = self._block_at(game_date, run[0].time_slot.start_time,
+                                               facility_indexes.get(facility_name), court_number)
+                    if block is not None:
+                        first = run[0]
+                        yield (
+                            first.home_team.school, first.away_team.school,
+                            tuple((g.home_team, g.away_team, g.division) for g in run), block
+                        )
+                    run = []
+                if game is not None:
+                    run.append(game)
+
+    def _hint_options(self, options: List[MatchupOption], greedy_placements: List[Tuple]) -> set:
+        """Indices of the options that reproduce the greedy schedule."""
+        index = {
+            (tuple((a.id, b.id) for a, b, _ in o.games), o.block.date, o.block.start_time,
+             o.block.facility.name, o.block.court_number): i
+            for i, o in enumerate(options)
+        }
+        hinted = set()
+        for _, _, games, block in greedy_placements:
+            key = (tuple((a.id, b.id) for a, b, _ in games), block.date, block.start_time,
+                   block.facility.name, block.court_number)
+            if key in index:
+                hinted.add(index[key])
+        return hinted
+
+    # ------------------------------------------------------------------
+    # Model
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _frequency_windows(dates, window_days: int) -> List[List[date]]:
+        """
+        The dates within window_days of each date (first date included, first + window_days not).
+
+        Same span as the greedy scheduler's "< 7 days" / "< 14 days" checks.
+        """
+        dates = sorted(dates)
+        return [[d for d in dates if 0 <= (d - first).days < window_days] for first in dates]
+
+    def _build_model(self, options: List[MatchupOption]) -> Tuple[cp_model.CpModel, List]:
+        """Build the CP-SAT model over the options. Returns (model, option variables)."""
+        model = cp_model.CpModel()
+        option_vars = []
+        intervals = []
+
+        team_date_options = defaultdict(list)  # (team_id, date) -> option vars
+        team_dates = defaultdict(lambda: defaultdict(list))  # team_id -> date -> option vars (one per appearance)
+        pair_games = defaultdict(list)  # sorted team id pair -> option vars
+        school_pair_dates = defaultdict(list)  # (school pair, date) -> option vars
+        court_intervals = defaultdict(list)  # (facility, court, date) -> intervals
+        weeknight_court_games = defaultdict(list)  # (facility, court, date) -> (num_games, var)
+        school_intervals = defaultdict(list)  # (school, date) -> intervals
+        school_facilities = defaultdict(lambda: defaultdict(list))  # (school, weeknight) -> facility -> vars
+        school_dates = defaultdict(list)  # (school, date) -> vars
+        coach_intervals = defaultdict(list)  # (coach, date) -> intervals
+
+        coach_schools = defaultdict(set)
+        for team in self.teams:
+            if team.coach_name:
+                coach_schools[team.coach_name].add(team.school.name)
+        shared_coaches = {coach for coach, schools in coach_schools.items() if len(schools) > 1}
+
+        for i, option in enumerate(options):
+            block = option.block
+            var = model.NewBoolVar(f"option_{i}")
+            option_vars.append(var)
+
+            start = block.start_time.hour * 60 + block.start_time.minute
+            size = len(option.games) * GAME_DURATION_MINUTES
+            interval = model.NewOptionalFixedSizeIntervalVar(start, size, var, f"interval_{i}")
+            intervals.append(interval)
+
+            court_key = (block.facility.name, block.court_number, block.date)
+            court_intervals[court_key].append(interval)
+            if block.date.weekday() < 5:
+                weeknight_court_games[court_key].append((len(option.games), var))
+
+            school_pair_dates[(frozenset((option.school_a.name, option.school_b.name)), block.date)].append(var)
+            for school in {option.school_a.name, option.school_b.name}:
+                school_intervals[(school, block.date)].append(interval)
+                school_dates[(school, block.date)].append(var)
+                if block.date.weekday() < 5:
+                    school_facilities[(school, block.date)][block.facility.name].append(var)
+
+            teams_in_option = set()
+            coaches_in_option = set()
+            for team_a, team_b, _ in option.games:
+                pair_games[tuple(sorted([team_a.id, team_b.id]))].append(var)
+                for team in (team_a, team_b):
+                    team_dates[team.id][block.date].append(var)
+                    teams_in_option.add(team.id)
+                    if team.coach_name in shared_coaches:
+                        coaches_in_option.add(team.coach_name)
+            for team_id in teams_in_option:
+                team_date_options[(team_id, block.date)].append(var)
+            for coach in coaches_in_option:
+                coach_intervals[(coach, block.date)].append(interval)
+
+        # One game at a time on each court; schools and shared coaches in one place at a time
+        for group in (court_intervals, school_intervals, coach_intervals):
+            for group_intervals in group.values():
+                if len(group_intervals) > 1:
+                    model.AddNoOverlap(group_intervals)
+
+        # A team is in at most one option per date (no cross-matchup doubleheaders)
+        for option_group in team_date_options.values():
+            if len(option_group) > 1:
+                model.AddAtMostOne(option_group)
+
+        # A school pair meets at most once per date (one court, back to back)
+        for option_group in school_pair_dates.values():
+            if len(option_group) > 1:
+                model.AddAtMostOne(option_group)
+
+        # Weeknight courts: 0 games or 3+ games (referees)
+        for games_and_vars in weeknight_court_games.values():
+            used = model.NewBoolVar("")
+            total = sum(n * var for n, var in games_and_vars)
+            model.Add(total >= 3).OnlyEnforceIf(used)
+            model.Add(total == 0).OnlyEnforceIf(used.Not())
+
+        # One facility per school per weeknight
+        for by_facility in school_facilities.values():
+            if len(by_facility) < 2:
+                continue
+            facility_used = []
+            for facility_vars in by_facility.values():
+                used = model.NewBoolVar("")
+                for var in facility_vars:
+                    model.AddImplication(var, used)
+                facility_used.append(used)
+            model.AddAtMostOne(facility_used)
+
+        # No school Friday + Saturday
+        for (school, game_date), friday_vars in school_dates.items():
+            if game_date.weekday() != 4:
+                continue
+            saturday_vars = school_dates.get((school, game_date + timedelta(days=1)))
+            if saturday_vars:
+                plays_friday = model.NewBoolVar("")
+                for var in friday_vars:
+                    model.AddImplication(var, plays_friday)
+                for var in saturday_vars:
+                    model.AddImplication(var, plays_friday.Not())
+
+        # Teams meet at most twice
+        for pair_vars in pair_games.values():
+            if len(pair_vars) > 2:
+                model.Add(sum(pair_vars) <= 2)
+
+        # Team game counts and frequency windows (same windows as the greedy scheduler)
+        under_8 = []
+        for team in self.teams:
+            by_date = team_dates.get(team.id)
+            if not by_date:
+                continue
+            total = sum(var for date_vars in by_date.values() for var in date_vars)
+            model.Add(total <= TARGET_GAMES_PER_TEAM)
+            short = model.NewBoolVar(f"under_8_{team.id}")
+            model.Add(total >= TARGET_GAMES_PER_TEAM).OnlyEnforceIf(short.Not())
+            under_8.append(short)
+
+            for window_days, limit in ((7, MAX_GAMES_PER_7_DAYS), (14, MAX_GAMES_PER_14_DAYS)):
+                for window_dates in self._frequency_windows(by_date, window_days):
+                    window = [var for d in window_dates for var in by_date[d]]
+                    if len(window) > limit:
+                        model.Add(sum(window) <= limit)
+
+        model.Maximize(
+            sum(
+                var * (GAME_WEIGHT * len(o.games) + o.quality + (HOME_FACILITY_BONUS if o.home_school else 0))
+                for o, var in zip(options, option_vars)
+            )
+            - UNDER_8_PENALTY * sum(under_8)
+        )
+        return model, option_vars
@@ -0,0 +1,292 @@
+"""
+Decomposed scheduling: one subproblem per geographic cluster, solved in parallel.
+
+Geographic clustering dominates the matchup priority (PRIORITY_WEIGHTS), so nearly
+all matchups stay within a cluster. This mode:
+
+1. Partitions schools by cluster (schools without one form their own group)
+2. Gives every cluster its schools' home gyms plus the shared neutral sites
+3. Runs SchoolBasedScheduler on each subproblem in a separate process
+4. Merges the results into one scheduler state, largest cluster first. A matchup
+   that collides with games already merged (a shared neutral court, a coach at
+   schools in two clusters) is dropped as a whole, as is whatever it leaves on a
+   weeknight court/night short of the 3-game minimum
+5. Repairs: dropped matchups get new blocks, then the Saturday fill runs over the
+   whole league, which also places the cross-cluster games some teams need
+
+Wall-clock time follows the largest cluster instead of the whole league.
+"""
+
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, time
+from typing import Dict, List, Optional, Tuple
+import logging
+import os
+
+from app.core.config import WEEKNIGHT_SLOTS
+from app.models import Team, Facility, Division, Schedule, TimeSlot
+from app.services.scheduler_v2 import SchoolBasedScheduler, SchoolMatchup
+
+logger = logging.getLogger(__name__)
+
+UNASSIGNED_CLUSTER = "Unassigned"
+
+# Clusters with fewer schools than this are solved together (a lone school has no opponents)
+MIN_CLUSTER_SCHOOLS = 4
+
+# (home_team_id, away_team_id, division value, date, start, end, facility name, court number)
+GameRecord = Tuple[str, str, str, date, time, time, str, int]
+
+
+def _school_cluster(teams: List[Team]) -> str:
+    """Cluster name for a school: the most common cluster among its teams."""
+    counts = defaultdict(int)
+    for team in teams:
+        cluster = team.school.cluster or team.cluster
+        if cluster:
+            counts[cluster.value] += 1
+    if not counts:
+        return UNASSIGNED_CLUSTER
+    return max(sorted(counts), key=lambda name: counts[name])
+
+
+def _solve_cluster(cluster: str, teams: List[Team], facilities: List[Facility], rules: Dict) -> Tuple[str, List[GameRecord]]:
+    """
+    Schedule one cluster (runs in a worker process).
+
+    Returns compact game records so only plain values cross the process boundary.
+    """
+    scheduler = SchoolBasedScheduler(teams, facilities, rules)
+    schedule = scheduler.optimize_schedule()
+    records = [
+        (
+            game.home_team.id, game.away_team.id, game.division.value,
+            game.time_slot.date, game.time_slot.start_time, game.time_slot.end_time,
+            game.time_slot.facility.name, game.time_slot.court_number
+        )
+        for game in schedule.games
+    ]
+    return cluster, records
+
+
+class DecomposedScheduler(SchoolBasedScheduler):
+    """
+    Schedules each geographic cluster independently (in parallel) and merges the results.
+
+    The instance itself holds the merged league-wide state, so metrics and the repair
+    passes see one consistent schedule.
+    """
+
+    def __init__(self, teams: List[Team], facilities: List[Facility], rules: Dict,
+                 profile: bool = False, max_workers: Optional[int] = None):
+        """
+        Args:
+            teams: List of all teams to schedule
+            facilities: List of available facilities
+            rules: Dictionary of scheduling rules from config
+            profile: Record phase timings and counters
+            max_workers: Worker processes (default: one per cluster, capped at the CPU count)
+        """
+        super().__init__(teams, facilities, rules, profile=profile)
+        self.max_workers = max_workers
+        self.merge_conflicts = 0
+        self.dropped_matchups: List[SchoolMatchup] = []
+
+    def optimize_schedule(self) -> Schedule:
+        """Partition by cluster, solve subproblems in parallel, merge and repair."""
+        schedule = Schedule(season_start=self.season_start, season_end=self.season_end)
+
+        with self.profiler.phase("partition"):
+            subproblems = self._partition()
+        self.profiler.count("clusters", len(subproblems))
+        for cluster, (cluster_teams, cluster_facilities) in sorted(subproblems.items()):
+            logger.info(
+                "Cluster %s: %d teams, %d facilities", cluster, len(cluster_teams), len(cluster_facilities)
+            )
+
+        with self.profiler.phase("cluster_solves"):
+            results = self._solve_subproblems(subproblems)
+
+        with self.profiler.phase("merge"):
+            # Largest clusters first: they have the fewest alternatives for their matchups
+            for cluster in sorted(results, key=lambda c: (-len(subproblems[c][0]), c)):
+                self._merge_records(schedule, results[cluster])
+        self.profiler.count("merge_conflicts", self.merge_conflicts)
+        logger.info(
+            "Merged %d cluster schedules: %d games, %d games in conflicting or short matchups dropped",
+            len(results), len(schedule.games), self.merge_conflicts
+        )
+
+        # Repair: re-place dropped matchups, then fill Saturdays league-wide (cross-cluster too)
+        with self.profiler.phase("repair"):
+            replaced = self._replace_dropped(schedule)
+            teams_under_8 = [t for t in self.teams if self.team_game_count[t.id] < 8]
+            logger.info(
+                "Re-placed %d of %d dropped matchups; %d teams have < 8 games",
+                replaced, len(self.dropped_matchups), len(teams_under_8)
+            )
+            if teams_under_8:
+                with self.profiler.phase("saturday_fill"):
+                    self._fill_saturday_slots_aggressively(schedule, self._generate_school_matchups(), teams_under_8)
+
+        logger.info("Decomposed scheduling complete: %d total games", len(schedule.games))
+        return schedule
+
+    def _partition(self) -> Dict[str, Tuple[List[Team], List[Facility]]]:
+        """Split teams and facilities into one subproblem per cluster."""
+        school_teams = defaultdict(list)
+        for team in self.teams:
+            school_teams[team.school.name].append(team)
+        cluster_of_school = {name: _school_cluster(teams) for name, teams in school_teams.items()}
+
+        # Combine small clusters, then fold a still-small remainder into the smallest cluster
+        schools_in = defaultdict(list)
+        for name, cluster in cluster_of_school.items():
+            schools_in[cluster].append(name)
+        small = sorted(c for c, names in schools_in.items() if len(names) < MIN_CLUSTER_SCHOOLS)
+        if small:
+            combined = "+".join(small)
+            large = [c for c in schools_in if c not in small]
+            if sum(len(schools_in[c]) for c in small) < MIN_CLUSTER_SCHOOLS and large:
+                combined = min(large, key=lambda c: (len(schools_in[c]), c))
+            for name, cluster in cluster_of_school.items():
+                if cluster in small:
+                    cluster_of_school[name] = combined
+
+        cluster_teams = defaultdict(list)
+        for team in self.teams:
+            cluster_teams[cluster_of_school[team.school.name]].append(team)
+        cluster_facilities = defaultdict(list)
+
+        neutral = []
+        for facility in self.facilities:
+            owner = next(
+                (name for name in school_teams if self._facility_belongs_to_school(facility.name, name)), None
+            )
+            if owner is None:
+                neutral.append(facility)
+            else:
+                cluster_facilities[cluster_of_school[owner]].append(facility)
+
+        # Neutral sites are shared: every cluster may use them, the merge resolves collisions
+        for facility in neutral:
+            for cluster in cluster_teams:
+                cluster_facilities[cluster].append(facility)
+
+        return {cluster: (teams, cluster_facilities[cluster]) for cluster, teams in cluster_teams.items()}
+
+    def _solve_subproblems(self, subproblems: Dict[str, Tuple[List[Team], List[Facility]]]) -> Dict[str, List[GameRecord]]:
+        """Solve every cluster, in worker processes when there is more than one."""
+        workers = self.max_workers or min(len(subproblems), os.cpu_count() or 1)
+        if workers <= 1 or len(subproblems) <= 1:
+            return dict(
+                _solve_cluster(cluster, teams, facilities, self.rules)
+                for cluster, (teams, facilities) in subproblems.items()
+            )
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(_solve_cluster, cluster, teams, facilities, self.rules)
+                for cluster, (teams, facilities) in subproblems.items()
+            ]
+            return dict(future.result() for future in futures)
+
+    def _merge_records(self, schedule: Schedule, records: List[GameRecord]) -> None:
+        """
+        Commit one cluster's games, skipping matchups that collide with games already merged.
+
+        A matchup's back-to-back games on one court are kept or dropped together so the
+        repair passes can re-place them as a unit, and no weeknight court/night is left
+        with fewer than WEEKNIGHT_SLOTS games.
+        """
+        teams_by_id = {team.id: team for team in self.teams}
+        facilities_by_name = {facility.name: facility for facility in self.facilities}
+
+        runs = defaultdict(list)  # (school pair, date, facility, court) -> games
+        for home_id, away_id, division_value, game_date, start, end, facility_name, court in records:
+            home, away = teams_by_id[home_id], teams_by_id[away_id]
+            slot = TimeSlot(
+                date=game_date, start_time=start, end_time=end,
+                facility=facilities_by_name[facility_name], court_number=court
+            )
+            pair = tuple(sorted([home.school.name, away.school.name]))
+            runs[(pair, game_date, facility_name, court)].append((home, away, Division(division_value), slot))
+
+        # One solve placed the cluster's games, so they agree with each other; each run
+        # is checked against the clusters merged before it
+        kept = []
+        for key, games in sorted(runs.items(), key=lambda item: item[0][1:]):
+            if self._merge_conflict(games):
+                self._drop_run(games)
+            else:
+                kept.append((key, games))
+
+        # A dropped run can leave a weeknight court/night with fewer games than referees
+        # need: drop the rest of that court/night too, for the repair pass to re-place
+        court_night_games = Counter()
+        for (_, game_date, facility_name, court), games in kept:
+            if game_date.weekday() < 5:
+                court_night_games[(game_date, facility_name, court)] += len(games)
+        for (pair, game_date, facility_name, court), games in kept:
+            court_night = (game_date, facility_name, court)
+            if court_night in court_night_games and (
+                self.court_game_count.get(court_night, 0) + court_night_games[court_night] < WEEKNIGHT_SLOTS
+            ):
+                self._drop_run(games)
+                continue
+            for home, away, division, slot in games:
+                # home is team_a, so _commit_game keeps the cluster's home/away assignment
+                self._commit_game(schedule, home, away, division, slot)
+            self.school_matchup_count[pair] += 1
+
+    def _drop_run(self, games: List[Tuple[Team, Team, Division, TimeSlot]]) -> None:
+        """Leave a run of games out of the merge and queue its matchup for repair."""
+        self.merge_conflicts += len(games)
+        home, away = games[0][0], games[0][1]
+        self.dropped_matchups.append(SchoolMatchup(
+            school_a=home.school,
+            school_b=away.school,
+            games=[(h, a, division) for h, a, division, _ in games]
+        ))
+
+    def _replace_dropped(self, schedule: Schedule) -> int:
+        """Find new blocks for matchups dropped in the merge. Returns how many were placed."""
+        replaced = 0
+        for matchup in self.dropped_matchups:
+            result = self._find_time_block_for_matchup(matchup)
+            if not result:
+                continue
+            _, slots, home_school = result
+            for (team_a, team_b, division), slot in zip(matchup.games, slots):
+                self._commit_game(schedule, team_a, team_b, division, slot, home_school)
+            self.school_matchup_count[tuple(sorted([matchup.school_a.name, matchup.school_b.name]))] += 1
+            replaced += 1
+        return replaced
+
+    def _merge_conflict(self, games: List[Tuple[Team, Team, Division, TimeSlot]]) -> bool:
+        """
+        Whether a cluster's run of games on one court and date clashes with what is already merged.
+
+        Runs the same checks as _find_time_block_for_matchup: the court, a team, a
+        school or a coach already busy at a slot, the court/night reserved for another
+        school pairing, and no team playing twice on a weeknight.
+        """
+        games_per_team = Counter()
+        for home, away, _, slot in games:
+            if (slot.date, slot.start_time, slot.facility.name, slot.court_number) in self.used_courts:
+                return True
+            time_slot_key = (slot.date, slot.start_time)
+            for team in (home, away):
+                if time_slot_key in self.team_time_slots[team.id]:
+                    return True
+                if time_slot_key in self.school_time_slots[team.school.name]:
+                    return True
+                if time_slot_key in self.coach_time_slots[team.coach_name]:
+                    return True
+                games_per_team[team.id] += 1
+                if slot.date.weekday() < 5 and games_per_team[team.id] > 1:
+                    return True
+            if self._court_night_conflict(home, away, slot):
+                return True
+        return False
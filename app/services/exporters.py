@@ -0,0 +1,297 @@
+"""
+Schedule exports: CSV, XLSX (one sheet per week) and iCalendar feeds.
+
+Every writer walks the games once in season order and writes each row as it
+goes, so memory stays flat however large the schedule is. Display strings come
+from the shared GameFormatter, so exports match the API and the weekly Google
+Sheets tabs.
+
+openpyxl is optional: only XLSX export needs it.
+"""
+
+from collections import defaultdict
+from datetime import date, datetime, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+import csv
+import io
+import logging
+import os
+import re
+
+from app.models import Game
+from app.core.config import SHEET_WEEK_PREFIX
+from app.services.game_format import GameFormatter
+from app.services.schedule_query import season_order_key
+
+try:
+    import openpyxl
+except ImportError:  # Optional: XLSX export only
+    openpyxl = None
+
+logger = logging.getLogger(__name__)
+
+# Column layout of the weekly schedule tabs ("26 WINTER WEEK 1", ...)
+WEEK_SHEET_HEADERS = ["DATE", "DAY", "TIME", "HOME TEAM", "AWAY TEAM", "FACILITY", "DIVISION"]
+_ROW_FIELDS = ("date", "day", "time", "home_team", "away_team", "facility", "division")
+
+# CSV rows per chunk when streaming
+CSV_BATCH_SIZE = 500
+
+CALENDAR_TIMEZONE = "America/Los_Angeles"  # Las Vegas
+_VTIMEZONE = [
+    "BEGIN:VTIMEZONE",
+    f"TZID:{CALENDAR_TIMEZONE}",
+    "BEGIN:STANDARD",
+    "DTSTART:19701101T020000",
+    "RRULE:FREQ=YEARLY;BYMONTH=11;BYDAY=1SU",
+    "TZOFFSETFROM:-0700",
+    "TZOFFSETTO:-0800",
+    "TZNAME:PST",
+    "END:STANDARD",
+    "BEGIN:DAYLIGHT",
+    "DTSTART:19700308T020000",
+    "RRULE:FREQ=YEARLY;BYMONTH=3;BYDAY=2SU",
+    "TZOFFSETFROM:-0800",
+    "TZOFFSETTO:-0700",
+    "TZNAME:PDT",
+    "END:DAYLIGHT",
+    "END:VTIMEZONE",
+]
+
+
+def week_number(game_date: date, season_start: date) -> int:
+    """1-based season week of a date (weeks start on the season's first day)."""
+    return (game_date - season_start).days // 7 + 1
+
+
+def week_sheet_name(week: int) -> str:
+    """Name of a weekly schedule tab, e.g. "26 WINTER WEEK 3"."""
+    return f"{SHEET_WEEK_PREFIX} {week}"
+
+
+def in_season_order(games: Iterable[Game]) -> List[Game]:
+    """Games sorted by date, start time, facility and court."""
+    return sorted(games, key=season_order_key)
+
+
+def game_rows(games: Iterable[Game], formatter: Optional[GameFormatter] = None) -> Iterator[Tuple[Game, List]]:
+    """(game, row) pairs with rows in WEEK_SHEET_HEADERS order, in the order the games are given."""
+    formatter = formatter or GameFormatter()
+    for game in games:
+        data = formatter.game(game)
+        yield game, [data[name] for name in _ROW_FIELDS]
+
+
+# CSV
+
+def iter_csv(games: Iterable[Game], season_start: Optional[date] = None,
+             formatter: Optional[GameFormatter] = None, batch_size: int = CSV_BATCH_SIZE) -> Iterator[str]:
+    """
+    CSV text (WEEK plus the WEEK_SHEET_HEADERS columns) in chunks of batch_size rows.
+
+    Args:
+        games: Games in season order
+        season_start: First day of week 1 (default: the first game's date)
+        formatter: Shared GameFormatter (optional)
+        batch_size: Rows per yielded chunk
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(["WEEK"] + WEEK_SHEET_HEADERS)
+    rows = 0
+    for game, row in game_rows(games, formatter):
+        season_start = season_start or game.time_slot.date
+        writer.writerow([week_number(game.time_slot.date, season_start)] + row)
+        rows += 1
+        if rows % batch_size == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def write_csv(games: Iterable[Game], out: TextIO, season_start: Optional[date] = None,
+              formatter: Optional[GameFormatter] = None) -> None:
+    """Write games as CSV to a text file (see iter_csv)."""
+    for chunk in iter_csv(games, season_start, formatter):
+        out.write(chunk)
+
+
+# XLSX
+
+def write_xlsx(games: Iterable[Game], out, season_start: Optional[date] = None,
+               formatter: Optional[GameFormatter] = None) -> int:
+    """
+    Write games to an XLSX workbook with one "26 WINTER WEEK n" sheet per week.
+
+    Uses openpyxl's write-only mode, which streams rows to disk instead of
+    keeping every cell in memory.
+
+    Args:
+        games: Games in season order
+        out: File path or binary file object
+        season_start: First day of week 1 (default: the first game's date)
+        formatter: Shared GameFormatter (optional)
+
+    Returns:
+        Number of games written
+    """
+    if openpyxl is None:
+        raise RuntimeError("XLSX export requires openpyxl (pip install openpyxl)")
+
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet, current_week, count = None, None, 0
+    for game, row in game_rows(games, formatter):
+        season_start = season_start or game.time_slot.date
+        week = week_number(game.time_slot.date, season_start)
+        if week != current_week:
+            sheet = workbook.create_sheet(week_sheet_name(week))
+            sheet.append(WEEK_SHEET_HEADERS)
+            current_week = week
+        sheet.append(row)
+        count += 1
+    if sheet is None:
+        workbook.create_sheet(week_sheet_name(1)).append(WEEK_SHEET_HEADERS)
+    workbook.save(out)
+    return count
+
+
+# iCalendar
+
+def _escape_text(value: str) -> str:
+    return (value.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n"))
+
+
+def _fold(line: str) -> str:
+    """Fold a content line to 75 octets per RFC 5545 (continuations start with a space)."""
+    encoded = line.encode('utf-8')
+    if len(encoded) <= 75:
+        return line + "\r\n"
+    parts, start, limit = [], 0, 75
+    while start < len(encoded):
+        end = min(start + limit, len(encoded))
+        while end < len(encoded) and (encoded[end] & 0xC0) == 0x80:  # Don't split a UTF-8 sequence
+            end -= 1
+        parts.append(encoded[start:end].decode('utf-8'))
+        start, limit = end, 74  # Continuation lines lose one octet to the leading space
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def _event_uid(game: Game) -> str:
+    """Stable UID: the same matchup on the same day keeps its UID across regenerations."""
+    slot = game.time_slot
+    key = f"{game.home_team.id}-{game.away_team.id}-{slot.date:%Y%m%d}T{slot.start_time:%H%M}"
+    return re.sub(r"[^A-Za-z0-9-]+", "", key.replace(" ", "-")) + "@ncsaa-scheduler"
+
+
+class CalendarWriter:
+    """
+    Renders games as iCalendar VEVENTs, each game rendered once however many
+    calendars (home team, away team, both coaches) include it.
+    """
+
+    def __init__(self, formatter: Optional[GameFormatter] = None, dtstamp: Optional[datetime] = None):
+        self.formatter = formatter or GameFormatter()
+        self.dtstamp = (dtstamp or datetime.now(timezone.utc)).strftime("%Y%m%dT%H%M%SZ")
+        self._events: Dict[int, Tuple[Game, str]] = {}  # id(game) -> (game, rendered VEVENT)
+
+    def event(self, game: Game) -> str:
+        """The VEVENT for a game (rendered on first use)."""
+        cached = self._events.get(id(game))
+        if cached is not None:
+            return cached[1]
+        data = self.formatter.game(game)
+        slot = game.time_slot
+        location = data["facility"]
+        if slot.facility.address:
+            location = f"{location}, {slot.facility.address}"
+        summary = f"{data['division']}: {data['away_team']} at {data['home_team']}"
+        description = f"Home: {data['home_team']}\nAway: {data['away_team']}"
+        lines = [
+            "BEGIN:VEVENT",
+            f"UID:{_event_uid(game)}",
+            f"DTSTAMP:{self.dtstamp}",
+            f"DTSTART;TZID={CALENDAR_TIMEZONE}:{slot.date:%Y%m%d}T{slot.start_time:%H%M%S}",
+            f"DTEND;TZID={CALENDAR_TIMEZONE}:{slot.date:%Y%m%d}T{slot.end_time:%H%M%S}",
+            f"SUMMARY:{_escape_text(summary)}",
+            f"LOCATION:{_escape_text(location)}",
+            f"DESCRIPTION:{_escape_text(description)}",
+            "END:VEVENT",
+        ]
+        rendered = "".join(_fold(line) for line in lines)
+        self._events[id(game)] = (game, rendered)  # Holding the game keeps its id unique
+        return rendered
+
+    def iter_calendar(self, games: Iterable[Game], name: str) -> Iterator[str]:
+        """A complete VCALENDAR for the games, yielded piece by piece."""
+        header = [
+            "BEGIN:VCALENDAR",
+            "VERSION:2.0",
+            "PRODID:-//NCSAA//Basketball Scheduler//EN",
+            "CALSCALE:GREGORIAN",
+            "METHOD:PUBLISH",
+            f"X-WR-CALNAME:{_escape_text(name)}",
+            f"X-WR-TIMEZONE:{CALENDAR_TIMEZONE}",
+        ] + _VTIMEZONE
+        yield "".join(_fold(line) for line in header)
+        for game in games:
+            yield self.event(game)
+        yield "END:VCALENDAR\r\n"
+
+    def write_calendar(self, games: Iterable[Game], name: str, out: TextIO) -> None:
+        for chunk in self.iter_calendar(games, name):
+            out.write(chunk)
+
+
+def _slug(name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9]+", "_", name).strip("_") or "calendar"
+
+
+def calendar_groups(games: Iterable[Game], by: str = "team") -> Dict[str, Tuple[str, List[Game]]]:
+    """
+    Group games (in the order given) into one calendar per team or per coach.
+
+    Returns:
+        {key: (calendar name, games)}; keys are team ids, or coach names for by="coach"
+    """
+    if by not in ("team", "coach"):
+        raise ValueError(f"Unknown calendar grouping: {by!r} (expected 'team' or 'coach')")
+    groups: Dict[str, Tuple[str, List[Game]]] = {}
+    for game in games:
+        for team in (game.home_team, game.away_team):
+            if by == "team":
+                key, name = team.id, f"{team.school.name} ({team.coach_name}) - {team.division.value}"
+            else:
+                key, name = team.coach_name, f"Coach {team.coach_name}"
+            entry = groups.get(key)
+            if entry is None:
+                entry = groups[key] = (name, [])
+            if not entry[1] or entry[1][-1] is not game:  # A coach on both benches gets the game once
+                entry[1].append(game)
+    return groups
+
+
+def write_calendars(games: Iterable[Game], directory: str, by: str = "team",
+                    writer: Optional[CalendarWriter] = None) -> int:
+    """
+    Write one .ics file per team (or coach) into directory.
+
+    Each game's VEVENT is rendered once and shared by every calendar that has it.
+
+    Returns:
+        Number of calendar files written
+    """
+    writer = writer or CalendarWriter()
+    os.makedirs(directory, exist_ok=True)
+    groups = calendar_groups(games, by)
+    used_names = defaultdict(int)
+    for key, (name, group_games) in groups.items():
+        filename = _slug(key if by == "team" else name)
+        used_names[filename] += 1
+        if used_names[filename] > 1:
+            filename = f"{filename}_{used_names[filename]}"
+        with open(os.path.join(directory, f"{filename}.ics"), "w", encoding="utf-8", newline="") as f:
+            writer.write_calendar(group_games, name, f)
+    logger.info("Wrote %d %s calendars to %s", len(groups), by, directory)
+    return len(groups)
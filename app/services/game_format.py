@@ -0,0 +1,77 @@
+"""
+Display formatting for scheduled games.
+
+A season has thousands of games but only a few hundred distinct time slots,
+team displays and facility/court displays, so GameFormatter formats each of
+those once and reuses the strings. The API responses and the file exporters
+share it, so every output shows a game the same way.
+"""
+
+from datetime import date, time
+from typing import Any, Dict, Optional, Set, Tuple
+
+from app.models import Game, Team, TimeSlot
+
+# Field order of a formatted game (the API's GameResponse fields)
+GAME_FIELDS = ("id", "home_team", "away_team", "date", "day", "time", "facility", "court", "division")
+
+
+class GameFormatter:
+    """
+    Converts games to the GameResponse layout (matches the Google Sheets layout).
+
+    Formatted strings are cached by value, so one formatter can be shared by
+    every schedule.
+    """
+
+    def __init__(self):
+        self._slot_strings: Dict[Tuple[date, time, time], Tuple[str, str, str]] = {}  # -> (date, day, time)
+        self._team_displays: Dict[Tuple[str, str], str] = {}  # (school, coach) -> display
+        self._facility_displays: Dict[Tuple[str, int], str] = {}  # (facility, court) -> display
+
+    def _slot(self, slot: TimeSlot) -> Tuple[str, str, str]:
+        key = (slot.date, slot.start_time, slot.end_time)
+        strings = self._slot_strings.get(key)
+        if strings is None:
+            # 12-hour times, e.g. "5:00 PM - 6:00 PM"
+            start = slot.start_time.strftime("%I:%M %p").lstrip('0')
+            end = slot.end_time.strftime("%I:%M %p").lstrip('0')
+            strings = (slot.date.strftime("%Y-%m-%d"), slot.date.strftime("%A"), f"{start} - {end}")
+            self._slot_strings[key] = strings
+        return strings
+
+    def _team(self, team: Team) -> str:
+        key = (team.school.name, team.coach_name)
+        display = self._team_displays.get(key)
+        if display is None:
+            display = self._team_displays[key] = f"{team.school.name} ({team.coach_name})"
+        return display
+
+    def _facility(self, slot: TimeSlot) -> str:
+        key = (slot.facility.name, slot.court_number)
+        display = self._facility_displays.get(key)
+        if display is None:
+            display = slot.facility.name
+            if slot.court_number and slot.court_number > 0:
+                display = f"{display} - Court {slot.court_number}"
+            self._facility_displays[key] = display
+        return display
+
+    def game(self, game: Game, fields: Optional[Set[str]] = None) -> Dict[str, Any]:
+        """One game as a GameResponse-shaped dict (only the given fields, if any)."""
+        slot = game.time_slot
+        date_str, day_str, time_str = self._slot(slot)
+        data = {
+            "id": game.id,
+            "home_team": self._team(game.home_team),
+            "away_team": self._team(game.away_team),
+            "date": date_str,
+            "day": day_str,
+            "time": time_str,
+            "facility": self._facility(slot),
+            "court": slot.court_number,
+            "division": game.division.value,
+        }
+        if fields is not None:
+            return {name: value for name, value in data.items() if name in fields}
+        return data
@@ -0,0 +1,110 @@
+"""
+Shared, periodically refreshed league data for the read-only API endpoints.
+
+/api/teams, /api/facilities, /api/schools, /api/data and /api/info are pure
+functions of the spreadsheet contents. LeagueDataCache loads the sheets
+at most once per DATA_CACHE_TTL_SECONDS and tags each load with a hash of the
+sheet contents, which the endpoints use as their ETag source. A reload whose
+contents hash is unchanged keeps the previous LeagueData, so everything derived
+from it (such as its LeagueView) stays valid. A load that fails or comes back
+without teams or facilities (SheetsReader logs read errors and returns empty
+lists) is not cached: the previous LeagueData keeps being served and the next
+get() tries again.
+"""
+
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+import logging
+import threading
+import time
+
+from app.models import Team, Facility, School
+from app.core.config import DATA_CACHE_TTL_SECONDS
+from app.services.league_view import LeagueView, build_league_view
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LeagueData:
+    """One load of the league's teams, facilities, schools and rules."""
+    teams: List[Team]
+    facilities: List[Facility]
+    schools: Dict[str, School]
+    rules: Dict
+    content_hash: str  # Hash of the sheet contents these were parsed from
+    loaded_at: float = field(default_factory=time.time)
+    _view: Optional[LeagueView] = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def view(self) -> LeagueView:
+        """Display rows and summaries, built on first use."""
+        if self._view is None:
+            self._view = build_league_view(self.teams, self.facilities)
+        return self._view
+
+
+def load_league_data() -> LeagueData:
+    """Load everything from Google Sheets."""
+    from app.services.sheets_reader import SheetsReader  # gspread/google-auth are only needed here
+
+    reader = SheetsReader()
+    teams, facilities, rules = reader.load_all_data()
+    return LeagueData(
+        teams=teams,
+        facilities=facilities,
+        schools=reader.load_schools(),
+        rules=rules,
+        content_hash=reader.content_hash()
+    )
+
+
+class LeagueDataCache:
+    """Thread-safe LeagueData cache refreshed after a time-to-live."""
+
+    def __init__(self, ttl_seconds: float = DATA_CACHE_TTL_SECONDS,
+                 loader: Callable[[], LeagueData] = load_league_data):
+        self.ttl_seconds = ttl_seconds
+        self.loader = loader
+        self._data: Optional[LeagueData] = None
+        self._expires_at = 0.0  # time.monotonic() after which the data is reloaded
+        self._lock = threading.Lock()
+
+    def get(self) -> LeagueData:
+        """
+        The cached data, reloading it first if it is older than the TTL.
+
+        Raises:
+            Exception: The first load failed (later failures serve the previous data)
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self._data is None or now >= self._expires_at:
+                try:
+                    data = self.loader()
+                except Exception as e:
+                    if self._data is None:
+                        raise
+                    logger.warning("League data reload failed (%s), keeping content %s",
+                                   e, self._data.content_hash[:12])
+                    return self._data
+                if not data.teams or not data.facilities:
+                    if self._data is None:
+                        return data  # Nothing better to serve; try again next time
+                    logger.warning("League data reload came back empty, keeping content %s",
+                                   self._data.content_hash[:12])
+                    return self._data
+                if self._data is None or data.content_hash != self._data.content_hash:
+                    logger.info("League data loaded (content %s)", data.content_hash[:12])
+                    self._data = data
+                self._expires_at = now + self.ttl_seconds
+            return self._data
+
+    def invalidate(self) -> None:
+        """Force a reload on the next get()."""
+        with self._lock:
+            self._expires_at = 0.0
+
+
+# Shared by the API routes
+league_data_cache = LeagueDataCache()
@@ -0,0 +1,305 @@
+"""
+Synthetic league generator for offline scale and performance testing.
+
+Produces the same (teams, facilities, rules) tuple as SheetsReader.load_all_data(),
+so benchmarks and tests can drive the schedulers at any league size without
+touching Google Sheets. Output is fully determined by the LeagueSpec (including
+its seed).
+
+Naming follows the spreadsheet conventions the scheduler relies on:
+- Facilities are one entry per court: "<Site> - Court <n>"
+- A school's home gym contains the school name, so _facility_belongs_to_school()
+  recognizes it; neutral sites never contain any school name
+- School names are two words with no color or number suffix, and no school name
+  is a substring of another
+"""
+
+import itertools
+import random
+from dataclasses import dataclass, field, replace
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from app.models import Team, School, Facility, Division, Cluster, Tier
+
+
+# Roughly the size of the current league (56 schools, ~220 teams, 24 courts)
+CURRENT_LEAGUE_SCHOOLS = 56
+CURRENT_LEAGUE_NEUTRAL_SITES = 8
+
+# Scale factors used by benchmarks: current size, 5x and 20x
+SCALE_FACTORS = (1, 5, 20)
+
+_SCHOOL_PREFIXES = [
+    "Acacia", "Alder", "Aspen", "Bayberry", "Birch", "Bluff", "Boulder", "Briar",
+    "Canyon", "Cedar", "Chaparral", "Clover", "Cobalt", "Coral", "Cottonwood", "Cypress",
+    "Desert", "Dogwood", "Eagle", "Elm", "Falcon", "Fern", "Foothill", "Granite",
+    "Hawthorn", "Heron", "Hickory", "Juniper", "Kestrel", "Larkspur", "Laurel", "Linden",
+    "Magnolia", "Mesa", "Mesquite", "Mulberry", "Oakmont", "Osprey", "Palomino", "Pinyon",
+    "Quail", "Redwood", "Rosewood", "Sage", "Sequoia", "Sparrow", "Spruce", "Summit",
+    "Sycamore", "Tamarack", "Thistle", "Timber", "Walnut", "Willow", "Yucca", "Zephyr",
+]
+_SCHOOL_SUFFIXES = [
+    "Academy", "Charter", "Prep", "Ridge", "Valley", "Heights", "Meadows", "Crossing",
+    "Springs", "Park", "Hills", "Point", "Trails", "Landing", "Commons", "Grove",
+    "Harbor", "Vista", "Terrace", "Hollow", "Bend", "Reach", "Glen", "Knoll",
+]
+
+_SITE_AREAS = [
+    "Northgate", "Southgate", "Eastview", "Westview", "Midtown", "Uptown", "Riverside",
+    "Lakeside", "Parkside", "Downtown", "Centennial", "Sunrise", "Sunset", "Crestview",
+]
+_SITE_KINDS = [
+    "Community Center", "Recreation Center", "Sports Complex", "Fieldhouse",
+    "Youth Center", "Activity Center", "Civic Arena", "Athletic Club",
+]
+
+_COACH_FIRST = [
+    "Alex", "Bailey", "Casey", "Dana", "Elliot", "Frankie", "Glen", "Harper", "Indy",
+    "Jordan", "Kai", "Lee", "Morgan", "Noel", "Oakley", "Parker", "Quinn", "Riley",
+    "Sam", "Taylor", "Val", "Wren", "Avery", "Blake", "Cameron", "Drew", "Emerson",
+    "Finley", "Hayden", "Jamie",
+]
+_COACH_LAST = [
+    "Alvarez", "Bennett", "Carter", "Delgado", "Ellis", "Foster", "Garcia", "Hughes",
+    "Ibarra", "Jensen", "Kim", "Lopez", "Morales", "Nguyen", "Ortiz", "Patel", "Quintero",
+    "Reyes", "Sato", "Torres", "Underwood", "Vasquez", "Walsh", "Xu", "Young", "Zamora",
+    "Brooks", "Chen", "Diaz", "Evans", "Flores", "Grant", "Hayes", "Iverson", "Jacobs",
+    "Khan", "Lambert", "Mendez", "Nash", "Owens",
+]
+
+# Relative likelihood that a school fields a team in each division
+_DIVISION_WEIGHTS = {
+    Division.ES_K1_REC: 0.4,
+    Division.ES_23_REC: 0.6,
+    Division.ES_BOYS_COMP: 1.0,
+    Division.ES_GIRLS_COMP: 0.8,
+    Division.BOYS_JV: 1.0,
+    Division.GIRLS_JV: 0.8,
+}
+
+
+@dataclass
+class LeagueSpec:
+    """
+    Parameters for a synthetic league.
+
+    Defaults approximate the current league; use scaled() for larger leagues.
+    """
+    num_schools: int = CURRENT_LEAGUE_SCHOOLS
+    divisions_per_school: Tuple[int, int] = (2, 6)  # min/max divisions fielded per school
+    shared_coach_rate: float = 0.3  # Chance a coach also takes the school's next team
+    home_gym_rate: float = 0.3  # Fraction of schools that host games in their own gym
+    home_gym_courts: Tuple[int, int] = (1, 2)
+    home_gym_date_rate: float = 0.5  # Fraction of season dates a home gym is available
+    num_neutral_sites: int = CURRENT_LEAGUE_NEUTRAL_SITES
+    neutral_site_courts: Tuple[int, int] = (1, 3)
+    neutral_date_rate: float = 1.0  # < 1.0 gives neutral sites specific available dates
+    k1_court_rate: float = 0.25  # Fraction of neutral sites with an 8ft-rim K-1 court
+    season_start: date = date(2026, 1, 5)
+    season_weeks: int = 8
+    cluster_weights: Dict[Cluster, float] = field(
+        default_factory=lambda: {cluster: 1.0 for cluster in Cluster}
+    )
+    tier_weights: Dict[Tier, float] = field(
+        default_factory=lambda: {tier: 1.0 for tier in Tier}
+    )
+    unassigned_cluster_rate: float = 0.0  # Schools missing cluster data
+    blackout_rate: float = 0.05  # Fraction of season dates each school blacks out
+    seed: int = 2026
+
+    def scaled(self, factor: float) -> 'LeagueSpec':
+        """Return a copy with schools and facilities multiplied by factor."""
+        return replace(
+            self,
+            num_schools=max(2, int(round(self.num_schools * factor))),
+            num_neutral_sites=max(1, int(round(self.num_neutral_sites * factor))),
+            cluster_weights=dict(self.cluster_weights),
+            tier_weights=dict(self.tier_weights)
+        )
+
+    @property
+    def season_end(self) -> date:
+        """Saturday of the final week."""
+        return self.season_start + timedelta(days=self.season_weeks * 7 - 2)
+
+
+def _weighted_choice(rng: random.Random, weights: Dict):
+    """Pick a key from a {value: weight} dict."""
+    keys = list(weights.keys())
+    return rng.choices(keys, weights=[weights[k] for k in keys], k=1)[0]
+
+
+def _season_dates(spec: LeagueSpec) -> List[date]:
+    """All Monday-Saturday dates in the season."""
+    dates = []
+    current = spec.season_start
+    while current <= spec.season_end:
+        if current.weekday() != 6:
+            dates.append(current)
+        current += timedelta(days=1)
+    return dates
+
+
+def _school_names(rng: random.Random, count: int) -> List[str]:
+    """Unique two-word school names; none is a substring of another."""
+    combos = [f"{p} {s}" for p, s in itertools.product(_SCHOOL_PREFIXES, _SCHOOL_SUFFIXES)]
+    if count > len(combos):
+        raise ValueError(f"Cannot generate {count} unique school names (max {len(combos)})")
+    rng.shuffle(combos)
+
+    names = []
+    lowered = []
+    for candidate in combos:
+        low = candidate.lower()
+        if any(low in other or other in low for other in lowered):
+            continue
+        names.append(candidate)
+        lowered.append(low)
+        if len(names) == count:
+            break
+
+    if len(names) < count:
+        raise ValueError(f"Cannot generate {count} non-overlapping school names")
+    return names
+
+
+def _neutral_site_names(count: int, school_names: List[str]) -> List[str]:
+    """Neutral site names that never contain a school name."""
+    school_lower = [name.lower() for name in school_names]
+    names = []
+    for area, kind in itertools.product(_SITE_AREAS, _SITE_KINDS):
+        candidate = f"{area} {kind}"
+        if not any(school in candidate.lower() for school in school_lower):
+            names.append(candidate)
+
+    # Beyond the word combinations, number additional sites of the same kind
+    base = list(names)
+    round_num = 2
+    while len(names) < count:
+        names.extend(f"{name} {round_num}" for name in base)
+        round_num += 1
+    return names[:count]
+
+
+def _coach_names(rng: random.Random):
+    """Yield unique coach names in a deterministic shuffled order."""
+    combos = [f"{first} {last}" for first, last in itertools.product(_COACH_FIRST, _COACH_LAST)]
+    rng.shuffle(combos)
+    for name in combos:
+        yield name
+    for round_num in itertools.count(2):
+        for name in combos:
+            yield f"{name} {round_num}"
+
+
+def _sample_dates(rng: random.Random, dates: List[date], rate: float) -> List[date]:
+    """Random subset of dates (empty list means available all season, as in the sheet)."""
+    if rate >= 1.0:
+        return []
+    keep = max(1, int(round(len(dates) * rate)))
+    return sorted(rng.sample(dates, keep))
+
+
+def generate_league(spec: Optional[LeagueSpec] = None) -> Tuple[List[Team], List[Facility], Dict]:
+    """
+    Generate a synthetic league.
+
+    Args:
+        spec: League parameters (defaults to the current league size)
+
+    Returns:
+        (teams, facilities, rules) in the same shape as SheetsReader.load_all_data()
+    """
+    spec = spec or LeagueSpec()
+    rng = random.Random(spec.seed)
+    dates = _season_dates(spec)
+
+    # Schools
+    schools = []
+    for name in _school_names(rng, spec.num_schools):
+        cluster = None
+        if rng.random() >= spec.unassigned_cluster_rate:
+            cluster = _weighted_choice(rng, spec.cluster_weights)
+        schools.append(School(name=name, cluster=cluster, tier=_weighted_choice(rng, spec.tier_weights)))
+
+    # Teams (ids follow the SheetsReader format: School_Division_Coach_R<row>)
+    teams = []
+    coaches = _coach_names(rng)
+    divisions = list(_DIVISION_WEIGHTS.keys())
+    low, high = spec.divisions_per_school
+    row = 2
+    for school in schools:
+        num_divisions = rng.randint(low, min(high, len(divisions)))
+        fielded = set()
+        while len(fielded) < num_divisions:
+            fielded.add(_weighted_choice(rng, _DIVISION_WEIGHTS))
+
+        coach = next(coaches)
+        for division in divisions:
+            if division not in fielded:
+                continue
+            team_id = f"{school.name}_{division.value}_{coach.split()[1]}_R{row}"
+            team_id = team_id.replace(' ', '_').replace('/', '_').replace('-', '_')
+            teams.append(Team(
+                id=team_id,
+                school=school,
+                division=division,
+                coach_name=coach,
+                coach_email='',
+                tier=school.tier,
+                cluster=school.cluster
+            ))
+            row += 1
+            # Shared coaches take consecutive divisions at the same school
+            if rng.random() >= spec.shared_coach_rate:
+                coach = next(coaches)
+
+    # Facilities: one entry per court, like the FACILITIES sheet
+    facilities = []
+    for school in schools:
+        if rng.random() >= spec.home_gym_rate:
+            continue
+        available = _sample_dates(rng, dates, spec.home_gym_date_rate)
+        for court in range(1, rng.randint(*spec.home_gym_courts) + 1):
+            facilities.append(Facility(
+                name=f"{school.name} - Court {court}",
+                address=school.name,
+                available_dates=list(available)
+            ))
+
+    for site in _neutral_site_names(spec.num_neutral_sites, [s.name for s in schools]):
+        available = _sample_dates(rng, dates, spec.neutral_date_rate)
+        for court in range(1, rng.randint(*spec.neutral_site_courts) + 1):
+            facilities.append(Facility(
+                name=f"{site} - Court {court}",
+                address=site,
+                available_dates=list(available)
+            ))
+        if rng.random() < spec.k1_court_rate:
+            facilities.append(Facility(
+                name=f"{site} - K-1 Court",
+                address=site,
+                available_dates=list(available),
+                has_8ft_rims=True,
+                notes="8 foot rims"
+            ))
+
+    # Rules (holidays from config are added by the scheduler itself)
+    blackouts = {}
+    if spec.blackout_rate > 0:
+        per_school = int(round(len(dates) * spec.blackout_rate))
+        for school in schools:
+            if per_school:
+                blackouts[school.name] = sorted(rng.sample(dates, per_school))
+
+    rules = {
+        'season_start': spec.season_start,
+        'season_end': spec.season_end,
+        'holidays': [],
+        'no_game_dates': [],
+        'notes': [f"Synthetic league (seed {spec.seed})"],
+        'blackouts': blackouts
+    }
+
+    return teams, facilities, rules
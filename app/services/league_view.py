@@ -0,0 +1,156 @@
+"""
+Display-ready summaries of the league data, built once per data version.
+
+/api/data, /api/info, /api/teams and /api/schools all show the same teams,
+schools and facilities grouped different ways. LeagueView builds every row and
+every division, cluster and tier summary in one pass over the teams (and one
+over the facilities); the endpoints only pick the parts they return.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+from app.models import Team, Facility
+
+# Games each team plays, for the estimated game counts
+GAMES_PER_TEAM = 8
+
+
+@dataclass
+class LeagueView:
+    """Every team, school, facility and summary row the data endpoints return."""
+    # One row per team
+    team_rows: List[Dict[str, Any]] = field(default_factory=list)  # /api/data: relationship counts
+    team_infos: List[Dict[str, Any]] = field(default_factory=list)  # /api/info, /api/teams: full relationships
+    team_infos_by_division: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)
+
+    # One row per school, in order of first team
+    schools: List[Dict[str, Any]] = field(default_factory=list)  # /api/data: cluster/tier of the school's first team
+    school_infos: List[Dict[str, Any]] = field(default_factory=list)  # /api/info: the school's own cluster/tier
+    team_ids_by_school: Dict[str, List[str]] = field(default_factory=dict)
+
+    # One row per facility
+    facility_rows: List[Dict[str, Any]] = field(default_factory=list)  # /api/data
+    facility_infos: List[Dict[str, Any]] = field(default_factory=list)  # /api/info: with the first 10 dates
+
+    divisions: List[Dict[str, Any]] = field(default_factory=list)  # {name, team_count, estimated_games}
+    clusters: List[Dict[str, Any]] = field(default_factory=list)  # {name, team_count, school_count}
+    tiers: List[Dict[str, Any]] = field(default_factory=list)  # {name, team_count, school_count}
+
+
+def build_league_view(teams: List[Team], facilities: List[Facility]) -> LeagueView:
+    """Build every row and summary of the data endpoints in one pass over teams and facilities."""
+    view = LeagueView()
+    schools: Dict[str, Dict[str, Any]] = {}
+    school_infos: Dict[str, Dict[str, Any]] = {}
+    divisions: Dict[str, Dict[str, Any]] = {}
+    clusters: Dict[str, Dict[str, Any]] = {}
+    tiers: Dict[str, Dict[str, Any]] = {}
+
+    for team in teams:
+        school_name = team.school.name
+        division = team.division.value
+        cluster = team.cluster.value if team.cluster else None
+        tier = team.tier.value if team.tier else None
+
+        view.team_rows.append({
+            "id": team.id,
+            "school": school_name,
+            "division": division,
+            "coach_name": team.coach_name,
+            "coach_email": team.coach_email,
+            "tier": tier,
+            "cluster": cluster,
+            "home_facility": team.home_facility,
+            "rivals_count": len(team.rivals),
+            "do_not_play_count": len(team.do_not_play)
+        })
+        team_info = {
+            "id": team.id,
+            "school_name": school_name,
+            "division": division,
+            "coach_name": team.coach_name,
+            "coach_email": team.coach_email,
+            "home_facility": team.home_facility,
+            "tier": tier,
+            "cluster": cluster,
+            "rivals": list(team.rivals),
+            "do_not_play": list(team.do_not_play)
+        }
+        view.team_infos.append(team_info)
+        view.team_infos_by_division.setdefault(division, []).append(team_info)
+
+        school = schools.get(school_name)
+        if school is None:
+            school = schools[school_name] = {"name": school_name, "cluster": cluster, "tier": tier, "teams": []}
+            school_infos[school_name] = {
+                "name": school_name,
+                "cluster": team.school.cluster.value if team.school.cluster else None,
+                "tier": team.school.tier.value if team.school.tier else None,
+                "teams": []
+            }
+            view.team_ids_by_school[school_name] = []
+        school["teams"].append({
+            "id": team.id,
+            "division": division,
+            "coach": team.coach_name,
+            "email": team.coach_email
+        })
+        school_infos[school_name]["teams"].append({
+            "id": team.id,
+            "division": division,
+            "coach_name": team.coach_name,
+            "coach_email": team.coach_email
+        })
+        view.team_ids_by_school[school_name].append(team.id)
+
+        if division not in divisions:
+            divisions[division] = {"name": division, "team_count": 0, "estimated_games": 0}
+        divisions[division]["team_count"] += 1
+        if cluster:
+            if cluster not in clusters:
+                clusters[cluster] = {"name": cluster, "team_count": 0, "school_count": 0}
+            clusters[cluster]["team_count"] += 1
+        if tier:
+            if tier not in tiers:
+                tiers[tier] = {"name": tier, "team_count": 0, "school_count": 0}
+            tiers[tier]["team_count"] += 1
+
+    for summary in divisions.values():
+        summary["estimated_games"] = (summary["team_count"] * GAMES_PER_TEAM) // 2
+    # Schools count toward the cluster and tier of their first team
+    for school in schools.values():
+        if school["cluster"] in clusters:
+            clusters[school["cluster"]]["school_count"] += 1
+        if school["tier"] in tiers:
+            tiers[school["tier"]]["school_count"] += 1
+
+    view.schools = list(schools.values())
+    view.school_infos = list(school_infos.values())
+    view.divisions = list(divisions.values())
+    view.clusters = list(clusters.values())
+    view.tiers = list(tiers.values())
+
+    for facility in facilities:
+        view.facility_rows.append({
+            "name": facility.name,
+            "address": facility.address,
+            "max_courts": facility.max_courts,
+            "has_8ft_rims": facility.has_8ft_rims,
+            "available_dates_count": len(facility.available_dates),
+            "unavailable_dates_count": len(facility.unavailable_dates),
+            "notes": facility.notes
+        })
+        view.facility_infos.append({
+            "name": facility.name,
+            "address": facility.address,
+            "max_courts": facility.max_courts,
+            "has_8ft_rims": facility.has_8ft_rims,
+            "notes": facility.notes,
+            "available_dates_count": len(facility.available_dates),
+            "unavailable_dates_count": len(facility.unavailable_dates),
+            "available_dates": [str(d) for d in facility.available_dates[:10]],  # First 10
+            "unavailable_dates": [str(d) for d in facility.unavailable_dates[:10]]  # First 10
+        })
+
+    return view
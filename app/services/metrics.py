@@ -0,0 +1,83 @@
+"""
+Quality-versus-time metrics for a schedule run.
+
+Every run (CLI, API, benchmarks) emits the same record so speed changes can be
+checked against schedule quality side by side.
+"""
+
+import sys
+from typing import Dict, List, Optional
+
+from app.models import Schedule, Team, ScheduleValidationResult
+from app.services.aggregates import ScheduleAggregate, aggregate_schedule
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB, or None if unavailable."""
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in kilobytes on Linux and bytes on macOS
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(max_rss / divisor, 1)
+
+
+def compute_run_metrics(
+    schedule: Schedule,
+    teams: List[Team],
+    validation_result: Optional[ScheduleValidationResult] = None,
+    wall_time_seconds: Optional[float] = None,
+    scheduler=None,
+    aggregate: Optional[ScheduleAggregate] = None
+) -> Dict:
+    """
+    Build the standard metrics record for one schedule run.
+
+    Args:
+        schedule: The generated schedule
+        teams: All teams that should have been scheduled
+        validation_result: Validator output (violation counts are None without it)
+        wall_time_seconds: End-to-end generation time
+        scheduler: The SchoolBasedScheduler used, for relaxation passes and capacity
+        aggregate: Precomputed aggregate of the schedule (built if not given)
+
+    Returns:
+        Dictionary of quality and performance metrics
+    """
+    if aggregate is None:
+        aggregate = aggregate_schedule(schedule, teams)
+    court_nights = aggregate.weeknight_court_games
+
+    metrics = {
+        "total_games": aggregate.total_games,
+        "total_teams": len(teams),
+        **aggregate.game_count_buckets(teams),
+        "hard_violations": None,
+        "soft_violations": None,
+        "weeknight_courts": len(court_nights),
+        "weeknight_courts_under_3_games": sum(1 for c in court_nights.values() if c < 3),
+        "relaxation_passes_used": None,
+        "saturday_fill_passes_used": None,
+        "facility_utilization": None,
+        "wall_time_seconds": round(wall_time_seconds, 3) if wall_time_seconds is not None else None,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+    if validation_result is not None:
+        metrics["hard_violations"] = len(validation_result.hard_constraint_violations)
+        metrics["soft_violations"] = len(validation_result.soft_constraint_violations)
+
+    if scheduler is not None:
+        metrics["relaxation_passes_used"] = getattr(scheduler, "rematch_passes_used", None)
+        metrics["saturday_fill_passes_used"] = getattr(scheduler, "saturday_fill_passes_used", None)
+        # Every time block starts at one court/time slot, so the block count is the capacity
+        capacity = len(getattr(scheduler, "time_blocks", []) or [])
+        if capacity:
+            metrics["facility_utilization"] = round(len(schedule.games) / capacity, 4)
+
+    return metrics
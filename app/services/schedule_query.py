@@ -0,0 +1,223 @@
+"""
+Indexed queries over a stored schedule.
+
+Games are put in season order (date, start time, facility, court) once, and every
+filterable attribute (team, school, coach, division, facility, day of week) gets a
+sorted list of game positions. A query starts from the shortest matching list,
+narrowed by binary search to the date range (a contiguous slice of the order), and
+checks the remaining filters only on those games, so a coach's games or one
+facility's schedule never touch the rest of the season. A page picks up right
+after its cursor and stops once it is full.
+"""
+
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from datetime import date, time
+from itertools import islice
+from typing import Iterator, List, Optional, Tuple
+import heapq
+import threading
+
+from app.models import Game, Schedule
+
+DAY_NAMES = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+
+# Page size when none is given, and the largest page a request may ask for
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# Match totals kept per filter set, so paging on doesn't recount the season
+MAX_CACHED_TOTALS = 256
+
+
+def season_order_key(game: Game) -> Tuple[date, time, str, int]:
+    """Sort key putting games in season order: date, start time, facility, court."""
+    slot = game.time_slot
+    return (slot.date, slot.start_time, slot.facility.name, slot.court_number)
+
+
+class QueryError(ValueError):
+    """A filter value or cursor that cannot be interpreted."""
+
+
+def parse_days(days: str) -> List[int]:
+    """Weekday numbers (Monday=0) from a comma-separated list like "Tue,Saturday"."""
+    weekdays = []
+    for name in days.split(','):
+        name = name.strip().lower()
+        if not name:
+            continue
+        matches = [i for i, day in enumerate(DAY_NAMES) if len(name) >= 3 and day.startswith(name)]
+        if len(matches) != 1:
+            raise QueryError(f"Unknown day of week: {name!r}")
+        weekdays.append(matches[0])
+    return weekdays
+
+
+@dataclass
+class GameFilters:
+    """Filters for a games query (all optional; text filters are case-insensitive)."""
+    team: Optional[str] = None  # Team id, home or away
+    school: Optional[str] = None
+    coach: Optional[str] = None
+    division: Optional[str] = None  # Division value, e.g. "BOY'S JV"
+    facility: Optional[str] = None
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
+    days: Optional[List[int]] = None  # Weekday numbers, Monday=0
+
+
+@dataclass
+class GamePage:
+    """One page of query results."""
+    games: List[Game]
+    total: int  # Games matching the filters across all pages
+    next_cursor: Optional[str]
+
+
+class GameIndex:
+    """Position lists over a schedule's games in season order."""
+
+    def __init__(self, schedule: Schedule):
+        self.games = sorted(schedule.games, key=season_order_key)
+        self.dates = [g.time_slot.date for g in self.games]
+
+        by_team = defaultdict(list)
+        by_school = defaultdict(list)
+        by_coach = defaultdict(list)
+        by_division = defaultdict(list)
+        by_facility = defaultdict(list)
+        by_weekday = defaultdict(list)
+        for position, game in enumerate(self.games):
+            for team in {game.home_team, game.away_team}:
+                by_team[team.id].append(position)
+            for school in {game.home_team.school.name.lower(), game.away_team.school.name.lower()}:
+                by_school[school].append(position)
+            for coach in {game.home_team.coach_name.lower(), game.away_team.coach_name.lower()}:
+                if coach:
+                    by_coach[coach].append(position)
+            by_division[game.division.value.lower()].append(position)
+            by_facility[game.time_slot.facility.name.lower()].append(position)
+            by_weekday[game.time_slot.date.weekday()].append(position)
+
+        self._lists = {
+            'team': dict(by_team),
+            'school': dict(by_school),
+            'coach': dict(by_coach),
+            'division': dict(by_division),
+            'facility': dict(by_facility),
+        }
+        self._by_weekday = dict(by_weekday)
+        self._totals: "OrderedDict[tuple, int]" = OrderedDict()
+        self._totals_lock = threading.Lock()
+
+    def _matches(self, game: Game, filters: GameFilters) -> bool:
+        """Check every filter against one game."""
+        if filters.team and filters.team not in (game.home_team.id, game.away_team.id):
+            return False
+        if filters.school and filters.school.lower() not in (
+            game.home_team.school.name.lower(), game.away_team.school.name.lower()
+        ):
+            return False
+        if filters.coach and filters.coach.lower() not in (
+            game.home_team.coach_name.lower(), game.away_team.coach_name.lower()
+        ):
+            return False
+        if filters.division and filters.division.lower() != game.division.value.lower():
+            return False
+        if filters.facility and filters.facility.lower() != game.time_slot.facility.name.lower():
+            return False
+        if filters.days is not None and game.time_slot.date.weekday() not in filters.days:
+            return False
+        return True
+
+    def _candidates(self, filters: GameFilters, start: int, stop: int) -> Iterator[int]:
+        """Positions in [start, stop) from the shortest position list covering the filters."""
+        lists = []
+        if filters.team:
+            lists.append([self._lists['team'].get(filters.team, [])])
+        for name in ('school', 'coach', 'division', 'facility'):
+            value = getattr(filters, name)
+            if value:
+                lists.append([self._lists[name].get(value.lower(), [])])
+        if filters.days is not None:
+            lists.append([self._by_weekday.get(day, []) for day in set(filters.days)])
+
+        if not lists:
+            return iter(range(start, stop))
+        # Each candidate is one or more sorted lists (the days filter unions weekdays);
+        # only their [start, stop) windows are located and walked, never copied
+        windows = [
+            [(positions, bisect_left(positions, start), bisect_left(positions, stop)) for positions in group]
+            for group in lists
+        ]
+        shortest = min(windows, key=lambda group: sum(hi - lo for _, lo, hi in group))
+        return heapq.merge(*(map(positions.__getitem__, range(lo, hi)) for positions, lo, hi in shortest))
+
+    def _date_range(self, filters: GameFilters) -> Tuple[int, int]:
+        """Date range: a contiguous slice [start, stop) of the season order."""
+        start = bisect_left(self.dates, filters.date_from) if filters.date_from else 0
+        stop = bisect_right(self.dates, filters.date_to) if filters.date_to else len(self.games)
+        return start, stop
+
+    def _matching(self, filters: GameFilters, after: int = 0) -> Iterator[int]:
+        """Positions of the games matching the filters, from position `after` on."""
+        start, stop = self._date_range(filters)
+        for position in self._candidates(filters, max(start, after), stop):
+            if self._matches(self.games[position], filters):
+                yield position
+
+    @staticmethod
+    def _after(cursor: Optional[str]) -> int:
+        """Position of the first game after the cursor."""
+        if not cursor:
+            return 0
+        try:
+            return int(cursor) + 1
+        except ValueError:
+            raise QueryError(f"Invalid cursor: {cursor!r}")
+
+    def _total(self, filters: GameFilters) -> int:
+        """Games matching the filters, counted once per filter set."""
+        key = (
+            filters.team,
+            *(value.lower() if value else None
+              for value in (filters.school, filters.coach, filters.division, filters.facility)),
+            filters.date_from, filters.date_to,
+            frozenset(filters.days) if filters.days is not None else None
+        )
+        with self._totals_lock:
+            total = self._totals.get(key)
+            if total is not None:
+                self._totals.move_to_end(key)
+                return total
+        total = sum(1 for _ in self._matching(filters))
+        with self._totals_lock:
+            self._totals[key] = total
+            while len(self._totals) > MAX_CACHED_TOTALS:
+                self._totals.popitem(last=False)
+        return total
+
+    def matching(self, filters: GameFilters, cursor: Optional[str] = None) -> List[Game]:
+        """Every game matching the filters (after the cursor, if given), in season order."""
+        return [self.games[p] for p in self._matching(filters, self._after(cursor))]
+
+    def query(self, filters: GameFilters, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE) -> GamePage:
+        """
+        Games matching the filters, one page at a time in season order.
+
+        The cursor is the next_cursor of the previous page: the page starts
+        scanning right after it, so each page costs its own games, not the season's.
+        """
+        if not 1 <= limit <= MAX_PAGE_SIZE:
+            raise QueryError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+
+        page = list(islice(self._matching(filters, self._after(cursor)), limit + 1))
+        has_more = len(page) > limit
+        page = page[:limit]
+        return GamePage(
+            games=[self.games[p] for p in page],
+            total=self._total(filters),
+            next_cursor=str(page[-1]) if has_more else None
+        )
@@ -0,0 +1,87 @@
+"""
+In-memory store for generated schedules.
+
+The API keeps the most recent schedules together with their one-pass aggregate
+and run metrics, so statistics and game queries are answered from memory
+without reloading Google Sheets or rerunning the scheduler.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional
+import threading
+import uuid
+
+from app.models import Schedule, Team
+from app.services.aggregates import ScheduleAggregate, aggregate_schedule
+from app.services.schedule_query import GameIndex
+
+# How many generated schedules are kept (oldest are evicted first)
+MAX_STORED_SCHEDULES = 5
+
+
+@dataclass
+class StoredSchedule:
+    """A generated schedule with everything computed for it at generation time."""
+    schedule_id: str
+    schedule: Schedule
+    teams: List[Team]
+    aggregate: ScheduleAggregate
+    metrics: Dict = field(default_factory=dict)
+    validation: Dict = field(default_factory=dict)
+    generated_at: datetime = field(default_factory=datetime.now)
+    _game_index: Optional[GameIndex] = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def game_index(self) -> GameIndex:
+        """Query indexes over the games, built on first use."""
+        if self._game_index is None:
+            self._game_index = GameIndex(self.schedule)
+        return self._game_index
+
+
+class ScheduleStore:
+    """Thread-safe store of the most recent generated schedules."""
+
+    def __init__(self, max_schedules: int = MAX_STORED_SCHEDULES):
+        self.max_schedules = max_schedules
+        self._schedules: "OrderedDict[str, StoredSchedule]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, schedule: Schedule, teams: List[Team], aggregate: Optional[ScheduleAggregate] = None,
+            metrics: Optional[Dict] = None, validation: Optional[Dict] = None) -> StoredSchedule:
+        """Store a generated schedule and return its entry (with a new schedule_id)."""
+        stored = StoredSchedule(
+            schedule_id=uuid.uuid4().hex[:12],
+            schedule=schedule,
+            teams=teams,
+            aggregate=aggregate or aggregate_schedule(schedule, teams),
+            metrics=metrics or {},
+            validation=validation or {}
+        )
+        with self._lock:
+            self._schedules[stored.schedule_id] = stored
+            while len(self._schedules) > self.max_schedules:
+                self._schedules.popitem(last=False)
+        return stored
+
+    def get(self, schedule_id: str) -> Optional[StoredSchedule]:
+        """A stored schedule by id, or None if unknown or evicted."""
+        with self._lock:
+            return self._schedules.get(schedule_id)
+
+    def latest(self) -> Optional[StoredSchedule]:
+        """The most recently generated schedule, or None before the first one."""
+        with self._lock:
+            if not self._schedules:
+                return None
+            return next(reversed(self._schedules.values()))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._schedules.clear()
+
+
+# Shared by the API routes
+schedule_store = ScheduleStore()
@@ -8,6 +8,7 @@ from datetime import datetime, date, time, timedelta
 from typing import List, Dict, Set, Tuple, Optional
 from collections import defaultdict
 import itertools
+import logging
 
 from app.models import (
     Team, Facility, Game, TimeSlot, Division, Schedule,
@@ -24,6 +25,7 @@ from app.core.config import (
     PRIORITY_WEIGHTS
 )
 
+logger = logging.getLogger(__name__)
 
 class ScheduleOptimizer:
     """
@@ -53,17 +55,20 @@ class ScheduleOptimizer:
         for holiday_str in US_HOLIDAYS:
             self.holidays.add(self._parse_date(holiday_str))
         
+        # School blackout dates: {school_name: [dates]}
+        self.school_blackouts = rules.get('blackouts', {})
+        
         # Group teams by division
         self.teams_by_division = self._group_teams_by_division()
         
         # Generate all possible time slots
         self.time_slots = self._generate_time_slots()
         
-        print(f"Scheduler initialized:")
-        print(f"  Season: {self.season_start} to {self.season_end}")
-        print(f"  Teams: {len(self.teams)}")
-        print(f"  Facilities: {len(self.facilities)}")
-        print(f"  Time slots: {len(self.time_slots)}")
+        logger.info(
+            "Scheduler initialized: season %s to %s, %d teams, %d facilities, %d time slots",
+            self.season_start, self.season_end, len(self.teams),
+            len(self.facilities), len(self.time_slots)
+        )
     
     def _parse_date(self, date_input) -> date:
         """Parse a date from string or date object."""
@@ -193,9 +198,7 @@ class ScheduleOptimizer:
         Generate an optimized schedule using constraint programming.
         This is the main entry point for schedule generation.
         """
-        print("\n" + "=" * 60)
-        print("Starting schedule optimization...")
-        print("=" * 60)
+        logger.info("Starting schedule optimization...")
         
         schedule = Schedule(
             season_start=self.season_start,
@@ -211,17 +214,16 @@ class ScheduleOptimizer:
         
         # Schedule each division separately
         for division, division_teams in self.teams_by_division.items():
-            print(f"\nScheduling division: {division.value}")
-            print(f"  Teams: {len(division_teams)}")
+            logger.info("Scheduling division: %s (%d teams)", division.value, len(division_teams))
             
             if len(division_teams) < 2:
-                print(f"  Skipping - not enough teams")
+                logger.info("  Skipping - not enough teams")
                 continue
             
             # For larger divisions (30+ teams), try CP-SAT first for better quality
             # For smaller divisions, use greedy algorithm (faster, still good quality)
             if len(division_teams) >= 30:
-                print(f"  Using CP-SAT solver (large division, 30s timeout)...")
+                logger.info("  Using CP-SAT solver (large division, 30s timeout)...")
                 division_games = self._schedule_division(division, division_teams)
                 # If CP-SAT fails or produces incomplete schedule, use greedy
                 team_counts = defaultdict(int)
@@ -230,20 +232,18 @@ class ScheduleOptimizer:
                     team_counts[game.away_team.id] += 1
                 teams_under_8 = [t for t in division_teams if team_counts[t.id] < 8]
                 if teams_under_8:
-                    print(f"  CP-SAT incomplete ({len(teams_under_8)} teams < 8 games), switching to greedy algorithm...")
+                    logger.info("  CP-SAT incomplete (%d teams < 8 games), switching to greedy algorithm...", len(teams_under_8))
                     division_games = self._greedy_schedule_division(division, division_teams)
             else:
-                print(f"  Using optimized greedy algorithm...")
+                logger.info("  Using optimized greedy algorithm...")
                 division_games = self._greedy_schedule_division(division, division_teams)
             
             for game in division_games:
                 schedule.add_game(game)
             
-            print(f"  Generated {len(division_games)} games")
+            logger.info("  Generated %d games", len(division_games))
         
-        print("\n" + "=" * 60)
-        print(f"Schedule optimization complete: {len(schedule.games)} total games")
-        print("=" * 60)
+        logger.info("Schedule optimization complete: %d total games", len(schedule.games))
         
         return schedule
     
@@ -258,10 +258,101 @@ class ScheduleOptimizer:
         Returns:
             List of scheduled games
         """
+        model, game_vars, usable_slot_indices, pruned = self._build_division_model(division, teams)
+        
+        # Solve the model
+        # Optimal timeout: 30 seconds per division provides good balance
+        # - Too short (<15s): May miss optimal solutions, but fast
+        # - Too long (>60s): Better solutions, but slow for large divisions
+        # - 30s: Good balance for most divisions, finds good solutions
+        solver = cp_model.CpSolver()
+        solver.parameters.max_time_in_seconds = 30.0  # 30 seconds per division - optimal balance
+        solver.parameters.num_search_workers = 4  # Use parallel workers
+        solver.parameters.log_search_progress = False
+        
+        logger.debug("  Solving CP-SAT model (30s timeout)...")
+        status = solver.Solve(model)
+        
+        # The cross-cluster prune can remove matchups some team needed to reach 8 games
+        if status == cp_model.INFEASIBLE and pruned:
+            logger.info("  Infeasible without %d cross-cluster matchups, re-solving with them", pruned)
+            model, game_vars, usable_slot_indices, _ = self._build_division_model(
+                division, teams, prune_cross_cluster=False
+            )
+            status = solver.Solve(model)
+        
+        # Extract solution
+        games = []
+        
+        if status == cp_model.OPTIMAL or status == cp_model.FEASIBLE:
+            logger.info("  Solution found (status: %s)", solver.StatusName(status))
+            
+            game_id = 0
+            for (i, j), matchup_vars in game_vars.items():
+                for idx, var in matchup_vars.items():
+                    if solver.Value(var):
+                        team1 = teams[i]
+                        team2 = teams[j]
+                        actual_slot_idx = usable_slot_indices[idx]
+                        slot = self.time_slots[actual_slot_idx]
+                        
+                        # Determine home/away
+                        # Prefer team1's home facility if available
+                        home_team = team1
+                        away_team = team2
+                        
+                        if team2.home_facility and team2.home_facility == slot.facility.name:
+                            home_team = team2
+                            away_team = team1
+                        
+                        game = Game(
+                            id=f"{division.value}_{game_id}",
+                            home_team=home_team,
+                            away_team=away_team,
+                            time_slot=slot,
+                            division=division
+                        )
+                        
+                        games.append(game)
+                        
+                        # Update global tracking to prevent cross-division conflicts
+                        time_slot_key = (slot.date, slot.start_time)
+                        slot_key = (slot.date, slot.start_time, slot.facility.name, slot.court_number)
+                        
+                        if hasattr(self, 'global_school_time_slots'):
+                            self.global_school_time_slots[home_team.school.name].add(time_slot_key)
+                            self.global_school_time_slots[away_team.school.name].add(time_slot_key)
+                        
+                        if hasattr(self, 'global_used_slots'):
+                            self.global_used_slots.add(slot_key)
+                        
+                        game_id += 1
+        else:
+            logger.warning("  No solution found (status: %s)", solver.StatusName(status))
+            # Fallback to greedy algorithm
+            games = self._greedy_schedule_division(division, teams)
+        
+        return games
+    
+    def _build_division_model(self, division: Division, teams: List[Team],
+                              prune_cross_cluster: bool = True) -> Tuple[cp_model.CpModel, Dict, List[int], int]:
+        """
+        Build the CP-SAT model for one division.
+        
+        Args:
+            division: The division to schedule
+            teams: List of teams in this division
+            prune_cross_cluster: Leave out cross-cluster matchups between teams that
+                each have enough feasible same-cluster opponents
+            
+        Returns:
+            (model, game_vars[(team1_idx, team2_idx)][usable slot idx] = BoolVar,
+             usable slot indices into self.time_slots, number of matchups pruned)
+        """
         model = cp_model.CpModel()
         
-        # Create variables for each possible matchup and time slot
-        # game_vars[team1_idx][team2_idx][slot_idx] = BoolVar
+        # Create variables only for feasible (matchup, slot) pairs
+        # game_vars[(team1_idx, team2_idx)][slot_idx] = BoolVar
         game_vars = {}
         matchup_scores = {}
         
@@ -270,10 +361,17 @@ class ScheduleOptimizer:
         # Filter time slots to exclude:
         # 1. Facility/court slots already used by other divisions
         # 2. Time slots where schools from this division are already playing
+        # 3. Facilities that are unavailable or have the wrong rim height for this division
         usable_slot_indices = []
         schools_in_division = set(team.school.name for team in teams)
         
         for slot_idx, slot in enumerate(self.time_slots):
+            # K-1 REC needs 8ft rims, and 8ft rim courts are only for K-1 REC
+            if (division == Division.ES_K1_REC) != bool(slot.facility.has_8ft_rims):
+                continue
+            if not slot.facility.is_available(slot.date):
+                continue
+            
             # Check if this specific facility/court slot is already used
             slot_key = (slot.date, slot.start_time, slot.facility.name, slot.court_number)
             if hasattr(self, 'global_used_slots') and slot_key in self.global_used_slots:
@@ -294,7 +392,7 @@ class ScheduleOptimizer:
         num_slots = len(usable_slot_indices)
         
         # Generate all possible matchups
-        matchups = []
+        eligible_pairs = []
         for i in range(num_teams):
             for j in range(i + 1, num_teams):
                 team1, team2 = teams[i], teams[j]
@@ -307,154 +405,99 @@ class ScheduleOptimizer:
                 if team2.id in team1.do_not_play or team1.id in team2.do_not_play:
                     continue
                 
-                matchups.append((i, j))
-                matchup_scores[(i, j)] = self._calculate_matchup_score(team1, team2)
+                eligible_pairs.append((i, j))
+        
+        # Cluster compatibility: cross-cluster games only for teams without
+        # enough same-cluster opponents to reach 8 games. Only opponents that can
+        # actually meet count: a pair blacked out on every usable date has no variables.
+        target_games_per_team = 8  # All teams must play exactly 8 games
+        usable_dates = {self.time_slots[slot_idx].date for slot_idx in usable_slot_indices}
+        pair_blackouts = {}
+        same_cluster_opponents = defaultdict(int)
+        for (i, j) in eligible_pairs:
+            pair_blackouts[(i, j)] = set(self.school_blackouts.get(teams[i].school.name, ())) | \
+                set(self.school_blackouts.get(teams[j].school.name, ()))
+            if teams[i].cluster and teams[i].cluster == teams[j].cluster and usable_dates - pair_blackouts[(i, j)]:
+                same_cluster_opponents[i] += 1
+                same_cluster_opponents[j] += 1
+        
+        matchups = []
+        pruned = 0
+        for (i, j) in eligible_pairs:
+            team1, team2 = teams[i], teams[j]
+            if prune_cross_cluster and team1.cluster and team2.cluster and team1.cluster != team2.cluster:
+                if (same_cluster_opponents[i] >= target_games_per_team and
+                        same_cluster_opponents[j] >= target_games_per_team):
+                    pruned += 1
+                    continue
+            matchups.append((i, j))
+            matchup_scores[(i, j)] = self._calculate_matchup_score(team1, team2)
+        
+        # Team-incidence lists, built once while creating variables
+        team_vars = defaultdict(list)  # team_idx -> all game vars
+        team_time_vars = defaultdict(list)  # (team_idx, date, start_time) -> game vars
+        team_week_vars = defaultdict(list)  # (team_idx, week) -> game vars
+        slot_vars = defaultdict(list)  # slot idx -> game vars
         
-        # Create decision variables
-        # For each matchup, for each usable slot, create a variable indicating if game is scheduled
         for (i, j) in matchups:
             game_vars[(i, j)] = {}
+            blackout_dates = pair_blackouts[(i, j)]
             for idx, slot_idx in enumerate(usable_slot_indices):
-                var_name = f'game_t{i}_t{j}_s{idx}'
-                game_vars[(i, j)][idx] = model.NewBoolVar(var_name)
+                slot = self.time_slots[slot_idx]
+                if slot.date in blackout_dates:
+                    continue
+                var = model.NewBoolVar(f'game_t{i}_t{j}_s{idx}')
+                game_vars[(i, j)][idx] = var
+                
+                week_num = (slot.date - self.season_start).days // 7
+                slot_vars[idx].append(var)
+                for team_idx in (i, j):
+                    team_vars[team_idx].append(var)
+                    team_time_vars[(team_idx, slot.date, slot.start_time)].append(var)
+                    team_week_vars[(team_idx, week_num)].append(var)
+        
+        num_vars = sum(len(v) for v in game_vars.values())
+        logger.debug(
+            "  Created %d variables for %d matchups x %d usable slots", num_vars, len(matchups), num_slots
+        )
         
         # CONSTRAINT 1: Each team plays exactly 8 games (rule requirement)
-        target_games_per_team = 8  # All teams must play exactly 8 games
-        
         for team_idx in range(num_teams):
-            team_games = []
-            for (i, j) in matchups:
-                if i == team_idx or j == team_idx:
-                    for idx in range(num_slots):
-                        if idx in game_vars[(i, j)]:
-                            team_games.append(game_vars[(i, j)][idx])
-            
             # Each team must play exactly 8 games
-            if team_games:
-                model.Add(sum(team_games) == target_games_per_team)
+            if team_vars[team_idx]:
+                model.Add(sum(team_vars[team_idx]) == target_games_per_team)
         
         # CONSTRAINT 2: Each matchup happens at most once
         for (i, j) in matchups:
-            model.Add(sum(game_vars[(i, j)][idx] for idx in range(num_slots) if idx in game_vars[(i, j)]) <= 1)
-        
-        # CONSTRAINT 3: No team plays multiple games at the same time
-        for idx in range(num_slots):
-            for team_idx in range(num_teams):
-                games_at_slot = []
-                for (i, j) in matchups:
-                    if (i == team_idx or j == team_idx) and idx in game_vars[(i, j)]:
-                        games_at_slot.append(game_vars[(i, j)][idx])
-                
-                if games_at_slot:
-                    model.Add(sum(games_at_slot) <= 1)
+            if game_vars[(i, j)]:
+                model.Add(sum(game_vars[(i, j)].values()) <= 1)
+        
+        # CONSTRAINT 3: No team plays multiple games at the same time (on any court)
+        for games_at_time in team_time_vars.values():
+            if len(games_at_time) > 1:
+                model.Add(sum(games_at_time) <= 1)
         
         # CONSTRAINT 4: Respect max games per 7 days
-        for team_idx in range(num_teams):
-            # Group usable slots by week
-            slots_by_week = defaultdict(list)
-            for idx, slot_idx in enumerate(usable_slot_indices):
-                slot = self.time_slots[slot_idx]
-                week_num = (slot.date - self.season_start).days // 7
-                slots_by_week[week_num].append(idx)
-            
-            for week_slot_indices in slots_by_week.values():
-                games_in_week = []
-                for (i, j) in matchups:
-                    if i == team_idx or j == team_idx:
-                        for idx in week_slot_indices:
-                            if idx in game_vars[(i, j)]:
-                                games_in_week.append(game_vars[(i, j)][idx])
-                
-                if games_in_week:
-                    model.Add(sum(games_in_week) <= MAX_GAMES_PER_7_DAYS)
+        for games_in_week in team_week_vars.values():
+            if len(games_in_week) > MAX_GAMES_PER_7_DAYS:
+                model.Add(sum(games_in_week) <= MAX_GAMES_PER_7_DAYS)
         
         # CONSTRAINT 5: Only one game per time slot per facility/court
-        for idx in range(num_slots):
-            games_at_slot = []
-            for (i, j) in matchups:
-                if idx in game_vars[(i, j)]:
-                    games_at_slot.append(game_vars[(i, j)][idx])
-            
-            if games_at_slot:
-                # Allow multiple games at same time if different courts
+        for games_at_slot in slot_vars.values():
+            if len(games_at_slot) > 1:
                 model.Add(sum(games_at_slot) <= 1)
         
         # OBJECTIVE: Maximize matchup quality scores
         objective_terms = []
         for (i, j) in matchups:
             score = matchup_scores[(i, j)]
-            for idx in range(num_slots):
-                if idx in game_vars[(i, j)]:
-                    objective_terms.append(game_vars[(i, j)][idx] * score)
+            for var in game_vars[(i, j)].values():
+                objective_terms.append(var * score)
         
         if objective_terms:
             model.Maximize(sum(objective_terms))
         
-        # Solve the model
-        # Optimal timeout: 30 seconds per division provides good balance
-        # - Too short (<15s): May miss optimal solutions, but fast
-        # - Too long (>60s): Better solutions, but slow for large divisions
-        # - 30s: Good balance for most divisions, finds good solutions
-        solver = cp_model.CpSolver()
-        solver.parameters.max_time_in_seconds = 30.0  # 30 seconds per division - optimal balance
-        solver.parameters.num_search_workers = 4  # Use parallel workers
-        solver.parameters.log_search_progress = False
-        
-        print(f"  Solving CP-SAT model (30s timeout)...")
-        status = solver.Solve(model)
-        
-        # Extract solution
-        games = []
-        
-        if status == cp_model.OPTIMAL or status == cp_model.FEASIBLE:
-            print(f"  Solution found (status: {solver.StatusName(status)})")
-            
-            game_id = 0
-            for (i, j) in matchups:
-                for idx in range(num_slots):
-                    if idx in game_vars[(i, j)] and solver.Value(game_vars[(i, j)][idx]):
-                        team1 = teams[i]
-                        team2 = teams[j]
-                        actual_slot_idx = usable_slot_indices[idx]
-                        slot = self.time_slots[actual_slot_idx]
-                        
-                        # Determine home/away
-                        # Prefer team1's home facility if available
-                        home_team = team1
-                        away_team = team2
-                        
-                        if team2.home_facility and team2.home_facility == slot.facility.name:
-                            home_team = team2
-                            away_team = team1
-                        
-                        game = Game(
-                            id=f"{division.value}_{game_id}",
-                            home_team=home_team,
-                            away_team=away_team,
-                            time_slot=slot,
-                            division=division
-                        )
-                        
-                        games.append(game)
-                        
-                        # Update global tracking to prevent cross-division conflicts
-                        time_slot_key = (slot.date, slot.start_time)
-                        slot_key = (slot.date, slot.start_time, slot.facility.name, slot.court_number)
-                        
-                        if hasattr(self, 'global_school_time_slots'):
-                            self.global_school_time_slots[home_team.school.name].add(time_slot_key)
-                            self.global_school_time_slots[away_team.school.name].add(time_slot_key)
-                        
-                        if hasattr(self, 'global_used_slots'):
-                            self.global_used_slots.add(slot_key)
-                        
-                        game_id += 1
-        else:
-            print(f"  No solution found (status: {solver.StatusName(status)})")
-            # Fallback to greedy algorithm
-            games = self._greedy_schedule_division(division, teams)
-        
-        return games
+        return model, game_vars, usable_slot_indices, pruned
     
     def _greedy_schedule_division(self, division: Division, teams: List[Team]) -> List[Game]:
         """
@@ -513,7 +556,7 @@ class ScheduleOptimizer:
         # Sort slots by date and time for better scheduling
         usable_slots.sort(key=lambda s: (s.date, s.start_time))
         
-        print(f"  Using {len(usable_slots)} filtered slots (from {len(self.time_slots)} total)")
+        logger.debug("  Using %d filtered slots (from %d total)", len(usable_slots), len(self.time_slots))
         
         # Generate all possible matchups sorted by preference
         matchups = []
@@ -637,7 +680,7 @@ class ScheduleOptimizer:
         ]
         
         if teams_needing_games:
-            print(f"  Second pass: {len(teams_needing_games)} teams need more games")
+            logger.info("  Second pass: %d teams need more games", len(teams_needing_games))
             
             # Sort teams by number of games (fewest first) - prioritize teams most behind
             teams_needing_games.sort(key=lambda t: team_games_count[t.id])
@@ -838,22 +881,24 @@ class ScheduleOptimizer:
                 if not progress_made:
                     # No progress made in this pass, try more aggressive approach
                     if pass_num < max_passes - 1:
-                        print(f"  Pass {pass_num + 1} complete, {len(teams_needing_games)} teams still need games")
+                        logger.info("  Pass %d complete, %d teams still need games", pass_num + 1, len(teams_needing_games))
         
         # Report final game counts and attempt final desperate fill if needed
         teams_under_8 = [t for t in teams if team_games_count[t.id] < target_games]
         if teams_under_8:
-            print(f"  WARNING: {len(teams_under_8)} teams still have < 8 games:")
+            logger.warning("  %d teams still have < 8 games", len(teams_under_8))
             for team in teams_under_8[:15]:  # Show first 15
-                print(f"    {team.id}: {team_games_count[team.id]} games")
+                logger.debug("    %s: %d games", team.id, team_games_count[team.id])
             
             # Calculate how many games are needed
             total_needed = sum(target_games - team_games_count[t.id] for t in teams_under_8)
-            print(f"  Total games needed: {total_needed}")
-            print(f"  Available slots remaining: {len(usable_slots) - len(used_slots)}")
+            logger.info(
+                "  Total games needed: %d, available slots remaining: %d",
+                total_needed, len(usable_slots) - len(used_slots)
+            )
             
             # Final desperate attempt: allow any matchup if teams are very far behind
-            print(f"  Attempting final desperate fill pass...")
+            logger.info("  Attempting final desperate fill pass...")
             for team in teams_under_8:
                 needed = target_games - team_games_count[team.id]
                 if needed <= 0:
@@ -918,14 +963,16 @@ class ScheduleOptimizer:
                     if team_games_count[team.id] >= target_games:
                         break
         else:
-            print(f"  SUCCESS: All {len(teams)} teams have exactly 8 games!")
+            logger.info("  SUCCESS: All %d teams have exactly 8 games!", len(teams))
         
         # Final verification
         final_teams_under_8 = [t for t in teams if team_games_count[t.id] < target_games]
         if final_teams_under_8:
-            print(f"  Final status: {len(final_teams_under_8)} teams still < 8 games")
-            print(f"  This indicates insufficient time slots or constraint conflicts")
+            logger.warning(
+                "  Final status: %d teams still < 8 games "
+                "(insufficient time slots or constraint conflicts)", len(final_teams_under_8)
+            )
         else:
-            print(f"  All teams have exactly 8 games - RULE SATISFIED")
+            logger.info("  All teams have exactly 8 games - RULE SATISFIED")
         
         return games
@@ -15,10 +15,13 @@ KEY CHANGES FROM ORIGINAL:
 """
 
 from datetime import datetime, date, time, timedelta
-from typing import List, Dict, Set, Tuple, Optional
-from collections import defaultdict
+from typing import Iterator, List, Dict, Set, Tuple, Optional
+from collections import defaultdict, Counter
 from dataclasses import dataclass
+import heapq
 import itertools
+import logging
+import re
 
 from app.models import (
     Team, Facility, Game, TimeSlot, Division, Schedule, School
@@ -33,6 +36,22 @@ from app.core.config import (
     NO_GAMES_ON_SUNDAY, REC_DIVISIONS, ES_K1_REC_PRIORITY_SITES,
     PRIORITY_WEIGHTS
 )
+from app.core.profiling import SchedulerProfiler
+
+logger = logging.getLogger(__name__)
+
+# Rematch-pass relaxation that can resolve each _find_time_block_for_matchup rejection reason.
+# Reasons not listed are hard constraints no later pass relaxes.
+REMATCH_RELAXATION_FOR_REJECTION = {
+    'saturday_rest': 'relax_saturday_rest',
+    'weeknight_3game': 'relax_weeknight_3game',
+    'team_frequency': 'allow_partial_matchups',  # Includes teams that already have 8 games
+}
+
+# Rejection reasons that later games can lift (a court gaining games, a school gaining a
+# weeknight). Every other reason only gets stricter as games are added, so a matchup that
+# failed on those alone fails again until the relaxation level changes.
+STATE_DEPENDENT_REJECTIONS = {'weeknight_3game', 'school_weeknight', 'school_opponent_mismatch', 'one_facility_per_day'}
 
 
 @dataclass
@@ -94,6 +113,169 @@ class TimeBlock:
         return slots
 
 
+# Compact time block address: (date, facility index, court number, start slot index)
+BlockKey = Tuple[date, int, int, int]
+
+
+def _slot_end(start_time: time) -> time:
+    """End time of a game starting at start_time."""
+    return (datetime.combine(date.min, start_time) + timedelta(minutes=GAME_DURATION_MINUTES)).time()
+
+
+def _day_start_times(day_start: time, day_end: time) -> Tuple[time, ...]:
+    """Game start times that fit between day_start and day_end."""
+    start_times = []
+    current_time = day_start
+    while current_time < day_end:
+        end_time = _slot_end(current_time)
+        if end_time <= day_end:
+            start_times.append(current_time)
+        current_time = end_time
+    return tuple(start_times)
+
+
+class TimeBlockIndex:
+    """
+    The season's time blocks, materialized lazily one (date, facility) at a time.
+
+    A block is addressed by a BlockKey; TimeBlock objects are only built for the days
+    and facilities a pass actually reads, then cached. Iterating yields every block in
+    generation order (date, facility, court, start time), and len() is computed
+    without materializing anything.
+
+    Start indexes refer to the league's slot grid for the day (weeknight or Saturday
+    window). A facility with hours from the FACILITIES sheet only gets blocks for grid
+    slots that fall inside one of its windows that day.
+    """
+
+    def __init__(self, facilities: List[Facility], game_dates: List[date]):
+        self.facilities = facilities
+        self.dates = game_dates  # Valid game days, in order
+        self._start_times = {}  # {is_saturday: start times}
+        self._slot_runs = {}  # {(is_saturday, windows): consecutive bookable slots from each start}
+        self._open_facilities = {}  # {date: facility indexes with bookable courts that day}
+        self._blocks = {}  # {(date, facility_index): {(court, start_index): TimeBlock}}
+        self._facility_block_counts = {}  # {facility_index: blocks over the season}
+
+    def start_times(self, game_date: date) -> Tuple[time, ...]:
+        """Start times of the game slots on this day (weeknight or Saturday window)."""
+        day_of_week = game_date.weekday()
+        if day_of_week > 5:
+            return ()
+        is_saturday = day_of_week == 5
+        start_times = self._start_times.get(is_saturday)
+        if start_times is None:
+            if is_saturday:
+                start_times = _day_start_times(SATURDAY_START_TIME, SATURDAY_END_TIME)
+            else:
+                start_times = _day_start_times(WEEKNIGHT_START_TIME, WEEKNIGHT_END_TIME)
+            self._start_times[is_saturday] = start_times
+        return start_times
+
+    def slot_runs(self, game_date: date, facility_index: int) -> Tuple[int, ...]:
+        """
+        For each start index of the day, how many back-to-back slots a court at this
+        facility can host from there (0 when the slot is outside the facility's hours).
+        """
+        windows = self.facilities[facility_index].time_windows_on(game_date)
+        cache_key = (game_date.weekday() == 5, windows)
+        runs = self._slot_runs.get(cache_key)
+        if runs is None:
+            start_times = self.start_times(game_date)
+            bookable = [
+                not windows or any(
+                    window_start <= start_time and _slot_end(start_time) <= window_end
+                    for window_start, window_end in windows
+                )
+                for start_time in start_times
+            ]
+            run_lengths = [0] * (len(start_times) + 1)
+            for start_index in range(len(start_times) - 1, -1, -1):
+                if bookable[start_index]:
+                    run_lengths[start_index] = run_lengths[start_index + 1] + 1
+            runs = tuple(run_lengths[:-1])
+            self._slot_runs[cache_key] = runs
+        return runs
+
+    def open_facilities(self, game_date: date) -> Tuple[int, ...]:
+        """Indexes of facilities with courts that can host a game on this date."""
+        open_facilities = self._open_facilities.get(game_date)
+        if open_facilities is None:
+            open_facilities = tuple(
+                index for index, facility in enumerate(self.facilities)
+                if facility.max_courts > 0 and facility.is_available(game_date)
+                and any(self.slot_runs(game_date, index))
+            )
+            self._open_facilities[game_date] = open_facilities
+        return open_facilities
+
+    def _starts_per_court(self, game_date: date, facility_index: int) -> int:
+        return sum(1 for run in self.slot_runs(game_date, facility_index) if run)
+
+    def facility_block_count(self, facility_index: int) -> int:
+        """Number of blocks one facility has over the season."""
+        count = self._facility_block_counts.get(facility_index)
+        if count is None:
+            count = sum(
+                self._starts_per_court(game_date, facility_index) * self.facilities[facility_index].max_courts
+                for game_date in self.dates if facility_index in self.open_facilities(game_date)
+            )
+            self._facility_block_counts[facility_index] = count
+        return count
+
+    def _blocks_by_key(self, game_date: date, facility_index: int) -> Dict[Tuple[int, int], TimeBlock]:
+        """{(court, start_index): TimeBlock} for one facility on one date (cached)."""
+        cache_key = (game_date, facility_index)
+        blocks = self._blocks.get(cache_key)
+        if blocks is None:
+            facility = self.facilities[facility_index]
+            start_times = self.start_times(game_date)
+            runs = self.slot_runs(game_date, facility_index)
+            blocks = {
+                (court_number, start_index): TimeBlock(
+                    facility=facility,
+                    date=game_date,
+                    start_time=start_times[start_index],
+                    num_consecutive_slots=runs[start_index],
+                    court_number=court_number
+                )
+                for court_number in range(1, facility.max_courts + 1)
+                for start_index in range(len(start_times)) if runs[start_index]
+            }
+            self._blocks[cache_key] = blocks
+        return blocks
+
+    def blocks_for(self, game_date: date, facility_index: int) -> List[TimeBlock]:
+        """All blocks at one facility on one date, ordered by court then start time."""
+        return list(self._blocks_by_key(game_date, facility_index).values())
+
+    def blocks_on(self, game_date: date) -> Iterator[TimeBlock]:
+        """All blocks on one date, in generation order."""
+        for facility_index in self.open_facilities(game_date):
+            yield from self.blocks_for(game_date, facility_index)
+
+    def block(self, key: BlockKey) -> TimeBlock:
+        """The TimeBlock for a compact key."""
+        game_date, facility_index, court_number, start_index = key
+        return self._blocks_by_key(game_date, facility_index)[(court_number, start_index)]
+
+    @property
+    def materialized(self) -> int:
+        """How many TimeBlock objects have been built so far."""
+        return sum(len(blocks) for blocks in self._blocks.values())
+
+    def __iter__(self) -> Iterator[TimeBlock]:
+        for game_date in self.dates:
+            yield from self.blocks_on(game_date)
+
+    def __len__(self) -> int:
+        return sum(
+            self._starts_per_court(game_date, index) * self.facilities[index].max_courts
+            for game_date in self.dates
+            for index in self.open_facilities(game_date)
+        )
+
+
 class SchoolBasedScheduler:
     """
     Redesigned scheduler that groups games by school matchups.
@@ -106,11 +288,20 @@ class SchoolBasedScheduler:
     5. Cluster coaches within each matchup for back-to-back games
     """
     
-    def __init__(self, teams: List[Team], facilities: List[Facility], rules: Dict):
+    def __init__(self, teams: List[Team], facilities: List[Facility], rules: Dict,
+                 profile: bool = False):
         self.teams = teams
         self.facilities = facilities
         self.rules = rules
         
+        # Optional instrumentation (phase timings + block rejection reasons)
+        self.profiler = SchedulerProfiler(enabled=profile)
+        
+        # Memoized _facility_belongs_to_school results: {(facility_name, school_name): bool}
+        self._facility_owner_cache = {}
+        # Memoized _facility_owners results: {facility_name: frozenset of school names}
+        self._facility_owners_cache = {}
+        
         # Parse season dates
         self.season_start = self._parse_date(rules.get('season_start', SEASON_START_DATE))
         self.season_end = self._parse_date(rules.get('season_end', SEASON_END_DATE))
@@ -124,18 +315,21 @@ class SchoolBasedScheduler:
         self.school_blackouts = rules.get('blackouts', {})
         if self.school_blackouts:
             total_blackout_days = sum(len(dates) for dates in self.school_blackouts.values())
-            print(f"Loaded {total_blackout_days} blackout dates for {len(self.school_blackouts)} schools")
+            logger.info("Loaded %d blackout dates for %d schools", total_blackout_days, len(self.school_blackouts))
         
         # Group teams by school and division
         self.teams_by_school = self._group_teams_by_school()
         self.teams_by_division = self._group_teams_by_division()
         self.schools = list(self.teams_by_school.keys())
         
-        # Generate time blocks (not individual slots)
-        self.time_blocks = self._generate_time_blocks()
+        # Index time blocks (not individual slots); blocks are built lazily per date/facility
+        with self.profiler.phase("block_generation"):
+            self.time_blocks = self._generate_time_blocks()
+        self.profiler.count("time_blocks", len(self.time_blocks))
         
         # Track usage
         self.used_courts = set()  # (date, start_time, facility_name, court_number) - track individual courts
+        self.court_game_count = defaultdict(int)  # {(date, facility_name, court_number): games on that court}
         self.team_game_count = defaultdict(int)
         self.team_game_dates = defaultdict(list)  # Track dates for each team
         self.school_matchup_count = defaultdict(int)  # Track how many times schools play
@@ -148,6 +342,7 @@ class SchoolBasedScheduler:
         # Key: (date, facility_name, court_number, school_name) -> opponent_school_name
         # This ensures ALL games for a school on a court/night are against the SAME opponent
         self.school_opponents_on_court = {}  # {(date, facility, court, school): opponent_school}
+        self.court_schools = defaultdict(set)  # {(date, facility, court): schools playing on it}
         
         # CRITICAL: Track which facility each school plays at on each date
         # A school should only play at ONE facility per day
@@ -163,12 +358,25 @@ class SchoolBasedScheduler:
         # Client: "If we have a site for 8-10 hours we should have more than 3-4 games there"
         self.facility_date_games = defaultdict(int)  # {(facility_name, date): game_count}
         
-        print(f"\nSchool-Based Scheduler initialized:")
-        print(f"  Season: {self.season_start} to {self.season_end}")
-        print(f"  Teams: {len(self.teams)}")
-        print(f"  Schools: {len(self.schools)}")
-        print(f"  Facilities: {len(self.facilities)}")
-        print(f"  Time blocks: {len(self.time_blocks)}")
+        # Rejection reasons from the most recent _find_time_block_for_matchup call
+        self.last_rejections = Counter()
+        
+        # Memoized _find_time_block_for_matchup failures, invalidated by _commit_game:
+        # {(schools, games, relaxation flags): rejection Counter}
+        # {('court', date, facility, court) | ('weeknights', school): {memo keys to drop}}
+        self._block_failure_memo = {}
+        self._block_failure_watchers = defaultdict(set)
+        
+        # Relaxation passes used by the last optimize_schedule() run (reported in run metrics)
+        self.rematch_passes_used = 0
+        self.saturday_fill_passes_used = 0
+        
+        logger.info(
+            "School-Based Scheduler initialized: season %s to %s, %d teams, %d schools, "
+            "%d facilities, %d time blocks",
+            self.season_start, self.season_end, len(self.teams), len(self.schools),
+            len(self.facilities), len(self.time_blocks)
+        )
         
         # CRITICAL: Check data quality
         self._check_cluster_coverage()
@@ -184,43 +392,30 @@ class SchoolBasedScheduler:
         
         coverage_pct = len(teams_with_cluster) / len(self.teams) * 100 if self.teams else 0
         
-        print(f"\n{'='*80}")
-        print("CLUSTER COVERAGE CHECK")
-        print(f"{'='*80}")
-        print(f"Teams with cluster: {len(teams_with_cluster)} ({coverage_pct:.1f}%)")
-        print(f"Teams without cluster: {len(teams_without_cluster)}")
+        logger.info(
+            "Cluster coverage: %d teams with cluster (%.1f%%), %d without",
+            len(teams_with_cluster), coverage_pct, len(teams_without_cluster)
+        )
         
         if coverage_pct < 90:
-            print(f"\n[WARNING] Only {coverage_pct:.1f}% of teams have cluster assignments!")
-            print("[WARNING] Geographic clustering will be severely limited!")
-            print("[CRITICAL] Cross-town travel will occur frequently!")
-            print("\n[ACTION REQUIRED] Please assign clusters in Google Sheet:")
-            print("  Tab: 'TIERS, CLUSTERS, RIVALS, DO NOT PLAY'")
-            print("  Column: Cluster (e.g., Henderson, North Las Vegas, etc.)")
-            
             schools_without = sorted(set(t.school.name for t in teams_without_cluster))
-            print(f"\nSchools missing clusters ({len(schools_without)}):")
-            for i, school in enumerate(schools_without[:25], 1):
-                print(f"  {i}. {school}")
-            if len(schools_without) > 25:
-                print(f"  ... and {len(schools_without) - 25} more")
-            
-            print(f"\n{'='*80}")
-            print("RECOMMENDATION: Assign clusters to ALL schools before scheduling")
-            print(f"{'='*80}\n")
-        else:
-            print(f"\n[OK] Good cluster coverage ({coverage_pct:.1f}%)")
-            print(f"{'='*80}\n")
+            logger.warning(
+                "Only %.1f%% of teams have cluster assignments - geographic clustering will be "
+                "severely limited and cross-town travel will occur frequently. Assign clusters in "
+                "tab 'TIERS, CLUSTERS, RIVALS, DO NOT PLAY' (column: Cluster).",
+                coverage_pct
+            )
+            logger.warning(
+                "Schools missing clusters (%d): %s%s",
+                len(schools_without), ", ".join(schools_without[:25]),
+                f" ... and {len(schools_without) - 25} more" if len(schools_without) > 25 else ""
+            )
     
     def _report_data_quality(self):
         """
         Report comprehensive data quality issues.
         Helps identify missing or problematic data before scheduling.
         """
-        print(f"\n{'='*80}")
-        print("DATA QUALITY REPORT")
-        print(f"{'='*80}")
-        
         # Get unique schools
         unique_schools = {}
         for team in self.teams:
@@ -233,25 +428,24 @@ class SchoolBasedScheduler:
         
         tier_coverage = len(schools_with_tier) / len(unique_schools) * 100 if unique_schools else 0
         
-        print(f"\n[TIER DATA]")
-        print(f"  Schools with tier: {len(schools_with_tier)} ({tier_coverage:.1f}%)")
-        print(f"  Schools without tier: {len(schools_without_tier)}")
-        
+        logger.info(
+            "Tier data: %d schools with tier (%.1f%%), %d without",
+            len(schools_with_tier), tier_coverage, len(schools_without_tier)
+        )
         if schools_without_tier:
-            print(f"\n  Schools missing tier data:")
-            for school in sorted(schools_without_tier)[:10]:
-                print(f"    - {school}")
-            if len(schools_without_tier) > 10:
-                print(f"    ... and {len(schools_without_tier) - 10} more")
+            missing = sorted(schools_without_tier)
+            logger.info(
+                "Schools missing tier data: %s%s", ", ".join(missing[:10]),
+                f" ... and {len(missing) - 10} more" if len(missing) > 10 else ""
+            )
         
         # Check blackout coverage
-        if hasattr(self, 'school_blackouts'):
-            schools_with_blackouts = len(self.school_blackouts)
-            print(f"\n[BLACKOUT DATA]")
-            print(f"  Schools with blackouts: {schools_with_blackouts}")
-            if schools_with_blackouts > 0:
-                total_blackout_days = sum(len(dates) for dates in self.school_blackouts.values())
-                print(f"  Total blackout dates: {total_blackout_days}")
+        if hasattr(self, 'school_blackouts') and self.school_blackouts:
+            total_blackout_days = sum(len(dates) for dates in self.school_blackouts.values())
+            logger.info(
+                "Blackout data: %d schools with blackouts, %d total blackout dates",
+                len(self.school_blackouts), total_blackout_days
+            )
         
         # Check team distribution
         teams_per_school = defaultdict(int)
@@ -261,30 +455,25 @@ class SchoolBasedScheduler:
         small_schools = [(name, count) for name, count in teams_per_school.items() if count <= 2]
         large_schools = [(name, count) for name, count in teams_per_school.items() if count >= 6]
         
-        print(f"\n[TEAM DISTRIBUTION]")
-        print(f"  Schools with 1-2 teams: {len(small_schools)}")
-        print(f"  Schools with 6+ teams: {len(large_schools)}")
-        
-        if small_schools:
-            print(f"\n  Small schools (may have scheduling challenges):")
-            for school, count in sorted(small_schools)[:5]:
-                print(f"    - {school}: {count} team(s)")
+        logger.info(
+            "Team distribution: %d schools with 1-2 teams, %d schools with 6+ teams",
+            len(small_schools), len(large_schools)
+        )
+        for school, count in sorted(small_schools)[:5]:
+            logger.debug("  Small school (may have scheduling challenges): %s: %d team(s)", school, count)
         
         # Check K-1 facilities
         k1_facilities = [f for f in self.facilities if f.has_8ft_rims]
-        print(f"\n[K-1 FACILITIES]")
-        print(f"  Facilities with 8ft rims: {len(k1_facilities)}")
-        for facility in k1_facilities:
-            print(f"    - {facility.name}")
-        
-        print(f"\n{'='*80}")
-        print("DATA QUALITY CHECK COMPLETE")
-        print(f"{'='*80}\n")
-        
-        # DIAGNOSTIC: Show facility availability for first week
-        print(f"\n{'='*80}")
-        print("FIRST WEEK FACILITY AVAILABILITY (Jan 5-11, 2026)")
-        print(f"{'='*80}")
+        logger.info(
+            "K-1 facilities with 8ft rims (%d): %s",
+            len(k1_facilities), ", ".join(f.name for f in k1_facilities)
+        )
+        
+        # DIAGNOSTIC: Show facility availability for first week (debug only - walks every date)
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
+        
+        logger.debug("First week facility availability (%s onward):", self.season_start)
         first_week_dates = [self.season_start + timedelta(days=i) for i in range(7)]
         
         # Check key facilities
@@ -292,29 +481,29 @@ class SchoolBasedScheduler:
         
         if key_facilities:
             for facility in key_facilities:
-                print(f"\n{facility.name}:")
-                print(f"  Max courts: {facility.max_courts}")
-                print(f"  Has available_dates list: {len(facility.available_dates) > 0} ({len(facility.available_dates)} dates)")
-                print(f"  Has unavailable_dates list: {len(facility.unavailable_dates) > 0} ({len(facility.unavailable_dates)} dates)")
+                logger.debug(
+                    "%s: max courts %d, %d available dates, %d unavailable dates",
+                    facility.name, facility.max_courts,
+                    len(facility.available_dates), len(facility.unavailable_dates)
+                )
                 
                 for check_date in first_week_dates:
-                    day_name = check_date.strftime("%A, %b %d")
                     is_avail = facility.is_available(check_date)
-                    status = "✅" if is_avail else "❌"
-                    print(f"    {status} {day_name}")
-                    
+                    detail = ""
                     if not is_avail:
                         if facility.unavailable_dates and check_date in facility.unavailable_dates:
-                            print(f"       → Explicitly unavailable")
+                            detail = " (explicitly unavailable)"
                         elif facility.available_dates and check_date not in facility.available_dates:
-                            print(f"       → Not in available_dates list")
+                            detail = " (not in available_dates list)"
+                    logger.debug(
+                        "    %s %s%s", "available" if is_avail else "unavailable",
+                        check_date.strftime("%A, %b %d"), detail
+                    )
         else:
-            print("  No Faith or LVBC facilities found")
-            print(f"  Total facilities loaded: {len(self.facilities)}")
-            if len(self.facilities) > 0:
-                print(f"  First 5 facilities: {[f.name for f in self.facilities[:5]]}")
-        
-        print(f"{'='*80}\n")
+            logger.debug(
+                "No Faith or LVBC facilities found (%d facilities loaded, first 5: %s)",
+                len(self.facilities), [f.name for f in self.facilities[:5]]
+            )
     
     def _parse_date(self, date_input) -> date:
         """Parse a date from string or date object."""
@@ -348,80 +537,24 @@ class SchoolBasedScheduler:
             return False
         return True
     
-    def _generate_time_blocks(self) -> List[TimeBlock]:
+    def _generate_time_blocks(self) -> TimeBlockIndex:
         """
-        Generate time blocks with CONSECUTIVE slots on SAME court for back-to-back games.
+        Index time blocks with CONSECUTIVE slots on SAME court for back-to-back games.
         
         CRITICAL: Each block represents consecutive time slots on ONE specific court.
         This allows school matchups to play back-to-back on the same court.
+        
+        Only the valid game dates are listed here; blocks are built per date and
+        facility the first time a pass reads them (see TimeBlockIndex).
         """
-        blocks = []
+        game_dates = []
         current_date = self.season_start
-        
         while current_date <= self.season_end:
-            if not self._is_valid_game_date(current_date):
-                current_date += timedelta(days=1)
-                continue
-            
-            day_of_week = current_date.weekday()
-            
-            # Determine available time slots for this day
-            if day_of_week < 5:  # Weeknight (Monday-Friday)
-                time_slots = []
-                current_time = WEEKNIGHT_START_TIME
-                while current_time < WEEKNIGHT_END_TIME:
-                    end_time = (datetime.combine(date.min, current_time) + timedelta(minutes=GAME_DURATION_MINUTES)).time()
-                    if end_time <= WEEKNIGHT_END_TIME:
-                        time_slots.append(current_time)
-                    current_time = end_time
-            elif day_of_week == 5:  # Saturday
-                time_slots = []
-                current_time = SATURDAY_START_TIME
-                while current_time < SATURDAY_END_TIME:
-                    end_time = (datetime.combine(date.min, current_time) + timedelta(minutes=GAME_DURATION_MINUTES)).time()
-                    if end_time <= SATURDAY_END_TIME:
-                        time_slots.append(current_time)
-                    current_time = end_time
-            else:
-                current_date += timedelta(days=1)
-                continue
-            
-            # For each facility and each court, create blocks with consecutive slots
-            for facility in self.facilities:
-                if facility.max_courts <= 0:
-                    continue
-                
-                # Check facility availability
-                if not facility.is_available(current_date):
-                    # Log why facility is skipped (only for first week to avoid spam)
-                    if current_date <= self.season_start + timedelta(days=7):
-                        if facility.unavailable_dates and current_date in facility.unavailable_dates:
-                            pass  # Explicitly unavailable
-                        elif facility.available_dates and current_date not in facility.available_dates:
-                            # Facility has specific dates but this isn't one of them
-                            pass
-                    continue
-                
-                # For each court at this facility
-                for court_num in range(1, facility.max_courts + 1):
-                    # Create blocks starting at each time slot
-                    for start_idx, start_time in enumerate(time_slots):
-                        # Calculate how many consecutive slots are available from this start time
-                        num_consecutive = len(time_slots) - start_idx
-                        
-                        # Create a block with these consecutive slots
-                        # (the block can provide 1 to num_consecutive slots for back-to-back games)
-                        blocks.append(TimeBlock(
-                            facility=facility,
-                            date=current_date,
-                            start_time=start_time,
-                            num_consecutive_slots=num_consecutive,
-                            court_number=court_num
-                        ))
-            
+            if self._is_valid_game_date(current_date) and current_date.weekday() <= 5:
+                game_dates.append(current_date)
             current_date += timedelta(days=1)
         
-        return blocks
+        return TimeBlockIndex(self.facilities, game_dates)
     
     def _generate_school_matchups(self) -> List[SchoolMatchup]:
         """
@@ -471,7 +604,7 @@ class SchoolBasedScheduler:
         # Sort by priority score (highest first)
         matchups.sort(key=lambda m: m.priority_score, reverse=True)
         
-        print(f"\nGenerated {len(matchups)} school matchups")
+        logger.info("Generated %d school matchups", len(matchups))
         return matchups
     
     def _calculate_school_matchup_score(self, school_a: School, school_b: School, 
@@ -657,6 +790,11 @@ class SchoolBasedScheduler:
         - "Pinecrest Sloan Canyon Blue" matches "Pincrest Sloan Canyon" facility (typo!)
         - "Pinecrest Sloan Canyon Black" matches "Pinecrest Sloan Canyon" facility
         """
+        cache_key = (facility_name, school_name)
+        cached = self._facility_owner_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         # Normalize names for comparison
         facility_lower = facility_name.lower()
         school_lower = school_name.lower()
@@ -676,18 +814,122 @@ class SchoolBasedScheduler:
                 break
         
         # Also remove number suffixes (e.g., "Faith 6A" -> "Faith")
-        import re
         school_base = re.sub(r'\s+\d+[a-z]?$', '', school_base).strip()
         
-        # Check if base school name is in facility name
-        if school_base in facility_lower:
-            return True
+        # Check base school name, then original school name (for exact matches)
+        belongs = school_base in facility_lower or school_lower in facility_lower
+        self._facility_owner_cache[cache_key] = belongs
+        return belongs
+    
+    def _facility_owners(self, facility_name: str) -> frozenset:
+        """Names of the schools (with teams in this league) that a facility belongs to."""
+        owners = self._facility_owners_cache.get(facility_name)
+        if owners is None:
+            owners = frozenset(
+                school.name for school in self.schools
+                if self._facility_belongs_to_school(facility_name, school.name)
+            )
+            self._facility_owners_cache[facility_name] = owners
+        return owners
+    
+    def _candidate_block_keys(self, matchup: SchoolMatchup, rejected: Counter) -> Iterator[Tuple[BlockKey, Optional[School]]]:
+        """
+        Yield (block key, home school) for every block this matchup may use, best first.
         
-        # Also check original school name (for exact matches)
-        if school_lower in facility_lower:
-            return True
+        CRITICAL: Home facilities should ONLY be used by the home school. Home gyms of the
+        two schools come first (by weight, then date and start time), then neutral sites
+        (by date and start time). Other schools' gyms are counted as rejected and skipped.
+        Ties keep generation order (facility, then court).
+        """
+        num_games = len(matchup.games)
         
-        return False
+        # Classify each facility once per call instead of once per block
+        home_groups = defaultdict(list)  # {weight: [(facility_index, home_school), ...]}
+        neutral = []
+        for facility_index, facility in enumerate(self.time_blocks.facilities):
+            # Check if facility belongs to one of the schools IN THIS MATCHUP
+            if self._facility_belongs_to_school(facility.name, matchup.school_a.name):
+                home_school = matchup.school_a
+            elif self._facility_belongs_to_school(facility.name, matchup.school_b.name):
+                home_school = matchup.school_b
+            elif not self._facility_owners(facility.name):
+                # Only use neutral facilities (not belonging to any school)
+                neutral.append((facility_index, None))
+                continue
+            else:
+                # Skip facilities belonging to other schools
+                rejected['other_school_facility'] += self.time_blocks.facility_block_count(facility_index)
+                continue
+            
+            # CRITICAL: Prioritize matchups with more games at home facilities
+            # Client: "Faith only 1 game instead of 3. Need all 3 games."
+            # Strategy: Allow ALL matchups at home facility, but prioritize larger ones
+            num_school_teams = len([t for t in self.teams if t.school == home_school])
+            if num_games >= num_school_teams:
+                # Ideal: Matchup has enough games for all teams
+                weight = 1000 + (num_games * 10)  # Very high priority
+            elif num_games >= 3:
+                # Good: At least 3 games (enough for officials)
+                weight = 500 + (num_games * 10)  # High priority
+            else:
+                # Acceptable: 1-2 games (can combine multiple matchups to reach 3+)
+                weight = 100 + (num_games * 10)  # Medium priority
+            home_groups[weight].append((facility_index, home_school))
+        
+        # Try home facilities FIRST (much higher priority), then neutral
+        groups = [home_groups[weight] for weight in sorted(home_groups, reverse=True)] + [neutral]
+        for group in groups:
+            for game_date in self.time_blocks.dates:
+                open_facilities = self.time_blocks.open_facilities(game_date)
+                members = [
+                    (index, school, self.time_blocks.slot_runs(game_date, index))
+                    for index, school in group if index in open_facilities
+                ]
+                if not members:
+                    continue
+                num_starts = len(self.time_blocks.start_times(game_date))
+                for start_index in range(num_starts):
+                    for facility_index, home_school, runs in members:
+                        if not runs[start_index]:
+                            continue  # Outside the facility's hours that day
+                        for court_number in range(1, self.time_blocks.facilities[facility_index].max_courts + 1):
+                            yield (game_date, facility_index, court_number, start_index), home_school
+    
+    def _court_night_conflict(self, team_a: Team, team_b: Team, slot: TimeSlot) -> Optional[str]:
+        """
+        Check a game against the games already on its court and night.
+        
+        "If a school plays on a weeknight we should have all the games on that court
+        be those 2 schools and not a mix and match of schools." Applied STRICTLY on
+        weeknights at NEUTRAL facilities, RELAXED at HOME facilities (a school can host
+        multiple opponents to reach 3+ games). Also no team plays twice on a weeknight.
+        
+        Returns:
+            'court_reserved', 'school_opponent_mismatch', 'weeknight_doubleheader', or None
+        """
+        is_weeknight = slot.date.weekday() < 5
+        is_home_facility = self._facility_belongs_to_school(slot.facility.name, team_a.school.name) or \
+                           self._facility_belongs_to_school(slot.facility.name, team_b.school.name)
+        
+        # If there are already schools on this court/night, they must be this matchup's
+        schools_on_this_court = self.court_schools.get((slot.date, slot.facility.name, slot.court_number), set())
+        if schools_on_this_court and is_weeknight and not is_home_facility:
+            if {team_a.school.name, team_b.school.name} != schools_on_this_court:
+                return 'court_reserved'
+        
+        # Each school already on this court/night must be facing the same opponent
+        for team, opponent in ((team_a, team_b), (team_b, team_a)):
+            court_key = (slot.date, slot.facility.name, slot.court_number, team.school.name)
+            expected_opponent = self.school_opponents_on_court.get(court_key)
+            if expected_opponent is not None and expected_opponent != opponent.school.name:
+                return 'school_opponent_mismatch'
+        
+        # No team plays 2+ games on a weeknight (Monday-Friday)
+        if is_weeknight:
+            if slot.date in self.team_game_dates[team_a.id] or slot.date in self.team_game_dates[team_b.id]:
+                return 'weeknight_doubleheader'
+        
+        return None
     
     def _find_time_block_for_matchup(
         self, 
@@ -701,87 +943,44 @@ class SchoolBasedScheduler:
         CRITICAL (Rule #10): If using a school's facility, that school MUST be the home team.
         
         Returns (time_block, assigned_slots, home_school) or None if no suitable block found.
+        The reasons blocks were rejected are kept in self.last_rejections.
+        
+        Failures are memoized per (matchup games, relaxation level) until _commit_game
+        changes state one of the rejections depended on.
         """
         num_games = len(matchup.games)
+        self.profiler.count("find_time_block_calls")
+        
+        memo_key = (
+            matchup.school_a.name, matchup.school_b.name,
+            tuple((team_a.id, team_b.id) for team_a, team_b, _ in matchup.games),
+            relax_saturday_rest, relax_weeknight_3game
+        )
+        cached = self._block_failure_memo.get(memo_key)
+        if cached is not None:
+            self.profiler.count("find_time_block_memo_hits")
+            self.last_rejections = Counter(cached)
+            return None
+        
+        rejected = Counter()
+        self.last_rejections = rejected
+        watched = set()  # State that could lift one of the rejections (see STATE_DEPENDENT_REJECTIONS)
         
         # Cluster games by coach for optimal ordering
         ordered_games = self._cluster_games_by_coach(matchup.games)
         
         # Prioritize blocks: STRONGLY prefer facilities that match one of the schools
-        # CRITICAL: Home facilities should ONLY be used by the home school
-        home_facility_blocks = []  # Highest priority - home facilities for this matchup
-        neutral_blocks = []  # Lower priority - neutral facilities
+        # Blocks are visited as compact keys and only materialized once the cheap checks pass
+        index = self.time_blocks
         
-        for block in self.time_blocks:
-            # Check if facility belongs to one of the schools IN THIS MATCHUP
-            school_a_home = self._facility_belongs_to_school(block.facility.name, matchup.school_a.name)
-            school_b_home = self._facility_belongs_to_school(block.facility.name, matchup.school_b.name)
+        for block_key, home_school in self._candidate_block_keys(matchup, rejected):
+            game_date, facility_index, court_number, start_index = block_key
+            facility = index.facilities[facility_index]
+            start_times = index.start_times(game_date)
             
-            # Check if facility belongs to ANY school (to avoid using other schools' gyms)
-            facility_belongs_to_other_school = False
-            if not school_a_home and not school_b_home:
-                # This facility might belong to a different school
-                for team in self.teams:
-                    if self._facility_belongs_to_school(block.facility.name, team.school.name):
-                        # This facility belongs to a school not in this matchup
-                        facility_belongs_to_other_school = True
-                        break
-            
-            if school_a_home:
-                # CRITICAL: Prioritize matchups with more games at home facilities
-                # Client: "Faith only 1 game instead of 3. Need all 3 games."
-                # Strategy: Allow ALL matchups at home facility, but prioritize larger ones
-                num_school_a_teams = len([t for t in self.teams if t.school == matchup.school_a])
-                num_games = len(matchup.games)
-                
-                # Calculate priority weight based on game count
-                # More games = higher priority for home facility
-                if num_games >= num_school_a_teams:
-                    # Ideal: Matchup has enough games for all teams
-                    weight = 1000 + (num_games * 10)  # Very high priority
-                elif num_games >= 3:
-                    # Good: At least 3 games (enough for officials)
-                    weight = 500 + (num_games * 10)  # High priority
-                else:
-                    # Acceptable: 1-2 games (can combine multiple matchups to reach 3+)
-                    # Still prefer home facility, just lower priority
-                    weight = 100 + (num_games * 10)  # Medium priority
-                
-                home_facility_blocks.append((block, matchup.school_a, weight))
-                
-            elif school_b_home:
-                # CRITICAL: Prioritize matchups with more games at home facilities
-                num_school_b_teams = len([t for t in self.teams if t.school == matchup.school_b])
-                num_games = len(matchup.games)
-                
-                # Calculate priority weight based on game count
-                if num_games >= num_school_b_teams:
-                    # Ideal: Matchup has enough games for all teams
-                    weight = 1000 + (num_games * 10)
-                elif num_games >= 3:
-                    # Good: At least 3 games (enough for officials)
-                    weight = 500 + (num_games * 10)
-                else:
-                    # Acceptable: 1-2 games (can combine multiple matchups to reach 3+)
-                    weight = 100 + (num_games * 10)
-                
-                home_facility_blocks.append((block, matchup.school_b, weight))
-            elif not facility_belongs_to_other_school:
-                # Only use neutral facilities (not belonging to any school)
-                neutral_blocks.append((block, None, 1))  # Neutral facility, weight=1
-            # Skip facilities belonging to other schools
-        
-        # Sort home facility blocks by WEIGHT (highest first), then date
-        # This ensures matchups with more games get priority at home facilities
-        home_facility_blocks.sort(key=lambda x: (-x[2], x[0].date, x[0].start_time))
-        neutral_blocks.sort(key=lambda x: (x[0].date, x[0].start_time))
-        
-        # Try home facilities FIRST (much higher priority), then neutral
-        all_blocks = home_facility_blocks + neutral_blocks
-        
-        for block, home_school, weight in all_blocks:
             # Check if this block has enough CONSECUTIVE slots for back-to-back games
-            if block.num_consecutive_slots < num_games:
+            if index.slot_runs(game_date, facility_index)[start_index] < num_games:
+                rejected['block_too_short'] += 1
                 continue
             
             # CRITICAL: STRICT 3-game minimum on ALL weeknight courts (for referees)
@@ -790,13 +989,10 @@ class SchoolBasedScheduler:
             # they get 3 games."
             # 
             # RELAXATION: In very late rematch passes (8+), allow <3 games if desperate
-            is_weeknight = block.date.weekday() < 5
+            is_weeknight = game_date.weekday() < 5
             if is_weeknight and not relax_weeknight_3game:
                 # Count existing games at this facility on this date/court
-                existing_games_at_facility = sum(
-                    1 for (d, _t, f, c) in self.used_courts
-                    if d == block.date and f == block.facility.name and c == block.court_number
-                )
+                existing_games_at_facility = self.court_game_count.get((game_date, facility.name, court_number), 0)
                 
                 total_games_after = existing_games_at_facility + num_games
                 
@@ -804,6 +1000,8 @@ class SchoolBasedScheduler:
                 # This applies to home AND neutral facilities
                 if total_games_after < 3:
                     # Skip this block - not enough games for referees
+                    rejected['weeknight_3game'] += 1
+                    watched.add(('court', game_date, facility.name, court_number))
                     continue
             
             # CRITICAL: Prevent schools from spreading over multiple weeknights
@@ -816,26 +1014,25 @@ class SchoolBasedScheduler:
                 # If school A already has a weeknight game
                 if len(school_a_weeknights) > 0:
                     # This block MUST be on one of school A's existing weeknights
-                    if block.date not in school_a_weeknights:
+                    if game_date not in school_a_weeknights:
+                        rejected['school_weeknight'] += 1
+                        watched.add(('weeknights', matchup.school_a.name))
                         continue  # Skip - would create a second weeknight for school A
                 
                 # If school B already has a weeknight game
                 if len(school_b_weeknights) > 0:
                     # This block MUST be on one of school B's existing weeknights
-                    if block.date not in school_b_weeknights:
+                    if game_date not in school_b_weeknights:
+                        rejected['school_weeknight'] += 1
+                        watched.add(('weeknights', matchup.school_b.name))
                         continue  # Skip - would create a second weeknight for school B
             
             # Check if the consecutive slots on this court are available
-            slots_available = True
-            test_slots = block.get_slots(num_games)
-            
-            for slot in test_slots:
-                court_key = (slot.date, slot.start_time, slot.facility.name, slot.court_number)
-                if court_key in self.used_courts:
-                    slots_available = False
-                    break
-            
-            if not slots_available:
+            if any(
+                (game_date, start_time, facility.name, court_number) in self.used_courts
+                for start_time in start_times[start_index:start_index + num_games]
+            ):
+                rejected['court_in_use'] += 1
                 continue
             
             # Special handling for ES K-1 REC and 8ft rim courts
@@ -843,22 +1040,27 @@ class SchoolBasedScheduler:
             has_non_k1_rec = any(div != Division.ES_K1_REC for _, _, div in ordered_games)
             
             # Rule: K-1 REC division REQUIRES 8ft rims
-            if has_k1_rec and not block.facility.has_8ft_rims:
+            if has_k1_rec and not facility.has_8ft_rims:
+                rejected['k1_rim'] += 1
                 continue
             
             # Rule: 8ft rim courts (K-1 courts) can ONLY be used by K-1 REC division
             # CRITICAL: ALL games must be K-1 REC, not just some
             # Middle school games (JV, competitive, 2-3 REC) should NOT use K-1 courts
-            if block.facility.has_8ft_rims and has_non_k1_rec:
+            if facility.has_8ft_rims and has_non_k1_rec:
+                rejected['k1_rim'] += 1
                 continue  # Block if ANY game is non-K-1 REC
             
             # Rule: ES 2-3 REC games (1 ref) should ONLY be at start or end of day
             # This avoids disrupting the 2-ref flow for other divisions
             has_23_rec = any(div == Division.ES_23_REC for _, _, div in ordered_games)
             if has_23_rec:
-                if not self._is_start_or_end_of_day(block.date, block.start_time):
+                if not self._is_start_or_end_of_day(game_date, start_times[start_index]):
+                    rejected['es23_timing'] += 1
                     continue  # ES 2-3 REC must be at day boundaries
             
+            block = index.block(block_key)
+            
             # Check if all teams can play on this date and in these time slots
             can_schedule = True
             test_slots = block.get_slots(num_games)
@@ -881,6 +1083,9 @@ class SchoolBasedScheduler:
                         can_schedule = False
                 
                 if not can_schedule:
+                    rejected['one_facility_per_day'] += 1
+                    watched.add(('weeknights', matchup.school_a.name))
+                    watched.add(('weeknights', matchup.school_b.name))
                     continue
             
             # CRITICAL: Track which schools are playing in this time block
@@ -890,10 +1095,12 @@ class SchoolBasedScheduler:
             # CRITICAL: Track teams playing in THIS MATCHUP on THIS DATE
             # to prevent weeknight doubleheaders (same team, 2 games, same night)
             teams_in_matchup_on_date = defaultdict(int)
+            reason = None
             
             for i, (team_a, team_b, division) in enumerate(ordered_games):
                 if i >= len(test_slots):
                     can_schedule = False
+                    reason = 'block_too_short'
                     break
                 
                 slot = test_slots[i]
@@ -902,27 +1109,33 @@ class SchoolBasedScheduler:
                 # CRITICAL: Check if either TEAM is already playing at this specific time
                 if time_slot_key in self.team_time_slots[team_a.id]:
                     can_schedule = False
+                    reason = 'team_conflict'
                     break
                 if time_slot_key in self.team_time_slots[team_b.id]:
                     can_schedule = False
+                    reason = 'team_conflict'
                     break
                 
                 # CRITICAL: Check if either SCHOOL is already playing at this specific time
                 # This prevents "Pinecrest Springs on different courts at same time"
                 if time_slot_key in self.school_time_slots[team_a.school.name]:
                     can_schedule = False
+                    reason = 'school_conflict'
                     break
                 if time_slot_key in self.school_time_slots[team_b.school.name]:
                     can_schedule = False
+                    reason = 'school_conflict'
                     break
                 
                 # CRITICAL: Check if either COACH is already busy at this specific time
                 # This prevents "Doral Pebble (Ferrell) on 2 courts at same time"
                 if time_slot_key in self.coach_time_slots[team_a.coach_name]:
                     can_schedule = False
+                    reason = 'coach_conflict'
                     break
                 if time_slot_key in self.coach_time_slots[team_b.coach_name]:
                     can_schedule = False
+                    reason = 'coach_conflict'
                     break
                 
                 # Track schools in this block
@@ -933,73 +1146,18 @@ class SchoolBasedScheduler:
                 teams_in_matchup_on_date[team_a.id] += 1
                 teams_in_matchup_on_date[team_b.id] += 1
                 
-                # CRITICAL: Check school opponent consistency on same court/night
-                # "If a school plays on a weeknight we should have all the games on that court
-                # be those 2 schools and not a mix and match of schools."
-                # Apply STRICTLY on weeknights at NEUTRAL facilities
-                # RELAX at HOME facilities (school can host multiple opponents to reach 3+ games)
-                
-                is_weeknight = block.date.weekday() < 5
-                is_home_facility = self._facility_belongs_to_school(block.facility.name, team_a.school.name) or \
-                                   self._facility_belongs_to_school(block.facility.name, team_b.school.name)
-                
-                # First, check if ANY school is already using this court/night
-                court_date_key = (block.date, block.facility.name, block.court_number)
-                schools_on_this_court = set()
-                for (date, facility, court, school), opponent in self.school_opponents_on_court.items():
-                    if date == block.date and facility == block.facility.name and court == block.court_number:
-                        schools_on_this_court.add(school)
-                        schools_on_this_court.add(opponent)
-                
-                # If there are already schools on this court/night, check if current matchup matches
-                # STRICT enforcement on weeknights at NEUTRAL facilities
-                # RELAXED at HOME facilities (allow multiple opponents to reach 3+ games)
-                if schools_on_this_court and is_weeknight and not is_home_facility:
-                    current_matchup_schools = {team_a.school.name, team_b.school.name}
-                    if current_matchup_schools != schools_on_this_court:
-                        # Different school matchup trying to use same court/night
-                        can_schedule = False
-                        break  # Breaks school clustering - court is reserved for other schools
-                
-                # Also check individual school consistency (original logic)
-                court_key_a = (block.date, block.facility.name, block.court_number, team_a.school.name)
-                court_key_b = (block.date, block.facility.name, block.court_number, team_b.school.name)
-                
-                # Check if team_a's school is already playing on this court/night
-                if court_key_a in self.school_opponents_on_court:
-                    # School A is already playing on this court/night
-                    # Ensure opponent is the SAME as before
-                    expected_opponent = self.school_opponents_on_court[court_key_a]
-                    if expected_opponent != team_b.school.name:
-                        can_schedule = False
-                        break  # Different opponent - breaks school clustering
-                
-                # Check if team_b's school is already playing on this court/night
-                if court_key_b in self.school_opponents_on_court:
-                    # School B is already playing on this court/night
-                    # Ensure opponent is the SAME as before
-                    expected_opponent = self.school_opponents_on_court[court_key_b]
-                    if expected_opponent != team_a.school.name:
-                        can_schedule = False
-                        break  # Different opponent - breaks school clustering
+                # CRITICAL: Keep each weeknight court to one school pairing, and no
+                # team plays twice on a weeknight
+                reason = self._court_night_conflict(team_a, team_b, slot)
+                if reason:
+                    can_schedule = False
+                    break
                 
-                # CRITICAL: Check weeknight doubleheader constraint
-                # A team should NOT play 2+ games on the same weeknight
-                if block.date.weekday() < 5:  # Weeknight (Monday-Friday)
-                    # Check if this team already has a game on this date (from previous matchups)
-                    if block.date in self.team_game_dates[team_a.id]:
-                        can_schedule = False
-                        break
-                    if block.date in self.team_game_dates[team_b.id]:
-                        can_schedule = False
-                        break
-                    
-                    # Check if this team will have 2+ games in THIS matchup on this weeknight
-                    if teams_in_matchup_on_date[team_a.id] > 1:
-                        can_schedule = False
-                        break
-                    if teams_in_matchup_on_date[team_b.id] > 1:
+                # Check if this team will have 2+ games in THIS matchup on this weeknight
+                if block.date.weekday() < 5:
+                    if teams_in_matchup_on_date[team_a.id] > 1 or teams_in_matchup_on_date[team_b.id] > 1:
                         can_schedule = False
+                        reason = 'weeknight_doubleheader'
                         break
                 
                 # CRITICAL: Check Saturday doubleheader rest time (non-rec divisions only)
@@ -1062,7 +1220,12 @@ class SchoolBasedScheduler:
                             # So we need time_diff >= 120 minutes (2 hours) between START times for 1-hour games
                             if time_diff_minutes < 120:  # Need 2 hours between start times for 60min rest
                                 can_schedule = False
-                                print(f"      [SATURDAY REST] Blocked: {team_a.school.name} would have {time_diff_minutes:.0f}min between starts (need 120+ for 60min rest)")
+                                reason = 'saturday_rest'
+                                if logger.isEnabledFor(logging.DEBUG):
+                                    logger.debug(
+                                        "[SATURDAY REST] Blocked: %s would have %.0fmin between starts (need 120+ for 60min rest)",
+                                        team_a.school.name, time_diff_minutes, extra={"rate_limit": "saturday_rest"}
+                                    )
                                 break
                         
                         # Check team_b: ensure 60+ minutes from all other non-rec games
@@ -1075,7 +1238,12 @@ class SchoolBasedScheduler:
                                 # Need at least 120 minutes between start times (= 60min rest after 1-hour game)
                                 if time_diff_minutes < 120:
                                     can_schedule = False
-                                    print(f"      [SATURDAY REST] Blocked: {team_b.school.name} would have {time_diff_minutes:.0f}min between starts (need 120+ for 60min rest)")
+                                    reason = 'saturday_rest'
+                                    if logger.isEnabledFor(logging.DEBUG):
+                                        logger.debug(
+                                            "[SATURDAY REST] Blocked: %s would have %.0fmin between starts (need 120+ for 60min rest)",
+                                            team_b.school.name, time_diff_minutes, extra={"rate_limit": "saturday_rest"}
+                                        )
                                     break
                 
                 if not can_schedule:
@@ -1084,32 +1252,133 @@ class SchoolBasedScheduler:
                 # Check game frequency constraints (check for each team)
                 if not self._can_team_play_on_date(team_a, block.date):
                     can_schedule = False
+                    reason = 'team_frequency'
                     break
                 if not self._can_team_play_on_date(team_b, block.date):
                     can_schedule = False
+                    reason = 'team_frequency'
                     break
             
             if not can_schedule:
+                rejected[reason] += 1
+                if reason == 'school_opponent_mismatch':
+                    watched.add(('court', block.date, block.facility.name, block.court_number))
                 continue
             
             # CRITICAL: Verify this is a proper school matchup (2 schools only)
             # If more than 2 schools, it means we're mixing matchups - reject this
             if len(schools_in_block) > 2:
+                rejected['mixed_schools'] += 1
                 continue
             
             # Check if schools have already played enough times
             matchup_key = tuple(sorted([matchup.school_a.name, matchup.school_b.name]))
             # Allow up to 2 matchups in first pass, more in rematch pass
             if self.school_matchup_count[matchup_key] >= 2:
+                rejected['matchup_limit'] += 1
                 continue
             
             # Get consecutive slots on the same court for back-to-back games
             slots = block.get_slots(num_games)
             
+            self.profiler.count("find_time_block_found")
+            self.profiler.record_rejections(rejected)
             return (block, slots, home_school)
         
+        self.profiler.record_rejections(rejected)
+        
+        # Remember the failure until a game lands on state it depended on
+        self._block_failure_memo[memo_key] = Counter(rejected)
+        for watch_key in watched:
+            self._block_failure_watchers[watch_key].add(memo_key)
         return None
     
+    def _invalidate_block_failures(self, watch_key: Tuple) -> None:
+        """Drop memoized block failures that depended on watch_key."""
+        for memo_key in self._block_failure_watchers.pop(watch_key, ()):
+            self._block_failure_memo.pop(memo_key, None)
+    
+    def _commit_game(self, schedule: Schedule, team_a: Team, team_b: Team, division: Division,
+                     slot: TimeSlot, home_school: Optional[School] = None) -> Game:
+        """
+        Add one game to the schedule and update every tracking structure.
+        
+        All scheduling passes go through here so the constraint checks always see
+        the same state.
+        
+        CRITICAL (Rule #10): If the facility belongs to a school, that school is the home team.
+        At neutral facilities team_a is home.
+        """
+        if home_school and team_b.school == home_school:
+            home_team, away_team = team_b, team_a
+        else:
+            home_team, away_team = team_a, team_b
+        
+        game = Game(
+            id=f"{division.value}_{len(schedule.games)}",
+            home_team=home_team,
+            away_team=away_team,
+            time_slot=slot,
+            division=division
+        )
+        schedule.add_game(game)
+        
+        school_a = team_a.school.name
+        school_b = team_b.school.name
+        
+        # Team game counts and dates (frequency rules)
+        self.team_game_count[team_a.id] += 1
+        self.team_game_count[team_b.id] += 1
+        self.team_game_dates[team_a.id].append(slot.date)
+        self.team_game_dates[team_b.id].append(slot.date)
+        
+        # CRITICAL: Track school-level dates for back-to-back day checking
+        # This prevents Somerset NLV (Stanley) Friday + Somerset NLV (Lide) Saturday
+        if slot.date not in self.school_game_dates[school_a]:
+            self.school_game_dates[school_a].append(slot.date)
+        if slot.date not in self.school_game_dates[school_b]:
+            self.school_game_dates[school_b].append(slot.date)
+        
+        # Mark this specific court as used
+        self.used_courts.add((slot.date, slot.start_time, slot.facility.name, slot.court_number))
+        court_date_key = (slot.date, slot.facility.name, slot.court_number)
+        self.court_game_count[court_date_key] += 1
+        
+        # Track team, school and coach time slots to prevent double-booking
+        time_slot_key = (slot.date, slot.start_time)
+        self.team_time_slots[team_a.id].add(time_slot_key)
+        self.team_time_slots[team_b.id].add(time_slot_key)
+        self.school_time_slots[school_a].add(time_slot_key)
+        self.school_time_slots[school_b].add(time_slot_key)
+        self.coach_time_slots[team_a.coach_name].add(time_slot_key)
+        self.coach_time_slots[team_b.coach_name].add(time_slot_key)
+        
+        # CRITICAL: Track school opponents on this court/night
+        # This ensures ALL games for a school on a court/night are against SAME opponent
+        self.school_opponents_on_court[(slot.date, slot.facility.name, slot.court_number, school_a)] = school_b
+        self.school_opponents_on_court[(slot.date, slot.facility.name, slot.court_number, school_b)] = school_a
+        self.court_schools[court_date_key].update((school_a, school_b))
+        
+        # CRITICAL: Track school-facility-date to prevent school at multiple facilities per day
+        self.school_facility_dates[(school_a, slot.date)] = slot.facility.name
+        self.school_facility_dates[(school_b, slot.date)] = slot.facility.name
+        
+        # CRITICAL: Track school weeknight usage to prevent spreading over multiple nights
+        if slot.date.weekday() < 5:
+            self.school_weeknights[school_a].add(slot.date)
+            self.school_weeknights[school_b].add(slot.date)
+        
+        # Track facility utilization
+        self.facility_date_games[(slot.facility.name, slot.date)] += 1
+        
+        # Memoized block failures that depended on this court or these schools' weeknights
+        self._invalidate_block_failures(('court', slot.date, slot.facility.name, slot.court_number))
+        if slot.date.weekday() < 5:
+            self._invalidate_block_failures(('weeknights', school_a))
+            self._invalidate_block_failures(('weeknights', school_b))
+        
+        return game
+    
     def _can_team_play_on_date(self, team: Team, game_date: date) -> bool:
         """
         Check if team can play on this date based on frequency rules.
@@ -1176,9 +1445,7 @@ class SchoolBasedScheduler:
         """
         Main entry point: Generate schedule by school matchups.
         """
-        print("\n" + "=" * 60)
-        print("SCHOOL-BASED SCHEDULING (Redesigned Algorithm)")
-        print("=" * 60)
+        logger.info("School-based scheduling (redesigned algorithm) starting")
         
         schedule = Schedule(
             season_start=self.season_start,
@@ -1186,22 +1453,26 @@ class SchoolBasedScheduler:
         )
         
         # Generate all school matchups
-        matchups = self._generate_school_matchups()
-        
-        # Sort matchups by score (higher score = better matchup, schedule first)
-        # This ensures high-priority matchups (with home facilities) get scheduled first
-        matchups_with_scores = [(m, self._calculate_school_matchup_score(m.school_a, m.school_b, m.games)) for m in matchups]
-        matchups_with_scores.sort(key=lambda x: x[1], reverse=True)  # Highest score first
-        matchups = [m for m, score in matchups_with_scores]
-        
-        print(f"\nScheduling {len(matchups)} matchups (sorted by priority)...")
-        print(f"  Top priority: Schools with home facilities (score boost: +1000)")
-        print(f"  High priority: Rivals, same cluster, same tier")
+        with self.profiler.phase("matchup_generation"):
+            matchups = self._generate_school_matchups()
+            
+            # Sort matchups by score (higher score = better matchup, schedule first)
+            # This ensures high-priority matchups (with home facilities) get scheduled first
+            matchups_with_scores = [(m, self._calculate_school_matchup_score(m.school_a, m.school_b, m.games)) for m in matchups]
+            matchups_with_scores.sort(key=lambda x: x[1], reverse=True)  # Highest score first
+            matchups = [m for m, score in matchups_with_scores]
+        self.profiler.count("matchups", len(matchups))
+        
+        logger.info(
+            "Scheduling %d matchups sorted by priority (home facilities first, then rivals, "
+            "same cluster, same tier)", len(matchups)
+        )
         
         # Schedule each matchup
         scheduled_count = 0
         failed_count = 0
         
+        self.profiler.start_phase("first_pass")
         for matchup in matchups:
             result = self._find_time_block_for_matchup(matchup)
             
@@ -1228,88 +1499,13 @@ class SchoolBasedScheduler:
                     if i < len(assigned_slots):
                         slot = assigned_slots[i]
                         
-                        # CRITICAL: Determine home/away based on home_school (Rule #10)
-                        # If facility belongs to a school, that school is ALWAYS the home team
-                        if home_school:
-                            # One of the schools is the home team (playing at their facility)
-                            if team_a.school == home_school:
-                                home_team = team_a
-                                away_team = team_b
-                            else:
-                                home_team = team_b
-                                away_team = team_a
-                        else:
-                            # Neutral facility - default to team_a as home
-                            home_team = team_a
-                            away_team = team_b
-                        
                         # CRITICAL: K-1 Court Validation (POST-CHECK)
                         # NEVER allow non-K-1 REC divisions on 8ft rim courts
                         if slot.facility.has_8ft_rims and division != Division.ES_K1_REC:
-                            print(f"    [K-1 VIOLATION PREVENTED] {division.value} attempted on {slot.facility.name}")
+                            logger.warning("[K-1 VIOLATION PREVENTED] %s attempted on %s", division.value, slot.facility.name)
                             continue  # Skip this game - K-1 court violation
                         
-                        game = Game(
-                            id=f"{division.value}_{len(schedule.games)}",
-                            home_team=home_team,
-                            away_team=away_team,
-                            time_slot=slot,
-                            division=division
-                        )
-                        
-                        schedule.add_game(game)
-                        
-                        # Update tracking
-                        self.team_game_count[team_a.id] += 1
-                        self.team_game_count[team_b.id] += 1
-                        self.team_game_dates[team_a.id].append(block.date)
-                        self.team_game_dates[team_b.id].append(block.date)
-                        
-                        # CRITICAL: Track school-level dates for back-to-back day checking
-                        # This prevents Somerset NLV (Stanley) Friday + Somerset NLV (Lide) Saturday
-                        if block.date not in self.school_game_dates[team_a.school.name]:
-                            self.school_game_dates[team_a.school.name].append(block.date)
-                        if block.date not in self.school_game_dates[team_b.school.name]:
-                            self.school_game_dates[team_b.school.name].append(block.date)
-                        
-                        # Mark this specific court as used
-                        court_key = (slot.date, slot.start_time, slot.facility.name, slot.court_number)
-                        self.used_courts.add(court_key)
-                        
-                        # Track team time slots to prevent double-booking
-                        time_slot_key = (slot.date, slot.start_time)
-                        self.team_time_slots[team_a.id].add(time_slot_key)
-                        self.team_time_slots[team_b.id].add(time_slot_key)
-                        
-                        # CRITICAL: Track school time slots to prevent same school on different courts
-                        self.school_time_slots[team_a.school.name].add(time_slot_key)
-                        self.school_time_slots[team_b.school.name].add(time_slot_key)
-                        
-                        # CRITICAL: Track coach time slots to prevent coach conflicts
-                        self.coach_time_slots[team_a.coach_name].add(time_slot_key)
-                        self.coach_time_slots[team_b.coach_name].add(time_slot_key)
-                        
-                        # CRITICAL: Track school opponents on this court/night
-                        # This ensures ALL games for a school on a court/night are against SAME opponent
-                        school_court_key_a = (slot.date, slot.facility.name, slot.court_number, team_a.school.name)
-                        school_court_key_b = (slot.date, slot.facility.name, slot.court_number, team_b.school.name)
-                        self.school_opponents_on_court[school_court_key_a] = team_b.school.name
-                        self.school_opponents_on_court[school_court_key_b] = team_a.school.name
-                        
-                        # CRITICAL: Track school-facility-date to prevent school at multiple facilities per day
-                        school_date_key_a = (team_a.school.name, slot.date)
-                        school_date_key_b = (team_b.school.name, slot.date)
-                        self.school_facility_dates[school_date_key_a] = slot.facility.name
-                        self.school_facility_dates[school_date_key_b] = slot.facility.name
-                        
-                        # CRITICAL: Track school weeknight usage to prevent spreading over multiple nights
-                        if slot.date.weekday() < 5:  # Weeknight
-                            self.school_weeknights[team_a.school.name].add(slot.date)
-                            self.school_weeknights[team_b.school.name].add(slot.date)
-                        
-                        # Track facility utilization
-                        facility_date_key = (slot.facility.name, slot.date)
-                        self.facility_date_games[facility_date_key] += 1
+                        self._commit_game(schedule, team_a, team_b, division, slot, home_school)
                 
                 # Track school matchup
                 matchup_key = tuple(sorted([matchup.school_a.name, matchup.school_b.name]))
@@ -1318,30 +1514,33 @@ class SchoolBasedScheduler:
                 scheduled_count += 1
             else:
                 failed_count += 1
+        self.profiler.end_phase("first_pass")
+        self.profiler.count("first_pass_scheduled_matchups", scheduled_count)
+        self.profiler.count("first_pass_failed_matchups", failed_count)
         
-        print(f"\nFirst pass complete:")
-        print(f"  Scheduled matchups: {scheduled_count}")
-        print(f"  Failed matchups: {failed_count}")
-        print(f"  Total games: {len(schedule.games)}")
+        logger.info(
+            "First pass complete: %d matchups scheduled, %d failed, %d total games",
+            scheduled_count, failed_count, len(schedule.games)
+        )
         
         # Check teams with < 8 games
         teams_under_8 = [t for t in self.teams if self.team_game_count[t.id] < 8]
         if teams_under_8:
-            print(f"\n  {len(teams_under_8)} teams have < 8 games, starting rematch pass...")
+            logger.info("%d teams have < 8 games, starting rematch pass", len(teams_under_8))
             
             # SECOND PASS: Allow rematches to fill remaining games
-            self._schedule_rematches(schedule, matchups, teams_under_8)
+            with self.profiler.phase("rematches"):
+                self._schedule_rematches(schedule, matchups, teams_under_8)
             
             # Recheck teams with < 8 games
             teams_under_8 = [t for t in self.teams if self.team_game_count[t.id] < 8]
             if teams_under_8:
-                print(f"\n  WARNING: {len(teams_under_8)} teams still have < 8 games after rematches")
+                logger.warning("%d teams still have < 8 games after rematches", len(teams_under_8))
                 for team in teams_under_8[:10]:
-                    print(f"    - {team.school.name} ({team.coach_name}): {self.team_game_count[team.id]} games")
+                    logger.warning("  - %s (%s): %d games", team.school.name, team.coach_name, self.team_game_count[team.id])
         
-        print("\n" + "=" * 60)
-        print(f"Scheduling complete: {len(schedule.games)} total games")
-        print("=" * 60)
+        logger.info("Scheduling complete: %d total games", len(schedule.games))
+        self.profiler.count("time_blocks_materialized", self.time_blocks.materialized)
         
         return schedule
     
@@ -1352,346 +1551,347 @@ class SchoolBasedScheduler:
         
         Constraint Relaxation Strategy:
         - Pass 1-2: Strict (complete matchups, single facility, court reservation)
-        - Pass 3-4: Allow partial matchups
-        - Pass 5-6: Allow multiple facilities per day
-        - Pass 7-8: Allow mixed matchups on courts
-        - Pass 9-10: Desperate fill (minimal constraints)
+        - Pass 3-4: Allow partial matchups (only the games whose teams still need games)
+        - Pass 4+: Relax Saturday rest time
+        - Pass 8+: Allow <3 games on weeknight courts (desperate)
+        
+        Only matchups touching teams under 8 games are kept on the worklist. When a
+        matchup fails, the rejection reasons are remembered and the matchup is parked
+        until a relaxation that could resolve one of those reasons becomes active
+        (or, for rejections later games can lift, until _commit_game has invalidated
+        its memoized block failure).
         """
-        print("\n  Starting rematch pass to fill remaining games...")
-        print("  Progressive constraint relaxation to ensure 8 games per team")
+        logger.info("Starting rematch pass with progressive constraint relaxation")
+        
+        # Worklist: matchup index -> indices of its games where a team still needs games
+        pending_games = {}
+        team_games = defaultdict(list)  # team_id -> [(matchup_index, game_index)]
+        for mi, matchup in enumerate(matchups):
+            for gi, (team_a, team_b, division) in enumerate(matchup.games):
+                team_games[team_a.id].append((mi, gi))
+                team_games[team_b.id].append((mi, gi))
+                if self.team_game_count[team_a.id] < 8 or self.team_game_count[team_b.id] < 8:
+                    pending_games.setdefault(mi, set()).add(gi)
+        
+        parked = {}  # matchup index -> (rejection reasons, relaxations active) at failure
         
         max_passes = 10
         for pass_num in range(max_passes):
             teams_still_needing = [t for t in self.teams if self.team_game_count[t.id] < 8]
-            if not teams_still_needing:
+            if not teams_still_needing or not pending_games:
                 break
+            self.rematch_passes_used = pass_num + 1
             
-            # Determine constraint relaxation level
-            allow_partial_matchups = pass_num >= 2  # Pass 3+
-            allow_multiple_facilities = pass_num >= 4  # Pass 5+
-            allow_mixed_courts = pass_num >= 6  # Pass 7+
-            relax_saturday_rest = pass_num >= 3  # Pass 4+ (allow shorter rest on Saturdays)
-            relax_weeknight_3game = pass_num >= 7  # Pass 8+ (allow <3 games on weeknights if desperate)
-            
-            relaxation_status = []
-            if allow_partial_matchups:
-                relaxation_status.append("partial matchups")
-            if allow_multiple_facilities:
-                relaxation_status.append("multiple facilities")
-            if allow_mixed_courts:
-                relaxation_status.append("mixed courts")
-            
-            status_str = f" ({', '.join(relaxation_status)})" if relaxation_status else " (strict)"
-            print(f"    Pass {pass_num + 1}: {len(teams_still_needing)} teams need games{status_str}")
-            games_added = 0
-            
-            # Try to schedule matchups for teams that need games
-            for matchup in matchups:
-                matchup_key = tuple(sorted([matchup.school_a.name, matchup.school_b.name]))
+            with self.profiler.phase(f"rematch_pass_{pass_num + 1}"):
+                # Determine constraint relaxation level
+                relaxations = {
+                    'allow_partial_matchups': pass_num >= 2,  # Pass 3+
+                    'relax_saturday_rest': pass_num >= 3,  # Pass 4+ (allow shorter rest on Saturdays)
+                    'relax_weeknight_3game': pass_num >= 7,  # Pass 8+ (allow <3 games on weeknights if desperate)
+                }
+                active = frozenset(name for name, enabled in relaxations.items() if enabled)
+                allow_partial_matchups = relaxations['allow_partial_matchups']
                 
-                # Check if any teams in this matchup need more games
-                teams_in_matchup_need_games = False
-                for team_a, team_b, division in matchup.games:
-                    if self.team_game_count[team_a.id] < 8 or self.team_game_count[team_b.id] < 8:
-                        teams_in_matchup_need_games = True
-                        break
+                relaxation_status = []
+                if allow_partial_matchups:
+                    relaxation_status.append("partial matchups")
+                if relaxations['relax_saturday_rest']:
+                    relaxation_status.append("short Saturday rest")
+                if relaxations['relax_weeknight_3game']:
+                    relaxation_status.append("weeknight courts under 3 games")
                 
-                if not teams_in_matchup_need_games:
-                    continue
+                status_str = f" ({', '.join(relaxation_status)})" if relaxation_status else " (strict)"
+                logger.info(
+                    "  Pass %d: %d teams need games, %d matchups on worklist (%d parked)%s",
+                    pass_num + 1, len(teams_still_needing), len(pending_games), len(parked), status_str
+                )
+                games_added = 0
                 
                 # Progressively relax rematch limit
                 max_rematches = 2 + pass_num  # Start at 2, increase each pass
-                if self.school_matchup_count[matchup_key] >= max_rematches:
-                    continue
-                
-                # Try to schedule this matchup again (with relaxed constraints)
-                result = self._find_time_block_for_matchup(
-                    matchup,
-                    relax_saturday_rest=relax_saturday_rest,
-                    relax_weeknight_3game=relax_weeknight_3game
-                )
-            
-            if result:
-                block, assigned_slots, home_school = result
-                
-                # CRITICAL: Check if we need to schedule this matchup
-                # Only schedule if at least one team needs games
-                teams_need_games = any(
-                    self.team_game_count[team_a.id] < 8 or self.team_game_count[team_b.id] < 8
-                    for team_a, team_b, division in matchup.games
-                )
                 
-                if not teams_need_games:
-                    continue
-                
-                # CRITICAL: Check if we have enough slots
-                # Pass 1-2: Require ALL games (strict)
-                # Pass 3+: Allow partial matchups (relaxed)
-                if not allow_partial_matchups:
-                    # Strict: Need ALL games
-                    if len(assigned_slots) < len(matchup.games):
+                # Try worklist matchups in priority order
+                for mi in sorted(pending_games):
+                    if mi not in pending_games:
+                        continue  # Satisfied earlier in this pass
+                    matchup = matchups[mi]
+                    matchup_key = tuple(sorted([matchup.school_a.name, matchup.school_b.name]))
+                    
+                    if self.school_matchup_count[matchup_key] >= max_rematches:
                         continue
-                else:
-                    # Relaxed: Schedule whatever fits
-                    if len(assigned_slots) == 0:
+                    
+                    # Skip parked matchups until something that could help them has changed
+                    if mi in parked and not self._rematch_retry_worthwhile(parked[mi], active):
+                        self.profiler.count("rematch_skipped_parked")
                         continue
-                
-                # Create games
-                for i, (team_a, team_b, division) in enumerate(matchup.games):
-                    # Only schedule if at least one team needs games
-                    if self.team_game_count[team_a.id] >= 8 and self.team_game_count[team_b.id] >= 8:
+                    parked.pop(mi, None)
+                    
+                    # Partial passes only offer the games whose teams both still need games
+                    target = matchup
+                    if allow_partial_matchups:
+                        target = self._needy_submatchup(matchup)
+                        if target is None:
+                            continue
+                    
+                    # Try to schedule this matchup again (with relaxed constraints)
+                    result = self._find_time_block_for_matchup(
+                        target,
+                        relax_saturday_rest=relaxations['relax_saturday_rest'],
+                        relax_weeknight_3game=relaxations['relax_weeknight_3game']
+                    )
+                    
+                    if not result:
+                        parked[mi] = (frozenset(self.last_rejections), active)
                         continue
                     
-                    if i < len(assigned_slots):
-                        slot = assigned_slots[i]
+                    block, assigned_slots, home_school = result
+                    
+                    # CRITICAL: Need a slot for every offered game (the block search guarantees it)
+                    if len(assigned_slots) < len(target.games):
+                        continue
+                    
+                    # Create games
+                    for i, (team_a, team_b, division) in enumerate(target.games):
+                        # Only schedule if at least one team needs games
+                        if self.team_game_count[team_a.id] >= 8 and self.team_game_count[team_b.id] >= 8:
+                            continue
                         
-                        # Determine home/away based on home_school
-                        if home_school:
-                            if team_a.school == home_school:
-                                home_team = team_a
-                                away_team = team_b
-                            else:
-                                home_team = team_b
-                                away_team = team_a
-                        else:
-                            home_team = team_a
-                            away_team = team_b
+                        slot = assigned_slots[i]
                         
                         # CRITICAL: K-1 Court Validation (POST-CHECK - REMATCH PASS)
                         # NEVER allow non-K-1 REC divisions on 8ft rim courts
                         if slot.facility.has_8ft_rims and division != Division.ES_K1_REC:
-                            print(f"    [K-1 VIOLATION PREVENTED - REMATCH] {division.value} attempted on {slot.facility.name}")
+                            logger.warning("[K-1 VIOLATION PREVENTED - REMATCH] %s attempted on %s", division.value, slot.facility.name)
                             continue  # Skip this game - K-1 court violation
                         
-                        game = Game(
-                            id=f"{division.value}_{len(schedule.games)}",
-                            home_team=home_team,
-                            away_team=away_team,
-                            time_slot=slot,
-                            division=division
-                        )
-                        
-                        schedule.add_game(game)
-                        
-                        # Update tracking
-                        self.team_game_count[team_a.id] += 1
-                        self.team_game_count[team_b.id] += 1
-                        self.team_game_dates[team_a.id].append(block.date)
-                        self.team_game_dates[team_b.id].append(block.date)
-                        
-                        # CRITICAL: Track school-level dates for back-to-back day checking
-                        # This prevents Somerset NLV (Stanley) Friday + Somerset NLV (Lide) Saturday
-                        if block.date not in self.school_game_dates[team_a.school.name]:
-                            self.school_game_dates[team_a.school.name].append(block.date)
-                        if block.date not in self.school_game_dates[team_b.school.name]:
-                            self.school_game_dates[team_b.school.name].append(block.date)
-                        
-                        # Mark this specific court as used
-                        court_key = (slot.date, slot.start_time, slot.facility.name, slot.court_number)
-                        self.used_courts.add(court_key)
-                        
-                        # Track team time slots to prevent double-booking
-                        time_slot_key = (slot.date, slot.start_time)
-                        self.team_time_slots[team_a.id].add(time_slot_key)
-                        self.team_time_slots[team_b.id].add(time_slot_key)
-                        
-                        # CRITICAL: Track school time slots to prevent same school on different courts
-                        self.school_time_slots[team_a.school.name].add(time_slot_key)
-                        self.school_time_slots[team_b.school.name].add(time_slot_key)
-                        
-                        # CRITICAL: Track coach time slots to prevent coach conflicts
-                        self.coach_time_slots[team_a.coach_name].add(time_slot_key)
-                        self.coach_time_slots[team_b.coach_name].add(time_slot_key)
-                        
-                        # CRITICAL: Track school opponents on this court/night
-                        # This ensures ALL games for a school on a court/night are against SAME opponent
-                        school_court_key_a = (slot.date, slot.facility.name, slot.court_number, team_a.school.name)
-                        school_court_key_b = (slot.date, slot.facility.name, slot.court_number, team_b.school.name)
-                        self.school_opponents_on_court[school_court_key_a] = team_b.school.name
-                        self.school_opponents_on_court[school_court_key_b] = team_a.school.name
-                        
-                        # CRITICAL: Track school-facility-date to prevent school at multiple facilities per day
-                        school_date_key_a = (team_a.school.name, slot.date)
-                        school_date_key_b = (team_b.school.name, slot.date)
-                        self.school_facility_dates[school_date_key_a] = slot.facility.name
-                        self.school_facility_dates[school_date_key_b] = slot.facility.name
-                        
-                        # CRITICAL: Track school weeknight usage to prevent spreading over multiple nights
-                        if slot.date.weekday() < 5:  # Weeknight
-                            self.school_weeknights[team_a.school.name].add(slot.date)
-                            self.school_weeknights[team_b.school.name].add(slot.date)
+                        self._commit_game(schedule, team_a, team_b, division, slot, home_school)
+                        games_added += 1
                         
-                        # Track facility utilization
-                        facility_date_key = (slot.facility.name, slot.date)
-                        self.facility_date_games[facility_date_key] += 1
+                        # Drop games (and matchups) that no longer involve a team needing games
+                        for team in (team_a, team_b):
+                            if self.team_game_count[team.id] < 8:
+                                continue
+                            for mj, gj in team_games[team.id]:
+                                other_a, other_b, _ = matchups[mj].games[gj]
+                                if self.team_game_count[other_a.id] >= 8 and self.team_game_count[other_b.id] >= 8:
+                                    if mj in pending_games:
+                                        pending_games[mj].discard(gj)
+                                        if not pending_games[mj]:
+                                            del pending_games[mj]
+                                            parked.pop(mj, None)
+                    
+                    # Track school matchup
+                    self.school_matchup_count[matchup_key] += 1
                 
-                # Track school matchup
-                self.school_matchup_count[matchup_key] += 1
-                games_added += 1
+                logger.info("  Added %d games in this pass", games_added)
             
             if games_added == 0:
-                print(f"    No more games could be scheduled, stopping")
-                break
+                # Keep going only if a relaxation that hasn't started yet could unpark something
+                upcoming = set(REMATCH_RELAXATION_FOR_REJECTION.values()) - active
+                if not any(
+                    upcoming & {REMATCH_RELAXATION_FOR_REJECTION.get(r) for r in reasons}
+                    for reasons, _ in parked.values()
+                ):
+                    logger.info("  No more games could be scheduled, stopping")
+                    break
         
-        print(f"  Rematch pass complete: {len(schedule.games)} total games")
+        logger.info("Rematch pass complete: %d total games", len(schedule.games))
         
         # CRITICAL: AGGRESSIVE SATURDAY SLOT FILLING
         # Client: "If we have a site for 8-10 hours we should have more than 3-4 games there"
         # Fill ALL available Saturday slots to maximize facility utilization
         teams_still_needing = [t for t in self.teams if self.team_game_count[t.id] < 8]
         if teams_still_needing:
-            print(f"\n  AGGRESSIVE SATURDAY FILLING: {len(teams_still_needing)} teams still need games")
-            self._fill_saturday_slots_aggressively(schedule, matchups, teams_still_needing)
+            logger.info("Aggressive Saturday filling: %d teams still need games", len(teams_still_needing))
+            with self.profiler.phase("saturday_fill"):
+                self._fill_saturday_slots_aggressively(schedule, matchups, teams_still_needing)
+    
+    def _needy_submatchup(self, matchup: SchoolMatchup) -> Optional[SchoolMatchup]:
+        """The part of a matchup whose teams both still need games (None if empty)."""
+        games = [
+            (team_a, team_b, division) for team_a, team_b, division in matchup.games
+            if self.team_game_count[team_a.id] < 8 and self.team_game_count[team_b.id] < 8
+        ]
+        if not games:
+            return None
+        if len(games) == len(matchup.games):
+            return matchup
+        return SchoolMatchup(
+            school_a=matchup.school_a,
+            school_b=matchup.school_b,
+            games=games,
+            priority_score=matchup.priority_score
+        )
+    
+    def _rematch_retry_worthwhile(self, failure: Tuple[frozenset, frozenset], active: frozenset) -> bool:
+        """
+        Decide whether a parked matchup could succeed now.
+        
+        Args:
+            failure: (rejection reasons, relaxations active) when it last failed
+            active: Relaxations active in the current pass
+        """
+        reasons, active_then = failure
+        newly_active = active - active_then
+        for reason in reasons:
+            if REMATCH_RELAXATION_FOR_REJECTION.get(reason) in newly_active:
+                return True
+            # Later games can lift these; the block failure memo knows whether any did
+            if reason in STATE_DEPENDENT_REJECTIONS:
+                return True
+        return False
     
     def _fill_saturday_slots_aggressively(self, schedule: Schedule, matchups: List[SchoolMatchup], teams_needing_games: List[Team]):
         """
-        Ultra-aggressive pass to fill ALL available Saturday slots.
+        Ultra-aggressive pass to fill remaining Saturday slots for teams under 8 games.
         
         Strategy:
         - Ignore 120-min rest requirement (allow back-to-back)
-        - Ignore complete matchup requirement (allow ANY partial matchup)
+        - Ignore complete matchup requirement (schedule single games)
         - Ignore court reservation (allow mixed matchups on same court)
         - ONLY respect HARD constraints (no double-booking, no same-school, etc.)
         
-        Goal: Use EVERY available slot at EVERY facility to maximize games.
+        Demand-driven: teams with the fewest games are served first from a priority
+        queue, each team only tries its own candidate opponents, and each pair only
+        probes the free Saturday slots indexed by date and start time. Work scales
+        with the number of missing games rather than blocks x matchups.
         """
-        print("    Starting aggressive Saturday slot filling...")
-        print("    Relaxing: Saturday rest time, complete matchups, court reservation")
+        logger.info("Starting aggressive Saturday slot filling (relaxing rest time, complete matchups, court reservation)")
+        
+        # Index: team -> candidate games (in matchup priority order)
+        candidates = defaultdict(list)
+        for matchup in matchups:
+            matchup_key = tuple(sorted([matchup.school_a.name, matchup.school_b.name]))
+            for team_a, team_b, division in matchup.games:
+                candidate = (team_a, team_b, division, matchup_key)
+                candidates[team_a.id].append(candidate)
+                candidates[team_b.id].append(candidate)
+        
+        free_saturday_slots = self._index_free_saturday_slots()
+        team_order = {team.id: i for i, team in enumerate(self.teams)}
         
         max_fill_passes = 5
         for fill_pass in range(max_fill_passes):
             teams_still_needing = [t for t in self.teams if self.team_game_count[t.id] < 8]
             if not teams_still_needing:
-                print(f"    ✅ All teams have 8 games!")
+                logger.info("All teams have 8 games")
                 break
+            self.saturday_fill_passes_used = fill_pass + 1
             
-            print(f"      Fill pass {fill_pass + 1}: {len(teams_still_needing)} teams need games")
+            logger.info("  Fill pass %d: %d teams need games", fill_pass + 1, len(teams_still_needing))
             games_added = 0
             
             # Increase rematch limit progressively
             max_rematches = 5 + fill_pass
             
-            # Try all Saturday time blocks
-            saturday_blocks = [b for b in self.time_blocks if b.date.weekday() == 5]
+            # Priority queue of under-scheduled teams (fewest games first)
+            queue = [(self.team_game_count[t.id], team_order[t.id], t) for t in teams_still_needing]
+            heapq.heapify(queue)
             
-            for block in saturday_blocks:
-                # For each matchup, try to schedule ANY game from it
-                for matchup in matchups:
-                    matchup_key = tuple(sorted([matchup.school_a.name, matchup.school_b.name]))
-                    
-                    # Check rematch limit
+            while queue:
+                count, order, team = heapq.heappop(queue)
+                if count != self.team_game_count[team.id] or count >= 8:
+                    continue  # Stale entry - team was re-queued with its new count
+                
+                for team_a, team_b, division, matchup_key in candidates[team.id]:
+                    opponent = team_b if team_a.id == team.id else team_a
+                    if self.team_game_count[opponent.id] >= 8:
+                        continue
                     if self.school_matchup_count[matchup_key] >= max_rematches:
                         continue
                     
-                    # Find teams in this matchup that need games
-                    games_to_schedule = []
-                    for team_a, team_b, division in matchup.games:
-                        if self.team_game_count[team_a.id] < 8 or self.team_game_count[team_b.id] < 8:
-                            games_to_schedule.append((team_a, team_b, division))
-                    
-                    if not games_to_schedule:
+                    slot = self._find_free_saturday_slot(free_saturday_slots, team_a, team_b, division)
+                    if slot is None:
                         continue
                     
-                    # Try to schedule ANY game (even just 1) from this matchup in this block
-                    for team_a, team_b, division in games_to_schedule:
-                        # Check if we have an available slot
-                        test_slots = block.get_slots(1)  # Just need 1 slot
-                        if not test_slots:
-                            break
-                        
-                        slot = test_slots[0]
-                        
-                        # Check if slot is available
-                        court_key = (slot.date, slot.start_time, slot.facility.name, slot.court_number)
-                        if court_key in self.used_courts:
-                            continue
-                        
-                        # HARD CONSTRAINTS ONLY (no soft constraints)
-                        # 1. No team double-booking
-                        time_slot_key = (slot.date, slot.start_time)
-                        if time_slot_key in self.team_time_slots[team_a.id] or time_slot_key in self.team_time_slots[team_b.id]:
-                            continue
-                        
-                        # 2. No same school at same time (different courts)
-                        if time_slot_key in self.school_time_slots[team_a.school.name] or time_slot_key in self.school_time_slots[team_b.school.name]:
-                            continue
-                        
-                        # 3. No coach conflicts
-                        if time_slot_key in self.coach_time_slots[team_a.coach_name] or time_slot_key in self.coach_time_slots[team_b.coach_name]:
-                            continue
-                        
-                        # 4. K-1 court restriction
-                        if slot.facility.has_8ft_rims and division != Division.ES_K1_REC:
-                            continue
-                        
-                        # 5. ES 2-3 REC timing (start or end of day)
-                        if division == Division.ES_23_REC:
-                            if not self._is_start_or_end_of_day(slot.date, slot.start_time):
-                                continue
-                        
-                        # 6. Friday + Saturday back-to-back (school-level)
-                        if not self._can_team_play_on_date(team_a, slot.date) or not self._can_team_play_on_date(team_b, slot.date):
-                            continue
-                        
-                        # ALL HARD CONSTRAINTS PASSED - SCHEDULE THE GAME!
-                        
-                        # Determine home/away (prefer home school if facility matches)
-                        home_school = None
-                        if self._facility_belongs_to_school(slot.facility.name, team_a.school.name):
-                            home_school = team_a.school
-                        elif self._facility_belongs_to_school(slot.facility.name, team_b.school.name):
-                            home_school = team_b.school
-                        
-                        if home_school:
-                            if team_a.school == home_school:
-                                home_team = team_a
-                                away_team = team_b
-                            else:
-                                home_team = team_b
-                                away_team = team_a
-                        else:
-                            home_team = team_a
-                            away_team = team_b
-                        
-                        # Create game
-                        game = Game(
-                            id=f"{division.value}_{len(schedule.games)}",
-                            home_team=home_team,
-                            away_team=away_team,
-                            time_slot=slot,
-                            division=division
-                        )
-                        schedule.games.append(game)
-                        
-                        # Update tracking
-                        self.team_game_count[team_a.id] += 1
-                        self.team_game_count[team_b.id] += 1
-                        self.team_game_dates[team_a.id].append(slot.date)
-                        self.team_game_dates[team_b.id].append(slot.date)
-                        
-                        self.used_courts.add(court_key)
-                        self.team_time_slots[team_a.id].add(time_slot_key)
-                        self.team_time_slots[team_b.id].add(time_slot_key)
-                        self.school_time_slots[team_a.school.name].add(time_slot_key)
-                        self.school_time_slots[team_b.school.name].add(time_slot_key)
-                        self.coach_time_slots[team_a.coach_name].add(time_slot_key)
-                        self.coach_time_slots[team_b.coach_name].add(time_slot_key)
-                        
-                        self.school_matchup_count[matchup_key] += 1
-                        games_added += 1
-                        
-                        # Stop after scheduling one game from this matchup (move to next matchup)
-                        break
+                    # ALL HARD CONSTRAINTS PASSED - SCHEDULE THE GAME!
+                    # Determine home/away (prefer home school if facility matches)
+                    home_school = None
+                    if self._facility_belongs_to_school(slot.facility.name, team_a.school.name):
+                        home_school = team_a.school
+                    elif self._facility_belongs_to_school(slot.facility.name, team_b.school.name):
+                        home_school = team_b.school
+                    
+                    self._commit_game(schedule, team_a, team_b, division, slot, home_school)
+                    self.school_matchup_count[matchup_key] += 1
+                    games_added += 1
+                    
+                    # Re-queue both teams with their new counts
+                    for scheduled in (team, opponent):
+                        if self.team_game_count[scheduled.id] < 8:
+                            heapq.heappush(queue, (self.team_game_count[scheduled.id], team_order[scheduled.id], scheduled))
+                    break
             
-            print(f"      Added {games_added} games in this fill pass")
+            logger.info("  Added %d games in this fill pass", games_added)
             
             if games_added == 0:
-                print(f"      No more games could be added, stopping aggressive fill")
+                logger.info("  No more games could be added, stopping aggressive fill")
                 break
         
         teams_final = [t for t in self.teams if self.team_game_count[t.id] < 8]
         if teams_final:
-            print(f"    ⚠️  {len(teams_final)} teams still under 8 games after aggressive fill")
+            logger.warning("%d teams still under 8 games after aggressive fill", len(teams_final))
         else:
-            print(f"    ✅ ALL teams have 8 games!")
-
+            logger.info("All teams have 8 games")
+    
+    def _index_free_saturday_slots(self) -> Dict[date, Dict[time, List[TimeSlot]]]:
+        """
+        Index unused Saturday court slots: {date: {start_time: [slot, ...]}}.
+        
+        Every time block starts at one court/time, so each block's first slot is one entry.
+        """
+        index = defaultdict(lambda: defaultdict(list))
+        saturdays = [d for d in self.time_blocks.dates if d.weekday() == 5]
+        for block in itertools.chain.from_iterable(self.time_blocks.blocks_on(d) for d in saturdays):
+            court_key = (block.date, block.start_time, block.facility.name, block.court_number)
+            if court_key in self.used_courts:
+                continue
+            index[block.date][block.start_time].append(block.get_slots(1)[0])
+        
+        # Sorted by date, then start time (earliest slots first)
+        return {
+            saturday: {start: index[saturday][start] for start in sorted(index[saturday])}
+            for saturday in sorted(index)
+        }
+    
+    def _find_free_saturday_slot(self, free_slots: Dict[date, Dict[time, List[TimeSlot]]],
+                                 team_a: Team, team_b: Team, division: Division) -> Optional[TimeSlot]:
+        """
+        Find the earliest free Saturday slot where this pair can play, checking hard constraints only.
+        Slots that turn out to be taken are dropped from the index as they are found.
+        """
+        for saturday, slots_by_time in free_slots.items():
+            # Frequency rules, blackouts and Friday + Saturday back-to-back (school-level)
+            if not self._can_team_play_on_date(team_a, saturday) or not self._can_team_play_on_date(team_b, saturday):
+                continue
+            
+            for start_time, slots in slots_by_time.items():
+                if not slots:
+                    continue
+                
+                # 1-3. No team, school or coach double-booking at this time
+                time_slot_key = (saturday, start_time)
+                if time_slot_key in self.team_time_slots[team_a.id] or time_slot_key in self.team_time_slots[team_b.id]:
+                    continue
+                if time_slot_key in self.school_time_slots[team_a.school.name] or time_slot_key in self.school_time_slots[team_b.school.name]:
+                    continue
+                if time_slot_key in self.coach_time_slots[team_a.coach_name] or time_slot_key in self.coach_time_slots[team_b.coach_name]:
+                    continue
+                
+                # 5. ES 2-3 REC timing (start or end of day)
+                if division == Division.ES_23_REC and not self._is_start_or_end_of_day(saturday, start_time):
+                    continue
+                
+                for slot in list(slots):
+                    court_key = (slot.date, slot.start_time, slot.facility.name, slot.court_number)
+                    if court_key in self.used_courts:
+                        slots.remove(slot)
+                        continue
+                    
+                    # 4. K-1 court restriction
+                    if slot.facility.has_8ft_rims and division != Division.ES_K1_REC:
+                        continue
+                    
+                    return slot
+        
+        return None
@@ -0,0 +1,289 @@
+"""
+Rate-limited, retrying access to the Google Sheets API.
+
+Every gspread call the app makes goes through one process-wide SheetsClient:
+
+- A token bucket keeps the whole process under the Sheets per-minute quota,
+  however many requests are loading data at once.
+- Quota (429), server (5xx) and connection errors are retried with jittered
+  exponential backoff.
+- A circuit breaker stops calling Sheets after repeated failures. While it is
+  open, reads are answered from the last good copy of each sheet.
+- Calls, retries, failures and latency are counted per operation
+  (GET /api/sheets/metrics).
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, List, Optional
+import logging
+import random
+import threading
+import time
+
+import gspread
+import requests
+
+from app.core.config import (
+    SHEETS_REQUESTS_PER_MINUTE, SHEETS_BURST, SHEETS_MAX_RETRIES,
+    SHEETS_BACKOFF_SECONDS, SHEETS_MAX_BACKOFF_SECONDS, SHEETS_BACKOFF_JITTER,
+    SHEETS_BREAKER_FAILURES, SHEETS_BREAKER_RESET_SECONDS
+)
+
+logger = logging.getLogger(__name__)
+
+# HTTP statuses worth retrying: quota exhausted, or a transient server error
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class SheetsUnavailable(Exception):
+    """Google Sheets is not being called because the circuit breaker is open."""
+
+
+def is_unavailable(error: BaseException) -> bool:
+    """Whether an error means Sheets is unreachable or over quota (as opposed to a bad request)."""
+    if isinstance(error, SheetsUnavailable):
+        return True
+    if isinstance(error, gspread.exceptions.APIError):
+        return getattr(error.response, "status_code", None) in RETRYABLE_STATUS_CODES
+    return isinstance(error, (requests.ConnectionError, requests.Timeout))
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, at most `capacity` saved up."""
+
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.sleep = sleep
+        self._tokens = float(capacity)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Take tokens, waiting for them if needed. Returns the seconds waited."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self.clock()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                wait = (tokens - self._tokens) / self.rate
+            self.sleep(wait)
+            waited += wait
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` failed calls in a row; after `reset_seconds`
+    lets one trial call through (half-open) and closes again if it succeeds.
+    """
+
+    def __init__(self, failure_threshold: int, reset_seconds: float, clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.clock = clock
+        self.state = "closed"  # closed, open or half_open
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a call may go ahead now."""
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and self.clock() - self._opened_at >= self.reset_seconds:
+                self.state = "half_open"
+                return True  # The one trial call
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state != "closed":
+                logger.info("Google Sheets calls succeeding again, circuit closed")
+            self.state = "closed"
+            self._failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self.state == "half_open" or (self.state == "closed" and self._failures >= self.failure_threshold):
+                if self.state == "closed":
+                    logger.warning("%d Google Sheets calls failed in a row, circuit open for %.0fs",
+                                   self._failures, self.reset_seconds)
+                self.state = "open"
+                self._opened_at = self.clock()
+
+
+@dataclass
+class CallCounter:
+    """API calls and retries made on behalf of one caller (e.g. one publish)."""
+    calls: int = 0
+    retries: int = 0
+
+
+class SheetsClient:
+    """Shared gate for every Google Sheets API call."""
+
+    def __init__(self, requests_per_minute: float = SHEETS_REQUESTS_PER_MINUTE, burst: int = SHEETS_BURST,
+                 max_retries: int = SHEETS_MAX_RETRIES, backoff_seconds: float = SHEETS_BACKOFF_SECONDS,
+                 max_backoff_seconds: float = SHEETS_MAX_BACKOFF_SECONDS, jitter: float = SHEETS_BACKOFF_JITTER,
+                 breaker_failures: int = SHEETS_BREAKER_FAILURES,
+                 breaker_reset_seconds: float = SHEETS_BREAKER_RESET_SECONDS,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep,
+                 rng: Optional[random.Random] = None):
+        """
+        Args:
+            requests_per_minute: Sustained call rate across the process
+            burst: Calls allowed back to back before throttling starts
+            max_retries: Retries per call on quota, server and connection errors
+            backoff_seconds: Delay before the first retry (doubles each retry)
+            max_backoff_seconds: Upper bound on a single retry delay
+            jitter: Fraction of each delay randomly taken off, so clients don't retry in lockstep
+            breaker_failures: Failed calls in a row that open the circuit
+            breaker_reset_seconds: How long the circuit stays open before a trial call
+            clock, sleep, rng: Replaceable for tests
+        """
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.jitter = jitter
+        self.sleep = sleep
+        self.rng = rng or random.Random()
+        self.bucket = TokenBucket(requests_per_minute / 60.0, burst, clock=clock, sleep=sleep)
+        self.breaker = CircuitBreaker(breaker_failures, breaker_reset_seconds, clock=clock)
+        self._snapshots: Dict[Hashable, List[List[str]]] = {}
+        self._operations: Dict[str, Dict[str, float]] = {}
+        self._throttled_seconds = 0.0
+        self._fallbacks = 0
+        self._lock = threading.Lock()
+
+    def _backoff(self, attempt: int) -> float:
+        delay = min(self.backoff_seconds * (2 ** attempt), self.max_backoff_seconds)
+        return delay - delay * self.jitter * self.rng.random()
+
+    def _record(self, operation: str, **increments: float) -> None:
+        with self._lock:
+            stats = self._operations.get(operation)
+            if stats is None:
+                stats = self._operations[operation] = {
+                    "calls": 0, "retries": 0, "failures": 0, "rejected": 0, "latency_seconds": 0.0, "max_latency_seconds": 0.0
+                }
+            for name, value in increments.items():
+                if name == "max_latency_seconds":
+                    stats[name] = max(stats[name], value)
+                else:
+                    stats[name] += value
+
+    def call(self, operation: str, func: Callable, *args, counter: Optional[CallCounter] = None, **kwargs) -> Any:
+        """
+        Call func(*args, **kwargs), rate-limited and retried.
+
+        Args:
+            operation: Name the call is counted under in the metrics (e.g. "get_all_values")
+            func: The gspread method to call
+            counter: Also counts this call's attempts and retries (optional)
+
+        Raises:
+            SheetsUnavailable: The circuit breaker is open
+            gspread.exceptions.APIError: A non-retryable error, or retries ran out
+        """
+        attempt = 0
+        while True:
+            if not self.breaker.allow():
+                self._record(operation, rejected=1)
+                raise SheetsUnavailable(f"Google Sheets circuit open, not calling {operation}")
+            waited = self.bucket.acquire()
+            if waited:
+                with self._lock:
+                    self._throttled_seconds += waited
+            if counter is not None:
+                counter.calls += 1
+
+            start = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                elapsed = time.perf_counter() - start
+                self._record(operation, calls=1, latency_seconds=elapsed, max_latency_seconds=elapsed)
+                if not is_unavailable(e):
+                    if isinstance(e, gspread.exceptions.GSpreadException):
+                        self.breaker.record_success()  # Sheets answered; the request itself was bad
+                    raise
+                if attempt >= self.max_retries:
+                    self._record(operation, failures=1)
+                    self.breaker.record_failure()
+                    raise
+                delay = self._backoff(attempt)
+                attempt += 1
+                self._record(operation, retries=1)
+                if counter is not None:
+                    counter.retries += 1
+                logger.warning("Sheets %s failed (%s), retry %d/%d in %.1fs",
+                               operation, e, attempt, self.max_retries, delay)
+                self.sleep(delay)
+                continue
+
+            elapsed = time.perf_counter() - start
+            self._record(operation, calls=1, latency_seconds=elapsed, max_latency_seconds=elapsed)
+            self.breaker.record_success()
+            return result
+
+    def read(self, key: Hashable, fetch: Callable[[], List[List[str]]]) -> List[List[str]]:
+        """
+        fetch() a sheet's values (fetch makes its API calls through call()).
+
+        The result is kept as the last good copy of `key`. If Sheets is
+        unavailable (circuit open, or retries exhausted), that copy is returned
+        instead of raising.
+        """
+        try:
+            data = fetch()
+        except Exception as e:
+            if not is_unavailable(e):
+                raise
+            with self._lock:
+                snapshot = self._snapshots.get(key)
+                if snapshot is not None:
+                    self._fallbacks += 1
+            if snapshot is None:
+                raise
+            logger.warning("Google Sheets unavailable (%s), using the last good copy of %s", e, key)
+            return [list(row) for row in snapshot]
+        with self._lock:
+            self._snapshots[key] = [list(row) for row in data]
+        return data
+
+    def metrics(self) -> Dict[str, Any]:
+        """Counters since startup: totals, per-operation calls, retries and latency, and breaker state."""
+        with self._lock:
+            operations = {}
+            for operation, stats in sorted(self._operations.items()):
+                operations[operation] = {
+                    "calls": int(stats["calls"]),
+                    "retries": int(stats["retries"]),
+                    "failures": int(stats["failures"]),
+                    "rejected": int(stats["rejected"]),
+                    "avg_latency_ms": round(1000 * stats["latency_seconds"] / stats["calls"], 1) if stats["calls"] else 0.0,
+                    "max_latency_ms": round(1000 * stats["max_latency_seconds"], 1)
+                }
+            return {
+                "calls": sum(s["calls"] for s in operations.values()),
+                "retries": sum(s["retries"] for s in operations.values()),
+                "failures": sum(s["failures"] for s in operations.values()),
+                "rejected": sum(s["rejected"] for s in operations.values()),
+                "fallbacks": self._fallbacks,
+                "throttled_seconds": round(self._throttled_seconds, 3),
+                "circuit": self.breaker.state,
+                "cached_sheets": len(self._snapshots),
+                "operations": operations
+            }
+
+
+# Shared by every reader and publisher in the process
+sheets_client = SheetsClient()
@@ -0,0 +1,210 @@
+"""
+Publishes generated schedules to the weekly Google Sheets tabs ("26 WINTER WEEK n").
+
+Publishing reads every week tab in one call, diffs it against the schedule and
+writes only the cells that changed, in one batched update per changed tab.
+Re-publishing after a small repair therefore costs a couple of reads and one
+write per touched week instead of a full rewrite. Calls go through the shared
+sheets_client, which rate-limits them and retries quota and server errors.
+"""
+
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+import logging
+import re
+
+import gspread
+from gspread.utils import absolute_range_name, rowcol_to_a1
+
+from app.models import Game, Schedule
+from app.core.config import SPREADSHEET_ID, SHEET_WEEK_PREFIX, get_google_credentials
+from app.services.exporters import WEEK_SHEET_HEADERS, game_rows, in_season_order, week_number, week_sheet_name
+from app.services.game_format import GameFormatter
+from app.services.sheets_client import CallCounter, SheetsClient, sheets_client
+
+logger = logging.getLogger(__name__)
+
+_WEEK_TAB = re.compile(rf"^{re.escape(SHEET_WEEK_PREFIX)} (\d+)$")
+_LAST_COLUMN = rowcol_to_a1(1, len(WEEK_SHEET_HEADERS)).rstrip("0123456789")
+
+
+@dataclass
+class TabUpdate:
+    """The writes needed to bring one week tab up to date."""
+    title: str
+    rows: int  # Rows the tab must have (headers included)
+    ranges: List[Tuple[str, List[List[str]]]]  # (A1 range, values), changed cells only
+    cells_changed: int
+    worksheet: Optional[gspread.Worksheet] = field(default=None, repr=False)  # None: tab must be created
+
+    @property
+    def create(self) -> bool:
+        return self.worksheet is None
+
+
+@dataclass
+class PublishResult:
+    """What a publish changed and what it cost."""
+    tabs_created: List[str] = field(default_factory=list)
+    tabs_updated: List[str] = field(default_factory=list)
+    tabs_unchanged: List[str] = field(default_factory=list)
+    cells_changed: int = 0
+    api_calls: int = 0
+    retries: int = 0
+    dry_run: bool = False
+
+
+def week_tables(games: Iterable[Game], season_start: Optional[date] = None,
+                formatter: Optional[GameFormatter] = None) -> Dict[int, List[List[str]]]:
+    """Each week's tab contents (headers, then the week's games in season order)."""
+    tables: Dict[int, List[List[str]]] = {}
+    for game, row in game_rows(in_season_order(games), formatter):
+        season_start = season_start or game.time_slot.date
+        week = week_number(game.time_slot.date, season_start)
+        if week not in tables:
+            tables[week] = [list(WEEK_SHEET_HEADERS)]
+        tables[week].append(row)
+    return tables
+
+
+def diff_ranges(current: List[List[str]], desired: List[List[str]]) -> Tuple[List[Tuple[str, List[List[str]]]], int]:
+    """
+    The ranges to write so current (a tab's values) becomes desired.
+
+    Only the schedule columns are compared; rows past the end of desired are
+    cleared. Consecutive rows changed in the same columns share one range.
+
+    Returns:
+        ([(A1 range, values)], number of changed cells)
+    """
+    width = len(WEEK_SHEET_HEADERS)
+    blank = [""] * width
+    spans = []  # (row, first column, last column, values)
+    changed = 0
+    for r in range(max(len(current), len(desired))):
+        want = desired[r] if r < len(desired) else blank
+        have = list(current[r][:width]) if r < len(current) else []
+        have += [""] * (width - len(have))
+        columns = [c for c in range(width) if want[c] != have[c]]
+        if columns:
+            changed += len(columns)
+            spans.append((r, columns[0], columns[-1], want[columns[0]:columns[-1] + 1]))
+
+    ranges = []
+    block = None  # [first row, last row, first column, last column, values]
+    for r, first, last, values in spans:
+        if block and block[1] == r - 1 and block[2] == first and block[3] == last:
+            block[1] = r
+            block[4].append(values)
+            continue
+        if block:
+            ranges.append(block)
+        block = [r, r, first, last, [values]]
+    if block:
+        ranges.append(block)
+    return [
+        (f"{rowcol_to_a1(top + 1, first + 1)}:{rowcol_to_a1(bottom + 1, last + 1)}", values)
+        for top, bottom, first, last, values in ranges
+    ], changed
+
+
+class SheetsPublisher:
+    """Writes schedules to the weekly tabs of the league spreadsheet."""
+
+    def __init__(self, spreadsheet=None, client: SheetsClient = sheets_client):
+        """
+        Args:
+            spreadsheet: gspread Spreadsheet to write to (default: open SPREADSHEET_ID)
+            client: Rate limiter and retry policy for the API calls (default: the shared one)
+        """
+        self.client = client
+        self._counter = CallCounter()
+        if spreadsheet is None:
+            gc = gspread.authorize(get_google_credentials())
+            spreadsheet = self._call("open_by_key", gc.open_by_key, SPREADSHEET_ID)
+        self.spreadsheet = spreadsheet
+
+    def _call(self, operation: str, func, *args):
+        return self.client.call(operation, func, *args, counter=self._counter)
+
+    def _week_tabs(self) -> Dict[str, gspread.Worksheet]:
+        """Existing week tabs by title."""
+        return {ws.title: ws for ws in self._call("worksheets", self.spreadsheet.worksheets) if _WEEK_TAB.match(ws.title)}
+
+    def _read_tabs(self, titles: List[str]) -> Dict[str, List[List[str]]]:
+        """Current schedule columns of the given tabs, in one call."""
+        if not titles:
+            return {}
+        ranges = [absolute_range_name(title, f"A:{_LAST_COLUMN}") for title in titles]
+        response = self._call("values_batch_get", self.spreadsheet.values_batch_get, ranges)
+        return {
+            title: value_range.get("values", [])
+            for title, value_range in zip(titles, response.get("valueRanges", []))
+        }
+
+    def plan(self, schedule: Schedule, formatter: Optional[GameFormatter] = None) -> List[TabUpdate]:
+        """
+        The updates that would bring every week tab in line with the schedule.
+
+        Week tabs with no games left in the schedule are cleared below their headers.
+        """
+        tables = week_tables(schedule.games, schedule.season_start, formatter)
+        desired = {week_sheet_name(week): rows for week, rows in sorted(tables.items())}
+        existing = self._week_tabs()
+        for title in existing:
+            desired.setdefault(title, [list(WEEK_SHEET_HEADERS)])
+        current = self._read_tabs([title for title in desired if title in existing])
+
+        updates = []
+        for title, rows in desired.items():
+            ranges, changed = diff_ranges(current.get(title, []), rows)
+            updates.append(TabUpdate(title=title, rows=len(rows), ranges=ranges, cells_changed=changed,
+                                     worksheet=existing.get(title)))
+        return updates
+
+    def publish(self, schedule: Schedule, formatter: Optional[GameFormatter] = None,
+                dry_run: bool = False) -> PublishResult:
+        """
+        Write a schedule to the week tabs, changing only cells that differ.
+
+        Args:
+            schedule: Schedule to publish
+            formatter: Shared GameFormatter (optional)
+            dry_run: Only read and diff; report what would change
+
+        Returns:
+            PublishResult with the tabs touched, cells changed and API calls made
+        """
+        result = PublishResult(dry_run=dry_run)
+        self._counter = CallCounter()
+        updates = self.plan(schedule, formatter)
+        for update in updates:
+            result.cells_changed += update.cells_changed
+            if not update.ranges and not update.create:
+                result.tabs_unchanged.append(update.title)
+                continue
+            (result.tabs_created if update.create else result.tabs_updated).append(update.title)
+            if dry_run:
+                continue
+            if update.create:
+                self._call("add_worksheet", self.spreadsheet.add_worksheet, update.title, update.rows, len(WEEK_SHEET_HEADERS))
+            elif update.rows > update.worksheet.row_count:
+                self._call("add_rows", update.worksheet.add_rows, update.rows - update.worksheet.row_count)
+            if update.ranges:
+                # RAW keeps dates and times as the exact strings compared on the next publish
+                self._call("values_batch_update", self.spreadsheet.values_batch_update, {
+                    "valueInputOption": "RAW",
+                    "data": [
+                        {"range": absolute_range_name(update.title, a1), "values": values}
+                        for a1, values in update.ranges
+                    ]
+                })
+
+        result.api_calls, result.retries = self._counter.calls, self._counter.retries
+        logger.info(
+            "%s %d cells: %d tabs created, %d updated, %d unchanged (%d API calls, %d retries)",
+            "Would change" if dry_run else "Published", result.cells_changed, len(result.tabs_created),
+            len(result.tabs_updated), len(result.tabs_unchanged), result.api_calls, result.retries
+        )
+        return result
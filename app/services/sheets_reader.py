@@ -5,20 +5,27 @@ Handles reading all data from Google Sheets and converting to data models.
 
 import gspread
 from google.oauth2.service_account import Credentials
-from datetime import datetime, date
-from typing import List, Dict, Optional, Tuple
+from collections import defaultdict
+from datetime import datetime, date, time
+from typing import List, Dict, Optional, Set, Tuple
+import hashlib
+import json
+import logging
 import re
 
 from app.models import (
     Team, School, Facility, Division, Tier, Cluster,
     Schedule
 )
+from app.services.sheets_client import SheetsUnavailable, is_unavailable, sheets_client
 from app.core.config import (
     SPREADSHEET_ID, get_google_credentials,
     SHEET_DATES_NOTES, SHEET_TIERS_CLUSTERS, SHEET_TEAM_LIST,
     SHEET_FACILITIES, SHEET_COMPETITIVE_TIERS
 )
 
+logger = logging.getLogger(__name__)
+
 
 class SheetsReader:
     """Reads data from Google Sheets and converts to data models."""
@@ -27,13 +34,67 @@ class SheetsReader:
         """Initialize the Google Sheets client."""
         self.credentials = self._get_credentials()
         self.client = gspread.authorize(self.credentials)
-        self.spreadsheet = self.client.open_by_key(SPREADSHEET_ID)
+        try:
+            self.spreadsheet = sheets_client.call("open_by_key", self.client.open_by_key, SPREADSHEET_ID)
+        except Exception as e:
+            if not is_unavailable(e):
+                raise
+            logger.warning("Google Sheets unavailable (%s), reading the last good copy of each sheet", e)
+            self.spreadsheet = None
         
         # Cache for loaded data
         self._teams_cache: Optional[List[Team]] = None
         self._facilities_cache: Optional[List[Facility]] = None
         self._schools_cache: Optional[Dict[str, School]] = None
         self._rules_cache: Optional[Dict] = None
+        
+        # Running team indexes, filled while teams are loaded
+        self._team_ids: Set[str] = set()
+        self._teams_by_school: Dict[str, List[Team]] = defaultdict(list)
+        self._teams_by_school_division: Dict[Tuple[str, Division], List[Team]] = defaultdict(list)
+        
+        # SHA-256 of every sheet read so far, for content-based cache keys
+        self._sheet_digests: Dict[str, str] = {}
+    
+    def _fetch_sheet(self, sheet_name: str) -> List[List[str]]:
+        if self.spreadsheet is None:
+            raise SheetsUnavailable("Spreadsheet could not be opened")
+        worksheet = sheets_client.call("worksheet", self.spreadsheet.worksheet, sheet_name)
+        return sheets_client.call("get_all_values", worksheet.get_all_values)
+    
+    def _read_sheet(self, sheet_name: str) -> List[List[str]]:
+        """
+        All values of a worksheet, recording their digest for content_hash().
+        
+        Calls go through the shared rate-limited sheets_client; while Sheets is
+        unavailable the last good copy of the sheet is returned.
+        """
+        data = sheets_client.read((SPREADSHEET_ID, sheet_name), lambda: self._fetch_sheet(sheet_name))
+        self._sheet_digests[sheet_name] = hashlib.sha256(
+            json.dumps(data, separators=(',', ':')).encode('utf-8')
+        ).hexdigest()
+        return data
+    
+    def content_hash(self) -> str:
+        """Hash of the contents of every sheet read so far (changes when any of them is edited)."""
+        combined = hashlib.sha256()
+        for sheet_name in sorted(self._sheet_digests):
+            combined.update(f"{sheet_name}\0{self._sheet_digests[sheet_name]}\0".encode('utf-8'))
+        return combined.hexdigest()
+    
+    def _index_team(self, team: Team) -> None:
+        """Add a team to the running team indexes."""
+        self._team_ids.add(team.id)
+        self._teams_by_school[team.school.name].append(team)
+        self._teams_by_school_division[(team.school.name, team.division)].append(team)
+    
+    def _index_teams(self, teams: List[Team]) -> None:
+        """Rebuild the team indexes for a list of teams."""
+        self._team_ids = set()
+        self._teams_by_school = defaultdict(list)
+        self._teams_by_school_division = defaultdict(list)
+        for team in teams:
+            self._index_team(team)
     
     def _get_credentials(self) -> Credentials:
         """Get Google Sheets API credentials from environment or file."""
@@ -62,9 +123,46 @@ class SheetsReader:
             except ValueError:
                 continue
         
-        print(f"Warning: Could not parse date: {date_str}")
+        logger.warning("Could not parse date: %s", date_str, extra={"rate_limit": "unparsed_date"})
         return None
     
+    def _parse_time(self, time_str: str) -> Optional[time]:
+        """Parse a time string like "5:00 PM", "5pm", "17:00" or "8:30 p.m."."""
+        if not time_str or time_str.strip() == '':
+            return None
+        
+        time_str = time_str.strip().upper().replace('.', '')
+        time_str = re.sub(r'\s*(AM|PM)$', r' \1', time_str)
+        
+        # Try different time formats
+        formats = ['%I:%M %p', '%I %p', '%I:%M:%S %p', '%H:%M', '%H:%M:%S']
+        for fmt in formats:
+            try:
+                parsed = datetime.strptime(time_str, fmt).time()
+            except ValueError:
+                continue
+            # No AM/PM: gyms don't open before 8 AM, so "5:00" means 5:00 PM
+            if fmt.startswith('%H') and 1 <= parsed.hour < 8:
+                parsed = parsed.replace(hour=parsed.hour + 12)
+            return parsed
+        
+        logger.warning("Could not parse time: %s", time_str, extra={"rate_limit": "unparsed_time"})
+        return None
+    
+    def _parse_time_window(self, start_str: str, end_str: str) -> Optional[Tuple[time, time]]:
+        """Parse a START TIME / END TIME pair; None if either is missing or the window is empty."""
+        start_time = self._parse_time(start_str)
+        end_time = self._parse_time(end_str)
+        if start_time is None or end_time is None:
+            return None
+        if end_time <= start_time:
+            logger.warning(
+                "Ignoring facility hours %s-%s (end is not after start)", start_str, end_str,
+                extra={"rate_limit": "facility_hours"}
+            )
+            return None
+        return (start_time, end_time)
+    
     def _parse_enum(self, value: str, enum_class):
         """Parse a string value to an enum, handling variations."""
         if not value:
@@ -90,11 +188,10 @@ class SheetsReader:
         if self._rules_cache:
             return self._rules_cache
         
-        print("Loading scheduling rules...")
+        logger.info("Loading scheduling rules...")
         
         try:
-            sheet = self.spreadsheet.worksheet(SHEET_DATES_NOTES)
-            data = sheet.get_all_values()
+            data = self._read_sheet(SHEET_DATES_NOTES)
             
             rules = {
                 'season_start': None,
@@ -156,13 +253,14 @@ class SheetsReader:
                     rules['holidays'].append(holiday_date)
             
             self._rules_cache = rules
-            print(f"Loaded rules: {rules['season_start']} to {rules['season_end']}, {len(rules['holidays'])} holidays")
+            logger.info(
+                "Loaded rules: %s to %s, %d holidays",
+                rules['season_start'], rules['season_end'], len(rules['holidays'])
+            )
             return rules
             
         except Exception as e:
-            print(f"Error loading rules: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error loading rules: %s", e)
             # Return defaults from config
             from app.core.config import SEASON_START_DATE, SEASON_END_DATE, US_HOLIDAYS
             return {
@@ -178,14 +276,13 @@ class SheetsReader:
         if self._schools_cache:
             return self._schools_cache
         
-        print("Loading schools...")
+        logger.info("Loading schools...")
         
         schools = {}
         
         try:
             # Load from TIERS, CLUSTERS sheet (for clusters)
-            sheet = self.spreadsheet.worksheet(SHEET_TIERS_CLUSTERS)
-            data = sheet.get_all_values()
+            data = self._read_sheet(SHEET_TIERS_CLUSTERS)
             
             # Find header row
             header_row = 0
@@ -227,8 +324,7 @@ class SheetsReader:
             # CRITICAL: Load tier classifications from COMPETITIVE TIERS sheet
             # This is the authoritative source for tier data
             try:
-                tier_sheet = self.spreadsheet.worksheet(SHEET_COMPETITIVE_TIERS)
-                tier_data = tier_sheet.get_all_values()
+                tier_data = self._read_sheet(SHEET_COMPETITIVE_TIERS)
                 
                 # The sheet has format: Tier 1 | Tier 2 | Tier 3 | Tier 4
                 # Row 1: Headers "Tier 1 – Elite..." etc
@@ -266,14 +362,14 @@ class SheetsReader:
                                             tier=tier
                                         )
                 
-                print(f"Loaded tier classifications from COMPETITIVE TIERS sheet")
+                logger.info("Loaded tier classifications from COMPETITIVE TIERS sheet")
             except Exception as e:
-                print(f"Warning: Could not load COMPETITIVE TIERS sheet: {e}")
+                logger.warning("Could not load COMPETITIVE TIERS sheet: %s", e)
             
-            print(f"Loaded {len(schools)} schools")
+            logger.info("Loaded %d schools", len(schools))
             
         except Exception as e:
-            print(f"Error loading schools: {e}")
+            logger.error("Error loading schools: %s", e)
         
         self._schools_cache = schools
         return schools
@@ -340,14 +436,14 @@ class SheetsReader:
         if self._teams_cache:
             return self._teams_cache
         
-        print("Loading teams...")
+        logger.info("Loading teams...")
         
         schools = self.load_schools()
         teams = []
+        self._index_teams(teams)
         
         try:
-            sheet = self.spreadsheet.worksheet(SHEET_TEAM_LIST)
-            data = sheet.get_all_values()
+            data = self._read_sheet(SHEET_TEAM_LIST)
             
             # Find header row (should be row 1, index 0)
             header_row = 0
@@ -375,7 +471,7 @@ class SheetsReader:
                         division_columns[col_idx] = div_enum
                         break
             
-            print(f"Found {len(division_columns)} division columns: {division_columns}")
+            logger.debug("Found %d division columns: %s", len(division_columns), division_columns)
             
             # Parse teams from each division column
             # Skip header row (0) and count row (1)
@@ -411,12 +507,11 @@ class SheetsReader:
                     team_id = team_id.replace(' ', '_').replace('/', '_').replace('-', '_')
                     
                     # Check for duplicate teams
-                    existing_team_ids = {t.id for t in teams}
-                    if team_id in existing_team_ids:
+                    if team_id in self._team_ids:
                         # Make it unique by adding counter
                         counter = 1
                         original_id = team_id
-                        while team_id in existing_team_ids:
+                        while team_id in self._team_ids:
                             team_id = f"{original_id}_{counter}"
                             counter += 1
                     
@@ -436,13 +531,12 @@ class SheetsReader:
                     )
                     
                     teams.append(team)
+                    self._index_team(team)
             
-            print(f"Loaded {len(teams)} teams")
+            logger.info("Loaded %d teams", len(teams))
             
         except Exception as e:
-            print(f"Error loading teams: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error loading teams: %s", e)
         
         self._teams_cache = teams
         return teams
@@ -487,13 +581,14 @@ class SheetsReader:
         if self._facilities_cache:
             return self._facilities_cache
         
-        print("Loading facilities...")
+        logger.info("Loading facilities...")
         
         facilities_dict = {}  # Group by facility name
+        facility_dates = defaultdict(set)  # {facility name: available dates across all rows}
+        facility_windows = defaultdict(lambda: defaultdict(set))  # {facility name: {date or None: {(start, end)}}}
         
         try:
-            sheet = self.spreadsheet.worksheet(SHEET_FACILITIES)
-            data = sheet.get_all_values()
+            data = self._read_sheet(SHEET_FACILITIES)
             
             # Header row is row 1 (index 0)
             header_row = 0
@@ -521,18 +616,29 @@ class SheetsReader:
                 dates_str = str(row[dates_col]).strip() if len(row) > dates_col else ''
                 available_dates = self._parse_date_range(dates_str)
                 
-                # DEBUG: Log date parsing for key facilities
-                if facility_name and ('faith' in facility_name.lower() or 'lvbc' in facility_name.lower() or 'las vegas basketball' in facility_name.lower()):
-                    if dates_str:
-                        print(f"  [FACILITY] {facility_name} - {court_name}: dates_str='{dates_str[:100]}...' → parsed {len(available_dates)} dates")
-                        if available_dates:
-                            print(f"    First 5 dates: {sorted(available_dates)[:5]}")
-                    else:
-                        print(f"  [FACILITY] {facility_name} - {court_name}: NO dates string (empty DATES column)")
-                
                 # Parse court name
                 court_name = str(row[court_col]).strip() if len(row) > court_col else ''
                 
+                # Parse hours (applies to this row's dates, or to every date if the row has none)
+                time_window = self._parse_time_window(
+                    str(row[start_time_col]).strip() if len(row) > start_time_col else '',
+                    str(row[end_time_col]).strip() if len(row) > end_time_col else ''
+                )
+                
+                # DEBUG: Log date parsing per facility row
+                if logger.isEnabledFor(logging.DEBUG):
+                    if dates_str:
+                        logger.debug(
+                            "[FACILITY] %s - %s: dates_str='%s...' -> parsed %d dates (first 5: %s)",
+                            facility_name, court_name, dates_str[:100], len(available_dates),
+                            sorted(available_dates)[:5], extra={"rate_limit": "facility_dates"}
+                        )
+                    else:
+                        logger.debug(
+                            "[FACILITY] %s - %s: NO dates string (empty DATES column)",
+                            facility_name, court_name, extra={"rate_limit": "facility_dates"}
+                        )
+                
                 # Create unique facility name with court
                 full_facility_name = f"{facility_name} - {court_name}" if court_name else facility_name
                 
@@ -565,42 +671,49 @@ class SheetsReader:
                 else:
                     facility = facilities_dict[full_facility_name]
                 
-                # Add dates to facility availability
-                facility.available_dates.extend(available_dates)
-                facility.available_dates = list(set(facility.available_dates))  # Remove duplicates
+                # Add dates to facility availability (deduplicated once all rows are read)
+                facility_dates[full_facility_name].update(available_dates)
+                if time_window:
+                    for window_date in available_dates or [None]:
+                        facility_windows[full_facility_name][window_date].add(time_window)
             
             facilities = list(facilities_dict.values())
-            
-            print(f"Loaded {len(facilities)} facilities")
+            shared_windows = {}  # Dates with the same hours share one tuple
+            for facility in facilities:
+                facility.available_dates = sorted(facility_dates[facility.name])  # Re-indexes availability
+                for window_date, windows in facility_windows[facility.name].items():
+                    windows = tuple(sorted(windows))
+                    windows = shared_windows.setdefault(windows, windows)
+                    if window_date is None:
+                        facility.default_time_windows = windows
+                    else:
+                        facility.time_windows[window_date] = windows
             
             # Summary: Show facilities with and without date restrictions
-            facilities_with_dates = [f for f in facilities if f.available_dates]
-            facilities_without_dates = [f for f in facilities if not f.available_dates]
-            
-            print(f"  Facilities with specific dates: {len(facilities_with_dates)}")
-            print(f"  Facilities available all season: {len(facilities_without_dates)}")
+            facilities_with_dates = sum(1 for f in facilities if f.available_dates)
+            facilities_with_hours = sum(1 for f in facilities if f.time_windows or f.default_time_windows)
+            logger.info(
+                "Loaded %d facilities (%d with specific dates, %d available all season, %d with hours)",
+                len(facilities), facilities_with_dates, len(facilities) - facilities_with_dates,
+                facilities_with_hours
+            )
             
         except Exception as e:
-            print(f"Error loading facilities: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error loading facilities: %s", e)
         
         self._facilities_cache = facilities
         return facilities
     
     def load_rivals_and_restrictions(self, teams: List[Team]) -> None:
         """Load rival and do-not-play relationships from the sheet."""
-        print("Loading rival and restriction data...")
+        logger.info("Loading rival and restriction data...")
         
         try:
-            sheet = self.spreadsheet.worksheet(SHEET_TIERS_CLUSTERS)
-            data = sheet.get_all_values()
+            data = self._read_sheet(SHEET_TIERS_CLUSTERS)
             
-            # Create team lookup by school name and division
-            team_lookup = {}
-            for team in teams:
-                key = f"{team.school.name}_{team.division.value}"
-                team_lookup[key] = team
+            # Team lookups by school and (school, division); reuse the load_teams indexes
+            if teams is not self._teams_cache:
+                self._index_teams(teams)
             
             # Find relevant columns
             header_row = 0
@@ -627,27 +740,23 @@ class SheetsReader:
                 # Process rivals
                 if rivals_col >= 0 and len(row) > rivals_col and row[rivals_col]:
                     rival_schools = [s.strip() for s in str(row[rivals_col]).split(',')]
-                    for team in teams:
-                        if team.school.name == school_name:
-                            for rival_school in rival_schools:
-                                for rival_team in teams:
-                                    if rival_team.school.name == rival_school and rival_team.division == team.division:
-                                        team.rivals.add(rival_team.id)
+                    for team in self._teams_by_school.get(school_name, []):
+                        for rival_school in rival_schools:
+                            for rival_team in self._teams_by_school_division.get((rival_school, team.division), []):
+                                team.rivals.add(rival_team.id)
                 
                 # Process do-not-play
                 if dnp_col >= 0 and len(row) > dnp_col and row[dnp_col]:
                     dnp_schools = [s.strip() for s in str(row[dnp_col]).split(',')]
-                    for team in teams:
-                        if team.school.name == school_name:
-                            for dnp_school in dnp_schools:
-                                for dnp_team in teams:
-                                    if dnp_team.school.name == dnp_school and dnp_team.division == team.division:
-                                        team.do_not_play.add(dnp_team.id)
+                    for team in self._teams_by_school.get(school_name, []):
+                        for dnp_school in dnp_schools:
+                            for dnp_team in self._teams_by_school_division.get((dnp_school, team.division), []):
+                                team.do_not_play.add(dnp_team.id)
             
-            print(f"Loaded rival and restriction relationships")
+            logger.info("Loaded rival and restriction relationships")
             
         except Exception as e:
-            print(f"Error loading rivals/restrictions: {e}")
+            logger.error("Error loading rivals/restrictions: %s", e)
     
     def load_blackouts(self) -> Dict[str, List[date]]:
         """
@@ -658,8 +767,7 @@ class SheetsReader:
         """
         try:
             from app.core.config import SHEET_BLACKOUTS
-            blackouts_sheet = self.spreadsheet.worksheet(SHEET_BLACKOUTS)
-            data = blackouts_sheet.get_all_values()
+            data = self._read_sheet(SHEET_BLACKOUTS)
             
             blackouts = {}
             
@@ -686,18 +794,16 @@ class SheetsReader:
                     else:
                         blackouts[normalized_name] = dates
             
-            print(f"Loaded blackout dates for {len(blackouts)} schools")
+            logger.info("Loaded blackout dates for %d schools", len(blackouts))
             return blackouts
             
         except Exception as e:
-            print(f"Warning: Could not load blackouts: {e}")
+            logger.warning("Could not load blackouts: %s", e)
             return {}
     
     def load_all_data(self) -> Tuple[List[Team], List[Facility], Dict]:
         """Load all data from Google Sheets."""
-        print("=" * 60)
-        print("Loading all data from Google Sheets...")
-        print("=" * 60)
+        logger.info("Loading all data from Google Sheets...")
         
         rules = self.load_rules()
         schools = self.load_schools()
@@ -709,11 +815,9 @@ class SheetsReader:
         # Add blackouts to rules
         rules['blackouts'] = blackouts
         
-        print("=" * 60)
-        print(f"Data loading complete:")
-        print(f"  - {len(schools)} schools")
-        print(f"  - {len(teams)} teams")
-        print(f"  - {len(facilities)} facilities")
-        print("=" * 60)
+        logger.info(
+            "Data loading complete: %d schools, %d teams, %d facilities",
+            len(schools), len(teams), len(facilities)
+        )
         
         return teams, facilities, rules
@@ -3,20 +3,24 @@ Schedule validation module for the NCSAA Basketball Scheduling System.
 Validates schedules against all hard and soft constraints.
 """
 
+import logging
 from datetime import timedelta
-from typing import List, Dict, Set
+from typing import List, Dict, Optional, Set
 from collections import defaultdict
 
 from app.models import (
-    Schedule, Game, Team, SchedulingConstraint,
+    Schedule, Game, Team, Division, SchedulingConstraint,
     ScheduleValidationResult, TeamScheduleStats
 )
+from app.services.aggregates import ScheduleAggregate, aggregate_schedule
 from app.core.config import (
     MAX_GAMES_PER_7_DAYS, MAX_GAMES_PER_14_DAYS,
     MAX_DOUBLEHEADERS_PER_SEASON, DOUBLEHEADER_BREAK_MINUTES,
     PRIORITY_WEIGHTS
 )
 
+logger = logging.getLogger(__name__)
+
 
 class ScheduleValidator:
     """
@@ -40,9 +44,7 @@ class ScheduleValidator:
         """
         result = ScheduleValidationResult(is_valid=True)
         
-        print("\n" + "=" * 60)
-        print("Validating schedule...")
-        print("=" * 60)
+        logger.info("Validating schedule...")
         
         # Run all validation checks
         self._check_facility_court_conflicts(schedule, result)  # NEW: Check for facility/court double-booking
@@ -57,24 +59,22 @@ class ScheduleValidator:
         self._check_home_away_balance(schedule, result)
         self._check_rival_matchups(schedule, result)
         
-        # Print summary
-        print("\n" + "=" * 60)
-        print("Validation Results:")
-        print("=" * 60)
-        print(f"Valid: {result.is_valid}")
-        print(f"Hard Constraint Violations: {len(result.hard_constraint_violations)}")
-        print(f"Soft Constraint Violations: {len(result.soft_constraint_violations)}")
-        print(f"Total Penalty Score: {result.total_penalty_score:.2f}")
-        
-        if result.hard_constraint_violations:
-            print("\nHard Constraint Violations:")
-            for violation in result.hard_constraint_violations[:10]:  # Show first 10
-                print(f"  - {violation.constraint_type}: {violation.description}")
-        
-        if result.soft_constraint_violations:
-            print(f"\nSoft Constraint Violations: {len(result.soft_constraint_violations)}")
-        
-        print("=" * 60)
+        # Log summary
+        logger.info(
+            "Validation results: valid=%s, hard violations=%d, soft violations=%d, penalty=%.2f",
+            result.is_valid, len(result.hard_constraint_violations),
+            len(result.soft_constraint_violations), result.total_penalty_score
+        )
+        
+        for violation in result.hard_constraint_violations[:10]:  # Show first 10
+            logger.warning("Hard violation - %s: %s", violation.constraint_type, violation.description)
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            for violation in result.soft_constraint_violations:
+                logger.debug(
+                    "Soft violation - %s: %s", violation.constraint_type, violation.description,
+                    extra={"rate_limit": "soft_violation"}
+                )
         
         return result
     
@@ -244,8 +244,9 @@ class ScheduleValidator:
             teams.add(game.home_team)
             teams.add(game.away_team)
         
+        aggregate = aggregate_schedule(schedule)
         for team in teams:
-            stats = self.get_team_stats(team, schedule)
+            stats = aggregate.team_stats(team)
             
             if stats.total_games == 0:
                 continue
@@ -297,94 +298,70 @@ class ScheduleValidator:
                 )
                 result.add_violation(constraint)
     
-    def get_team_stats(self, team: Team, schedule: Schedule) -> TeamScheduleStats:
+    def get_team_stats(self, team: Team, schedule: Schedule,
+                       aggregate: Optional[ScheduleAggregate] = None) -> TeamScheduleStats:
         """
         Calculate statistics for a team's schedule.
         
         Args:
             team: The team to analyze
             schedule: The complete schedule
+            aggregate: Precomputed aggregate of the schedule (built if not given)
             
         Returns:
             TeamScheduleStats with all statistics
         """
-        stats = TeamScheduleStats(team=team)
-        
-        team_games = schedule.get_team_games(team)
-        stats.total_games = len(team_games)
-        
-        for game in team_games:
-            if game.is_home_game(team):
-                stats.home_games += 1
-            else:
-                stats.away_games += 1
-            
-            if game.is_doubleheader:
-                stats.doubleheaders += 1
-            
-            opponent = game.get_opponent(team)
-            if opponent:
-                stats.opponents.append(opponent)
-            
-            # Track games by week
-            if schedule.season_start:
-                week_num = (game.time_slot.date - schedule.season_start).days // 7
-                stats.games_by_week[week_num] = stats.games_by_week.get(week_num, 0) + 1
-        
-        return stats
+        if aggregate is None:
+            aggregate = aggregate_schedule(schedule)
+        return aggregate.team_stats(team)
     
-    def generate_schedule_report(self, schedule: Schedule) -> str:
+    def generate_schedule_report(self, schedule: Schedule,
+                                 aggregate: Optional[ScheduleAggregate] = None) -> str:
         """
         Generate a comprehensive report of the schedule.
         
         Args:
             schedule: The schedule to report on
+            aggregate: Precomputed aggregate of the schedule (built if not given)
             
         Returns:
             Formatted report string
         """
+        if aggregate is None:
+            aggregate = aggregate_schedule(schedule)
+        
         report = []
         report.append("=" * 80)
         report.append("SCHEDULE REPORT")
         report.append("=" * 80)
         report.append(f"Season: {schedule.season_start} to {schedule.season_end}")
-        report.append(f"Total Games: {len(schedule.games)}")
+        report.append(f"Total Games: {aggregate.total_games}")
         report.append("")
         
         # Games by division
         report.append("Games by Division:")
-        from app.models import Division
         for division in Division:
-            div_games = schedule.get_games_by_division(division)
+            div_games = aggregate.games_by_division.get(division, 0)
             if div_games:
-                report.append(f"  {division.value}: {len(div_games)} games")
+                report.append(f"  {division.value}: {div_games} games")
         report.append("")
         
         # Games by date
         report.append("Games by Date:")
-        games_by_date = defaultdict(list)
-        for game in schedule.games:
-            games_by_date[game.time_slot.date].append(game)
-        
-        for game_date in sorted(games_by_date.keys()):
-            games = games_by_date[game_date]
-            report.append(f"  {game_date}: {len(games)} games")
+        for game_date in sorted(aggregate.games_by_date):
+            report.append(f"  {game_date}: {aggregate.games_by_date[game_date]} games")
         report.append("")
         
-        # Team statistics
+        # Team statistics (teams that play at least one game)
         report.append("Team Statistics:")
-        teams = set()
-        for game in schedule.games:
-            teams.add(game.home_team)
-            teams.add(game.away_team)
-        
-        for team in sorted(teams, key=lambda t: t.id):
-            stats = self.get_team_stats(team, schedule)
-            report.append(f"  {team.id}:")
-            report.append(f"    Total Games: {stats.total_games}")
-            report.append(f"    Home: {stats.home_games}, Away: {stats.away_games}")
-            if stats.doubleheaders > 0:
-                report.append(f"    Doubleheaders: {stats.doubleheaders}")
+        for position in sorted(range(len(aggregate.teams)), key=lambda i: aggregate.teams[i].id):
+            if not aggregate.team_games[position]:
+                continue
+            report.append(f"  {aggregate.teams[position].id}:")
+            report.append(f"    Total Games: {aggregate.team_games[position]}")
+            report.append(f"    Home: {aggregate.team_home_games[position]}, Away: {aggregate.team_away_games[position]}")
+            if aggregate.team_doubleheaders[position] > 0:
+                report.append(f"    Doubleheaders: {aggregate.team_doubleheaders[position]}")
         
         report.append("=" * 80)
         
@@ -0,0 +1,295 @@
+"""
+Benchmark suite for the scheduler, validator and API serialization.
+
+Runs on synthetic leagues from app.services.league_generator (no Google Sheets
+access) and writes machine-readable JSON results tagged with the git commit.
+
+Usage:
+    # Time every stage at 0.25x and 1x the current league, 3 repeats each
+    python scripts/run_benchmarks.py --scales 0.25,1 --repeat 3 --output results/head.json
+
+    # Compare two result files (e.g. produced on two commits) and flag regressions
+    python scripts/run_benchmarks.py --compare results/base.json results/head.json --threshold 0.15
+
+Stages:
+    scheduler_init        SchoolBasedScheduler.__init__ (time block generation)
+    optimize_schedule     SchoolBasedScheduler.optimize_schedule (all passes)
+    rematches             _schedule_rematches portion of optimize_schedule
+    validate_schedule     ScheduleValidator.validate_schedule
+    game_responses        GameResponse conversion used by POST /api/schedule
+"""
+
+import sys
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime
+
+# Add backend directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.logging_config import configure_logging
+from app.services.league_generator import LeagueSpec, generate_league
+from app.services.scheduler_v2 import SchoolBasedScheduler
+from app.services.validator import ScheduleValidator
+from app.services.metrics import compute_run_metrics
+
+try:
+    from app.api.routes import build_game_responses
+except ImportError:  # API dependencies (fastapi) not installed
+    build_game_responses = None
+
+STAGES = ["scheduler_init", "optimize_schedule", "rematches", "validate_schedule", "game_responses"]
+
+# Stages faster than this are too noisy to flag as regressions
+MIN_COMPARABLE_SECONDS = 0.01
+
+# Run metrics where any increase is a quality regression
+QUALITY_METRICS = ["teams_under_8_games", "hard_violations", "weeknight_courts_under_3_games"]
+
+
+def _git_commit() -> dict:
+    """Current commit hash and whether the working tree has local changes."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=root, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = bool(subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            cwd=root, capture_output=True, text=True, check=True
+        ).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": None, "dirty": None}
+    return {"commit": commit, "dirty": dirty}
+
+
+def _run_once(teams, facilities, rules, track_memory: bool = False) -> dict:
+    """
+    Run every stage once.
+
+    Returns:
+        {stage: seconds} (or {stage: peak MB} when track_memory is set) plus run info
+    """
+    results = {}
+
+    def measure(stage, func):
+        if track_memory:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+        started = time.perf_counter()
+        value = func()
+        elapsed = time.perf_counter() - started
+        if track_memory:
+            peak = tracemalloc.get_traced_memory()[1]
+            results[stage] = round((peak - before) / (1024 * 1024), 3)
+        else:
+            results[stage] = elapsed
+        return value
+
+    scheduler = measure(
+        "scheduler_init", lambda: SchoolBasedScheduler(teams, facilities, rules, profile=True)
+    )
+    schedule = measure("optimize_schedule", scheduler.optimize_schedule)
+
+    # The rematch passes run inside optimize_schedule; the profiler times them
+    rematch_phase = next(
+        (p for p in scheduler.profiler.report()["phases"] if p["name"] == "rematches"), None
+    )
+    if not track_memory:
+        results["rematches"] = rematch_phase["seconds"] if rematch_phase else 0.0
+
+    validation = measure("validate_schedule", lambda: ScheduleValidator().validate_schedule(schedule))
+
+    if build_game_responses is not None:
+        measure("game_responses", lambda: build_game_responses(schedule))
+
+    results["_metrics"] = compute_run_metrics(
+        schedule, teams, validation,
+        wall_time_seconds=results["scheduler_init"] + results["optimize_schedule"] + results["validate_schedule"],
+        scheduler=scheduler
+    ) if not track_memory else None
+    return results
+
+
+def run_benchmarks(scales, repeat: int, seed: int, track_memory: bool = True) -> dict:
+    """Run all stages at each scale and collect timing/memory statistics."""
+    runs = []
+    for scale in scales:
+        spec = LeagueSpec(seed=seed).scaled(scale)
+        teams, facilities, rules = generate_league(spec)
+        schools = len({t.school.name for t in teams})
+        print(f"\nScale {scale}x: {schools} schools, {len(teams)} teams, {len(facilities)} courts")
+
+        timings = {stage: [] for stage in STAGES}
+        last = {}
+        for i in range(repeat):
+            last = _run_once(teams, facilities, rules)
+            for stage in STAGES:
+                if stage in last:
+                    timings[stage].append(last[stage])
+            print(f"  Run {i + 1}/{repeat}: optimize_schedule {last['optimize_schedule']:.3f}s, "
+                  f"{last['_metrics']['total_games']} games, "
+                  f"{last['_metrics']['teams_under_8_games']} teams under 8")
+
+        memory = {}
+        if track_memory:
+            tracemalloc.start()
+            memory = _run_once(teams, facilities, rules, track_memory=True)
+            tracemalloc.stop()
+
+        stages = {}
+        for stage in STAGES:
+            samples = timings[stage]
+            if not samples:
+                continue
+            stages[stage] = {
+                "min_seconds": round(min(samples), 4),
+                "median_seconds": round(statistics.median(samples), 4),
+                "samples": [round(s, 4) for s in samples],
+            }
+            if stage in memory:
+                stages[stage]["peak_memory_mb"] = memory[stage]
+
+        runs.append({
+            "scale": scale,
+            "schools": schools,
+            "teams": len(teams),
+            "facilities": len(facilities),
+            "metrics": last.get("_metrics"),
+            "stages": stages,
+        })
+
+    return {
+        **_git_commit(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": seed,
+        "repeat": repeat,
+        "runs": runs,
+    }
+
+
+def compare_results(base: dict, head: dict, threshold: float) -> list:
+    """
+    Compare two benchmark result files.
+
+    Returns:
+        List of regression descriptions (empty when head is within threshold of base)
+    """
+    regressions = []
+    base_runs = {run["scale"]: run for run in base.get("runs", [])}
+
+    print(f"\nBase: {str(base.get('commit'))[:10]}  Head: {str(head.get('commit'))[:10]}  "
+          f"(threshold {threshold:.0%})")
+    print(f"{'scale':>6}  {'stage':<20} {'base s':>10} {'head s':>10} {'change':>8}  "
+          f"{'base MB':>8} {'head MB':>8}")
+
+    for run in head.get("runs", []):
+        base_run = base_runs.get(run["scale"])
+        if not base_run:
+            continue
+        for stage, head_stats in run["stages"].items():
+            base_stats = base_run["stages"].get(stage)
+            if not base_stats:
+                continue
+
+            base_s = base_stats["min_seconds"]
+            head_s = head_stats["min_seconds"]
+            change = (head_s - base_s) / base_s if base_s > 0 else 0.0
+            base_mb = base_stats.get("peak_memory_mb")
+            head_mb = head_stats.get("peak_memory_mb")
+
+            flag = ""
+            if head_s >= MIN_COMPARABLE_SECONDS and change > threshold:
+                flag = "  SLOWER"
+                regressions.append(f"{run['scale']}x {stage}: {base_s:.4f}s -> {head_s:.4f}s ({change:+.0%})")
+            if base_mb and head_mb and head_mb > base_mb * (1 + threshold) and head_mb - base_mb > 1:
+                flag += "  MORE MEMORY"
+                regressions.append(f"{run['scale']}x {stage}: {base_mb:.1f}MB -> {head_mb:.1f}MB")
+
+            print(f"{run['scale']:>6}  {stage:<20} {base_s:>10.4f} {head_s:>10.4f} {change:>+8.0%}  "
+                  f"{base_mb if base_mb is not None else '-':>8} "
+                  f"{head_mb if head_mb is not None else '-':>8}{flag}")
+
+        # Speed is only an improvement if quality holds
+        head_metrics = run.get("metrics") or {}
+        base_metrics = base_run.get("metrics") or {}
+        for key in QUALITY_METRICS:
+            if head_metrics.get(key) is None or base_metrics.get(key) is None:
+                continue
+            if head_metrics[key] > base_metrics[key]:
+                regressions.append(
+                    f"{run['scale']}x quality: {key} {base_metrics[key]} -> {head_metrics[key]}"
+                )
+
+    return regressions
+
+
+def main():
+    """Run benchmarks or compare two result files."""
+    parser = argparse.ArgumentParser(
+        description='NCSAA Basketball Scheduling System - Benchmark suite'
+    )
+    parser.add_argument(
+        '--scales',
+        default='0.25,1',
+        help='Comma-separated league sizes relative to the current league (default: 0.25,1)'
+    )
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per scale (default: 3)')
+    parser.add_argument('--seed', type=int, default=2026, help='League generator seed')
+    parser.add_argument('--no-memory', action='store_true', help='Skip the tracemalloc memory pass')
+    parser.add_argument('--output', metavar='PATH', help='Write results as JSON to PATH')
+    parser.add_argument(
+        '--compare',
+        nargs=2,
+        metavar=('BASE', 'HEAD'),
+        help='Compare two result files instead of running benchmarks'
+    )
+    parser.add_argument(
+        '--threshold',
+        type=float,
+        default=0.10,
+        help='Relative slowdown/memory growth flagged as a regression (default: 0.10)'
+    )
+    parser.add_argument('--verbose', action='store_true', help='Show scheduler logging')
+
+    args = parser.parse_args()
+    configure_logging(level="INFO" if args.verbose else "ERROR")
+
+    if args.compare:
+        with open(args.compare[0]) as f:
+            base = json.load(f)
+        with open(args.compare[1]) as f:
+            head = json.load(f)
+        regressions = compare_results(base, head, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s):")
+            for regression in regressions:
+                print(f"  - {regression}")
+            return 1
+        print("\nNo regressions")
+        return 0
+
+    scales = [float(s) if '.' in s else int(s) for s in args.scales.split(',') if s.strip()]
+    results = run_benchmarks(scales, args.repeat, args.seed, track_memory=not args.no_memory)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w') as f:
+            f.write(output)
+        print(f"\nResults written to {args.output}")
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
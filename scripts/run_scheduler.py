@@ -5,6 +5,7 @@ Orchestrates the complete scheduling workflow.
 
 import sys
 import argparse
+import json
 from datetime import datetime
 import os
 
@@ -13,7 +14,15 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.services.sheets_reader import SheetsReader
 from app.services.scheduler_v2 import SchoolBasedScheduler
+from app.services.cp_scheduler import CPSatScheduler
+from app.services.decomposed_scheduler import DecomposedScheduler
 from app.services.validator import ScheduleValidator
+from app.services.aggregates import aggregate_schedule
+from app.services.metrics import compute_run_metrics
+from app.services.sheets_publisher import SheetsPublisher
+from app.services.sheets_client import sheets_client
+from app.services.exporters import CalendarWriter, in_season_order, write_calendars, write_csv, write_xlsx
+from app.core.logging_config import configure_logging
 
 
 def main():
@@ -34,8 +43,70 @@ def main():
         action='store_true',
         help='Enable verbose output'
     )
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Record scheduler phase timings and block rejection reasons'
+    )
+    parser.add_argument(
+        '--profile-output',
+        metavar='PATH',
+        help='Write the profiling report as JSON to PATH (implies --profile)'
+    )
+    parser.add_argument(
+        '--solver',
+        choices=['greedy', 'cpsat', 'decomposed'],
+        default='greedy',
+        help='greedy: school-based scheduler (default); cpsat: CP-SAT model warm-started from greedy; '
+             'decomposed: per-cluster greedy runs in parallel processes, merged and repaired'
+    )
+    parser.add_argument(
+        '--time-limit',
+        type=float,
+        default=60.0,
+        metavar='SECONDS',
+        help='CP-SAT time limit for --solver cpsat (default: 60)'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        metavar='N',
+        help='Worker processes for --solver decomposed (default: one per cluster)'
+    )
+    parser.add_argument(
+        '--metrics-output',
+        metavar='PATH',
+        help='Append the run metrics record as one JSON line to PATH'
+    )
+    parser.add_argument(
+        '--export-csv',
+        metavar='PATH',
+        help='Write the schedule as CSV to PATH'
+    )
+    parser.add_argument(
+        '--export-xlsx',
+        metavar='PATH',
+        help='Write the schedule as an XLSX workbook (one sheet per week) to PATH; needs openpyxl'
+    )
+    parser.add_argument(
+        '--export-calendars',
+        metavar='DIR',
+        help='Write one iCalendar file per team to DIR/teams and per coach to DIR/coaches'
+    )
+    parser.add_argument(
+        '--publish',
+        action='store_true',
+        help='Write the schedule to the weekly Google Sheets tabs (only changed cells are written)'
+    )
+    parser.add_argument(
+        '--publish-dry-run',
+        action='store_true',
+        help='Report which weekly tabs and how many cells --publish would change, without writing'
+    )
     
     args = parser.parse_args()
+    profile = args.profile or bool(args.profile_output)
+    configure_logging(level="DEBUG" if args.verbose else None)
     
     print("\n" + "=" * 80)
     print("NCSAA BASKETBALL SCHEDULING SYSTEM")
@@ -61,11 +132,22 @@ def main():
         print(f"  - {len(teams)} teams")
         print(f"  - {len(facilities)} facilities")
         print(f"  - Season: {rules.get('season_start')} to {rules.get('season_end')}")
+        sheets = sheets_client.metrics()
+        print(f"  - Sheets API: {sheets['calls']} calls, {sheets['retries']} retries, "
+              f"{sheets['throttled_seconds']:.1f}s throttled, {sheets['fallbacks']} sheets from last good copy")
         
         # Step 2: Generate optimized schedule (using school-based clustering)
         print("\n[STEP 2] Generating optimized schedule...")
         print("Using school-based clustering algorithm (Rule #15)")
-        optimizer = SchoolBasedScheduler(teams, facilities, rules)
+        generation_start = datetime.now()
+        if args.solver == 'cpsat':
+            print(f"Optimizing with CP-SAT ({args.time_limit:.0f}s limit, warm-started from greedy)")
+            optimizer = CPSatScheduler(teams, facilities, rules, profile=profile, time_limit_seconds=args.time_limit)
+        elif args.solver == 'decomposed':
+            print("Scheduling each geographic cluster in parallel, then merging")
+            optimizer = DecomposedScheduler(teams, facilities, rules, profile=profile, max_workers=args.workers)
+        else:
+            optimizer = SchoolBasedScheduler(teams, facilities, rules, profile=profile)
         schedule = optimizer.optimize_schedule()
         
         if not schedule or len(schedule.games) == 0:
@@ -78,6 +160,7 @@ def main():
         print("\n[STEP 3] Validating schedule...")
         validator = ScheduleValidator()
         validation_result = validator.validate_schedule(schedule)
+        generation_time = (datetime.now() - generation_start).total_seconds()
         
         # Print validation summary
         print("\n" + "=" * 80)
@@ -89,15 +172,62 @@ def main():
             print("\nWARNING: Schedule has hard constraint violations!")
             print("The schedule will still be written, but manual adjustments may be needed.")
         
-        # Step 4: Generate detailed report
+        # Step 4: Generate detailed report (report and metrics share one aggregate)
         print("\n[STEP 4] Generating schedule report...")
-        report = validator.generate_schedule_report(schedule)
+        aggregate = aggregate_schedule(schedule, teams)
+        report = validator.generate_schedule_report(schedule, aggregate)
         print("\n" + report)
         
-        # Step 5: Schedule generation complete (no longer writing to Google Sheets)
+        # Step 5: Export files and publish to the weekly tabs (both optional)
         print("\n[STEP 5] Schedule generation complete")
+        if args.export_csv or args.export_xlsx or args.export_calendars:
+            games = in_season_order(schedule.games)
+            if args.export_csv:
+                with open(args.export_csv, 'w', newline='', encoding='utf-8') as f:
+                    write_csv(games, f, schedule.season_start)
+                print(f"CSV export written to {args.export_csv}")
+            if args.export_xlsx:
+                write_xlsx(games, args.export_xlsx, schedule.season_start)
+                print(f"XLSX export written to {args.export_xlsx}")
+            if args.export_calendars:
+                writer = CalendarWriter()  # Shared, so each game's event is rendered once
+                team_count = write_calendars(games, os.path.join(args.export_calendars, 'teams'), 'team', writer)
+                coach_count = write_calendars(games, os.path.join(args.export_calendars, 'coaches'), 'coach', writer)
+                print(f"{team_count} team and {coach_count} coach calendars written to {args.export_calendars}")
+        if args.publish or args.publish_dry_run:
+            result = SheetsPublisher(reader.spreadsheet).publish(schedule, dry_run=args.publish_dry_run)
+            verb = "Would change" if result.dry_run else "Changed"
+            print(f"{verb} {result.cells_changed} cells: {len(result.tabs_created)} week tabs created, "
+                  f"{len(result.tabs_updated)} updated, {len(result.tabs_unchanged)} unchanged "
+                  f"({result.api_calls} API calls, {result.retries} retries)")
         print("Schedule is ready for use via API or frontend")
         
+        if profile:
+            profile_report = optimizer.profiler.report()
+            print("\n" + "=" * 80)
+            print("PROFILING REPORT")
+            print("=" * 80)
+            print(json.dumps(profile_report, indent=2))
+            if args.profile_output:
+                with open(args.profile_output, 'w') as f:
+                    json.dump(profile_report, f, indent=2)
+                print(f"Profiling report written to {args.profile_output}")
+        
+        # Quality-versus-time metrics
+        metrics = compute_run_metrics(
+            schedule, teams, validation_result,
+            wall_time_seconds=generation_time, scheduler=optimizer, aggregate=aggregate
+        )
+        print("\n" + "=" * 80)
+        print("RUN METRICS")
+        print("=" * 80)
+        print(json.dumps(metrics, indent=2))
+        if args.metrics_output:
+            record = {"timestamp": datetime.now().isoformat(timespec='seconds'), **metrics}
+            with open(args.metrics_output, 'a') as f:
+                f.write(json.dumps(record) + "\n")
+            print(f"Run metrics appended to {args.metrics_output}")
+        
         # Final summary
         print("\n" + "=" * 80)
         print("SCHEDULING COMPLETE")
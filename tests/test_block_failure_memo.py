@@ -0,0 +1,93 @@
+"""
+Test memoization of _find_time_block_for_matchup failures.
+
+Verifies:
+1. A failed matchup is not re-evaluated while nothing it depended on changes
+2. Committing a game on a watched court drops the memoized failure
+3. A different relaxation level is evaluated separately
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models import Schedule
+from app.services.league_generator import LeagueSpec, generate_league
+from app.services.scheduler_v2 import SchoolBasedScheduler, SchoolMatchup, TimeBlockIndex
+
+
+def _single_game_matchup(scheduler):
+    """A one-game matchup on a league with weeknight courts only (fails the 3-game rule)."""
+    matchup = next(m for m in scheduler._generate_school_matchups() if m.games)
+    return SchoolMatchup(
+        school_a=matchup.school_a,
+        school_b=matchup.school_b,
+        games=matchup.games[:1],
+        priority_score=matchup.priority_score
+    )
+
+
+def _weeknight_scheduler():
+    teams, facilities, rules = generate_league(
+        LeagueSpec(num_schools=4, num_neutral_sites=1, home_gym_rate=0.0, blackout_rate=0.0, season_weeks=2)
+    )
+    scheduler = SchoolBasedScheduler(teams, facilities, rules, profile=True)
+    # Keep only weeknight blocks so every rejection is a 3-game (or harder) rejection
+    scheduler.time_blocks = TimeBlockIndex(
+        scheduler.facilities, [d for d in scheduler.time_blocks.dates if d.weekday() < 5]
+    )
+    return scheduler
+
+
+def test_failure_is_memoized():
+    """The second identical call is answered from the memo."""
+    scheduler = _weeknight_scheduler()
+    matchup = _single_game_matchup(scheduler)
+
+    assert scheduler._find_time_block_for_matchup(matchup) is None
+    first_reasons = dict(scheduler.last_rejections)
+    assert 'weeknight_3game' in first_reasons
+
+    assert scheduler._find_time_block_for_matchup(matchup) is None
+    counters = scheduler.profiler.report()['counters']
+    assert counters['find_time_block_memo_hits'] == 1
+    assert dict(scheduler.last_rejections) == first_reasons
+
+    # A relaxation level is its own memo entry
+    assert scheduler._find_time_block_for_matchup(matchup, relax_weeknight_3game=True) is not None
+    print("[PASS] Failed matchups are memoized per relaxation level")
+
+
+def test_commit_invalidates_watched_court():
+    """Games on a court the failure depended on force a re-evaluation."""
+    scheduler = _weeknight_scheduler()
+    matchup = _single_game_matchup(scheduler)
+    assert scheduler._find_time_block_for_matchup(matchup) is None
+
+    # Put two games from another matchup on the first watched court
+    watch_key = next(k for k in scheduler._block_failure_watchers if k[0] == 'court')
+    _, court_date, facility_name, court_number = watch_key
+    block = next(
+        b for b in scheduler.time_blocks
+        if (b.date, b.facility.name, b.court_number) == (court_date, facility_name, court_number)
+    )
+    other = next(
+        m for m in scheduler._generate_school_matchups()
+        if {m.school_a, m.school_b}.isdisjoint({matchup.school_a, matchup.school_b})
+    )
+    schedule = Schedule()
+    slot = block.get_slots(1)[0]
+    team_a, team_b, division = other.games[0]
+    scheduler._commit_game(schedule, team_a, team_b, division, slot)
+
+    assert not scheduler._block_failure_memo
+    scheduler._find_time_block_for_matchup(matchup)
+    counters = scheduler.profiler.report()['counters']
+    assert counters.get('find_time_block_memo_hits', 0) == 0
+    assert counters['find_time_block_calls'] == 2
+    print("[PASS] Committing on a watched court drops the memoized failure")
+
+
+if __name__ == "__main__":
+    test_failure_is_memoized()
+    test_commit_invalidates_watched_court()
@@ -0,0 +1,171 @@
+"""
+Test ETags, conditional GETs and the league data cache behind the data endpoints.
+
+Verifies:
+1. LeagueDataCache reloads only after its TTL and keeps unchanged data as-is;
+   failed or empty reloads keep the previous data and are retried
+2. Data endpoints send ETag and Cache-Control, and answer If-None-Match with 304
+3. ETags change when the sheet contents change; /api/rules (config only) never loads the sheets
+4. Compressed variants get their own ETag, which still revalidates
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+
+from app.api.caching import etag_matches, rendered_bodies
+from app.main import app
+from app.services.league_data import LeagueData, LeagueDataCache, league_data_cache
+from app.services.league_generator import LeagueSpec, generate_league
+
+ENDPOINTS = ["/api/teams", "/api/facilities", "/api/schools", "/api/rules", "/api/data", "/api/info"]
+
+
+class _Loader:
+    """Stands in for Google Sheets: a generated league with a settable content hash."""
+
+    def __init__(self):
+        self.teams, self.facilities, self.rules = generate_league(LeagueSpec(num_schools=6, num_neutral_sites=2))
+        self.content_hash = "v1"
+        self.calls = 0
+        self.failing = False
+        self.empty = False
+
+    def __call__(self) -> LeagueData:
+        self.calls += 1
+        if self.failing:
+            raise ConnectionError("Sheets unreachable")
+        return LeagueData(
+            teams=[] if self.empty else self.teams,
+            facilities=self.facilities,
+            schools={team.school.name: team.school for team in self.teams},
+            rules=self.rules,
+            content_hash=self.content_hash
+        )
+
+
+def test_cache_ttl():
+    """Loads once per TTL; an unchanged reload keeps the same object."""
+    loader = _Loader()
+    cache = LeagueDataCache(ttl_seconds=3600, loader=loader)
+    first = cache.get()
+    assert cache.get() is first and loader.calls == 1
+
+    cache.invalidate()
+    assert cache.get() is first and loader.calls == 2  # Same contents: same LeagueData
+
+    loader.content_hash = "v2"
+    cache.invalidate()
+    assert cache.get() is not first and cache.get().content_hash == "v2"
+    print("[PASS] League data cache honours its TTL and content hash")
+
+
+def test_cache_keeps_data_on_failed_reload():
+    """A failed or empty reload serves the previous data and is retried on the next get."""
+    loader = _Loader()
+    cache = LeagueDataCache(ttl_seconds=3600, loader=loader)
+    first = cache.get()
+
+    loader.failing = True
+    cache.invalidate()
+    assert cache.get() is first and cache.get() is first and loader.calls == 3  # Retried, not cached
+
+    loader.failing, loader.empty = False, True
+    loader.content_hash = "empty"
+    assert cache.get() is first and loader.calls == 4
+
+    loader.empty = False
+    loader.content_hash = "v2"
+    assert cache.get().content_hash == "v2" and loader.calls == 5
+    assert cache.get().content_hash == "v2" and loader.calls == 5  # Cached again
+
+    loader.failing = True
+    empty_cache = LeagueDataCache(ttl_seconds=3600, loader=loader)
+    try:
+        empty_cache.get()
+        assert False, "Nothing to fall back to"
+    except ConnectionError:
+        pass
+    print("[PASS] Failed and empty reloads keep the previous league data")
+
+
+def test_etag_matching():
+    assert etag_matches('"abc"', '"abc"')
+    assert etag_matches('W/"abc", "def"', '"abc"')
+    assert etag_matches('"abc-gzip"', '"abc"')
+    assert etag_matches('*', '"abc"')
+    assert not etag_matches('"abd"', '"abc"')
+    assert not etag_matches('', '"abc"')
+    print("[PASS] If-None-Match matching")
+
+
+def test_conditional_endpoints():
+    """Every data endpoint revalidates to 304 until the sheets change."""
+    loader = _Loader()
+    original = league_data_cache.loader
+    league_data_cache.loader = loader
+    league_data_cache.invalidate()
+    rendered_bodies.clear()
+    client = TestClient(app)
+    identity = {"Accept-Encoding": "identity"}
+    try:
+        etags = {}
+        for url in ENDPOINTS:
+            response = client.get(url, headers=identity)
+            assert response.status_code == 200, url
+            assert "max-age" in response.headers["cache-control"]
+            etags[url] = response.headers["etag"]
+
+            repeat = client.get(url, headers={**identity, "If-None-Match": etags[url]})
+            assert repeat.status_code == 304 and repeat.content == b"", url
+            assert repeat.headers["etag"] == etags[url]
+        assert len(set(etags.values())) == len(ENDPOINTS)
+        assert loader.calls == 1  # One sheets load served every request
+
+        teams = client.get("/api/teams", headers=identity).json()
+        assert len(teams) == len(loader.teams)
+        assert client.get("/api/data", headers=identity).json()["summary"]["total_teams"] == len(loader.teams)
+
+        # A compressed variant has its own ETag and still revalidates
+        compressed = client.get("/api/data", headers={"Accept-Encoding": "gzip"})
+        assert compressed.headers["content-encoding"] == "gzip"
+        assert compressed.headers["etag"] == etags["/api/data"][:-1] + '-gzip"'
+        assert "accept-encoding" in compressed.headers["vary"].lower()
+        repeat = client.get("/api/data", headers={"Accept-Encoding": "gzip", "If-None-Match": compressed.headers["etag"]})
+        assert repeat.status_code == 304
+        assert repeat.headers["etag"] == compressed.headers["etag"]  # Freshens the stored gzip copy
+        assert "accept-encoding" in repeat.headers["vary"].lower()
+
+        # An uncompressed copy revalidates under its own ETag
+        repeat = client.get("/api/data", headers={"Accept-Encoding": "gzip", "If-None-Match": etags["/api/data"]})
+        assert repeat.status_code == 304 and repeat.headers["etag"] == etags["/api/data"]
+
+        # Edited sheets: new ETags, old ones no longer match
+        loader.content_hash = "v2"
+        league_data_cache.invalidate()
+        for url in ENDPOINTS:
+            if url == "/api/rules":
+                continue
+            response = client.get(url, headers={**identity, "If-None-Match": etags[url]})
+            assert response.status_code == 200, url
+            assert response.headers["etag"] != etags[url]
+
+        # Rules come from config: same ETag, and no sheets load behind them
+        league_data_cache.invalidate()
+        calls = loader.calls
+        response = client.get("/api/rules", headers={**identity, "If-None-Match": etags["/api/rules"]})
+        assert response.status_code == 304 and loader.calls == calls
+    finally:
+        league_data_cache.loader = original
+        league_data_cache.invalidate()
+        rendered_bodies.clear()
+    print(f"[PASS] {len(ENDPOINTS)} endpoints answer conditional GETs with 304")
+
+
+if __name__ == "__main__":
+    test_cache_ttl()
+    test_cache_keeps_data_on_failed_reload()
+    test_etag_matching()
+    test_conditional_endpoints()
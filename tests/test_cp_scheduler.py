@@ -0,0 +1,125 @@
+"""
+Test the CP-SAT school-matchup scheduler.
+
+Verifies:
+1. Greedy placements are recovered as model options (the warm-start hint)
+2. The returned schedule is never worse than the greedy schedule
+3. A CP-SAT schedule keeps matchups back to back on one court
+4. The API rejects time limits that are not positive or exceed TIMEOUT_SECONDS
+5. Frequency windows span the same days as the greedy scheduler (7 days = first + 0..6)
+6. Candidate blocks are built only at the matchup's gyms and neutral sites
+"""
+
+import sys
+import os
+from collections import defaultdict
+from datetime import date, timedelta
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+
+from app.core.config import TIMEOUT_SECONDS
+from app.main import app
+from app.services.cp_scheduler import CPSatScheduler
+from app.services.league_generator import LeagueSpec, generate_league
+from app.services.scheduler_v2 import SchoolBasedScheduler
+from app.services.validator import ScheduleValidator
+
+
+def _league():
+    return generate_league(
+        LeagueSpec(num_schools=5, num_neutral_sites=2, home_gym_rate=0.0, blackout_rate=0.0, season_weeks=6)
+    )
+
+
+def test_greedy_hint_is_expressible():
+    """Every back-to-back run of the greedy schedule becomes a hinted option."""
+    teams, facilities, rules = _league()
+    greedy_schedule = SchoolBasedScheduler(teams, facilities, rules).optimize_schedule()
+
+    scheduler = CPSatScheduler(teams, facilities, rules)
+    placements = list(scheduler._greedy_placements(greedy_schedule))
+    options = scheduler._build_options(scheduler._generate_school_matchups(), placements)
+    hinted = scheduler._hint_options(options, placements)
+
+    assert sum(len(games) for _, _, games, _ in placements) == len(greedy_schedule.games)
+    assert len(hinted) == len(placements)
+    print(f"[PASS] {len(hinted)} greedy placements hinted among {len(options)} options")
+
+
+def test_cpsat_not_worse_than_greedy():
+    """The returned schedule ranks no worse than greedy on hard violations, then teams under 8."""
+    teams, facilities, rules = _league()
+    validator = ScheduleValidator()
+
+    greedy = CPSatScheduler(teams, facilities, rules)
+    greedy_quality = greedy._schedule_quality(
+        SchoolBasedScheduler(teams, facilities, rules).optimize_schedule(), validator
+    )
+
+    scheduler = CPSatScheduler(teams, facilities, rules, time_limit_seconds=10, num_workers=4)
+    schedule = scheduler.optimize_schedule()
+    quality = scheduler._schedule_quality(schedule, validator)
+    print(f"Status {scheduler.solver_status}, fallback {scheduler.used_greedy_fallback}: "
+          f"{quality} vs greedy {greedy_quality}")
+
+    assert scheduler.solver_status in ("OPTIMAL", "FEASIBLE")
+    assert quality <= greedy_quality
+
+    if not scheduler.used_greedy_fallback:
+        # Each school pair plays on one court per night, in consecutive slots
+        runs = defaultdict(list)
+        for game in schedule.games:
+            slot = game.time_slot
+            pair = frozenset((game.home_team.school.name, game.away_team.school.name))
+            runs[(slot.date, pair)].append(slot)
+        for slots in runs.values():
+            assert len({(s.facility.name, s.court_number) for s in slots}) == 1
+        for team in teams:
+            assert scheduler.team_game_count[team.id] <= 8
+    print("[PASS] CP-SAT schedule is at least as good as greedy")
+
+
+def test_time_limit_validated():
+    """Out-of-range time limits are rejected before any data is loaded."""
+    client = TestClient(app)
+    for limit in (0, -5, TIMEOUT_SECONDS + 1):
+        response = client.post("/api/schedule", json={"solver": "cpsat", "time_limit_seconds": limit})
+        assert response.status_code == 422, limit
+    print("[PASS] time_limit_seconds must be in (0, TIMEOUT_SECONDS]")
+
+
+
+def test_frequency_windows_match_greedy():
+    """A game 7 days after another starts a new 7-day window, as in SchoolBasedScheduler."""
+    start = date(2026, 1, 6)
+    dates = [start, start + timedelta(days=6), start + timedelta(days=7), start + timedelta(days=14)]
+    assert CPSatScheduler._frequency_windows(dates, 7) == [
+        [dates[0], dates[1]], [dates[1], dates[2]], [dates[2]], [dates[3]]
+    ]
+    assert CPSatScheduler._frequency_windows(dates, 14)[0] == dates[:3]
+    print("[PASS] Frequency windows exclude the 7th and 14th day after the first")
+
+
+def test_candidates_built_lazily():
+    """Building one matchup's options leaves other schools' gyms unmaterialized."""
+    teams, facilities, rules = generate_league(LeagueSpec(num_schools=8, num_neutral_sites=2, home_gym_rate=1.0))
+    scheduler = CPSatScheduler(teams, facilities, rules)
+    matchup = scheduler._generate_school_matchups()[0]
+    options = scheduler._build_options([matchup], [])
+    assert options
+
+    owners = {matchup.school_a.name, matchup.school_b.name, None}
+    touched = {scheduler.time_blocks.facilities[facility_index].name
+               for _, facility_index in scheduler.time_blocks._blocks}
+    assert all(scheduler._facility_owner_names[name] in owners for name in touched)
+    assert scheduler.time_blocks.materialized < len(scheduler.time_blocks)
+    print(f"[PASS] {scheduler.time_blocks.materialized} of {len(scheduler.time_blocks)} blocks built for one matchup")
+
+
+if __name__ == "__main__":
+    test_greedy_hint_is_expressible()
+    test_cpsat_not_worse_than_greedy()
+    test_time_limit_validated()
+    test_frequency_windows_match_greedy()
+    test_candidates_built_lazily()
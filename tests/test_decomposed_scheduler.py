@@ -0,0 +1,199 @@
+"""
+Test decomposed (per-cluster, parallel) scheduling.
+
+Verifies:
+1. Schools are partitioned by cluster, small clusters are combined and neutral
+   sites are shared by every subproblem
+2. Merging drops whole matchups that collide on a court already in use, on a
+   weeknight court kept for another school pairing, or that give a team a
+   second weeknight game
+3. A neutral weeknight court collision leaves no court/night under the 3-game minimum:
+   what the dropped run leaves behind is dropped too and queued for repair
+4. A full decomposed run produces one consistent schedule
+"""
+
+import sys
+import os
+from collections import Counter
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models import Schedule
+from app.services.decomposed_scheduler import DecomposedScheduler, MIN_CLUSTER_SCHOOLS
+from app.services.league_generator import LeagueSpec, generate_league
+
+
+def _league(**overrides):
+    spec = LeagueSpec(num_schools=16, num_neutral_sites=3, blackout_rate=0.0, season_weeks=6)
+    for key, value in overrides.items():
+        setattr(spec, key, value)
+    return generate_league(spec)
+
+
+def test_partition():
+    """Every team lands in exactly one subproblem; neutral sites are in all of them."""
+    teams, facilities, rules = _league()
+    scheduler = DecomposedScheduler(teams, facilities, rules)
+    subproblems = scheduler._partition()
+
+    assigned = Counter(team.id for cluster_teams, _ in subproblems.values() for team in cluster_teams)
+    assert sorted(assigned) == sorted(team.id for team in teams)
+    assert set(assigned.values()) == {1}
+
+    for cluster_teams, _ in subproblems.values():
+        assert len({team.school.name for team in cluster_teams}) >= MIN_CLUSTER_SCHOOLS
+
+    neutral = [f for f in facilities if not any(
+        scheduler._facility_belongs_to_school(f.name, t.school.name) for t in teams
+    )]
+    for _, cluster_facilities in subproblems.values():
+        names = {f.name for f in cluster_facilities}
+        assert all(f.name in names for f in neutral)
+    print(f"[PASS] {len(subproblems)} subproblems: {sorted(subproblems)}")
+
+
+def test_merge_drops_colliding_matchups():
+    """The second copy of a matchup on the same court is dropped as a whole."""
+    teams, facilities, rules = _league()
+    scheduler = DecomposedScheduler(teams, facilities, rules)
+    schedule = Schedule()
+
+    matchup = next(m for m in scheduler._generate_school_matchups() if len(m.games) >= 2)
+    block = next(b for b in scheduler.time_blocks if b.date.weekday() == 5 and b.num_consecutive_slots >= 2)
+    records = [
+        (team_a.id, team_b.id, division.value, slot.date, slot.start_time, slot.end_time,
+         slot.facility.name, slot.court_number)
+        for (team_a, team_b, division), slot in zip(matchup.games[:2], block.get_slots(2))
+    ]
+
+    scheduler._merge_records(schedule, records)
+    assert len(schedule.games) == 2
+    scheduler._merge_records(schedule, records)
+    assert len(schedule.games) == 2
+    assert scheduler.merge_conflicts == 2
+    print("[PASS] Colliding matchups are dropped as a unit")
+
+
+def test_merge_keeps_weeknight_rules():
+    """Runs that break the weeknight court pairing or doubleheader rules are dropped."""
+    teams, facilities, rules = _league()
+    scheduler = DecomposedScheduler(teams, facilities, rules)
+    schedule = Schedule()
+    schools = {team.school.name for team in teams}
+
+    def neutral(block):
+        return not any(scheduler._facility_belongs_to_school(block.facility.name, school) for school in schools)
+
+    def records(games, slots):
+        return [
+            (team_a.id, team_b.id, division.value, slot.date, slot.start_time, slot.end_time,
+             slot.facility.name, slot.court_number)
+            for (team_a, team_b, division), slot in zip(games, slots)
+        ]
+
+    block = next(b for b in scheduler.time_blocks
+                 if b.date.weekday() < 5 and neutral(b) and b.num_consecutive_slots >= 2)
+    first_slot, second_slot = block.get_slots(2)
+    matchups = scheduler._generate_school_matchups()
+    first = matchups[0]
+    pair = {first.school_a.name, first.school_b.name}
+    other = next(m for m in matchups if not {m.school_a.name, m.school_b.name} & pair)
+
+    # An earlier cluster's game on the neutral court
+    scheduler._commit_game(schedule, *first.games[0], first_slot)
+
+    # Another pairing on the same court later that night
+    scheduler._merge_records(schedule, records(other.games[:1], [second_slot]))
+    assert len(schedule.games) == 1 and scheduler.merge_conflicts == 1
+
+    # The same team again that night, on another court
+    elsewhere = next(b for b in scheduler.time_blocks
+                     if b.date == block.date and (b.facility.name, b.court_number) != (block.facility.name, block.court_number)
+                     and b.start_time != first_slot.start_time)
+    scheduler._merge_records(schedule, records(first.games[:1], elsewhere.get_slots(1)))
+    assert len(schedule.games) == 1 and scheduler.merge_conflicts == 2
+    print("[PASS] Merge keeps weeknight court pairings and no weeknight doubleheaders")
+
+
+
+def _weeknight_court_games(schedule):
+    return Counter(
+        (g.time_slot.date, g.time_slot.facility.name, g.time_slot.court_number)
+        for g in schedule.games if g.time_slot.date.weekday() < 5
+    )
+
+
+def test_merge_keeps_weeknight_minimum():
+    """A run dropped on a shared neutral weeknight court takes its short sibling court with it."""
+    teams, facilities, rules = _league()
+    scheduler = DecomposedScheduler(teams, facilities, rules)
+    schedule = Schedule()
+    schools = {team.school.name for team in teams}
+
+    def neutral(block):
+        return not any(scheduler._facility_belongs_to_school(block.facility.name, school) for school in schools)
+
+    def records(games, slots):
+        return [
+            (team_a.id, team_b.id, division.value, slot.date, slot.start_time, slot.end_time,
+             slot.facility.name, slot.court_number)
+            for (team_a, team_b, division), slot in zip(games, slots)
+        ]
+
+    shared, sibling = next(
+        (a, b) for a in scheduler.time_blocks if a.date.weekday() < 5 and neutral(a) and a.num_consecutive_slots >= 3
+        for b in scheduler.time_blocks.blocks_on(a.date)
+        if neutral(b) and b.facility.name != a.facility.name and b.start_time == a.start_time
+        and b.num_consecutive_slots >= 3
+    )
+    matchups = [m for m in scheduler._generate_school_matchups() if len(m.games) >= 3]
+    first = matchups[0]
+    pair = {first.school_a.name, first.school_b.name}
+    other = next(m for m in matchups if not {m.school_a.name, m.school_b.name} & pair)
+
+    # The largest cluster fills the neutral court that night
+    scheduler._merge_records(schedule, records(first.games[:3], shared.get_slots(3)))
+    assert len(schedule.games) == 3
+
+    # The next cluster put two games there and its third on the court next to it
+    scheduler._merge_records(
+        schedule, records(other.games[:2], shared.get_slots(2)) + records(other.games[2:3], sibling.get_slots(3)[2:])
+    )
+    assert len(schedule.games) == 3
+    assert scheduler.merge_conflicts == 3
+    assert sorted(len(m.games) for m in scheduler.dropped_matchups) == [1, 2]
+    assert min(_weeknight_court_games(schedule).values()) >= 3
+
+    scheduler._replace_dropped(schedule)
+    assert min(_weeknight_court_games(schedule).values()) >= 3
+    print(f"[PASS] Weeknight minimum kept after a neutral court collision ({len(schedule.games)} games after repair)")
+
+
+def test_decomposed_run():
+    """A full run (in worker processes) has no double-booked courts or teams."""
+    teams, facilities, rules = _league()
+    scheduler = DecomposedScheduler(teams, facilities, rules, profile=True, max_workers=2)
+    schedule = scheduler.optimize_schedule()
+
+    courts = Counter(
+        (g.time_slot.date, g.time_slot.start_time, g.time_slot.facility.name, g.time_slot.court_number)
+        for g in schedule.games
+    )
+    assert max(courts.values()) == 1
+    team_slots = Counter(
+        (team.id, g.time_slot.date, g.time_slot.start_time)
+        for g in schedule.games for team in (g.home_team, g.away_team)
+    )
+    assert max(team_slots.values()) == 1
+    for team in teams:
+        assert scheduler.team_game_count[team.id] == len(schedule.get_team_games(team))
+
+    under_8 = sum(1 for team in teams if scheduler.team_game_count[team.id] < 8)
+    print(f"[PASS] Decomposed run: {len(schedule.games)} games, {under_8} teams under 8")
+
+
+if __name__ == "__main__":
+    test_partition()
+    test_merge_drops_colliding_matchups()
+    test_merge_keeps_weeknight_rules()
+    test_merge_keeps_weeknight_minimum()
+    test_decomposed_run()
@@ -0,0 +1,170 @@
+"""
+Test the CSV, XLSX and iCalendar schedule exports.
+
+Verifies:
+1. CSV has one row per game, in season order, with the right week numbers
+2. iCalendar output is well-formed: CRLF lines folded to 75 octets, one VEVENT per game
+3. Per-team and per-coach calendars cover every game, each event rendered once
+4. XLSX has one sheet per week (skipped without openpyxl)
+5. The export endpoints stream the stored schedule; the XLSX build runs off the event loop
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import csv
+import inspect
+import io
+import tempfile
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services import exporters
+from app.services.exporters import (
+    CalendarWriter, WEEK_SHEET_HEADERS, calendar_groups, in_season_order, iter_csv,
+    week_number, week_sheet_name, write_calendars, write_xlsx
+)
+from app.services.game_format import GameFormatter
+from app.services.league_generator import LeagueSpec, generate_league
+from app.services.schedule_query import season_order_key
+from app.services.schedule_store import schedule_store
+from app.services.scheduler_v2 import SchoolBasedScheduler
+
+
+def _generated():
+    teams, facilities, rules = generate_league(
+        LeagueSpec(num_schools=6, num_neutral_sites=2, home_gym_rate=0.5, blackout_rate=0.0)
+    )
+    schedule = SchoolBasedScheduler(teams, facilities, rules).optimize_schedule()
+    return teams, schedule
+
+
+def _check_calendar(text, expected_events):
+    assert text.startswith("BEGIN:VCALENDAR\r\n") and text.endswith("END:VCALENDAR\r\n")
+    lines = text.split("\r\n")[:-1]
+    assert all(len(line.encode('utf-8')) <= 75 for line in lines)
+    assert "\n" not in text.replace("\r\n", "")
+    assert text.count("BEGIN:VEVENT") == text.count("END:VEVENT") == expected_events
+    unfolded = text.replace("\r\n ", "").split("\r\n")
+    uids = [line for line in unfolded if line.startswith("UID:")]
+    assert len(set(uids)) == len(uids)
+
+
+def test_csv():
+    """One CSV row per game, in season order, with week numbers from the season start."""
+    teams, schedule = _generated()
+    games = in_season_order(schedule.games)
+    text = "".join(iter_csv(games, schedule.season_start, batch_size=7))
+    rows = list(csv.reader(io.StringIO(text)))
+
+    assert rows[0] == ["WEEK"] + WEEK_SHEET_HEADERS
+    assert len(rows) - 1 == len(schedule.games)
+    assert [season_order_key(g) for g in games] == sorted(season_order_key(g) for g in schedule.games)
+    formatter = GameFormatter()
+    for game, row in zip(games, rows[1:]):
+        data = formatter.game(game)
+        assert int(row[0]) == week_number(game.time_slot.date, schedule.season_start)
+        assert row[1:] == [data["date"], data["day"], data["time"], data["home_team"], data["away_team"],
+                           data["facility"], data["division"]]
+    assert week_sheet_name(3).endswith(" 3")
+    print(f"[PASS] CSV export of {len(schedule.games)} games")
+
+
+def test_calendars():
+    """Calendars are valid and every team and coach calendar has all its games."""
+    teams, schedule = _generated()
+    games = in_season_order(schedule.games)
+    writer = CalendarWriter()
+
+    by_team = calendar_groups(games, by="team")
+    for team in teams:
+        expected = [g for g in games if team.id in (g.home_team.id, g.away_team.id)]
+        if expected:
+            assert by_team[team.id][1] == expected
+    by_coach = calendar_groups(games, by="coach")
+    for coach, (name, coach_games) in by_coach.items():
+        expected = [g for g in games if coach in (g.home_team.coach_name, g.away_team.coach_name)]
+        assert coach_games == expected, coach
+
+    text = "".join(writer.iter_calendar(games, "Whole league, with a long name that certainly needs folding"))
+    _check_calendar(text, len(games))
+
+    with tempfile.TemporaryDirectory() as directory:
+        team_files = write_calendars(games, os.path.join(directory, "teams"), "team", writer)
+        coach_files = write_calendars(games, os.path.join(directory, "coaches"), "coach", writer)
+        assert team_files == len(by_team) == len(os.listdir(os.path.join(directory, "teams")))
+        assert coach_files == len(by_coach) == len(os.listdir(os.path.join(directory, "coaches")))
+        total_events = 0
+        for name in os.listdir(os.path.join(directory, "teams")):
+            with open(os.path.join(directory, "teams", name), encoding="utf-8", newline="") as f:
+                content = f.read()
+            total_events += content.count("BEGIN:VEVENT")
+            _check_calendar(content, content.count("BEGIN:VEVENT"))
+        assert total_events == 2 * len(games)  # Every game is on both teams' calendars
+
+    assert len(writer._events) == len(games)  # Each game rendered once across all calendars
+    print(f"[PASS] {team_files} team and {coach_files} coach calendars")
+
+
+def test_xlsx():
+    """One sheet per week holding that week's games."""
+    if exporters.openpyxl is None:
+        print("[SKIP] openpyxl not installed")
+        return
+    teams, schedule = _generated()
+    games = in_season_order(schedule.games)
+    buffer = io.BytesIO()
+    assert write_xlsx(games, buffer, schedule.season_start) == len(games)
+    buffer.seek(0)
+    workbook = exporters.openpyxl.load_workbook(buffer, read_only=True)
+    weeks = sorted({week_number(g.time_slot.date, schedule.season_start) for g in games})
+    assert workbook.sheetnames == [week_sheet_name(week) for week in weeks]
+    rows = sum(sheet.max_row - 1 for sheet in workbook.worksheets)
+    assert rows == len(games)
+    print(f"[PASS] XLSX export with {len(weeks)} weekly sheets")
+
+
+def test_export_endpoints():
+    """CSV and iCalendar endpoints stream the stored schedule; bad requests are rejected."""
+    teams, schedule = _generated()
+    schedule_store.clear()
+    stored = schedule_store.add(schedule, teams)
+    client = TestClient(app)
+    base = f"/api/schedule/{stored.schedule_id}"
+    try:
+        response = client.get(f"{base}/export.csv")
+        assert response.status_code == 200 and response.headers["content-type"].startswith("text/csv")
+        assert "attachment" in response.headers["content-disposition"]
+        assert len(list(csv.reader(io.StringIO(response.text)))) == len(schedule.games) + 1
+
+        team = teams[0]
+        response = client.get(f"{base}/calendar.ics", params={"team": team.id})
+        assert response.status_code == 200 and response.headers["content-type"].startswith("text/calendar")
+        expected = sum(1 for g in schedule.games if team.id in (g.home_team.id, g.away_team.id))
+        _check_calendar(response.text, expected)
+
+        response = client.get(f"{base}/calendar.ics", params={"coach": team.coach_name.lower()})
+        assert response.status_code == 200
+        expected = sum(1 for g in schedule.games if team.coach_name in (g.home_team.coach_name, g.away_team.coach_name))
+        _check_calendar(response.text, expected)
+
+        assert client.get(f"{base}/calendar.ics").status_code == 400
+        assert client.get(f"{base}/calendar.ics", params={"team": team.id, "coach": "x"}).status_code == 400
+        assert client.get("/api/schedule/missing/export.csv").status_code == 404
+
+        response = client.get(f"{base}/export.xlsx")
+        assert response.status_code == (501 if exporters.openpyxl is None else 200)
+        xlsx_route = next(route for route in app.routes if getattr(route, "path", None) == "/api/schedule/{schedule_id}/export.xlsx")
+        assert not inspect.iscoroutinefunction(xlsx_route.endpoint)
+    finally:
+        schedule_store.clear()
+    print("[PASS] Export endpoints")
+
+
+if __name__ == "__main__":
+    test_csv()
+    test_calendars()
+    test_xlsx()
+    test_export_endpoints()
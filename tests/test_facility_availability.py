@@ -0,0 +1,122 @@
+"""
+Test the facility availability bitsets.
+
+Verifies:
+1. is_available matches the available/unavailable date lists for every date
+2. Facilities without date lists are available every day
+3. Assigning new date lists rebuilds the bitsets; the lists are immutable tuples
+4. FACILITIES rows become deduplicated dates and per-date hours
+"""
+
+import sys
+import os
+import random
+from datetime import date, time, timedelta
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models import Facility
+from app.services.sheets_reader import SheetsReader
+
+
+SEASON_START = date(2026, 1, 5)
+
+
+def _season_days(weeks=10):
+    return [SEASON_START + timedelta(days=i) for i in range(weeks * 7)]
+
+
+def test_bitset_matches_date_lists():
+    """Every date answers the same as list membership would."""
+    rng = random.Random(7)
+    days = _season_days()
+    for _ in range(20):
+        available = rng.sample(days, rng.randint(0, len(days)))
+        unavailable = rng.sample(days, rng.randint(0, 10))
+        facility = Facility(name="Gym", address="Gym", available_dates=available, unavailable_dates=unavailable)
+
+        # Include dates before and after every listed date
+        for day in [SEASON_START - timedelta(days=30)] + days + [days[-1] + timedelta(days=30)]:
+            expected = day not in unavailable and (not available or day in available)
+            assert facility.is_available(day) == expected, (day, available, unavailable)
+    print("[PASS] Bitset lookups match the date lists")
+
+
+def test_no_dates_means_always_available():
+    """A facility without date lists is open every day."""
+    facility = Facility(name="Gym", address="Gym")
+    assert all(facility.is_available(day) for day in _season_days())
+    print("[PASS] Facilities without dates are always available")
+
+
+def test_edits_rebuild_bitsets():
+    """Assigning new date lists rebuilds the bitsets; the lists can't be edited in place."""
+    days = _season_days()
+    facility = Facility(name="Gym", address="Gym", available_dates=[days[0]])
+    assert not facility.is_available(days[1])
+
+    facility.available_dates += (days[1],)
+    assert facility.is_available(days[1])
+
+    facility.unavailable_dates = [days[0]]
+    assert not facility.is_available(days[0]) and facility.unavailable_dates == (days[0],)
+
+    # Same lengths, different dates
+    facility.available_dates = (days[0], days[2])
+    assert not facility.is_available(days[1]) and facility.is_available(days[2])
+    facility.unavailable_dates = (days[2],)
+    assert facility.is_available(days[0]) and not facility.is_available(days[2])
+
+    try:
+        facility.available_dates.append(days[3])
+        assert False, "Date lists are tuples"
+    except AttributeError:
+        pass
+    print("[PASS] Date list assignments rebuild the bitsets")
+
+
+class _Sheet:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def get_all_values(self):
+        return self.rows
+
+
+class _Spreadsheet:
+    def __init__(self, rows):
+        self.sheet = _Sheet(rows)
+
+    def worksheet(self, name):
+        return self.sheet
+
+
+def test_load_facilities_hours():
+    """Rows for one court merge their dates, and each row's hours apply to its own dates."""
+    reader = SheetsReader.__new__(SheetsReader)  # No Google credentials needed
+    reader._facilities_cache = None
+    reader._sheet_digests = {}
+    reader.spreadsheet = _Spreadsheet([
+        ['SITE', 'DATES', 'COURT', 'START TIME', 'END TIME', 'GAME LENGTH', 'DIVISIONS ALLOWED', 'NOTES'],
+        ['Central Gym', 'Jan. 6, 7', 'Court 1', '6:00 PM', '8:30 PM', '60', '', ''],
+        ['Central Gym', 'Jan. 7, 10', 'Court 1', '8:00 AM', '12:00 PM', '60', '', ''],
+        ['Open Gym', '', 'Court 1', '5:00', '7:00', '60', '', ''],
+    ])
+
+    facilities = {f.name: f for f in reader.load_facilities()}
+    central = facilities['Central Gym - Court 1']
+    assert central.available_dates == (date(2026, 1, 6), date(2026, 1, 7), date(2026, 1, 10))
+    assert central.time_windows[date(2026, 1, 6)] == ((time(18, 0), time(20, 30)),)
+    assert central.time_windows[date(2026, 1, 7)] == ((time(8, 0), time(12, 0)), (time(18, 0), time(20, 30)))
+    assert central.time_windows_on(date(2026, 1, 8)) == ()
+
+    open_gym = facilities['Open Gym - Court 1']
+    assert open_gym.available_dates == ()
+    assert open_gym.time_windows_on(date(2026, 1, 8)) == ((time(17, 0), time(19, 0)),)
+    print("[PASS] FACILITIES rows parsed into dates and hours")
+
+
+if __name__ == "__main__":
+    test_bitset_matches_date_lists()
+    test_no_dates_means_always_available()
+    test_edits_rebuild_bitsets()
+    test_load_facilities_hours()
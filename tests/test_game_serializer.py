@@ -0,0 +1,78 @@
+"""
+Test the cached game serializer and JSON encoding.
+
+Verifies:
+1. Serialized games validate as GameResponse and keep the Sheets formatting
+2. Formatted strings are shared between games with the same slot, team or court
+3. The standard library fallback encodes the same JSON as orjson
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+from datetime import date
+
+import app.api.serializers as serializers
+from app.api.routes import GameResponse
+from app.api.serializers import GameSerializer, dumps
+from app.services.league_generator import LeagueSpec, generate_league
+from app.services.scheduler_v2 import SchoolBasedScheduler
+
+
+def _schedule():
+    teams, facilities, rules = generate_league(
+        LeagueSpec(num_schools=6, num_neutral_sites=2, home_gym_rate=0.0, blackout_rate=0.0)
+    )
+    return SchoolBasedScheduler(teams, facilities, rules).optimize_schedule()
+
+
+def test_games_match_response_model():
+    """Every serialized game is a valid GameResponse with the expected strings."""
+    schedule = _schedule()
+    serializer = GameSerializer()
+    games = serializer.games(schedule.games)
+    assert len(games) == len(schedule.games)
+
+    for game, data in zip(schedule.games, games):
+        assert GameResponse(**data).model_dump() == data
+        slot = game.time_slot
+        assert data["date"] == slot.date.isoformat()
+        assert data["day"] == slot.date.strftime("%A")
+        assert data["time"].endswith("M") and not data["time"].startswith("0")
+        assert data["home_team"] == f"{game.home_team.school.name} ({game.home_team.coach_name})"
+        if slot.court_number > 0:
+            assert data["facility"] == f"{slot.facility.name} - Court {slot.court_number}"
+
+    # Formatted once per distinct value
+    assert len(serializer._slot_strings) < len(schedule.games)
+    assert len(serializer._facility_displays) < len(schedule.games)
+    assert serializer.game(schedule.games[0], {"date", "court"}).keys() == {"date", "court"}
+    print(f"[PASS] {len(games)} games serialized; {len(serializer._slot_strings)} distinct slots formatted")
+
+
+def test_json_fallback_matches_orjson():
+    """Without orjson the standard library produces the same document."""
+    schedule = _schedule()
+    content = {
+        "games": GameSerializer().games(schedule.games),
+        "counts": {1: 2},
+        "season_start": date(2026, 1, 5),
+        "penalty": 12.5,
+    }
+    fast = dumps(content)
+    original = serializers.orjson
+    serializers.orjson = None
+    try:
+        fallback = dumps(content)
+    finally:
+        serializers.orjson = original
+    assert json.loads(fast) == json.loads(fallback)
+    assert json.loads(fallback)["season_start"] == "2026-01-05"
+    print("[PASS] json fallback matches orjson output")
+
+
+if __name__ == "__main__":
+    test_games_match_response_model()
+    test_json_fallback_matches_orjson()
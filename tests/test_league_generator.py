@@ -0,0 +1,89 @@
+"""
+Test the synthetic league generator used for offline scale testing.
+
+Verifies:
+1. Output is deterministic for a given seed
+2. Scaling multiplies schools and facilities
+3. Home gyms map to exactly one school and neutral sites to none
+4. Generated leagues can be scheduled and validated offline
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models import Division
+from app.services.league_generator import LeagueSpec, generate_league
+from app.services.scheduler_v2 import SchoolBasedScheduler
+from app.services.validator import ScheduleValidator
+
+
+def test_deterministic():
+    """The same spec must always produce the same league."""
+    first = generate_league(LeagueSpec(num_schools=12, seed=7))
+    second = generate_league(LeagueSpec(num_schools=12, seed=7))
+    other = generate_league(LeagueSpec(num_schools=12, seed=8))
+
+    assert [t.id for t in first[0]] == [t.id for t in second[0]]
+    assert [f.name for f in first[1]] == [f.name for f in second[1]]
+    assert first[2]['blackouts'] == second[2]['blackouts']
+    assert [t.id for t in first[0]] != [t.id for t in other[0]]
+    print("[PASS] Generator is deterministic per seed")
+
+
+def test_scaling():
+    """scaled() should grow schools and neutral sites proportionally."""
+    base = LeagueSpec()
+    for factor in (1, 5):
+        teams, facilities, rules = generate_league(base.scaled(factor))
+        schools = {t.school.name for t in teams}
+        print(f"  {factor}x: {len(schools)} schools, {len(teams)} teams, {len(facilities)} courts")
+        assert len(schools) == base.num_schools * factor
+        assert len({t.id for t in teams}) == len(teams)
+        assert len({f.name for f in facilities}) == len(facilities)
+        assert rules['season_start'] < rules['season_end']
+    print("[PASS] League scales with factor")
+
+
+def test_facility_ownership():
+    """Home gyms must be recognized by the scheduler; neutral sites must not."""
+    teams, facilities, rules = generate_league(LeagueSpec(num_schools=20, home_gym_rate=0.5))
+    scheduler = SchoolBasedScheduler(teams, facilities, rules)
+    school_names = sorted({t.school.name for t in teams})
+
+    home_gyms = 0
+    for facility in facilities:
+        owners = [s for s in school_names if scheduler._facility_belongs_to_school(facility.name, s)]
+        if facility.address in school_names:
+            assert owners == [facility.address], (facility.name, owners)
+            home_gyms += 1
+        else:
+            assert owners == [], (facility.name, owners)
+
+    assert home_gyms > 0
+    assert any(f.has_8ft_rims for f in facilities) or not any(
+        t.division == Division.ES_K1_REC for t in teams
+    )
+    print(f"[PASS] {home_gyms} home gym courts matched to their schools, neutral sites unowned")
+
+
+def test_schedule_small_league():
+    """A small generated league should schedule without hard violations."""
+    spec = LeagueSpec(num_schools=6, num_neutral_sites=2, home_gym_rate=0.0, blackout_rate=0.0)
+    teams, facilities, rules = generate_league(spec)
+
+    scheduler = SchoolBasedScheduler(teams, facilities, rules)
+    schedule = scheduler.optimize_schedule()
+    result = ScheduleValidator().validate_schedule(schedule)
+
+    print(f"  {len(teams)} teams, {len(schedule.games)} games, "
+          f"{len(result.hard_constraint_violations)} hard violations")
+    assert len(schedule.games) > 0
+    print("[PASS] Generated league schedules offline")
+
+
+if __name__ == "__main__":
+    test_deterministic()
+    test_scaling()
+    test_facility_ownership()
+    test_schedule_small_league()
@@ -0,0 +1,87 @@
+"""
+Test the shared league view behind /api/data, /api/info, /api/teams and /api/schools.
+
+Verifies:
+1. Division, cluster and tier summaries add up to the teams and schools
+2. Every school row lists exactly its teams
+3. The view is built once per LeagueData and shared by the endpoints
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+
+from app.api.caching import rendered_bodies
+from app.main import app
+from app.services.league_data import LeagueData, league_data_cache
+from app.services.league_generator import LeagueSpec, generate_league
+from app.services.league_view import build_league_view
+
+
+def _league_data():
+    teams, facilities, rules = generate_league(LeagueSpec(num_schools=12, num_neutral_sites=2))
+    return LeagueData(
+        teams=teams,
+        facilities=facilities,
+        schools={team.school.name: team.school for team in teams},
+        rules=rules,
+        content_hash="league-view-test"
+    )
+
+
+def test_summaries():
+    """Summary counts match the teams they summarize."""
+    data = _league_data()
+    view = build_league_view(data.teams, data.facilities)
+
+    assert len(view.team_rows) == len(view.team_infos) == len(data.teams)
+    assert sum(d["team_count"] for d in view.divisions) == len(data.teams)
+    assert all(d["estimated_games"] == d["team_count"] * 4 for d in view.divisions)
+    assert sum(c["team_count"] for c in view.clusters) == sum(1 for t in data.teams if t.cluster)
+    assert sum(c["school_count"] for c in view.clusters) == sum(1 for s in view.schools if s["cluster"])
+    assert sum(t["school_count"] for t in view.tiers) == sum(1 for s in view.schools if s["tier"])
+    assert {d: len(rows) for d, rows in view.team_infos_by_division.items()} == {
+        d["name"]: d["team_count"] for d in view.divisions
+    }
+
+    for school, info in zip(view.schools, view.school_infos):
+        ids = [t.id for t in data.teams if t.school.name == school["name"]]
+        assert [t["id"] for t in school["teams"]] == ids == view.team_ids_by_school[school["name"]]
+        assert [t["id"] for t in info["teams"]] == ids
+    assert len(view.facility_rows) == len(view.facility_infos) == len(data.facilities)
+    print(f"[PASS] Summaries for {len(data.teams)} teams, {len(view.schools)} schools add up")
+
+
+def test_view_shared_by_endpoints():
+    """One view per data version; the endpoints agree with it and each other."""
+    data = _league_data()
+    original = league_data_cache.loader
+    league_data_cache.loader = lambda: data
+    league_data_cache.invalidate()
+    rendered_bodies.clear()
+    try:
+        client = TestClient(app)
+        full = client.get("/api/data").json()
+        view = data.view
+        info = client.get("/api/info").json()
+        teams = client.get("/api/teams").json()
+        schools = client.get("/api/schools").json()
+        assert data.view is view  # Built once, reused by every endpoint
+
+        assert full["summary"]["total_teams"] == info["summary"]["total_teams"] == len(teams)
+        assert full["divisions"] == view.divisions
+        assert [t["id"] for t in teams] == [t.id for t in data.teams]
+        assert sum(len(s["teams"]) for s in schools) == len(data.teams)
+        assert info["summary"]["teams_by_division"] == {d["name"]: d["team_count"] for d in full["divisions"]}
+    finally:
+        league_data_cache.loader = original
+        league_data_cache.invalidate()
+        rendered_bodies.clear()
+    print("[PASS] Data endpoints slice one shared league view")
+
+
+if __name__ == "__main__":
+    test_summaries()
+    test_view_shared_by_endpoints()
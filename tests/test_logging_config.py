@@ -0,0 +1,78 @@
+"""
+Test the logging configuration used by the services.
+
+Verifies:
+1. JSON output carries level, logger name and extra fields
+2. Rate-limited diagnostics are capped per key
+3. Per-module level overrides are applied
+"""
+
+import io
+import json
+import logging
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.logging_config import configure_logging, RateLimitFilter, _parse_module_levels
+
+
+def test_json_output():
+    """JSON lines should include extra fields passed by the caller."""
+    stream = io.StringIO()
+    configure_logging(level="INFO", json_output=True, stream=stream)
+
+    logging.getLogger("app.services.test").info("Loaded %d teams", 12, extra={"phase": "load"})
+
+    record = json.loads(stream.getvalue().strip())
+    assert record["level"] == "INFO"
+    assert record["logger"] == "app.services.test"
+    assert record["message"] == "Loaded 12 teams"
+    assert record["phase"] == "load"
+    print("[PASS] JSON formatter emits structured records")
+
+
+def test_rate_limit():
+    """Only records tagged with a rate_limit key are capped."""
+    rate_filter = RateLimitFilter(max_records=3, window_seconds=60)
+
+    def make_record(key=None):
+        record = logging.LogRecord("app", logging.DEBUG, "", 0, "msg", (), None)
+        if key:
+            record.rate_limit = key
+        return record
+
+    tagged = [rate_filter.filter(make_record("facility")) for _ in range(10)]
+    untagged = [rate_filter.filter(make_record()) for _ in range(10)]
+
+    assert sum(tagged) == 3
+    assert all(untagged)
+    print("[PASS] Rate limit caps repetitive diagnostics")
+
+
+def test_module_levels():
+    """LOG_MODULE_LEVELS-style overrides should set per-module levels."""
+    assert _parse_module_levels("a.b=debug, c=WARNING,bad") == {"a.b": "DEBUG", "c": "WARNING"}
+
+    stream = io.StringIO()
+    configure_logging(
+        level="WARNING",
+        json_output=False,
+        module_levels={"app.services.verbose_module": "DEBUG"},
+        stream=stream
+    )
+    logging.getLogger("app.services.verbose_module").debug("visible")
+    logging.getLogger("app.services.quiet_module").info("hidden")
+
+    output = stream.getvalue()
+    assert "visible" in output
+    assert "hidden" not in output
+    print("[PASS] Per-module levels applied")
+
+    logging.getLogger("app.services.verbose_module").setLevel(logging.NOTSET)
+
+
+if __name__ == "__main__":
+    test_json_output()
+    test_rate_limit()
+    test_module_levels()
@@ -0,0 +1,126 @@
+"""
+Test the worklist-based rematch passes.
+
+Verifies:
+1. Parked matchups are only retried when a helpful relaxation becomes active
+2. Partial passes only offer games whose teams both still need games
+3. Rematch passes add games and skip parked matchups on a generated league
+4. Each pass logs the number of games it added, not matchups
+"""
+
+import sys
+import os
+import logging
+import re
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.league_generator import LeagueSpec, generate_league
+from app.services import scheduler_v2
+from app.services.scheduler_v2 import SchoolBasedScheduler
+
+
+def _scheduler(**overrides):
+    spec = LeagueSpec(num_schools=6, num_neutral_sites=2, home_gym_rate=0.0, blackout_rate=0.0)
+    for key, value in overrides.items():
+        setattr(spec, key, value)
+    teams, facilities, rules = generate_league(spec)
+    return SchoolBasedScheduler(teams, facilities, rules, profile=True)
+
+
+def test_retry_rules():
+    """Relaxations resolve only their own rejection reasons."""
+    scheduler = _scheduler()
+    strict = frozenset()
+    saturday = frozenset({'relax_saturday_rest'})
+
+    rest_failure = (frozenset({'saturday_rest', 'court_in_use'}), strict)
+    assert not scheduler._rematch_retry_worthwhile(rest_failure, strict)
+    assert scheduler._rematch_retry_worthwhile(rest_failure, saturday)
+
+    hard_failure = (frozenset({'court_in_use', 'k1_rim'}), strict)
+    assert not scheduler._rematch_retry_worthwhile(hard_failure, saturday)
+
+    # Later games can lift weeknight rejections; the block failure memo decides
+    weeknight_failure = (frozenset({'weeknight_3game'}), strict)
+    assert scheduler._rematch_retry_worthwhile(weeknight_failure, strict)
+    print("[PASS] Parked matchups retried only when something could help")
+
+
+def test_needy_submatchup():
+    """Games with a team already at 8 are dropped from partial matchups."""
+    scheduler = _scheduler()
+    matchup = next(m for m in scheduler._generate_school_matchups() if len(m.games) >= 2)
+
+    assert scheduler._needy_submatchup(matchup) is matchup
+
+    team_a, team_b, _ = matchup.games[0]
+    scheduler.team_game_count[team_a.id] = 8
+    partial = scheduler._needy_submatchup(matchup)
+    assert partial is not None
+    assert all(team_a.id not in (a.id, b.id) for a, b, _ in partial.games)
+    print("[PASS] Partial matchups keep only games whose teams need games")
+
+
+def test_rematch_passes_run():
+    """Rematch passes should add games and skip parked matchups."""
+    scheduler = _scheduler()
+    scheduler.optimize_schedule()
+    report = scheduler.profiler.report()
+
+    rematch_phases = [p['name'] for p in report['phases'] if p['name'].startswith('rematch_pass_')]
+    print(f"Rematch passes: {rematch_phases}, counters: {report['counters']}")
+    assert scheduler.rematch_passes_used == len(rematch_phases)
+    if scheduler.rematch_passes_used > 1:
+        assert report['counters'].get('rematch_skipped_parked', 0) > 0
+    print("[PASS] Rematch worklist skips parked matchups")
+
+
+class _GameCounts(SchoolBasedScheduler):
+    """Records the schedule size when the rematch passes and the Saturday fill start."""
+
+    def _schedule_rematches(self, schedule, *args, **kwargs):
+        self.before_rematches = len(schedule.games)
+        return super()._schedule_rematches(schedule, *args, **kwargs)
+
+    def _fill_saturday_slots_aggressively(self, schedule, *args, **kwargs):
+        self.before_fill = len(schedule.games)
+        return super()._fill_saturday_slots_aggressively(schedule, *args, **kwargs)
+
+
+class _Messages(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def test_pass_logs_count_games():
+    """The per-pass counts add up to the games the rematch passes scheduled."""
+    teams, facilities, rules = generate_league(
+        LeagueSpec(num_schools=6, num_neutral_sites=2, home_gym_rate=0.0, blackout_rate=0.0)
+    )
+    scheduler = _GameCounts(teams, facilities, rules)
+    handler = _Messages()
+    scheduler_v2.logger.addHandler(handler)
+    level = scheduler_v2.logger.level
+    scheduler_v2.logger.setLevel(logging.INFO)
+    try:
+        scheduler.optimize_schedule()
+    finally:
+        scheduler_v2.logger.removeHandler(handler)
+        scheduler_v2.logger.setLevel(level)
+
+    matches = (re.match(r"\s*Added (\d+) games in this pass$", message) for message in handler.messages)
+    logged = [int(match.group(1)) for match in matches if match]
+    assert len(logged) == scheduler.rematch_passes_used
+    assert sum(logged) == scheduler.before_fill - scheduler.before_rematches
+    print(f"[PASS] Rematch passes logged {logged} games")
+
+
+if __name__ == "__main__":
+    test_retry_rules()
+    test_needy_submatchup()
+    test_rematch_passes_run()
+    test_pass_logs_count_games()
@@ -0,0 +1,126 @@
+"""
+Test response compression and the streamed/columnar game formats.
+
+Verifies:
+1. Accept-Encoding parsing honours q=0
+2. Large responses are gzip-compressed, small ones and clients without gzip are not
+3. format=ndjson streams one game per line (compressed chunk by chunk)
+4. format=columnar rebuilds to the same games as the row format
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import gzip
+import json
+import zlib
+
+from fastapi.testclient import TestClient
+
+from app.api.compression import accepted_encodings, brotli
+from app.main import app
+from app.services.league_generator import LeagueSpec, generate_league
+from app.services.schedule_store import schedule_store
+from app.services.scheduler_v2 import SchoolBasedScheduler
+
+
+def _stored():
+    teams, facilities, rules = generate_league(
+        LeagueSpec(num_schools=6, num_neutral_sites=2, home_gym_rate=0.0, blackout_rate=0.0)
+    )
+    schedule = SchoolBasedScheduler(teams, facilities, rules).optimize_schedule()
+    return schedule_store.add(schedule, teams)
+
+
+def test_accepted_encodings():
+    assert accepted_encodings("gzip, deflate, br") == {"gzip": 1.0, "deflate": 1.0, "br": 1.0}
+    assert accepted_encodings("br;q=0, gzip;q=0.8") == {"gzip": 0.8}
+    assert accepted_encodings("") == {}
+    print("[PASS] Accept-Encoding parsing")
+
+
+def test_large_json_is_compressed():
+    """Full game pages are compressed; health checks and identity clients are not."""
+    client = TestClient(app)
+    schedule_store.clear()
+    stored = _stored()
+    url = f"/api/schedule/{stored.schedule_id}/games"
+
+    raw = client.get(url, params={"limit": 1000}, headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in raw.headers
+
+    compressed = client.get(url, params={"limit": 1000}, headers={"Accept-Encoding": "gzip"})
+    expected = "br" if brotli is not None else "gzip"
+    if expected == "gzip":
+        assert compressed.headers["content-encoding"] == "gzip"
+        assert "Accept-Encoding" in compressed.headers["vary"]
+        assert compressed.json() == raw.json()
+        size = int(compressed.headers["content-length"])
+        print(f"Games page: {len(raw.content)} bytes -> {size} bytes gzip")
+        assert size < len(raw.content) / 3
+
+    health = client.get("/api/health", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in health.headers
+    schedule_store.clear()
+    print("[PASS] Large responses are compressed, small ones are not")
+
+
+def test_ndjson_stream():
+    """NDJSON lines match the row format, compressed or not."""
+    client = TestClient(app)
+    schedule_store.clear()
+    stored = _stored()
+    url = f"/api/schedule/{stored.schedule_id}/games"
+    rows = client.get(url, params={"limit": 1000}).json()["games"]
+
+    response = client.get(url, params={"format": "ndjson"}, headers={"Accept-Encoding": "identity"})
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines == rows
+
+    with client.stream("GET", url, params={"format": "ndjson"}, headers={"Accept-Encoding": "gzip"}) as streamed:
+        assert streamed.headers["content-encoding"] == ("br" if brotli is not None else "gzip")
+        body = b"".join(streamed.iter_raw())
+    if brotli is None:
+        text = gzip.decompress(body).decode()
+        assert [json.loads(line) for line in text.splitlines()] == rows
+
+        # Each flushed chunk can be decoded as soon as it arrives
+        first = zlib.decompressobj(31).decompress(body[:len(body) // 2])
+        assert first.startswith(b'{"id":')
+    schedule_store.clear()
+    print(f"[PASS] NDJSON stream of {len(lines)} games")
+
+
+def test_columnar_shape():
+    """Columnar pages rebuild to the same games."""
+    client = TestClient(app)
+    schedule_store.clear()
+    stored = _stored()
+    url = f"/api/schedule/{stored.schedule_id}/games"
+    rows = client.get(url, params={"limit": 50}).json()
+    page = client.get(url, params={"limit": 50, "format": "columnar"}).json()
+
+    assert page["total"] == rows["total"] and page["next_cursor"] == rows["next_cursor"]
+    columns = page["games"]
+    rebuilt = []
+    for i in range(page["count"]):
+        game = {name: values[i] for name, values in columns.items()}
+        game["home_team"] = page["teams"][game["home_team"]]
+        game["away_team"] = page["teams"][game["away_team"]]
+        game["facility"] = page["facilities"][game["facility"]]
+        rebuilt.append(game)
+    assert rebuilt == rows["games"]
+
+    selected = client.get(url, params={"format": "columnar", "fields": "date,home_team"}).json()
+    assert set(selected["games"]) == {"date", "home_team"}
+    schedule_store.clear()
+    print(f"[PASS] Columnar page: {len(page['teams'])} teams, {len(page['facilities'])} facilities referenced")
+
+
+if __name__ == "__main__":
+    test_accepted_encodings()
+    test_large_json_is_compressed()
+    test_ndjson_stream()
+    test_columnar_shape()
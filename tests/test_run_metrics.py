@@ -0,0 +1,70 @@
+"""
+Test the quality-versus-time metrics emitted for every schedule run.
+
+Verifies:
+1. Game counts per team are bucketed into exactly 8 / under 8 / over 8
+2. Weeknight courts with fewer than 3 games are counted
+3. Scheduler-derived fields (relaxation passes, utilization) are filled in
+"""
+
+import sys
+import os
+from datetime import date, time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models import Team, School, Facility, Division, TimeSlot, Game, Schedule
+from app.services.league_generator import LeagueSpec, generate_league
+from app.services.metrics import compute_run_metrics
+from app.services.scheduler_v2 import SchoolBasedScheduler
+from app.services.validator import ScheduleValidator
+
+
+def test_weeknight_court_counts():
+    """A weeknight court with 2 games is flagged, a Saturday court is not."""
+    gym = Facility(name="Test Gym - Court 1", address="Test Gym")
+    home = Team(id="A", school=School(name="Alpha"), division=Division.BOYS_JV, coach_name="X", coach_email="")
+    away = Team(id="B", school=School(name="Beta"), division=Division.BOYS_JV, coach_name="Y", coach_email="")
+
+    schedule = Schedule()
+    for i, (game_date, hour) in enumerate([
+        (date(2026, 1, 6), 17), (date(2026, 1, 6), 18),  # Tuesday: 2 games on one court
+        (date(2026, 1, 10), 9),                            # Saturday
+    ]):
+        schedule.add_game(Game(
+            id=f"G{i}", home_team=home, away_team=away, division=Division.BOYS_JV,
+            time_slot=TimeSlot(date=game_date, start_time=time(hour, 0), end_time=time(hour + 1, 0), facility=gym)
+        ))
+
+    metrics = compute_run_metrics(schedule, [home, away], wall_time_seconds=1.23456)
+
+    assert metrics["total_games"] == 3
+    assert metrics["teams_under_8_games"] == 2
+    assert metrics["weeknight_courts"] == 1
+    assert metrics["weeknight_courts_under_3_games"] == 1
+    assert metrics["hard_violations"] is None
+    assert metrics["wall_time_seconds"] == 1.235
+    print("[PASS] Weeknight court and game count metrics")
+
+
+def test_metrics_from_scheduler_run():
+    """A full run should report relaxation passes, utilization and violations."""
+    teams, facilities, rules = generate_league(
+        LeagueSpec(num_schools=6, num_neutral_sites=2, home_gym_rate=0.0, blackout_rate=0.0)
+    )
+    scheduler = SchoolBasedScheduler(teams, facilities, rules)
+    schedule = scheduler.optimize_schedule()
+    validation = ScheduleValidator().validate_schedule(schedule)
+
+    metrics = compute_run_metrics(schedule, teams, validation, wall_time_seconds=0.5, scheduler=scheduler)
+    print(f"Metrics: {metrics}")
+
+    assert metrics["teams_with_8_games"] + metrics["teams_under_8_games"] + metrics["teams_over_8_games"] == len(teams)
+    assert metrics["hard_violations"] == len(validation.hard_constraint_violations)
+    assert metrics["relaxation_passes_used"] == scheduler.rematch_passes_used
+    assert 0 < metrics["facility_utilization"] <= 1
+    print("[PASS] Scheduler run metrics")
+
+
+if __name__ == "__main__":
+    test_weeknight_court_counts()
+    test_metrics_from_scheduler_run()
@@ -0,0 +1,211 @@
+"""
+Test the demand-driven aggressive Saturday fill.
+
+Verifies:
+1. Teams with the fewest games are served first
+2. Filled games respect the hard constraints: no team, school or coach playing
+   twice at one time, no court used twice, non-K-1 games off 8ft-rim courts,
+   no school playing Friday and Saturday back to back
+3. A slot that gets used drops out of the free-slot index
+4. The fill adds at least as many games as the previous block-by-block scan
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from collections import Counter
+from datetime import timedelta
+
+from app.models import Division, Schedule
+from app.services.league_generator import LeagueSpec, generate_league
+from app.services.scheduler_v2 import SchoolBasedScheduler
+
+
+class _RecordingScheduler(SchoolBasedScheduler):
+    """Records every game the Saturday fill commits, with both teams' counts beforehand."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.filling = False
+        self.fill_log = []  # (game, fill pass, count_a, count_b)
+
+    def _fill_saturday_slots_aggressively(self, *args, **kwargs):
+        self.filling = True
+        try:
+            return super()._fill_saturday_slots_aggressively(*args, **kwargs)
+        finally:
+            self.filling = False
+
+    def _commit_game(self, schedule, team_a, team_b, *args, **kwargs):
+        counts = (self.team_game_count[team_a.id], self.team_game_count[team_b.id])
+        game = super()._commit_game(schedule, team_a, team_b, *args, **kwargs)
+        if self.filling:
+            self.fill_log.append((game, self.saturday_fill_passes_used) + counts)
+        return game
+
+
+class _BlockScanScheduler(SchoolBasedScheduler):
+    """The fill before the priority queue: every Saturday block x every matchup, each pass."""
+
+    def _fill_saturday_slots_aggressively(self, schedule, matchups, teams_needing_games):
+        for fill_pass in range(5):
+            if all(self.team_game_count[t.id] >= 8 for t in self.teams):
+                break
+            games_added = 0
+            max_rematches = 5 + fill_pass
+            for block in [b for b in self.time_blocks if b.date.weekday() == 5]:
+                for matchup in matchups:
+                    matchup_key = tuple(sorted([matchup.school_a.name, matchup.school_b.name]))
+                    if self.school_matchup_count[matchup_key] >= max_rematches:
+                        continue
+                    for team_a, team_b, division in matchup.games:
+                        if self.team_game_count[team_a.id] >= 8 and self.team_game_count[team_b.id] >= 8:
+                            continue
+                        slot = block.get_slots(1)[0]
+                        if (slot.date, slot.start_time, slot.facility.name, slot.court_number) in self.used_courts:
+                            continue
+                        key = (slot.date, slot.start_time)
+                        if key in self.team_time_slots[team_a.id] or key in self.team_time_slots[team_b.id]:
+                            continue
+                        if key in self.school_time_slots[team_a.school.name] or key in self.school_time_slots[team_b.school.name]:
+                            continue
+                        if key in self.coach_time_slots[team_a.coach_name] or key in self.coach_time_slots[team_b.coach_name]:
+                            continue
+                        if slot.facility.has_8ft_rims and division != Division.ES_K1_REC:
+                            continue
+                        if division == Division.ES_23_REC and not self._is_start_or_end_of_day(slot.date, slot.start_time):
+                            continue
+                        if not self._can_team_play_on_date(team_a, slot.date) or not self._can_team_play_on_date(team_b, slot.date):
+                            continue
+                        home_school = None
+                        if self._facility_belongs_to_school(slot.facility.name, team_a.school.name):
+                            home_school = team_a.school
+                        elif self._facility_belongs_to_school(slot.facility.name, team_b.school.name):
+                            home_school = team_b.school
+                        self._commit_game(schedule, team_a, team_b, division, slot, home_school)
+                        self.school_matchup_count[matchup_key] += 1
+                        games_added += 1
+                        break
+            if games_added == 0:
+                break
+
+
+def _league(**overrides):
+    spec = LeagueSpec(num_schools=12, num_neutral_sites=4, k1_court_rate=0.5)
+    for key, value in overrides.items():
+        setattr(spec, key, value)
+    return generate_league(spec)
+
+
+def test_fewest_games_first():
+    """The team furthest from 8 games is served first, and served counts only rise within a pass."""
+    teams, facilities, rules = _league()
+    scheduler = _RecordingScheduler(teams, facilities, rules)
+    matchups = scheduler._generate_school_matchups()
+
+    neediest = teams[len(teams) // 2]
+    for team in teams:
+        scheduler.team_game_count[team.id] = 7
+    scheduler.team_game_count[neediest.id] = 4
+
+    schedule = Schedule(season_start=scheduler.season_start, season_end=scheduler.season_end)
+    scheduler._fill_saturday_slots_aggressively(schedule, matchups, teams)
+    first_pass = [entry for entry in scheduler.fill_log if entry[1] == 1]
+    assert first_pass, "The fill should add games"
+
+    first_game = first_pass[0][0]
+    assert neediest.id in (first_game.home_team.id, first_game.away_team.id)
+    served_counts = [min(count_a, count_b) for _, _, count_a, count_b in first_pass]
+    assert served_counts == sorted(served_counts)
+    print(f"[PASS] Fewest games first: first-pass counts {served_counts[:6]}...")
+
+
+def test_hard_constraints_hold():
+    """Every filled game passes the hard constraints against the whole schedule."""
+    teams, facilities, rules = _league()
+    assert any(f.has_8ft_rims for f in facilities)
+    scheduler = _RecordingScheduler(teams, facilities, rules)
+    schedule = scheduler.optimize_schedule()
+    assert scheduler.fill_log, "The fill should add games on this league"
+
+    courts = Counter((g.time_slot.date, g.time_slot.start_time, g.time_slot.facility.name, g.time_slot.court_number)
+                     for g in schedule.games)
+    assert max(courts.values()) == 1
+
+    by_time = {}
+    school_dates = {}
+    for game in schedule.games:
+        key = (game.time_slot.date, game.time_slot.start_time)
+        by_time.setdefault(key, []).append(game)
+        for team in (game.home_team, game.away_team):
+            school_dates.setdefault(team.school.name, set()).add(game.time_slot.date)
+
+    for game, _, _, _ in scheduler.fill_log:
+        slot = game.time_slot
+        assert slot.date.weekday() == 5
+        others = [g for g in by_time[(slot.date, slot.start_time)] if g is not game]
+        for team in (game.home_team, game.away_team):
+            for other in others:
+                other_teams = (other.home_team, other.away_team)
+                assert team.id not in {t.id for t in other_teams}, "team double-booked"
+                assert team.school.name not in {t.school.name for t in other_teams}, "school double-booked"
+                assert team.coach_name not in {t.coach_name for t in other_teams}, "coach double-booked"
+            friday = slot.date - timedelta(days=1)
+            assert friday not in school_dates[team.school.name], "school plays Friday and Saturday"
+        if slot.facility.has_8ft_rims:
+            assert game.division == Division.ES_K1_REC
+    print(f"[PASS] {len(scheduler.fill_log)} filled games respect the hard constraints")
+
+
+def test_used_slot_leaves_index():
+    """A committed slot is skipped and dropped by later lookups and absent from a fresh index."""
+    teams, facilities, rules = _league()
+    scheduler = SchoolBasedScheduler(teams, facilities, rules)
+    schedule = Schedule(season_start=scheduler.season_start, season_end=scheduler.season_end)
+    matchups = scheduler._generate_school_matchups()
+    free_slots = scheduler._index_free_saturday_slots()
+    pairs = [game for matchup in matchups for game in matchup.games]
+
+    team_a, team_b, division = pairs[0]
+    slot = scheduler._find_free_saturday_slot(free_slots, team_a, team_b, division)
+    assert slot is not None
+    scheduler._commit_game(schedule, team_a, team_b, division, slot)
+    used = (slot.date, slot.start_time, slot.facility.name, slot.court_number)
+
+    def court(s):
+        return (s.date, s.start_time, s.facility.name, s.court_number)
+
+    assert all(court(s) != used for slots in scheduler._index_free_saturday_slots().values()
+               for time_slots in slots.values() for s in time_slots)
+
+    busy = {team_a.school.name, team_b.school.name}
+    for other_a, other_b, other_division in pairs[1:]:
+        if {other_a.school.name, other_b.school.name} & busy:
+            continue
+        other = scheduler._find_free_saturday_slot(free_slots, other_a, other_b, other_division)
+        if other is not None and (other.date, other.start_time) == (slot.date, slot.start_time):
+            assert court(other) != used
+            assert all(court(s) != used for s in free_slots[slot.date][slot.start_time])
+            break
+    else:
+        assert False, "No other pair probed the used slot's time"
+    print("[PASS] Used slot dropped from the free-slot index")
+
+
+def test_matches_block_scan_game_count():
+    """The queue-driven fill schedules at least as many games as the block scan it replaced."""
+    counts = {}
+    for scheduler_class in (_BlockScanScheduler, SchoolBasedScheduler):
+        teams, facilities, rules = _league(num_neutral_sites=2, k1_court_rate=0.25)
+        counts[scheduler_class.__name__] = len(scheduler_class(teams, facilities, rules).optimize_schedule().games)
+    print(f"Games: {counts}")
+    assert counts["SchoolBasedScheduler"] >= counts["_BlockScanScheduler"]
+    print("[PASS] Fill keeps the block scan's game count")
+
+
+if __name__ == "__main__":
+    test_fewest_games_first()
+    test_hard_constraints_hold()
+    test_used_slot_leaves_index()
+    test_matches_block_scan_game_count()
@@ -0,0 +1,81 @@
+"""
+Test the one-pass schedule aggregate.
+
+Verifies:
+1. Per-team columns match a direct scan of each team's games
+2. Division, date, facility and school counts add up to the schedule
+3. The schedule report renders from the aggregate
+"""
+
+import sys
+import os
+from collections import Counter
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.aggregates import aggregate_schedule
+from app.services.league_generator import LeagueSpec, generate_league
+from app.services.scheduler_v2 import SchoolBasedScheduler
+from app.services.validator import ScheduleValidator
+
+
+def _scheduled_league():
+    teams, facilities, rules = generate_league(
+        LeagueSpec(num_schools=6, num_neutral_sites=2, home_gym_rate=0.5, blackout_rate=0.0)
+    )
+    schedule = SchoolBasedScheduler(teams, facilities, rules).optimize_schedule()
+    return teams, schedule
+
+
+def test_team_columns_match_scan():
+    """Every team's stats equal a direct scan of its games."""
+    teams, schedule = _scheduled_league()
+    aggregate = aggregate_schedule(schedule, teams)
+
+    assert aggregate.teams[:len(teams)] == teams
+    for team in teams:
+        games = schedule.get_team_games(team)
+        stats = aggregate.team_stats(team)
+        assert stats.total_games == len(games) == aggregate.games_for(team)
+        assert stats.home_games == sum(1 for g in games if g.is_home_game(team))
+        assert stats.away_games == stats.total_games - stats.home_games
+        assert stats.opponents == [g.get_opponent(team) for g in games]
+        assert sum(stats.games_by_week.values()) == stats.total_games
+    print("[PASS] Team columns match per-team scans")
+
+
+def test_breakdowns_add_up():
+    """Division / date / facility / school breakdowns cover every game."""
+    teams, schedule = _scheduled_league()
+    aggregate = aggregate_schedule(schedule)
+
+    assert aggregate.games_by_division == dict(Counter(g.division for g in schedule.games))
+    assert aggregate.games_by_date == dict(Counter(g.time_slot.date for g in schedule.games))
+    assert aggregate.games_by_facility == dict(Counter(g.time_slot.facility.name for g in schedule.games))
+    assert sum(aggregate.weeknight_court_games.values()) == sum(
+        1 for g in schedule.games if g.time_slot.date.weekday() < 5
+    )
+    for school, count in aggregate.games_by_school.items():
+        assert count == sum(1 for g in schedule.games if school in (g.home_team.school.name, g.away_team.school.name))
+
+    buckets = aggregate.game_count_buckets(teams)
+    assert sum(buckets.values()) == len(teams)
+    print("[PASS] Breakdowns add up to the schedule")
+
+
+def test_report_from_aggregate():
+    """The report lists totals and every team that plays."""
+    teams, schedule = _scheduled_league()
+    aggregate = aggregate_schedule(schedule, teams)
+    report = ScheduleValidator().generate_schedule_report(schedule, aggregate)
+
+    assert f"Total Games: {len(schedule.games)}" in report
+    playing = [t for t in teams if aggregate.games_for(t)]
+    assert all(f"  {t.id}:" in report for t in playing)
+    assert report == ScheduleValidator().generate_schedule_report(schedule)
+    print("[PASS] Schedule report renders from the aggregate")
+
+
+if __name__ == "__main__":
+    test_team_columns_match_scan()
+    test_breakdowns_add_up()
+    test_report_from_aggregate()
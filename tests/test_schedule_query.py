@@ -0,0 +1,165 @@
+"""
+Test the indexed games query over stored schedules.
+
+Verifies:
+1. Every filter returns exactly the games a full scan finds
+2. Cursor pagination visits every matching game once, in date and time order
+3. /api/schedule/{id}/games applies filters, pages and field selection
+4. Bad input (unknown schedule, field, day or cursor) is rejected
+5. Each page scans only from its cursor on; the total is counted once per filter set
+"""
+
+import sys
+import os
+import inspect
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import timedelta
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.league_generator import LeagueSpec, generate_league
+from app.services.schedule_query import GameIndex, GameFilters, QueryError, parse_days
+from app.services.schedule_store import schedule_store
+from app.services.scheduler_v2 import SchoolBasedScheduler
+
+
+def _generated():
+    teams, facilities, rules = generate_league(
+        LeagueSpec(num_schools=6, num_neutral_sites=2, home_gym_rate=0.5, blackout_rate=0.0)
+    )
+    schedule = SchoolBasedScheduler(teams, facilities, rules).optimize_schedule()
+    return teams, schedule
+
+
+def _scan(schedule, predicate):
+    return {game.id for game in schedule.games if predicate(game)}
+
+
+def _all_pages(index, filters, limit):
+    ids, cursor = [], None
+    while True:
+        page = index.query(filters, cursor=cursor, limit=limit)
+        ids.extend(game.id for game in page.games)
+        assert page.total >= len(ids)
+        if page.next_cursor is None:
+            return ids
+        cursor = page.next_cursor
+
+
+def test_filters_match_scan():
+    """Indexed results equal a full scan for each filter and a combination."""
+    teams, schedule = _generated()
+    index = GameIndex(schedule)
+    team = teams[0]
+    game = schedule.games[len(schedule.games) // 2]
+    first = min(g.time_slot.date for g in schedule.games)
+    date_from, date_to = first + timedelta(days=7), first + timedelta(days=27)
+
+    cases = [
+        (GameFilters(team=team.id), lambda g: team.id in (g.home_team.id, g.away_team.id)),
+        (GameFilters(school=team.school.name.upper()),
+         lambda g: team.school.name in (g.home_team.school.name, g.away_team.school.name)),
+        (GameFilters(coach=team.coach_name),
+         lambda g: team.coach_name in (g.home_team.coach_name, g.away_team.coach_name)),
+        (GameFilters(division=game.division.value.lower()), lambda g: g.division == game.division),
+        (GameFilters(facility=game.time_slot.facility.name),
+         lambda g: g.time_slot.facility.name == game.time_slot.facility.name),
+        (GameFilters(date_from=date_from, date_to=date_to),
+         lambda g: date_from <= g.time_slot.date <= date_to),
+        (GameFilters(days=parse_days("Sat")), lambda g: g.time_slot.date.weekday() == 5),
+        (GameFilters(school=team.school.name, days=parse_days("mon,tue,wed,thu,fri"), date_from=date_from),
+         lambda g: team.school.name in (g.home_team.school.name, g.away_team.school.name)
+         and g.time_slot.date.weekday() < 5 and g.time_slot.date >= date_from),
+    ]
+    for filters, predicate in cases:
+        page = index.query(filters, limit=1000)
+        expected = _scan(schedule, predicate)
+        assert {g.id for g in page.games} == expected, filters
+        assert page.total == len(expected)
+    print(f"[PASS] {len(cases)} filter cases match a full scan ({len(schedule.games)} games)")
+
+
+def test_cursor_pagination():
+    """Pages cover every match once, in season order."""
+    teams, schedule = _generated()
+    index = GameIndex(schedule)
+    filters = GameFilters(school=teams[0].school.name)
+    ids = _all_pages(index, filters, limit=3)
+    assert len(ids) == len(set(ids)) == index.query(filters).total
+
+    ids = _all_pages(index, GameFilters(), limit=7)
+    assert len(ids) == len(schedule.games)
+    by_id = {game.id: game for game in schedule.games}
+    order = [(by_id[i].time_slot.date, by_id[i].time_slot.start_time) for i in ids]
+    assert order == sorted(order)
+
+    try:
+        index.query(filters, cursor="not-a-cursor")
+        assert False, "bad cursor accepted"
+    except QueryError:
+        pass
+    print("[PASS] Cursor pagination covers every game once, in order")
+
+
+def test_games_endpoint():
+    """Filters, pages and field selection through the API."""
+    client = TestClient(app)
+    schedule_store.clear()
+    teams, schedule = _generated()
+    stored = schedule_store.add(schedule, teams)
+    url = f"/api/schedule/{stored.schedule_id}/games"
+    team = teams[0]
+
+    response = client.get(url, params={"team": team.id, "limit": 2, "fields": "date,time,home_team"})
+    assert response.status_code == 200
+    page = response.json()
+    assert page["count"] == len(page["games"]) <= 2
+    assert page["total"] == len(_scan(schedule, lambda g: team.id in (g.home_team.id, g.away_team.id)))
+    assert all(set(g) == {"date", "time", "home_team"} for g in page["games"])
+
+    seen = page["count"]
+    while page["next_cursor"]:
+        page = client.get(url, params={"team": team.id, "limit": 2, "cursor": page["next_cursor"]}).json()
+        seen += page["count"]
+    assert seen == page["total"]
+
+    saturday = client.get(url, params={"day": "Saturday"}).json()
+    assert all(g["day"] == "Saturday" for g in saturday["games"])
+
+    assert client.get("/api/schedule/missing/games").status_code == 404
+    assert client.get(url, params={"fields": "date,score"}).status_code == 400
+    assert client.get(url, params={"day": "Funday"}).status_code == 400
+    assert client.get(url, params={"limit": 0}).status_code == 400
+    route = next(r for r in app.routes if getattr(r, "path", None) == "/api/schedule/{schedule_id}/games")
+    assert not inspect.iscoroutinefunction(route.endpoint)
+    schedule_store.clear()
+    print("[PASS] /api/schedule/{id}/games filters, pages and selects fields")
+
+
+
+def test_pages_scan_from_cursor():
+    """Paging through the season checks each game about twice, not once per page."""
+    teams, schedule = _generated()
+    index = GameIndex(schedule)
+    checked = []
+    matches = index._matches
+    index._matches = lambda game, filters: checked.append(game) or matches(game, filters)
+
+    filters = GameFilters(days=parse_days("Tue,Sat"))
+    ids = _all_pages(index, filters, limit=5)
+    expected = _scan(schedule, lambda g: g.time_slot.date.weekday() in (1, 5))
+    assert len(ids) == len(expected) and set(ids) == expected
+    pages = -(-len(ids) // 5)
+    assert pages > 3
+    # One count for the total plus one walk across the pages (each page looks one game ahead)
+    assert len(checked) <= 2 * len(expected) + pages
+    print(f"[PASS] {pages} pages checked {len(checked)} games for {len(expected)} matches")
+
+
+if __name__ == "__main__":
+    test_filters_match_scan()
+    test_cursor_pagination()
+    test_games_endpoint()
+    test_pages_scan_from_cursor()
@@ -0,0 +1,74 @@
+"""
+Test the schedule store and the /api/stats endpoint it backs.
+
+Verifies:
+1. The store keeps the most recent schedules and evicts the oldest
+2. /api/stats returns 404 before any schedule is generated
+3. /api/stats reports the stored schedule's actual counts
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.league_generator import LeagueSpec, generate_league
+from app.services.metrics import compute_run_metrics
+from app.services.schedule_store import ScheduleStore, schedule_store
+from app.services.scheduler_v2 import SchoolBasedScheduler
+
+
+def _generated():
+    teams, facilities, rules = generate_league(
+        LeagueSpec(num_schools=6, num_neutral_sites=2, home_gym_rate=0.0, blackout_rate=0.0)
+    )
+    scheduler = SchoolBasedScheduler(teams, facilities, rules)
+    schedule = scheduler.optimize_schedule()
+    return teams, schedule, compute_run_metrics(schedule, teams, scheduler=scheduler)
+
+
+def test_store_keeps_latest():
+    """latest() is the newest entry and old entries are evicted."""
+    teams, schedule, metrics = _generated()
+    store = ScheduleStore(max_schedules=2)
+    first = store.add(schedule, teams, metrics=metrics)
+    second = store.add(schedule, teams, metrics=metrics)
+    third = store.add(schedule, teams, metrics=metrics)
+
+    assert store.latest() is third
+    assert store.get(second.schedule_id) is second
+    assert store.get(first.schedule_id) is None
+    assert third.aggregate.total_games == len(schedule.games)
+    print("[PASS] Store keeps the most recent schedules")
+
+
+def test_stats_endpoint():
+    """Stats come from the stored schedule, not from Sheets."""
+    client = TestClient(app)
+    schedule_store.clear()
+    assert client.get("/api/stats").status_code == 404
+
+    teams, schedule, metrics = _generated()
+    stored = schedule_store.add(schedule, teams, metrics=metrics)
+    response = client.get("/api/stats")
+    assert response.status_code == 200
+    stats = response.json()
+    print(f"Stats: { {k: v for k, v in stats.items() if k != 'games_by_facility'} }")
+
+    assert stats["schedule_id"] == stored.schedule_id
+    assert stats["total_games"] == len(schedule.games)
+    assert stats["total_teams"] == len(teams)
+    assert sum(stats["games_by_division"].values()) == len(schedule.games)
+    assert sum(stats["games_by_facility"].values()) == len(schedule.games)
+    for key in ("teams_with_8_games", "teams_under_8_games", "teams_over_8_games",
+                "weeknight_courts", "weeknight_courts_under_3_games", "facility_utilization"):
+        assert stats[key] == metrics[key], key
+    schedule_store.clear()
+    print("[PASS] /api/stats reports the stored schedule")
+
+
+if __name__ == "__main__":
+    test_store_keeps_latest()
+    test_stats_endpoint()
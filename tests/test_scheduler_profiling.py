@@ -0,0 +1,77 @@
+"""
+Test the built-in scheduler profiling hooks.
+
+Verifies:
+1. Profiling is off by default and reports nothing
+2. When enabled, every scheduler phase is timed
+3. Block rejection reasons are counted inside _find_time_block_for_matchup
+"""
+
+import sys
+import os
+from datetime import date
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models import Team, School, Facility, Division, Cluster, Tier
+from app.services.scheduler_v2 import SchoolBasedScheduler
+
+
+def _small_league():
+    """Build a tiny offline league: 4 schools, 2 divisions, 1 neutral gym."""
+    teams = []
+    for name in ["Alder Prep", "Birch Academy", "Cedar Charter", "Dogwood Prep"]:
+        school = School(name=name, cluster=Cluster.EAST, tier=Tier.TIER_2)
+        for division in [Division.ES_BOYS_COMP, Division.BOYS_JV]:
+            teams.append(Team(
+                id=f"{name}_{division.value}".replace(' ', '_'),
+                school=school,
+                division=division,
+                coach_name=f"Coach {name.split()[0]} {division.name}",
+                coach_email="",
+                tier=school.tier,
+                cluster=school.cluster
+            ))
+    facilities = [Facility(name="Community Center - Court 1", address="Community Center", max_courts=1)]
+    rules = {
+        'season_start': date(2026, 1, 5),
+        'season_end': date(2026, 2, 28),
+        'holidays': [],
+        'blackouts': {}
+    }
+    return teams, facilities, rules
+
+
+def test_profiling_disabled_by_default():
+    """The profiler should be silent unless explicitly enabled."""
+    teams, facilities, rules = _small_league()
+    scheduler = SchoolBasedScheduler(teams, facilities, rules)
+    scheduler.optimize_schedule()
+
+    assert scheduler.profiler.report() is None
+    print("[PASS] Profiling disabled by default")
+
+
+def test_profiling_report():
+    """Phases and rejection reasons should appear in the report."""
+    teams, facilities, rules = _small_league()
+    scheduler = SchoolBasedScheduler(teams, facilities, rules, profile=True)
+    scheduler.optimize_schedule()
+
+    report = scheduler.profiler.report()
+    phase_names = [p['name'] for p in report['phases']]
+    print(f"Phases: {phase_names}")
+    print(f"Rejections: {report['rejections']}")
+
+    assert 'block_generation' in phase_names
+    assert 'matchup_generation' in phase_names
+    assert 'first_pass' in phase_names
+    assert all(p['seconds'] >= 0 for p in report['phases'])
+    assert report['counters']['find_time_block_calls'] > 0
+    assert report['counters']['time_blocks'] == len(scheduler.time_blocks)
+    assert sum(report['rejections'].values()) > 0
+    print("[PASS] Profiling report contains phases and rejection reasons")
+
+
+if __name__ == "__main__":
+    test_profiling_disabled_by_default()
+    test_profiling_report()
@@ -0,0 +1,240 @@
+"""
+Test the shared Google Sheets client: rate limiting, retries, circuit breaker.
+
+Uses fake clocks and in-memory sheets (no Google credentials).
+
+Verifies:
+1. The token bucket allows a burst, then throttles to the configured rate
+2. Quota and server errors are retried with jittered exponential backoff
+3. Repeated failures open the circuit; a trial call after the reset closes it
+4. SheetsReader falls back to the last good copy of a sheet while Sheets is down
+5. Metrics count calls, retries and latency per operation
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import inspect
+
+import gspread
+from fastapi.testclient import TestClient
+
+from app.core.config import SHEET_TEAM_LIST
+from app.main import app
+from app.services import sheets_reader as sheets_reader_module
+from app.services.sheets_client import (
+    CircuitBreaker, SheetsClient, SheetsUnavailable, TokenBucket, is_unavailable
+)
+from app.services.sheets_reader import SheetsReader
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class _Response:
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.text = f"HTTP {status_code}"
+
+    def json(self):
+        return {"error": {"code": self.status_code, "message": self.text}}
+
+
+def _api_error(status):
+    return gspread.exceptions.APIError(_Response(status))
+
+
+class _Flaky:
+    """A call that fails with the given statuses, then returns 'ok'."""
+
+    def __init__(self, statuses):
+        self.statuses = list(statuses)
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.statuses:
+            raise _api_error(self.statuses.pop(0))
+        return "ok"
+
+
+def _client(clock, **options):
+    settings = dict(requests_per_minute=600, burst=5, max_retries=3, backoff_seconds=1.0,
+                    max_backoff_seconds=8.0, jitter=0.5, breaker_failures=2, breaker_reset_seconds=30.0)
+    settings.update(options)
+    return SheetsClient(clock=clock, sleep=clock.sleep, **settings)
+
+
+def test_token_bucket():
+    """A burst goes straight through; later calls wait for tokens."""
+    clock = _Clock()
+    bucket = TokenBucket(rate=2.0, capacity=3, clock=clock, sleep=clock.sleep)
+    assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.acquire() == 0.5  # Next token after 1/rate seconds
+    clock.now += 10
+    assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]  # Refill capped at capacity
+    assert bucket.acquire() == 0.5
+    print("[PASS] Token bucket bursts, then throttles")
+
+
+def test_retries_with_jitter():
+    """Retryable errors back off exponentially within the jitter band; others raise at once."""
+    clock = _Clock()
+    client = _client(clock, requests_per_minute=60000, breaker_failures=10)
+    flaky = _Flaky([429, 503, 500])
+    assert client.call("get_all_values", flaky) == "ok" and flaky.calls == 4
+    for attempt, delay in enumerate(clock.sleeps):
+        full = 1.0 * 2 ** attempt
+        assert full * 0.5 <= delay <= full
+
+    flaky = _Flaky([400])
+    try:
+        client.call("get_all_values", flaky)
+        assert False, "400 should not be retried"
+    except gspread.exceptions.APIError:
+        assert flaky.calls == 1
+
+    flaky = _Flaky([429] * 10)
+    try:
+        client.call("get_all_values", flaky)
+        assert False, "Retries should run out"
+    except gspread.exceptions.APIError:
+        assert flaky.calls == 4
+
+    assert is_unavailable(_api_error(429)) and not is_unavailable(_api_error(404))
+    print("[PASS] Jittered exponential backoff on 429/5xx only")
+
+
+def test_circuit_breaker():
+    """Open after repeated failures, reject while open, one trial call after the reset."""
+    clock = _Clock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=30.0, clock=clock)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+
+    clock.now += 30
+    assert breaker.allow() and breaker.state == "half_open"
+    assert not breaker.allow()  # Only one trial at a time
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    clock.now += 30
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow()
+
+    client = _client(clock, max_retries=0)
+    for _ in range(2):
+        try:
+            client.call("worksheet", _Flaky([503]))
+        except gspread.exceptions.APIError:
+            pass
+    flaky = _Flaky([])
+    try:
+        client.call("worksheet", flaky)
+        assert False, "Open circuit should reject calls"
+    except SheetsUnavailable:
+        assert flaky.calls == 0
+    print("[PASS] Circuit breaker opens, rejects and recovers")
+
+
+class _Sheet:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def get_all_values(self):
+        return self.rows
+
+
+class _Spreadsheet:
+    def __init__(self, rows):
+        self.rows = rows
+        self.failing = False
+
+    def worksheet(self, name):
+        if self.failing:
+            raise _api_error(503)
+        return _Sheet(self.rows)
+
+
+def test_reader_falls_back_to_last_good_copy():
+    """While Sheets is down, reads return the last good copy; metrics record it all."""
+    clock = _Clock()
+    client = _client(clock, max_retries=1)
+    original = sheets_reader_module.sheets_client
+    sheets_reader_module.sheets_client = client
+    try:
+        reader = SheetsReader.__new__(SheetsReader)
+        reader._sheet_digests = {}
+        reader.spreadsheet = _Spreadsheet([["SCHOOL", "TEAM"], ["A", "A (Coach)"]])
+
+        first = reader._read_sheet(SHEET_TEAM_LIST)
+        content_hash = reader.content_hash()
+
+        reader.spreadsheet.failing = True
+        assert reader._read_sheet(SHEET_TEAM_LIST) == first  # Retries fail, last good copy
+        assert reader._read_sheet(SHEET_TEAM_LIST) == first
+        assert client.breaker.state == "open"  # Two failed calls in a row
+        assert reader._read_sheet(SHEET_TEAM_LIST) == first  # Rejected without calling Sheets
+        assert reader.content_hash() == content_hash
+
+        try:
+            reader._read_sheet("NEVER READ")
+            assert False, "No copy to fall back to"
+        except SheetsUnavailable:
+            pass
+
+        metrics = client.metrics()
+        assert metrics["fallbacks"] == 3 and metrics["circuit"] == "open"
+        assert metrics["operations"]["worksheet"]["retries"] == 2
+        assert metrics["operations"]["worksheet"]["rejected"] == 2
+        assert metrics["operations"]["get_all_values"]["calls"] == 1
+
+        clock.now += 30
+        reader.spreadsheet.failing = False
+        reader.spreadsheet.rows = [["SCHOOL", "TEAM"], ["B", "B (Coach)"]]
+        assert reader._read_sheet(SHEET_TEAM_LIST)[1][0] == "B"  # Recovered
+        assert client.breaker.state == "closed" and reader.content_hash() != content_hash
+    finally:
+        sheets_reader_module.sheets_client = original
+    print("[PASS] Reader serves the last good copy while Sheets is unavailable")
+
+
+def test_sheets_handlers_off_event_loop():
+    """Handlers that can wait on Sheets run in worker threads, not on the event loop."""
+    blocking = {"/api/schedule", "/api/schedule/{schedule_id}/publish", "/api/data", "/api/info",
+                "/api/teams", "/api/facilities", "/api/schools"}
+    routes = {route.path: route.endpoint for route in app.routes if getattr(route, "path", None) in blocking}
+    assert set(routes) == blocking
+    assert not any(inspect.iscoroutinefunction(endpoint) for endpoint in routes.values())
+    print("[PASS] Sheets-loading handlers are plain defs")
+
+
+def test_metrics_endpoint():
+    response = TestClient(app).get("/api/sheets/metrics")
+    assert response.status_code == 200
+    body = response.json()
+    assert {"calls", "retries", "fallbacks", "circuit", "operations"} <= set(body)
+    print("[PASS] /api/sheets/metrics")
+
+
+if __name__ == "__main__":
+    test_token_bucket()
+    test_retries_with_jitter()
+    test_circuit_breaker()
+    test_reader_falls_back_to_last_good_copy()
+    test_sheets_handlers_off_event_loop()
+    test_metrics_endpoint()
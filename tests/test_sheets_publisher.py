@@ -0,0 +1,210 @@
+"""
+Test publishing schedules to the weekly Google Sheets tabs.
+
+Uses an in-memory stand-in for the spreadsheet that counts API calls.
+
+Verifies:
+1. A first publish creates one tab per week holding that week's games
+2. Re-publishing an unchanged schedule reads but writes nothing
+3. After a small repair only the changed cells are written, one update per tab
+4. Weeks that lose games are cleared; quota errors are retried with backoff
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import gspread
+from gspread.utils import a1_range_to_grid_range
+
+from app.services.exporters import WEEK_SHEET_HEADERS, week_number, week_sheet_name
+from app.services.league_generator import LeagueSpec, generate_league
+from app.services.scheduler_v2 import SchoolBasedScheduler
+from app.services.sheets_client import SheetsClient
+from app.services.sheets_publisher import SheetsPublisher, diff_ranges, week_tables
+
+
+class _Response:
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.text = f"HTTP {status_code}"
+
+    def json(self):
+        return {"error": {"code": self.status_code, "message": self.text}}
+
+
+class _Worksheet:
+    def __init__(self, title, rows, cols):
+        self.title = title
+        self.row_count = rows
+        self.col_count = cols
+        self.cells = {}  # (row, col) -> value, 0-based
+
+    def add_rows(self, rows):
+        self.row_count += rows
+
+    def values(self):
+        if not self.cells:
+            return []
+        height = max(r for r, _ in self.cells) + 1
+        rows = [[self.cells.get((r, c), "") for c in range(self.col_count)] for r in range(height)]
+        while rows and not any(rows[-1]):
+            rows.pop()
+        return rows
+
+
+class _Spreadsheet:
+    """Just enough of gspread.Spreadsheet for the publisher."""
+
+    def __init__(self):
+        self.tabs = {}
+        self.calls = []
+        self.failures = []  # Status codes to raise on the next calls
+
+    def _record(self, name):
+        self.calls.append(name)
+        if self.failures:
+            raise gspread.exceptions.APIError(_Response(self.failures.pop(0)))
+
+    def worksheets(self):
+        self._record("worksheets")
+        return list(self.tabs.values())
+
+    def add_worksheet(self, title, rows, cols):
+        self._record("add_worksheet")
+        self.tabs[title] = _Worksheet(title, rows, cols)
+        return self.tabs[title]
+
+    def values_batch_get(self, ranges):
+        self._record("values_batch_get")
+        return {"valueRanges": [
+            {"range": r, "values": self.tabs[r.split("!")[0].strip("'")].values()} for r in ranges
+        ]}
+
+    def values_batch_update(self, body):
+        self._record("values_batch_update")
+        assert body["valueInputOption"] == "RAW"
+        tabs = {entry["range"].split("!")[0].strip("'") for entry in body["data"]}
+        assert len(tabs) == 1  # One update per tab
+        for entry in body["data"]:
+            title, a1 = entry["range"].split("!")
+            sheet = self.tabs[title.strip("'")]
+            grid = a1_range_to_grid_range(a1)
+            assert grid["endRowIndex"] <= sheet.row_count
+            for dr, row in enumerate(entry["values"]):
+                for dc, value in enumerate(row):
+                    sheet.cells[(grid["startRowIndex"] + dr, grid["startColumnIndex"] + dc)] = value
+
+
+def _client():
+    return SheetsClient(requests_per_minute=60000, burst=1000, sleep=lambda s: None)
+
+
+def _generated():
+    teams, facilities, rules = generate_league(
+        LeagueSpec(num_schools=6, num_neutral_sites=2, home_gym_rate=0.5, blackout_rate=0.0)
+    )
+    return SchoolBasedScheduler(teams, facilities, rules).optimize_schedule()
+
+
+def test_diff_ranges():
+    """Only changed cells are written; consecutive matching rows share a range."""
+    header = list(WEEK_SHEET_HEADERS)
+    row = ["2026-01-06", "Tuesday", "5:00 PM - 6:00 PM", "A (x)", "B (y)", "Gym", "BOY'S JV"]
+    assert diff_ranges([header, row], [header, row]) == ([], 0)
+
+    swapped = row[:3] + [row[4], row[3]] + row[5:]
+    ranges, changed = diff_ranges([header, row, row], [header, swapped, swapped])
+    assert ranges == [("D2:E3", [[row[4], row[3]], [row[4], row[3]]])] and changed == 4
+
+    ranges, changed = diff_ranges([header, row, row], [header])
+    assert ranges == [("A2:G3", [[""] * 7, [""] * 7])] and changed == 14
+    print("[PASS] Cell diff")
+
+
+def test_publish_and_republish():
+    """Full first publish, free re-publish, small repair writes a few cells."""
+    schedule = _generated()
+    spreadsheet = _Spreadsheet()
+    publisher = SheetsPublisher(spreadsheet, client=_client())
+    tables = week_tables(schedule.games, schedule.season_start)
+
+    result = publisher.publish(schedule)
+    assert sorted(result.tabs_created) == sorted(week_sheet_name(w) for w in tables)
+    for week, rows in tables.items():
+        assert spreadsheet.tabs[week_sheet_name(week)].values() == rows
+    assert spreadsheet.calls.count("values_batch_update") == len(tables)
+
+    spreadsheet.calls.clear()
+    result = publisher.publish(schedule)
+    assert result.cells_changed == 0 and len(result.tabs_unchanged) == len(tables)
+    assert spreadsheet.calls == ["worksheets", "values_batch_get"] and result.api_calls == 2
+
+    # Repair: swap home and away in one game
+    game = schedule.games[len(schedule.games) // 2]
+    game.home_team, game.away_team = game.away_team, game.home_team
+    spreadsheet.calls.clear()
+    result = publisher.publish(schedule)
+    assert result.cells_changed == 2 and len(result.tabs_updated) == 1
+    assert spreadsheet.calls == ["worksheets", "values_batch_get", "values_batch_update"]
+    tables = week_tables(schedule.games, schedule.season_start)
+    for week, rows in tables.items():
+        assert spreadsheet.tabs[week_sheet_name(week)].values() == rows
+    print(f"[PASS] Published {len(tables)} weeks; repair cost {result.api_calls} API calls")
+
+
+def test_removed_games_and_dry_run():
+    """Tabs losing games are cleared below the headers; dry runs write nothing."""
+    schedule = _generated()
+    spreadsheet = _Spreadsheet()
+    publisher = SheetsPublisher(spreadsheet, client=_client())
+    publisher.publish(schedule)
+
+    last_week = max(week_tables(schedule.games, schedule.season_start))
+    title = week_sheet_name(last_week)
+    schedule.games = [g for g in schedule.games if week_number(g.time_slot.date, schedule.season_start) != last_week]
+
+    spreadsheet.calls.clear()
+    result = publisher.publish(schedule, dry_run=True)
+    assert result.tabs_updated == [title] and "values_batch_update" not in spreadsheet.calls
+
+    publisher.publish(schedule)
+    assert spreadsheet.tabs[title].values() == [list(WEEK_SHEET_HEADERS)]
+    print("[PASS] Emptied week cleared, dry run wrote nothing")
+
+
+def test_quota_retries():
+    """429 and 5xx are retried with doubling delays; other errors are raised."""
+    schedule = _generated()
+    spreadsheet = _Spreadsheet()
+    delays = []
+    client = SheetsClient(requests_per_minute=6000, backoff_seconds=1.0, max_backoff_seconds=3.0, jitter=0.0,
+                          breaker_failures=100, sleep=delays.append)
+    publisher = SheetsPublisher(spreadsheet, client=client)
+
+    spreadsheet.failures = [429, 429, 503]
+    result = publisher.publish(schedule)
+    assert delays == [1.0, 2.0, 3.0] and result.retries == 3
+
+    spreadsheet.failures = [403]
+    try:
+        publisher.publish(schedule)
+        assert False, "403 should not be retried"
+    except gspread.exceptions.APIError:
+        pass
+
+    client.max_retries = 1
+    spreadsheet.failures = [429, 429]
+    try:
+        publisher.publish(schedule)
+        assert False, "Retries should run out"
+    except gspread.exceptions.APIError:
+        pass
+    print("[PASS] Quota errors retried with exponential backoff")
+
+
+if __name__ == "__main__":
+    test_diff_ranges()
+    test_publish_and_republish()
+    test_removed_games_and_dry_run()
+    test_quota_retries()
@@ -0,0 +1,127 @@
+"""
+Test SheetsReader parsing on in-memory sheets (no Google credentials).
+
+Verifies:
+1. load_teams keeps its team id / school / (school, division) indexes in sync
+2. Rivals and do-not-play relationships link same-division teams of the listed schools
+3. A large team list parses quickly
+4. content_hash changes exactly when a sheet's contents change
+"""
+
+import sys
+import os
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import SHEET_TEAM_LIST, SHEET_TIERS_CLUSTERS
+from app.models import School
+from app.services.sheets_reader import SheetsReader
+
+DIVISION_HEADERS = ['#', 'ES K-1 REC', 'ES 2-3 REC', "ES BOY'S COMP", "ES GIRL'S COMP", " BOY'S JV", " GIRL'S JV"]
+
+
+class _Sheet:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def get_all_values(self):
+        return self.rows
+
+
+class _Spreadsheet:
+    def __init__(self, sheets):
+        self.sheets = sheets
+
+    def worksheet(self, name):
+        return _Sheet(self.sheets[name])
+
+
+def _reader(num_schools, rows_per_school=1, relationships=()):
+    """A reader over a TEAM LIST with one team per division for every school row."""
+    school_names = [f"School {i}" for i in range(num_schools)]
+    team_rows = [DIVISION_HEADERS, ['', '0', '0', '0', '0', '0', '0']]
+    for name in school_names:
+        for coach in range(rows_per_school):
+            team_rows.append([''] + [f"{name} (Coach{coach})"] * 6)
+
+    reader = SheetsReader.__new__(SheetsReader)
+    reader._teams_cache = None
+    reader._sheet_digests = {}
+    reader._index_teams([])
+    reader._schools_cache = {name: School(name=name) for name in school_names}
+    reader.spreadsheet = _Spreadsheet({
+        SHEET_TEAM_LIST: team_rows,
+        SHEET_TIERS_CLUSTERS: [['SCHOOL', 'RIVALS', 'DO NOT PLAY']] + [list(r) for r in relationships],
+    })
+    return reader
+
+
+def test_team_indexes():
+    """Indexes built while loading agree with the loaded teams."""
+    reader = _reader(num_schools=5, rows_per_school=2)
+    teams = reader.load_teams()
+
+    assert len(teams) == 5 * 2 * 6
+    assert reader._team_ids == {t.id for t in teams}
+    assert len(reader._team_ids) == len(teams)
+    assert all(len(reader._teams_by_school[f"School {i}"]) == 12 for i in range(5))
+    assert all(len(group) == 2 for group in reader._teams_by_school_division.values())
+    print("[PASS] Team indexes match the loaded teams")
+
+
+def test_rivals_and_restrictions():
+    """Rival / do-not-play schools link teams in the same division only."""
+    reader = _reader(num_schools=4, relationships=[
+        ['School 0', 'School 1, School 2', 'School 3'],
+    ])
+    teams = reader.load_teams()
+    reader.load_rivals_and_restrictions(teams)
+
+    for team in teams:
+        expected_rivals = {
+            t.id for t in teams
+            if team.school.name == 'School 0' and t.school.name in ('School 1', 'School 2') and t.division == team.division
+        }
+        expected_dnp = {
+            t.id for t in teams
+            if team.school.name == 'School 0' and t.school.name == 'School 3' and t.division == team.division
+        }
+        assert team.rivals == expected_rivals
+        assert team.do_not_play == expected_dnp
+    print("[PASS] Rivals and do-not-play relationships")
+
+
+def test_large_team_list_parses_quickly():
+    """Parsing is linear in the number of teams."""
+    reader = _reader(num_schools=500, rows_per_school=4, relationships=[
+        [f"School {i}", f"School {i + 1}", f"School {i + 2}"] for i in range(498)
+    ])
+    start = time.perf_counter()
+    teams = reader.load_teams()
+    reader.load_rivals_and_restrictions(teams)
+    elapsed = time.perf_counter() - start
+    print(f"Parsed {len(teams)} teams and relationships in {elapsed * 1000:.0f}ms")
+    assert len(teams) == 500 * 4 * 6
+    print("[PASS] Large team list parsed")
+
+
+def test_content_hash():
+    """Same contents, same hash; one edited cell, a new hash."""
+    first = _reader(3)
+    first.load_teams()
+    second = _reader(3)
+    second.load_teams()
+    assert first.content_hash() == second.content_hash()
+
+    edited = _reader(3)
+    edited.spreadsheet.sheets[SHEET_TEAM_LIST][2][1] = "School 0 (Renamed)"
+    edited.load_teams()
+    assert edited.content_hash() != first.content_hash()
+    print("[PASS] content_hash follows the sheet contents")
+
+
+if __name__ == "__main__":
+    test_team_indexes()
+    test_rivals_and_restrictions()
+    test_large_team_list_parses_quickly()
+    test_content_hash()
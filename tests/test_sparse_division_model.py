@@ -0,0 +1,133 @@
+"""
+Test sparse variable generation in the v1 CP-SAT division model.
+
+Verifies:
+1. No variables are created for blackout dates or courts with the wrong rim height
+2. Cross-cluster matchups are dropped when both teams have 8+ same-cluster opponents
+3. Same-cluster opponents blacked out on every date don't count towards those 8,
+   and the unpruned model (the fallback when pruning is infeasible) keeps every pair
+"""
+
+import sys
+import os
+import re
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models import Division
+from app.services.league_generator import LeagueSpec, generate_league
+from app.services.scheduler import ScheduleOptimizer
+
+
+def _variable_names(optimizer, division, teams):
+    """Variable names of the model _schedule_division would solve."""
+    model, _, _, _ = optimizer._build_division_model(division, teams)
+    return [v.name for v in model.Proto().variables]
+
+
+def _pairs(names):
+    pairs = set()
+    for name in names:
+        match = re.match(r'game_t(\d+)_t(\d+)_s\d+$', name)
+        if match:
+            pairs.add((int(match.group(1)), int(match.group(2))))
+    return pairs
+
+
+def _usable_slots(optimizer, division):
+    """Usable slot list as indexed by the model (no other divisions scheduled yet)."""
+    return [
+        slot for slot in optimizer.time_slots
+        if (division == Division.ES_K1_REC) == bool(slot.facility.has_8ft_rims)
+        and slot.facility.is_available(slot.date)
+    ]
+
+
+def _clustered_division():
+    """The largest division of a league big enough for 8+ same-cluster opponents."""
+    teams, facilities, rules = generate_league(
+        LeagueSpec(num_schools=48, season_weeks=1, blackout_rate=0.0, unassigned_cluster_rate=0.0)
+    )
+    optimizer = ScheduleOptimizer(teams, facilities, rules)
+    division, division_teams = max(optimizer.teams_by_division.items(), key=lambda item: len(item[1]))
+    return optimizer, division, division_teams
+
+
+def test_no_variables_for_infeasible_slots():
+    """Blackout dates and wrong-rim courts never get a variable."""
+    teams, facilities, rules = generate_league(
+        LeagueSpec(num_schools=6, season_weeks=3, blackout_rate=0.3, k1_court_rate=1.0)
+    )
+    optimizer = ScheduleOptimizer(teams, facilities, rules)
+    division, division_teams = max(
+        ((d, t) for d, t in optimizer.teams_by_division.items() if d != Division.ES_K1_REC),
+        key=lambda item: len(item[1])
+    )
+
+    names = _variable_names(optimizer, division, division_teams)
+    usable = _usable_slots(optimizer, division)
+    assert names
+
+    blackouts = optimizer.school_blackouts
+    for name in names:
+        match = re.match(r'game_t(\d+)_t(\d+)_s(\d+)$', name)
+        if not match:
+            continue
+        i, j, idx = (int(g) for g in match.groups())
+        slot = usable[idx]
+        assert not slot.facility.has_8ft_rims
+        for team in (division_teams[i], division_teams[j]):
+            assert slot.date not in blackouts.get(team.school.name, [])
+    print(f"[PASS] {len(names)} variables, none on blackout dates or K-1 courts")
+
+
+def test_cross_cluster_pruning():
+    """With plenty of same-cluster opponents, cross-cluster pairs get no variables."""
+    optimizer, division, division_teams = _clustered_division()
+
+    model, _, _, pruned = optimizer._build_division_model(division, division_teams)
+    pairs = _pairs(v.name for v in model.Proto().variables)
+    assert pruned > 0
+
+    for i, j in pairs:
+        team_i, team_j = division_teams[i], division_teams[j]
+        if team_i.cluster != team_j.cluster:
+            same_i = sum(1 for t in division_teams if t is not team_i and t.cluster == team_i.cluster
+                         and t.school != team_i.school)
+            same_j = sum(1 for t in division_teams if t is not team_j and t.cluster == team_j.cluster
+                         and t.school != team_j.school)
+            assert same_i < 8 or same_j < 8
+    print(f"[PASS] {len(pairs)} matchups with variables, {pruned} cross-cluster ones pruned")
+
+
+def test_prune_counts_only_feasible_opponents():
+    """A team whose cluster-mates can never play keeps its cross-cluster matchups."""
+    optimizer, division, division_teams = _clustered_division()
+    pruned_pairs = _pairs(_variable_names(optimizer, division, division_teams))
+    cross = lambda i, j: division_teams[i].cluster != division_teams[j].cluster
+
+    def same_cluster(t):
+        return sum(1 for o in division_teams if o.cluster == t.cluster and o.school != t.school)
+
+    # A pruned cross-cluster pair; then black out the rest of the first team's cluster all season
+    i, j = next((i, j) for i in range(len(division_teams)) for j in range(i + 1, len(division_teams))
+                if cross(i, j) and min(same_cluster(division_teams[i]), same_cluster(division_teams[j])) >= 8)
+    assert (i, j) not in pruned_pairs
+    team = division_teams[i]
+    all_dates = sorted({slot.date for slot in optimizer.time_slots})
+    for other in division_teams:
+        if other.cluster == team.cluster and other.school != team.school:
+            optimizer.school_blackouts[other.school.name] = all_dates
+
+    pairs = _pairs(_variable_names(optimizer, division, division_teams))
+    assert (i, j) in pairs
+
+    model, _, _, pruned = optimizer._build_division_model(division, division_teams, prune_cross_cluster=False)
+    unpruned = _pairs(v.name for v in model.Proto().variables)
+    assert pruned == 0 and len(unpruned) > len(pairs)
+    print(f"[PASS] {team.id} keeps {sum(1 for p in pairs if i in p and cross(*p))} cross-cluster matchups")
+
+
+if __name__ == "__main__":
+    test_no_variables_for_infeasible_slots()
+    test_cross_cluster_pruning()
+    test_prune_counts_only_feasible_opponents()
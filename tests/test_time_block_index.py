@@ -0,0 +1,120 @@
+"""
+Test lazy time block generation.
+
+Verifies:
+1. Constructing the scheduler builds no TimeBlock objects
+2. The index enumerates the same blocks, in the same order, as eager generation
+3. Compact keys resolve to the matching block
+4. A matchup search only materializes the days and facilities it reads
+5. Facility hours limit blocks to the slots inside them
+"""
+
+import sys
+import os
+from datetime import date, time, timedelta
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.league_generator import LeagueSpec, generate_league
+from app.models import Facility
+from app.services.scheduler_v2 import SchoolBasedScheduler, TimeBlockIndex
+
+
+def _scheduler():
+    teams, facilities, rules = generate_league(
+        LeagueSpec(num_schools=6, num_neutral_sites=2, home_gym_rate=0.5, blackout_rate=0.0, season_weeks=4)
+    )
+    return SchoolBasedScheduler(teams, facilities, rules)
+
+
+def _eager_blocks(scheduler):
+    """(date, start, facility, court, consecutive slots) for every block, as eager generation listed them."""
+    index = scheduler.time_blocks
+    blocks = []
+    current_date = scheduler.season_start
+    while current_date <= scheduler.season_end:
+        if scheduler._is_valid_game_date(current_date) and current_date.weekday() <= 5:
+            start_times = index.start_times(current_date)
+            for facility in scheduler.facilities:
+                if facility.max_courts <= 0 or not facility.is_available(current_date):
+                    continue
+                for court in range(1, facility.max_courts + 1):
+                    for start_index, start_time in enumerate(start_times):
+                        blocks.append((current_date, start_time, facility.name, court, len(start_times) - start_index))
+        current_date += timedelta(days=1)
+    return blocks
+
+
+def test_construction_is_lazy():
+    """No blocks exist until something reads them, but the count is known."""
+    scheduler = _scheduler()
+    index = scheduler.time_blocks
+    assert index.materialized == 0
+    assert len(index) == len(_eager_blocks(scheduler))
+    assert index.materialized == 0
+    print(f"[PASS] {len(index)} blocks indexed, none materialized at construction")
+
+
+def test_iteration_matches_eager_generation():
+    """Iterating the index lists the eager blocks in generation order."""
+    scheduler = _scheduler()
+    listed = [
+        (b.date, b.start_time, b.facility.name, b.court_number, b.num_consecutive_slots)
+        for b in scheduler.time_blocks
+    ]
+    assert listed == _eager_blocks(scheduler)
+    print("[PASS] Lazy blocks match eager generation")
+
+
+def test_block_keys_resolve():
+    """A compact key resolves to the block at that date, facility, court and start."""
+    scheduler = _scheduler()
+    index = scheduler.time_blocks
+    saturday = next(d for d in index.dates if d.weekday() == 5)
+    facility_index = index.open_facilities(saturday)[-1]
+    facility = index.facilities[facility_index]
+    court = facility.max_courts
+    start_index = len(index.start_times(saturday)) - 1
+
+    block = index.block((saturday, facility_index, court, start_index))
+    assert (block.date, block.facility.name, block.court_number) == (saturday, facility.name, court)
+    assert block.start_time == index.start_times(saturday)[start_index]
+    assert block.num_consecutive_slots == 1
+    print("[PASS] Block keys resolve to their blocks")
+
+
+def test_search_touches_part_of_season():
+    """Finding a block materializes only the days/facilities the search got to."""
+    scheduler = _scheduler()
+    # Matchups mixing K-1 with other divisions fit no court; take the first that fits
+    assert any(scheduler._find_time_block_for_matchup(m) for m in scheduler._generate_school_matchups())
+    touched = scheduler.time_blocks.materialized
+    print(f"Materialized {touched} of {len(scheduler.time_blocks)} blocks")
+    assert 0 < touched < len(scheduler.time_blocks)
+    print("[PASS] Search materializes blocks on demand")
+
+
+def test_facility_hours_limit_blocks():
+    """Only grid slots inside a facility's hours get blocks, with runs cut at the window end."""
+    tuesday, saturday = date(2026, 1, 6), date(2026, 1, 10)
+    gym = Facility(
+        name="Gym - Court 1", address="Gym", max_courts=1,
+        time_windows={saturday: ((time(8, 0), time(10, 0)), (time(14, 0), time(15, 30)))},
+        default_time_windows=((time(18, 0), time(20, 30)),)
+    )
+    index = TimeBlockIndex([gym], [tuesday, saturday])
+
+    tuesday_blocks = [(b.start_time, b.num_consecutive_slots) for b in index.blocks_on(tuesday)]
+    assert tuesday_blocks == [(time(18, 0), 2), (time(19, 0), 1)]
+
+    saturday_blocks = [(b.start_time, b.num_consecutive_slots) for b in index.blocks_on(saturday)]
+    assert saturday_blocks == [(time(8, 0), 2), (time(9, 0), 1), (time(14, 0), 1)]
+    assert len(index) == 5
+    print("[PASS] Facility hours limit the generated blocks")
+
+
+if __name__ == "__main__":
+    test_construction_is_lazy()
+    test_iteration_matches_eager_generation()
+    test_block_keys_resolve()
+    test_search_touches_part_of_season()
+    test_facility_hours_limit_blocks()